@@ -174,6 +174,12 @@ GEOCODING_NOMINATIM_MIN_INTERVAL = float(
 GEOCODING_CACHE_TTL = int(os.environ.get('GEOCODING_CACHE_TTL', '86400'))
 GEOCODING_MAX_VARIANTES_VIA = int(os.environ.get('GEOCODING_MAX_VARIANTES_VIA', '2'))
 GEOCODING_NOMINATIM_429_BACKOFF = int(os.environ.get('GEOCODING_NOMINATIM_429_BACKOFF', '90'))
+# Geocode em lote (GeocodeEnderecoCache): endereços por rodada, trava e nova tentativa dos sem resultado.
+GEOCODING_LOTE_MAX = int(os.environ.get('GEOCODING_LOTE_MAX', '50'))
+GEOCODING_LOTE_LOCK_TTL = int(os.environ.get('GEOCODING_LOTE_LOCK_TTL', '600'))
+GEOCODING_REVALIDAR_SEM_RESULTADO_DIAS = int(
+    os.environ.get('GEOCODING_REVALIDAR_SEM_RESULTADO_DIAS', '7')
+)
 GEOCODING_VIA_REFERENCIA_ENABLED = os.environ.get(
     'GEOCODING_VIA_REFERENCIA_ENABLED', 'True'
 ).lower() == 'true'
@@ -228,6 +234,14 @@ AI_KERNEL_RETRY_BACKOFF_SECONDS = float(os.environ.get("AI_KERNEL_RETRY_BACKOFF_
 # "openai"   = payload {"input": ..., "model": ...} (OpenAI-compatible)
 AI_KERNEL_EMBEDDING_PAYLOAD = os.environ.get("AI_KERNEL_EMBEDDING_PAYLOAD", "gabinete").lower()
 AI_KERNEL_EMBEDDING_MODEL = os.environ.get("AI_KERNEL_EMBEDDING_MODEL", "mxbai-embed-large")
+# Textos por POST em VectorService.generate_embeddings e conexões keep-alive por processo.
+AI_KERNEL_EMBEDDING_BATCH_SIZE = int(os.environ.get("AI_KERNEL_EMBEDDING_BATCH_SIZE", "32"))
+AI_KERNEL_POOL_MAXSIZE = int(os.environ.get("AI_KERNEL_POOL_MAXSIZE", "10"))
+# Janela (ms) para agrupar chamadas concorrentes de generate_embedding num só POST; 0 desliga.
+AI_KERNEL_EMBEDDING_COALESCE_MS = int(os.environ.get("AI_KERNEL_EMBEDDING_COALESCE_MS", "5"))
+# Cache de embeddings por sha256(modelo + texto): LRU por processo + tabela core_embeddingcacheentrada.
+EMBEDDING_CACHE_ENABLED = os.environ.get("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_LRU_SIZE = int(os.environ.get("EMBEDDING_CACHE_LRU_SIZE", "2048"))
 
 # LLM Groq (triagem semantica / extracao de entidades de demandas)
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "")
@@ -235,6 +249,22 @@ GROQ_BASE_URL = os.environ.get("GROQ_BASE_URL", "https://api.groq.com/openai/v1/
 GROQ_MODEL = os.environ.get("GROQ_MODEL", "llama-3.3-70b-versatile")
 GROQ_TIMEOUT = int(os.environ.get("GROQ_TIMEOUT", "15"))
 GROQ_TEMPERATURE = float(os.environ.get("GROQ_TEMPERATURE", "0.1"))
+# Cliente HTTP de saída (core.services.http_externo): após N falhas seguidas (timeout, conexão, 5xx)
+# o upstream (kernel, groq, nominatim, viacep) falha na hora por X segundos. Chamadas simultâneas por
+# upstream limitadas (o Kernel usa AI_KERNEL_POOL_MAXSIZE).
+HTTP_EXTERNO_CIRCUITO_FALHAS = int(os.environ.get("HTTP_EXTERNO_CIRCUITO_FALHAS", "5"))
+HTTP_EXTERNO_CIRCUITO_ABERTO_SEGUNDOS = float(
+    os.environ.get("HTTP_EXTERNO_CIRCUITO_ABERTO_SEGUNDOS", "30")
+)
+HTTP_EXTERNO_MAX_CONCORRENTES = int(os.environ.get("HTTP_EXTERNO_MAX_CONCORRENTES", "16"))
+HTTP_EXTERNO_TIMEOUT_PADRAO = float(os.environ.get("HTTP_EXTERNO_TIMEOUT_PADRAO", "15"))
+# Cache de respostas Groq por hash do prompt (core.services.llm_cache_service): só chamadas com
+# temperatura 0 ou marcadas cacheáveis (extração de entidades, JSON do copiloto). TTL em segundos;
+# respostas acima de LLM_CACHE_MAX_BYTES não são guardadas.
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_MAX_ENTRADAS = int(os.environ.get("LLM_CACHE_MAX_ENTRADAS", "512"))
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", "65536"))
 
 # Sinapse (barramento/interoperabilidade)
 SINAPSE_DB_NAME = os.environ.get("SINAPSE_DB_NAME", "")
@@ -248,9 +278,17 @@ SINAPSE_ALERT_DIVERGENT_THRESHOLD = int(os.environ.get("SINAPSE_ALERT_DIVERGENT_
 SINAPSE_ALERT_EMAIL_RECIPIENTS = env_list("SINAPSE_ALERT_EMAIL_RECIPIENTS", "")
 SINAPSE_ALERT_WEBHOOK_URL = os.environ.get("SINAPSE_ALERT_WEBHOOK_URL", "")
 SINAPSE_ALERT_WEBHOOK_TIMEOUT = int(os.environ.get("SINAPSE_ALERT_WEBHOOK_TIMEOUT", "10"))
+# Snapshot do catálogo (serviços + órgãos) no cache compartilhado (integrations.sinapse_catalog_snapshot):
+# idade máxima em segundos e intervalo com que cada processo confere a versão publicada pelo sync.
+SINAPSE_CATALOGO_SNAPSHOT_TTL = int(os.environ.get("SINAPSE_CATALOGO_SNAPSHOT_TTL", "3600"))
+SINAPSE_CATALOGO_VERSAO_INTERVALO = float(os.environ.get("SINAPSE_CATALOGO_VERSAO_INTERVALO", "5"))
 # Triagem copiloto / debug: loga ranking no logger; mescla busca lexical em titulo/texto_limpo_rag
 SINAPSE_TRIAGEM_LOG = os.environ.get("SINAPSE_TRIAGEM_LOG", "False").lower() == "true"
 SINAPSE_TRIAGEM_LEXICAL_MERGE = os.environ.get("SINAPSE_TRIAGEM_LEXICAL_MERGE", "True").lower() == "true"
+# Busca lexical da carta via full-text Postgres (tabela core_catalogo_busca_lexical, preenchida por
+# `reindexar_busca_lexical_catalogo`); False volta ao icontains. Trigram só se pg_trgm estiver instalado.
+BUSCA_LEXICAL_FTS_ENABLED = os.environ.get("BUSCA_LEXICAL_FTS_ENABLED", "True").lower() == "true"
+BUSCA_LEXICAL_TRIGRAM_ENABLED = os.environ.get("BUSCA_LEXICAL_TRIGRAM_ENABLED", "True").lower() == "true"
 
 # Tendências (solicitações fora da carta Sinapse) — braço interno + copiloto
 COPILOTO_TENDENCIAS_ENABLED = os.environ.get("COPILOTO_TENDENCIAS_ENABLED", "True").lower() == "true"
@@ -258,6 +296,14 @@ COPILOTO_TENDENCIAS_ENABLED = os.environ.get("COPILOTO_TENDENCIAS_ENABLED", "Tru
 COPILOTO_FAQ_ENABLED = os.environ.get("COPILOTO_FAQ_ENABLED", "False").lower() == "true"
 TENDENCIA_SIMILARITY_THRESHOLD = float(os.environ.get("TENDENCIA_SIMILARITY_THRESHOLD", "0.85"))
 COPILOTO_TRIAGEM_SCORE_LIMIAR = float(os.environ.get("COPILOTO_TRIAGEM_SCORE_LIMIAR", "0.45"))
+# Consultas independentes do turno do copiloto em paralelo (core.services.copiloto_paralelo): carta
+# Sinapse direta e fallback da base otimizada, N por vez. Desligado = laço sequencial.
+COPILOTO_ENRIQUECIMENTO_PARALELO = (
+    os.environ.get("COPILOTO_ENRIQUECIMENTO_PARALELO", "True").lower() == "true"
+)
+COPILOTO_ENRIQUECIMENTO_MAX_PARALELO = int(
+    os.environ.get("COPILOTO_ENRIQUECIMENTO_MAX_PARALELO", "4")
+)
 # Corpus legado (aprendizado — não importa Demandas; JSON gerado por analisar_corpus_legado)
 CORPUS_LEGADO_ENABLED = os.environ.get("CORPUS_LEGADO_ENABLED", "True").lower() == "true"
 CORPUS_LEGADO_HINTS_COPILOTO_ENABLED = (
@@ -292,11 +338,15 @@ DESPACHO_JANELA_EDICAO_SEGUNDOS = int(os.environ.get("DESPACHO_JANELA_EDICAO_SEG
 CLUSTER_REQUER_MESMO_SERVICO = os.environ.get("CLUSTER_REQUER_MESMO_SERVICO", "True").lower() == "true"
 # Aguarda rascunhos / embeddings pendentes do mesmo serviço antes de despacho solo automático.
 CLUSTER_FORMACAO_GRACE_MINUTES = int(os.environ.get("CLUSTER_FORMACAO_GRACE_MINUTES", "20"))
+# Clusters candidatos (top-k por cosseno via índice HNSW) que seguem para o filtro geográfico.
+CLUSTER_ANN_TOP_K = int(os.environ.get("CLUSTER_ANN_TOP_K", "20"))
 
 # Base de Serviços Otimizada — substitui consultas diretas ao Sinapse
 USAR_BASE_SERVICOS_OTIMIZADA = os.environ.get("USAR_BASE_SERVICOS_OTIMIZADA", "True").lower() == "true"
 # Fallback automático para Sinapse se base otimizada falhar
 BASE_OTIMIZADA_FALLBACK_ENABLED = os.environ.get("BASE_OTIMIZADA_FALLBACK_ENABLED", "True").lower() == "true"
+# Ranking da base otimizada em memória (matriz + índice invertido); False volta às consultas pgvector/icontains.
+TRIAGEM_OTIMIZADA_INDICE_MEMORIA = os.environ.get("TRIAGEM_OTIMIZADA_INDICE_MEMORIA", "True").lower() == "true"
 
 # JWT Options
 SIMPLE_JWT = {
@@ -317,10 +367,22 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+# Concorrência limitada: o pipeline IA pós-save abre conexão com DB, Kernel e Groq.
+CELERY_WORKER_CONCURRENCY = int(os.environ.get("CELERY_WORKER_CONCURRENCY", "4"))
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 CELERY_WORKER_SEND_TASK_EVENTS = False
 CELERY_WORKER_DISABLE_GOSSIP = True
 CELERY_WORKER_DISABLE_MINGLE = True
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+# Pipeline IA pós-save (sgdl.pipeline_ia_demanda): retry exponencial enquanto o Kernel estiver fora.
+DEMANDA_PIPELINE_IA_MAX_RETRIES = int(os.environ.get("DEMANDA_PIPELINE_IA_MAX_RETRIES", "6"))
+DEMANDA_PIPELINE_IA_RETRY_BACKOFF = int(os.environ.get("DEMANDA_PIPELINE_IA_RETRY_BACKOFF", "30"))
+DEMANDA_PIPELINE_IA_RETRY_BACKOFF_MAX = int(
+    os.environ.get("DEMANDA_PIPELINE_IA_RETRY_BACKOFF_MAX", "1800")
+)
+# Chave de deduplicação por demanda (segundos); expira mesmo se o worker morrer.
+# A task renova a chave antes de cada retry (espera do retry + este TTL).
+DEMANDA_PIPELINE_IA_LOCK_TTL = int(os.environ.get("DEMANDA_PIPELINE_IA_LOCK_TTL", "900"))
 # Beat SLA: diário 07:00 (America/Sao_Paulo) — substitui cron manual quando Celery ativo
 CELERY_BEAT_SCHEDULE = {
     "sgdl-verificar-atrasos-diario": {
@@ -328,4 +390,41 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(hour=7, minute=0),
         "options": {"queue": "sgdl_default"},
     },
-}
\ No newline at end of file
+    "sgdl-recalcular-centroides-clusters": {
+        "task": "sgdl.recalcular_centroides_clusters",
+        "schedule": crontab(hour=3, minute=30),
+        "options": {"queue": "sgdl_default"},
+    },
+    "sgdl-reindexar-busca-lexical": {
+        "task": "sgdl.reindexar_busca_lexical",
+        "schedule": crontab(hour=4, minute=15),
+        "options": {"queue": "sgdl_default"},
+    },
+    "sgdl-geocodificar-enderecos-pendentes": {
+        "task": "sgdl.geocodificar_enderecos_pendentes",
+        "schedule": crontab(minute="*/15"),
+        "options": {"queue": "sgdl_default"},
+    },
+}
+
+# Contadores dos atalhos do hub de consultas (segundos; 0 desliga o cache).
+CONSULTA_HUB_CONTADORES_TTL = int(os.environ.get("CONSULTA_HUB_CONTADORES_TTL", "60"))
+
+# Cache compartilhado entre workers (gunicorn + Celery). Sem CACHE_REDIS_URL usa memória local
+# do processo — suficiente em dev, mas deduplicação/invalidação deixam de ser globais.
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL", "")
+if CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+            "KEY_PREFIX": "sgdl",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "sgdl-default",
+        }
+    }
@@ -4,6 +4,7 @@ from django.core.management.base import BaseCommand
 
 from core.services.corpus_legado_service import (
     corpus_legado_csv_path,
+    corpus_legado_indice_path,
     corpus_legado_json_path,
     gerar_relatorio_corpus,
 )
@@ -11,7 +12,8 @@ from core.services.corpus_legado_service import (
 
 class Command(BaseCommand):
     help = (
-        "Analisa docs/bd-legado-demandas-vereadores.csv e gera docs/insights/corpus-legado.json. "
+        "Analisa docs/bd-legado-demandas-vereadores.csv e gera docs/insights/corpus-legado.json "
+        "(e o índice invertido corpus-legado.indice.json ao lado). "
         "Não altera Demandas nem o fluxo do Copiloto."
     )
 
@@ -45,6 +47,7 @@ class Command(BaseCommand):
         rel = gerar_relatorio_corpus(csv_path=csv_path, json_path=json_path)
         self.stdout.write(self.style.SUCCESS(f"✓ {rel['total_registros']} registros analisados"))
         self.stdout.write(f"  JSON: {json_path}")
+        self.stdout.write(f"  Índice BM25: {corpus_legado_indice_path(json_path)}")
         self.stdout.write(f"  SHA256 CSV: {rel.get('checksum_csv', '')[:16]}…")
         self.stdout.write("")
         self.stdout.write("Top 10 trends:")
@@ -0,0 +1,112 @@
+"""
+Compara a busca de cluster compatível via pgvector (ANN) com a varredura Python legada.
+
+Somente leitura: nenhuma demanda é vinculada; mede latência, queries e concordância.
+
+Uso:
+  python manage.py benchmark_cluster_matching
+  python manage.py benchmark_cluster_matching --amostra 200
+  python manage.py benchmark_cluster_matching --servico-id 80
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import ClusterExecucao, Demanda
+from core.services.cluster_service import (
+    CLUSTER_STATUS_ABERTOS,
+    DEMANDA_STATUS_ELEGIVEIS,
+    ClusterService,
+    _embedding_list,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark da busca de cluster compatível: query pgvector (top-k + geo) "
+        "versus varredura Python sobre todos os clusters abertos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--amostra",
+            type=int,
+            default=50,
+            help="Quantidade de demandas (com embedding e serviço) avaliadas.",
+        )
+        parser.add_argument(
+            "--servico-id",
+            type=int,
+            default=None,
+            help="Restringe a amostra a um serviço Sinapse.",
+        )
+
+    def handle(self, *args, **options):
+        amostra: int = max(1, options["amostra"])
+        servico_id: int | None = options["servico_id"]
+
+        qs = (
+            Demanda.objects.filter(
+                status__in=DEMANDA_STATUS_ELEGIVEIS,
+                sinapse_servico_id__isnull=False,
+            )
+            .exclude(embedding__isnull=True)
+            .order_by("-pk")
+        )
+        if servico_id:
+            qs = qs.filter(sinapse_servico_id=servico_id)
+        demandas = list(qs[:amostra])
+        if not demandas:
+            self.stdout.write(self.style.WARNING("Nenhuma demanda elegível para a amostra."))
+            return
+
+        abertos = ClusterExecucao.objects.filter(status__in=CLUSTER_STATUS_ABERTOS).count()
+        self.stdout.write(
+            f"Amostra: {len(demandas)} demandas; clusters abertos: {abertos}."
+        )
+
+        svc = ClusterService()
+        tempos = {"ann": [], "varredura": []}
+        queries = {"ann": [], "varredura": []}
+        divergentes: list[int] = []
+
+        for demanda in demandas:
+            vetor = _embedding_list(demanda.embedding)
+            resultados = {}
+            for modo, fn in (
+                ("ann", svc._buscar_cluster_compativel),
+                ("varredura", svc._buscar_cluster_compativel_varredura),
+            ):
+                with CaptureQueriesContext(connection) as ctx:
+                    inicio = time.perf_counter()
+                    cluster = fn(demanda, vetor)
+                    tempos[modo].append((time.perf_counter() - inicio) * 1000)
+                queries[modo].append(len(ctx.captured_queries))
+                resultados[modo] = cluster.pk if cluster else None
+            if resultados["ann"] != resultados["varredura"]:
+                divergentes.append(int(demanda.pk))
+
+        for modo in ("varredura", "ann"):
+            ms = sorted(tempos[modo])
+            p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+            self.stdout.write(
+                f"{modo:>10}: média {statistics.mean(ms):.1f} ms | p95 {p95:.1f} ms | "
+                f"queries/demanda {statistics.mean(queries[modo]):.1f}"
+            )
+
+        if divergentes:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Resultados divergentes em {len(divergentes)} demanda(s): "
+                    f"{divergentes[:20]} (top-k={svc.ann_top_k}; aumente CLUSTER_ANN_TOP_K "
+                    "se o filtro geográfico descartar muitos candidatos)."
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Mesmo cluster escolhido em toda a amostra."))
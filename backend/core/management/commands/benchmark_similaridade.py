@@ -0,0 +1,86 @@
+"""
+Microbenchmark do cosseno: `triagem_service.cosine_similarity` (laço Python)
+versus o kernel NumPy de `similaridade_vetorial` (matriz float32 + argpartition).
+
+Não acessa banco: usa vetores sintéticos com a dimensão da carta (1024).
+
+Uso:
+  python manage.py benchmark_similaridade
+  python manage.py benchmark_similaridade --candidatos 5000 --repeticoes 20
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from core.services.similaridade_vetorial import (
+    empilhar_normalizado,
+    similaridades,
+    top_k_indices,
+)
+from core.services.triagem_service import cosine_similarity
+
+
+class Command(BaseCommand):
+    help = "Compara o cosseno puro Python com o kernel NumPy em lote (top-k)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--candidatos", type=int, default=600)
+        parser.add_argument("--dim", type=int, default=1024)
+        parser.add_argument("--top-k", type=int, default=5)
+        parser.add_argument("--repeticoes", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        n = max(1, options["candidatos"])
+        dim = max(1, options["dim"])
+        k = max(1, options["top_k"])
+        repeticoes = max(1, options["repeticoes"])
+
+        rng = np.random.default_rng(options["seed"])
+        candidatos = rng.standard_normal((n, dim)).astype(np.float32).tolist()
+        consulta = rng.standard_normal(dim).astype(np.float32).tolist()
+
+        def python_topk() -> list[int]:
+            scores = [cosine_similarity(consulta, v) for v in candidatos]
+            return sorted(range(n), key=lambda i: scores[i], reverse=True)[:k]
+
+        inicio = time.perf_counter()
+        matriz, _ = empilhar_normalizado(candidatos, dim=dim)
+        preparo_ms = (time.perf_counter() - inicio) * 1000
+
+        def numpy_topk() -> list[int]:
+            return top_k_indices(similaridades(consulta, matriz), k).tolist()
+
+        tempos: dict[str, list[float]] = {"python": [], "numpy": []}
+        resultados: dict[str, list[int]] = {}
+        for nome, fn in (("python", python_topk), ("numpy", numpy_topk)):
+            for _ in range(repeticoes):
+                t0 = time.perf_counter()
+                resultados[nome] = fn()
+                tempos[nome].append((time.perf_counter() - t0) * 1000)
+
+        self.stdout.write(f"{n} candidatos x {dim} dims, top-{k}, {repeticoes} repetições")
+        self.stdout.write(f"  preparo da matriz (uma vez): {preparo_ms:.1f} ms")
+        for nome in ("python", "numpy"):
+            self.stdout.write(
+                f"  {nome:>6}: mediana {statistics.median(tempos[nome]):.2f} ms "
+                f"(min {min(tempos[nome]):.2f} ms)"
+            )
+        ganho = statistics.median(tempos["python"]) / max(
+            statistics.median(tempos["numpy"]), 1e-6
+        )
+        self.stdout.write(f"  ganho: {ganho:.0f}x")
+        if resultados["python"] == resultados["numpy"]:
+            self.stdout.write(self.style.SUCCESS("  Mesmo top-k nos dois caminhos."))
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"  Top-k divergente: python={resultados['python']} "
+                    f"numpy={resultados['numpy']}"
+                )
+            )
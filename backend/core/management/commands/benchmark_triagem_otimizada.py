@@ -0,0 +1,79 @@
+"""
+Latência da triagem na base otimizada: índice em memória versus consultas ao
+banco (pgvector + `icontains` + nomes do Sinapse por resultado).
+
+Usa como consultas os próprios serviços ativos da carta (embedding + título),
+então roda contra a base real sem chamar o kernel de embeddings.
+
+Uso:
+  python manage.py benchmark_triagem_otimizada
+  python manage.py benchmark_triagem_otimizada --consultas 50 --top-k 5
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models_carta_otimizada import ServicoOtimizado
+from core.services.catalogo_otimizado_indice import indice_catalogo_otimizado
+from core.services.triagem_otimizada_service import TriagemOtimizadaService
+
+
+class Command(BaseCommand):
+    help = "Compara a busca híbrida da base otimizada com índice em memória e via banco."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--consultas", type=int, default=20)
+        parser.add_argument("--top-k", type=int, default=3)
+
+    def handle(self, *args, **options):
+        n = max(1, options["consultas"])
+        k = max(1, options["top_k"])
+
+        amostra = list(
+            ServicoOtimizado.objects.filter(ativo=True, embedding_otimizado__isnull=False)
+            .order_by("?")
+            .values_list("titulo_otimizado", "embedding_otimizado")[:n]
+        )
+        if not amostra:
+            self.stdout.write(self.style.WARNING("Nenhum serviço ativo com embedding."))
+            return
+
+        inicio = time.perf_counter()
+        indice = indice_catalogo_otimizado()
+        carga_ms = (time.perf_counter() - inicio) * 1000
+
+        com_indice = TriagemOtimizadaService()
+        sem_indice = TriagemOtimizadaService()
+        sem_indice.usar_indice_memoria = False
+
+        tempos: dict[str, list[float]] = {"indice": [], "banco": []}
+        concordam = 0
+        for titulo, embedding in amostra:
+            embedding = list(embedding)
+            tops: dict[str, list[int]] = {}
+            for nome, svc in (("indice", com_indice), ("banco", sem_indice)):
+                t0 = time.perf_counter()
+                resultados = svc._buscar_via_base_otimizada(embedding, k, titulo)
+                tempos[nome].append((time.perf_counter() - t0) * 1000)
+                tops[nome] = [r["servico_id"] for r in resultados]
+            concordam += int(tops["indice"][:1] == tops["banco"][:1])
+
+        self.stdout.write(
+            f"{len(amostra)} consultas, top-{k}, índice com {len(indice)} serviços "
+            f"({len(indice.tokens)} tokens)"
+        )
+        self.stdout.write(f"  carga do índice (uma vez): {carga_ms:.1f} ms")
+        for nome in ("indice", "banco"):
+            self.stdout.write(
+                f"  {nome:>6}: mediana {statistics.median(tempos[nome]):.2f} ms "
+                f"(p95 {sorted(tempos[nome])[int(0.95 * (len(tempos[nome]) - 1))]:.2f} ms)"
+            )
+        ganho = statistics.median(tempos["banco"]) / max(
+            statistics.median(tempos["indice"]), 1e-6
+        )
+        self.stdout.write(f"  ganho: {ganho:.1f}x")
+        self.stdout.write(f"  top-1 igual nos dois caminhos: {concordam}/{len(amostra)}")
@@ -0,0 +1,38 @@
+"""
+Situação do cache de embeddings (tabela + contadores do processo).
+
+Uso:
+  python manage.py cache_embeddings
+  python manage.py cache_embeddings --limpar-outros-modelos
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from core.models import EmbeddingCacheEntrada
+
+
+class Command(BaseCommand):
+    help = "Mostra o cache de embeddings por modelo e remove entradas de modelos antigos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limpar-outros-modelos",
+            action="store_true",
+            help="Remove entradas de modelos diferentes de AI_KERNEL_EMBEDDING_MODEL.",
+        )
+
+    def handle(self, *args, **options):
+        modelo = getattr(settings, "AI_KERNEL_EMBEDDING_MODEL", "mxbai-embed-large")
+        self.stdout.write(f"Modelo atual: {modelo}")
+        por_modelo = (
+            EmbeddingCacheEntrada.objects.values("modelo").annotate(n=Count("pk")).order_by("modelo")
+        )
+        for linha in por_modelo:
+            marca = "*" if linha["modelo"] == modelo else " "
+            self.stdout.write(f" {marca} {linha['modelo']}: {linha['n']} entrada(s)")
+
+        if options["limpar_outros_modelos"]:
+            removidas, _ = EmbeddingCacheEntrada.objects.exclude(modelo=modelo).delete()
+            self.stdout.write(self.style.SUCCESS(f"{removidas} entrada(s) de outros modelos removidas."))
@@ -0,0 +1,51 @@
+"""
+Geocodificação em lote dos endereços do mapa (tabela `GeocodeEnderecoCache`).
+
+Uso:
+  python manage.py geocodificar_enderecos
+  python manage.py geocodificar_enderecos --registrar --limite 200
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from core.models import Demanda, GeocodeEnderecoCache
+from core.services.geocode_cache_service import geocodificar_pendentes, registrar_pendentes_de_demandas
+
+
+class Command(BaseCommand):
+    help = "Resolve endereços pendentes do cache de geocode respeitando o rate limit do Nominatim."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--registrar",
+            action="store_true",
+            help="Antes do lote, registra como pendentes os endereços de demandas sem coordenadas.",
+        )
+        parser.add_argument(
+            "--limite",
+            type=int,
+            default=None,
+            help="Máximo de endereços nesta rodada (padrão: GEOCODING_LOTE_MAX).",
+        )
+
+    def handle(self, *args, **options):
+        if options["registrar"]:
+            novos = registrar_pendentes_de_demandas(Demanda.objects.all())
+            self.stdout.write(f"{novos} endereço(s) registrados como pendentes.")
+
+        resumo = geocodificar_pendentes(options["limite"])
+        self.stdout.write(
+            f"Resolvidos: {resumo['resolvidos']}; sem resultado: {resumo['sem_resultado']}; "
+            f"adiados por falha de consulta: {resumo['adiados']}."
+        )
+        if resumo["interrompido"]:
+            self.stdout.write(
+                self.style.WARNING("Nominatim em backoff/indisponível; restante fica para a próxima rodada.")
+            )
+        por_status = (
+            GeocodeEnderecoCache.objects.values("status").annotate(n=Count("pk")).order_by("status")
+        )
+        for linha in por_status:
+            self.stdout.write(f"  {linha['status']}: {linha['n']}")
+        self.stdout.write(self.style.SUCCESS("Geocodificação em lote concluída."))
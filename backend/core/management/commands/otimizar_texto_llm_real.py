@@ -178,7 +178,8 @@ Palavras-chave: (lista separada por vírgula)
 
 Inclua termos que cidadãos usam no dia a dia para encontrar ESTE serviço específico."""
 
-        raw = llm.completar_texto(system, user)
+        # Reexecuções do comando sobre o mesmo serviço reaproveitam o texto já gerado.
+        raw = llm.completar_texto(system, user, cacheavel=True)
         if raw and len(raw.strip()) > 80:
             return raw.strip()
         return None
@@ -0,0 +1,57 @@
+"""
+Reconstrói o índice full-text da carta (`core_catalogo_busca_lexical`).
+
+Fonte SINAPSE: lida do catálogo Sinapse (somente leitura). Fonte OTIMIZADA: lida
+de `ServicoOtimizado` — rode depois da SINAPSE para herdar nomes de órgão e
+categoria. Enquanto uma fonte não tiver sido indexada, as buscas lexicais dela
+continuam no `icontains`.
+
+Uso:
+  python manage.py reindexar_busca_lexical_catalogo
+  python manage.py reindexar_busca_lexical_catalogo --fonte sinapse
+  python manage.py reindexar_busca_lexical_catalogo --fonte otimizada
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.busca_lexical_catalogo import (
+    reindexar_otimizada,
+    reindexar_sinapse,
+    trigram_disponivel,
+)
+
+
+class Command(BaseCommand):
+    help = "Reconstrói o tsvector (GIN) da busca lexical da carta Sinapse e da base otimizada."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fonte",
+            choices=("todas", "sinapse", "otimizada"),
+            default="todas",
+        )
+
+    def handle(self, *args, **options):
+        fonte = options["fonte"]
+        etapas = []
+        if fonte in ("todas", "sinapse"):
+            etapas.append(("sinapse", reindexar_sinapse))
+        if fonte in ("todas", "otimizada"):
+            etapas.append(("otimizada", reindexar_otimizada))
+
+        for nome, reindexar in etapas:
+            inicio = time.perf_counter()
+            total = reindexar()
+            self.stdout.write(
+                f"  {nome}: {total} serviço(s) indexado(s) em "
+                f"{time.perf_counter() - inicio:.1f} s"
+            )
+        if not trigram_disponivel():
+            self.stdout.write(
+                self.style.WARNING("  pg_trgm ausente: busca sem tolerância a erros de digitação.")
+            )
+        self.stdout.write(self.style.SUCCESS("Índice lexical da carta atualizado."))
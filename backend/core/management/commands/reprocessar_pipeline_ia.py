@@ -0,0 +1,32 @@
+"""
+Reagenda o pipeline IA pós-save para demandas que ficaram sem embedding ou
+sem `ia_categoria` (Kernel/Groq fora do ar além dos retries da task).
+
+Uso:
+  python manage.py reprocessar_pipeline_ia
+  python manage.py reprocessar_pipeline_ia --limite 200
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.models import Demanda
+from core.services.demanda_pipeline_ia_service import agendar_pipeline_ia
+
+
+class Command(BaseCommand):
+    help = "Reagenda o pipeline IA (embedding + triagem) das demandas pendentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limite", type=int, default=500)
+
+    def handle(self, *args, **options):
+        limite = max(1, options["limite"])
+        pendentes = (
+            Demanda.objects.exclude(status__in=("RASCUNHO", "CANCELADO"))
+            .filter(Q(embedding__isnull=True) | Q(ia_categoria=""))
+            .order_by("-pk")
+            .values_list("pk", flat=True)[:limite]
+        )
+        agendadas = sum(1 for pk in pendentes if agendar_pipeline_ia(pk))
+        self.stdout.write(self.style.SUCCESS(f"Pipeline IA reagendado para {agendadas} demanda(s)."))
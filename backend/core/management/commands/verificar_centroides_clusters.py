@@ -0,0 +1,60 @@
+"""
+Confere o centróide incremental dos clusters contra a média real dos embeddings.
+
+O centróide é mantido como soma corrente + contagem (O(dim) por vínculo); este
+comando relata clusters cujo centróide gravado se afastou da média dos membros
+(distância de cosseno acima da tolerância) ou cuja contagem diverge.
+
+Uso:
+  python manage.py verificar_centroides_clusters
+  python manage.py verificar_centroides_clusters --tolerancia 1e-3
+  python manage.py verificar_centroides_clusters --corrigir
+  python manage.py verificar_centroides_clusters --todos --corrigir
+"""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from core.services.cluster_service import ClusterService
+
+
+class Command(BaseCommand):
+    help = "Relata (e opcionalmente corrige) clusters com centróide divergente da média real."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tolerancia",
+            type=float,
+            default=1e-4,
+            help="Distância de cosseno máxima aceita entre centróide gravado e média real.",
+        )
+        parser.add_argument(
+            "--corrigir",
+            action="store_true",
+            help="Recalcula do zero os clusters divergentes.",
+        )
+        parser.add_argument(
+            "--todos",
+            action="store_true",
+            help="Inclui clusters resolvidos (padrão: apenas ABERTO/EM_ANDAMENTO).",
+        )
+
+    def handle(self, *args, **options):
+        divergentes = ClusterService().verificar_centroides(
+            tolerancia=max(0.0, options["tolerancia"]),
+            corrigir=options["corrigir"],
+            apenas_abertos=not options["todos"],
+        )
+        if not divergentes:
+            self.stdout.write(self.style.SUCCESS("Todos os centróides conferem com a média real."))
+            return
+
+        for item in divergentes:
+            self.stdout.write(
+                f"  cluster {item['cluster_id']}: distância {item['distancia_cosseno']:.6f}, "
+                f"membros {item['membros']} (registrados {item['membros_registrados']})"
+                f"{' — recalculado' if item['corrigido'] else ''}"
+            )
+        estilo = self.style.SUCCESS if options["corrigir"] else self.style.WARNING
+        self.stdout.write(estilo(f"{len(divergentes)} cluster(s) com centróide divergente."))
@@ -0,0 +1,31 @@
+# Índice ANN (HNSW, cosseno) em ClusterExecucao.centroide + filtro status/serviço/janela
+
+import pgvector.django.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0079_simplifica_categoria_texto_padrao"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="clusterexecucao",
+            index=models.Index(
+                fields=["status", "sinapse_servico_id", "atualizado_em"],
+                name="core_cluster_status_svc_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="clusterexecucao",
+            index=pgvector.django.indexes.HnswIndex(
+                ef_construction=64,
+                fields=["centroide"],
+                m=16,
+                name="core_cluster_centroide_hnsw",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0080_cluster_centroide_hnsw'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmbeddingCacheEntrada',
+            fields=[
+                ('chave', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('modelo', models.CharField(db_index=True, max_length=100)),
+                ('dimensoes', models.PositiveSmallIntegerField()),
+                ('vetor', models.BinaryField()),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Cache de embedding',
+                'verbose_name_plural': 'Cache de embeddings',
+            },
+        ),
+    ]
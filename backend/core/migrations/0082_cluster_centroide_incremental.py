@@ -0,0 +1,26 @@
+# Soma corrente + contagem para o centróide incremental de ClusterExecucao.
+# Clusters existentes ficam com soma NULL e são inicializados no primeiro
+# vínculo/desvínculo ou por `verificar_centroides_clusters --corrigir`.
+# Generated by Django 5.2.6 on 2026-10-18 11:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0081_embedding_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clusterexecucao',
+            name='centroide_membros',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='clusterexecucao',
+            name='centroide_soma',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
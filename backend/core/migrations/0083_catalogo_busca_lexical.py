@@ -0,0 +1,62 @@
+# Índice full-text (tsvector 'portuguese' + GIN) da carta para a busca lexical.
+# pg_trgm é opcional: criado junto com o índice trigram do título quando a
+# extensão está disponível e o usuário tem permissão; sem ela a busca segue só
+# com ts_rank_cd (ver `core.services.busca_lexical_catalogo`).
+# Generated by Django 5.2.6 on 2026-10-18 11:36
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+TRIGRAM_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS busca_lexical_titulo_trgm
+            ON core_catalogo_busca_lexical USING gin (titulo_busca gin_trgm_ops);
+    END IF;
+EXCEPTION WHEN insufficient_privilege THEN
+    RAISE NOTICE 'pg_trgm indisponível: busca lexical sem tolerância a erros de digitação.';
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0082_cluster_centroide_incremental'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogoBuscaLexical',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fonte', models.CharField(choices=[('SINAPSE', 'Carta Sinapse'), ('OTIMIZADA', 'Base otimizada')], max_length=12)),
+                ('servico_id', models.PositiveIntegerField()),
+                ('ativo', models.BooleanField(default=True)),
+                ('orgao_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('titulo', models.TextField()),
+                ('orgao_nome', models.CharField(blank=True, default='', max_length=255)),
+                ('categoria_nome', models.CharField(blank=True, default='', max_length=255)),
+                ('titulo_busca', models.TextField(blank=True, default='')),
+                ('palavras_busca', models.TextField(blank=True, default='')),
+                ('corpo_busca', models.TextField(blank=True, default='')),
+                ('documento', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Índice lexical da carta',
+                'verbose_name_plural': 'Índice lexical da carta',
+                'db_table': 'core_catalogo_busca_lexical',
+                'indexes': [models.Index(fields=['fonte', 'ativo'], name='busca_lexical_fonte_ativo'), django.contrib.postgres.indexes.GinIndex(fields=['documento'], name='busca_lexical_documento_gin')],
+                'constraints': [models.UniqueConstraint(fields=('fonte', 'servico_id'), name='uniq_busca_lexical_fonte_servico')],
+            },
+        ),
+        migrations.RunSQL(
+            TRIGRAM_SQL,
+            reverse_sql="DROP INDEX IF EXISTS busca_lexical_titulo_trgm;",
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0083_catalogo_busca_lexical'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='demanda',
+            index=models.Index(fields=['data_entrada_etapa', 'data_criacao', 'id'], name='core_demanda_fila_etapa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='demanda',
+            index=models.Index(models.OrderBy(models.F('data_finalizacao'), descending=True, nulls_last=True), models.OrderBy(models.F('data_criacao'), descending=True), models.OrderBy(models.F('id'), descending=True), name='core_demanda_fila_final_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='demanda',
+            index=models.Index(fields=['-data_criacao', '-id'], name='core_demanda_criacao_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0084_demanda_indices_fila'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeEnderecoCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=512, unique=True)),
+                ('logradouro', models.CharField(blank=True, default='', max_length=255)),
+                ('bairro', models.CharField(blank=True, default='', max_length=120)),
+                ('cep', models.CharField(blank=True, default='', max_length=10)),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('RESOLVIDO', 'Resolvido'), ('SEM_RESULTADO', 'Sem resultado')], db_index=True, default='PENDENTE', max_length=16)),
+                ('resultado', models.JSONField(blank=True, default=dict, help_text='Dicionário devolvido pelo geocoder (coordenadas, fonte, endereço enriquecido).')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0)),
+                ('geocodificado_em', models.DateTimeField(blank=True, null=True)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Geocode de endereço',
+                'verbose_name_plural': 'Geocodes de endereço',
+                'ordering': ['criado_em'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0085_geocode_endereco_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenciaNumeracao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('escopo', models.CharField(help_text='Identificador da sequência (ex.: OFICIO_AUTOR:12, INDICACAO_CAMARA).', max_length=64)),
+                ('ano', models.PositiveSmallIntegerField()),
+                ('ultimo_numero', models.PositiveIntegerField(default=0)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Sequência de numeração',
+                'verbose_name_plural': 'Sequências de numeração',
+                'constraints': [models.UniqueConstraint(fields=('escopo', 'ano'), name='unique_sequencia_escopo_ano')],
+            },
+        ),
+    ]
@@ -6,7 +6,7 @@ from django.db import models
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
-from pgvector.django import VectorField
+from pgvector.django import HnswIndex, VectorField
 
 from integrations import sinapse_catalog
 
@@ -63,6 +63,10 @@ class ClusterExecucao(models.Model):
         help_text="Serviço Sinapse que unifica o agrupamento (mesmo serviço + proximidade).",
     )
     centroide = VectorField(dimensions=1024, null=True, blank=True)
+    # Soma corrente (float64) dos embeddings dos membros + quantos entram nela:
+    # vínculo/desvínculo atualizam o centróide em O(dim) sem reler o cluster inteiro.
+    centroide_soma = models.BinaryField(null=True, blank=True, editable=False)
+    centroide_membros = models.PositiveIntegerField(default=0, editable=False)
     protocolo_super_os = models.CharField(
         max_length=30,
         unique=True,
@@ -81,6 +85,22 @@ class ClusterExecucao(models.Model):
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "sinapse_servico_id", "atualizado_em"],
+                name="core_cluster_status_svc_idx",
+            ),
+            # ANN por cosseno — ClusterService._candidatos_cluster_ann ordena por CosineDistance.
+            HnswIndex(
+                name="core_cluster_centroide_hnsw",
+                fields=["centroide"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
+        ]
+
     def __str__(self):
         return self.titulo
 
@@ -291,6 +311,20 @@ class Demanda(models.Model):
                 name="unique_protocolo_indicacao_camara",
             ),
         ]
+        # Ordenações das filas do painel (paginação por cursor em `DemandaKeysetPagination`).
+        indexes = [
+            models.Index(
+                fields=["data_entrada_etapa", "data_criacao", "id"],
+                name="core_demanda_fila_etapa_idx",
+            ),
+            models.Index(
+                models.F("data_finalizacao").desc(nulls_last=True),
+                models.F("data_criacao").desc(),
+                models.F("id").desc(),
+                name="core_demanda_fila_final_idx",
+            ),
+            models.Index(fields=["-data_criacao", "-id"], name="core_demanda_criacao_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if self.origem_vinculo == self.ORIGEM_VINCULO_TENDENCIA:
@@ -674,3 +708,7 @@ from core.models_acompanhamento import DemandaAcompanhamento  # noqa: E402,F401
 from core.models_perna_operacional import PernaOperacional  # noqa: E402,F401
 from core.models_no_operacional import NoOperacional  # noqa: E402,F401
 from core.models_via_referencia import ViaReferenciaMogi  # noqa: E402,F401
+from core.models_cache_embedding import EmbeddingCacheEntrada  # noqa: E402,F401
+from core.models_geocode_cache import GeocodeEnderecoCache  # noqa: E402,F401
+from core.models_sequencia import SequenciaNumeracao  # noqa: E402,F401
+from core.models_busca_lexical import CatalogoBuscaLexical  # noqa: E402,F401
@@ -0,0 +1,52 @@
+"""Índice lexical (full-text) da carta de serviços, mantido na base do SGDL."""
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class CatalogoBuscaLexical(models.Model):
+    """
+    Um serviço da carta (Sinapse ou base otimizada) com `tsvector` em português.
+
+    O catálogo Sinapse é somente leitura, então o documento de busca vive aqui e é
+    regenerado por `core.services.busca_lexical_catalogo`. Os campos `*_busca` já
+    chegam sem acento e em minúsculas (unaccent aplicado na indexação e na consulta).
+    """
+
+    FONTE_SINAPSE = "SINAPSE"
+    FONTE_OTIMIZADA = "OTIMIZADA"
+    FONTE_CHOICES = (
+        (FONTE_SINAPSE, "Carta Sinapse"),
+        (FONTE_OTIMIZADA, "Base otimizada"),
+    )
+
+    fonte = models.CharField(max_length=12, choices=FONTE_CHOICES)
+    servico_id = models.PositiveIntegerField()
+    ativo = models.BooleanField(default=True)
+    orgao_id = models.PositiveIntegerField(null=True, blank=True)
+    titulo = models.TextField()
+    orgao_nome = models.CharField(max_length=255, blank=True, default="")
+    categoria_nome = models.CharField(max_length=255, blank=True, default="")
+    titulo_busca = models.TextField(blank=True, default="")
+    palavras_busca = models.TextField(blank=True, default="")
+    corpo_busca = models.TextField(blank=True, default="")
+    documento = SearchVectorField(null=True, editable=False)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "core_catalogo_busca_lexical"
+        verbose_name = "Índice lexical da carta"
+        verbose_name_plural = "Índice lexical da carta"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["fonte", "servico_id"], name="uniq_busca_lexical_fonte_servico"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["fonte", "ativo"], name="busca_lexical_fonte_ativo"),
+            GinIndex(fields=["documento"], name="busca_lexical_documento_gin"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.fonte}:{self.servico_id}"
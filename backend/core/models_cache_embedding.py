@@ -0,0 +1,20 @@
+"""Cache persistente de embeddings do Kernel AI, endereçado pelo conteúdo do texto."""
+
+from django.db import models
+
+
+class EmbeddingCacheEntrada(models.Model):
+    """Vetor float32 (bytes) por sha256(modelo + texto normalizado)."""
+
+    chave = models.CharField(max_length=64, primary_key=True)
+    modelo = models.CharField(max_length=100, db_index=True)
+    dimensoes = models.PositiveSmallIntegerField()
+    vetor = models.BinaryField()
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Cache de embedding"
+        verbose_name_plural = "Cache de embeddings"
+
+    def __str__(self) -> str:
+        return f"{self.modelo}:{self.chave[:12]}"
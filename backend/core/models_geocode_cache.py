@@ -0,0 +1,40 @@
+"""Cache persistente de geocodificação por endereço canônico (mapa e lote em background)."""
+
+from django.db import models
+
+
+class GeocodeEnderecoCache(models.Model):
+    """Resultado de `GeocodingService.resolver_endereco_geocode` por `chave_endereco_canonica`."""
+
+    STATUS_PENDENTE = "PENDENTE"
+    STATUS_RESOLVIDO = "RESOLVIDO"
+    STATUS_SEM_RESULTADO = "SEM_RESULTADO"
+    STATUS_CHOICES = (
+        (STATUS_PENDENTE, "Pendente"),
+        (STATUS_RESOLVIDO, "Resolvido"),
+        (STATUS_SEM_RESULTADO, "Sem resultado"),
+    )
+
+    chave = models.CharField(max_length=512, unique=True)
+    logradouro = models.CharField(max_length=255, blank=True, default="")
+    bairro = models.CharField(max_length=120, blank=True, default="")
+    cep = models.CharField(max_length=10, blank=True, default="")
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDENTE, db_index=True
+    )
+    resultado = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Dicionário devolvido pelo geocoder (coordenadas, fonte, endereço enriquecido).",
+    )
+    tentativas = models.PositiveSmallIntegerField(default=0)
+    geocodificado_em = models.DateTimeField(null=True, blank=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Geocode de endereço"
+        verbose_name_plural = "Geocodes de endereço"
+        ordering = ["criado_em"]
+
+    def __str__(self) -> str:
+        return f"{self.chave} ({self.status})"
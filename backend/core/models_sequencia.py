@@ -0,0 +1,25 @@
+"""Contadores de numeração por (escopo, ano) — ofício por autor, indicações da Câmara."""
+
+from django.db import models
+
+
+class SequenciaNumeracao(models.Model):
+    """Último número alocado em uma sequência anual; incrementado atomicamente no banco."""
+
+    escopo = models.CharField(
+        max_length=64,
+        help_text="Identificador da sequência (ex.: OFICIO_AUTOR:12, INDICACAO_CAMARA).",
+    )
+    ano = models.PositiveSmallIntegerField()
+    ultimo_numero = models.PositiveIntegerField(default=0)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Sequência de numeração"
+        verbose_name_plural = "Sequências de numeração"
+        constraints = [
+            models.UniqueConstraint(fields=["escopo", "ano"], name="unique_sequencia_escopo_ano"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.escopo}/{self.ano} — último nº {self.ultimo_numero}"
@@ -1,6 +1,20 @@
-"""Paginação opt-in (só quando `page` ou `page_size` estão na query)."""
+"""Paginação opt-in (só quando `page` ou `page_size` estão na query).
 
-from rest_framework.pagination import PageNumberPagination
+Listagens grandes também aceitam `?cursor=` (keyset): a posição é o valor das
+colunas de ordenação da última linha + pk, sem OFFSET nem COUNT.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class OptInPageNumberPagination(PageNumberPagination):
@@ -14,5 +28,142 @@ class OptInPageNumberPagination(PageNumberPagination):
         return super().paginate_queryset(queryset, request, view)
 
 
+class KeysetPagination(BasePagination):
+    """
+    Cursor opaco sobre a ordenação do próprio queryset (+ pk como desempate).
+
+    Colunas anuláveis são ordenadas com NULLs por último, para que o filtro de
+    "depois da posição" seja sempre uma comparação simples. O cursor carrega a ordenação com
+    que foi gerado; trocar de fila com um cursor antigo devolve 404.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering_padrao = ("-pk",)
+    invalid_cursor_message = "Cursor inválido."
+
+    def _tamanho_pagina(self, request) -> int:
+        try:
+            tamanho = int(request.query_params.get(self.page_size_query_param) or self.page_size)
+        except (TypeError, ValueError):
+            tamanho = self.page_size
+        return max(1, min(tamanho, self.max_page_size))
+
+    def _ordenacao(self, queryset) -> list[tuple[str, bool]]:
+        campos = [c for c in queryset.query.order_by if isinstance(c, str)]
+        if len(campos) != len(queryset.query.order_by) or not campos:
+            campos = list(self.ordering_padrao)
+        ordenacao: list[tuple[str, bool]] = []
+        for campo in campos:
+            desc = campo.startswith("-")
+            nome = campo.lstrip("-")
+            if nome == "pk":
+                nome = queryset.model._meta.pk.name
+            if all(nome != n for n, _ in ordenacao):
+                ordenacao.append((nome, desc))
+        pk = queryset.model._meta.pk.name
+        if all(nome != pk for nome, _ in ordenacao):
+            ordenacao.append((pk, ordenacao[-1][1]))
+        return ordenacao
+
+    def _codificar(self, ordenacao, obj) -> str:
+        valores = []
+        for nome, _desc in ordenacao:
+            valor = getattr(obj, obj._meta.get_field(nome).attname)
+            valores.append(valor.isoformat() if hasattr(valor, "isoformat") else valor)
+        bruto = json.dumps(
+            {"o": [("-" if d else "") + n for n, d in ordenacao], "v": valores},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip("=")
+
+    def _decodificar(self, texto: str, ordenacao, model) -> list[Any]:
+        try:
+            bruto = base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+            dados = json.loads(bruto)
+            esperado = [("-" if d else "") + n for n, d in ordenacao]
+            if dados["o"] != esperado or len(dados["v"]) != len(ordenacao):
+                raise ValueError("ordenação diferente")
+            return [
+                None if valor is None else model._meta.get_field(nome).to_python(valor)
+                for (nome, _desc), valor in zip(ordenacao, dados["v"])
+            ]
+        except Exception as exc:  # noqa: BLE001 - base64/JSON/ValidationError do campo
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    @staticmethod
+    def _filtro_depois(ordenacao, valores) -> Q:
+        """Linhas estritamente depois da posição (ordem lexicográfica, NULLs por último)."""
+        filtro = Q(pk__in=[])
+        iguais = Q()
+        for (nome, desc), valor in zip(ordenacao, valores):
+            if valor is None:
+                depois = Q(pk__in=[])
+                igual = Q(**{f"{nome}__isnull": True})
+            else:
+                depois = Q(**{f"{nome}__{'lt' if desc else 'gt'}": valor}) | Q(
+                    **{f"{nome}__isnull": True}
+                )
+                igual = Q(**{nome: valor})
+            filtro |= iguais & depois
+            iguais &= igual
+        return filtro
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordenacao = self._ordenacao(queryset)
+        expressoes = []
+        for nome, desc in self.ordenacao:
+            # NULLS LAST só nas colunas anuláveis: nas demais a ordem casa com índice simples.
+            nulls_last = True if queryset.model._meta.get_field(nome).null else None
+            expressoes.append(
+                F(nome).desc(nulls_last=nulls_last) if desc else F(nome).asc(nulls_last=nulls_last)
+            )
+        queryset = queryset.order_by(*expressoes)
+        cursor = (request.query_params.get(self.cursor_query_param) or "").strip()
+        if cursor:
+            valores = self._decodificar(cursor, self.ordenacao, queryset.model)
+            queryset = queryset.filter(self._filtro_depois(self.ordenacao, valores))
+        tamanho = self._tamanho_pagina(request)
+        linhas = list(queryset[: tamanho + 1])
+        self.tem_proxima = len(linhas) > tamanho
+        pagina = linhas[:tamanho]
+        self.proximo_cursor = (
+            self._codificar(self.ordenacao, pagina[-1]) if self.tem_proxima else None
+        )
+        return pagina
+
+    def get_next_link(self) -> str | None:
+        if not self.proximo_cursor:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, self.proximo_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "cursor": self.proximo_cursor, "results": data})
+
+
+class DemandaKeysetPagination(KeysetPagination):
+    """Filas do painel: `data_entrada_etapa, data_criacao` / `-data_finalizacao` (índices em Demanda)."""
+
+    ordering_padrao = ("-data_criacao",)
+
+
 class DemandaListPagination(OptInPageNumberPagination):
-    """Alias histórico — listagem de demandas."""
+    """Listagem de demandas: página numerada (opt-in) ou keyset com `?cursor=`."""
+
+    keyset_class = DemandaKeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self._keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self._keyset = self.keyset_class()
+            return self._keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if getattr(self, "_keyset", None) is not None:
+            return self._keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
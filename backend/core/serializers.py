@@ -1115,19 +1115,101 @@ class TextoPadraoDespachoSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+# Marca "sem valor pré-carregado" nos getters do painel (o valor do lote pode ser None).
+_FORA_DO_LOTE = object()
+
+
 class DemandaPainelListListSerializer(serializers.ListSerializer):
-    """Pré-carrega encaminhamento pós-encerramento para listagem da secretaria."""
+    """Pré-carrega encaminhamento pós-encerramento, Super OS e campos calculados da listagem."""
+
+    def _precarregar_campos_calculados(self, demandas: list[Demanda], request) -> None:
+        """Campos por linha do painel em consultas fixas (mapas por pk no contexto)."""
+        from django.db.models import Count
+
+        from core.models import DemandaVereadorVinculo
+        from core.services.acompanhamento_demanda_service import AcompanhamentoDemandaService
+        from core.services.assinatura_eletronica_service import AssinaturaEletronicaService
+        from core.services.cluster_aderencia_service import lideres_integrados_em_lote
+        from core.services.cluster_service import ClusterService
+        from core.services.fluxo_protocolo_service import FluxoProtocoloService
+        from core.services.prazo_demanda_service import PrazoDemandaService
+
+        pks = [int(d.pk) for d in demandas]
+        user = getattr(request, "user", None)
+        acompanhamento = AcompanhamentoDemandaService()
+        if user is not None and getattr(user, "is_authenticated", False):
+            acompanhando = acompanhamento.demanda_ids_acompanhando_ativos(user, pks)
+            pode_acompanhar = acompanhamento.demanda_ids_pode_acompanhar(user, demandas)
+        else:
+            acompanhando = pode_acompanhar = set()
+        self.context["acompanhando_map"] = {pk: pk in acompanhando for pk in pks}
+        self.context["pode_acompanhar_map"] = {pk: pk in pode_acompanhar for pk in pks}
+
+        integradas = lideres_integrados_em_lote(demandas)
+        self.context["protocolo_executivo_map"] = {
+            int(d.pk): d.protocolo_executivo
+            or integradas.get(int(d.pk), {}).get("protocolo_executivo")
+            for d in demandas
+        }
+        self.context["assinaturas_resumo_map"] = (
+            AssinaturaEletronicaService().resumo_assinaturas_em_lote(demandas, integradas)
+        )
+        self.context["cluster_acao_visivel_map"] = ClusterService().acao_cluster_visivel_em_lote(
+            demandas
+        )
+        self.context["fluxo_automatico_map"] = FluxoProtocoloService().despacho_automatico_em_lote(
+            demandas
+        )
+
+        prazo = PrazoDemandaService()
+        prazo.precarregar_servicos(d.sinapse_servico_id for d in demandas)
+        self.context["prazo_resolvido_map"] = {
+            int(d.pk): prazo.resolver_demanda(d).as_dict() for d in demandas
+        }
+
+        cluster_ids = {int(d.cluster_id) for d in demandas if d.cluster_id}
+        if cluster_ids:
+            tamanhos = dict(
+                Demanda.objects.filter(cluster_id__in=cluster_ids)
+                .values("cluster_id")
+                .annotate(total=Count("pk"))
+                .values_list("cluster_id", "total")
+            )
+            for d in demandas:
+                if d.cluster_id and Demanda.cluster.is_cached(d):
+                    d.cluster.demandas_count = tamanhos.get(int(d.cluster_id), 0)
+
+        vinculos: dict[int, list] = {
+            int(d.pk): []
+            for d in demandas
+            if d.tipo_legislativo == Demanda.TIPO_LEGISLATIVO_INDICACAO
+        }
+        if vinculos:
+            for vinculo in (
+                DemandaVereadorVinculo.objects.filter(demanda_id__in=vinculos)
+                .select_related("vereador")
+                .order_by("papel", "pk")
+            ):
+                vinculos[int(vinculo.demanda_id)].append(vinculo)
+        self.context["vereadores_vinculados_map"] = vinculos
 
     def to_representation(self, data):
         request = self.context.get("request")
+        from core.services.cluster_service import ClusterService
         from core.services.demanda_listagem_secretaria import (
             listagem_secretaria_encerrado,
             map_encaminhamento_pos_encerramento,
         )
 
+        demandas = list(data)
+        self.context["super_os_map"] = ClusterService().info_operacional_super_os_em_lote(
+            demandas
+        )
+        self._precarregar_campos_calculados(demandas, request)
+
         if listagem_secretaria_encerrado(request):
             orgao_id = getattr(request.user, "sinapse_orgao_id", None)
-            demanda_ids = [int(item.pk) for item in data]
+            demanda_ids = [int(item.pk) for item in demandas]
             self.context["encerramento_listagem_map"] = map_encaminhamento_pos_encerramento(
                 int(orgao_id), demanda_ids
             )
@@ -1138,11 +1220,11 @@ class DemandaPainelListListSerializer(serializers.ListSerializer):
                 map_localizacao_operacional_aberta,
             )
 
-            demanda_ids = [int(item.pk) for item in data]
+            demanda_ids = [int(item.pk) for item in demandas]
             self.context["localizacao_operacional_map"] = map_localizacao_operacional_aberta(
                 demanda_ids
             )
-        return super().to_representation(data)
+        return super().to_representation(demandas)
 
 
 class DemandaPainelListSerializer(serializers.ModelSerializer):
@@ -1205,11 +1287,18 @@ class DemandaPainelListSerializer(serializers.ModelSerializer):
             'vereadores_vinculados',
         ]
 
+    def _do_lote(self, chave: str, obj: Demanda):
+        """Valor pré-carregado pelo `DemandaPainelListListSerializer` (ou `_FORA_DO_LOTE`)."""
+        return (self.context.get(chave) or {}).get(int(obj.pk), _FORA_DO_LOTE)
+
     def get_vereadores_vinculados(self, obj: Demanda) -> list:
         from core.models import DemandaVereadorVinculo
 
         if obj.tipo_legislativo != Demanda.TIPO_LEGISLATIVO_INDICACAO:
             return []
+        vinculos = self._do_lote("vereadores_vinculados_map", obj)
+        if vinculos is _FORA_DO_LOTE:
+            vinculos = obj.vinculos_vereador.select_related("vereador").order_by("papel")
         return [
             {
                 "id": v.vereador_id,
@@ -1217,10 +1306,13 @@ class DemandaPainelListSerializer(serializers.ModelSerializer):
                 "papel": v.papel,
                 "papel_display": dict(DemandaVereadorVinculo.PAPEL_CHOICES).get(v.papel, v.papel),
             }
-            for v in obj.vinculos_vereador.select_related("vereador").order_by("papel")
+            for v in vinculos
         ]
 
     def get_acompanhando(self, obj: Demanda) -> bool:
+        valor = self._do_lote("acompanhando_map", obj)
+        if valor is not _FORA_DO_LOTE:
+            return valor
         request = self.context.get("request")
         if not request or not getattr(request.user, "is_authenticated", False):
             return False
@@ -1229,6 +1321,9 @@ class DemandaPainelListSerializer(serializers.ModelSerializer):
         return AcompanhamentoDemandaService().usuario_acompanha_ativo(request.user, obj.pk)
 
     def get_pode_acompanhar(self, obj: Demanda) -> bool:
+        valor = self._do_lote("pode_acompanhar_map", obj)
+        if valor is not _FORA_DO_LOTE:
+            return valor
         request = self.context.get("request")
         if not request or not getattr(request.user, "is_authenticated", False):
             return False
@@ -1237,19 +1332,31 @@ class DemandaPainelListSerializer(serializers.ModelSerializer):
         return AcompanhamentoDemandaService().pode_acompanhar(request.user, obj)
 
     def get_prazo_resolvido(self, obj: Demanda) -> dict:
+        valor = self._do_lote("prazo_resolvido_map", obj)
+        if valor is not _FORA_DO_LOTE:
+            return valor
         return obj.prazo_resolvido_dict()
 
     def get_protocolo_executivo(self, obj: Demanda) -> str | None:
+        valor = self._do_lote("protocolo_executivo_map", obj)
+        if valor is not _FORA_DO_LOTE:
+            return valor
         from core.services.cluster_aderencia_service import protocolo_executivo_efetivo
 
         return protocolo_executivo_efetivo(obj)
 
     def get_assinaturas_resumo(self, obj: Demanda) -> dict:
+        valor = self._do_lote("assinaturas_resumo_map", obj)
+        if valor is not _FORA_DO_LOTE:
+            return valor
         from core.services.assinatura_eletronica_service import AssinaturaEletronicaService
 
         return AssinaturaEletronicaService().resumo_assinaturas_demanda(obj)
 
     def get_super_os(self, obj: Demanda) -> dict:
+        info = (self.context.get("super_os_map") or {}).get(int(obj.pk))
+        if info is not None:
+            return info
         from core.services.cluster_service import ClusterService
 
         return ClusterService().info_operacional_super_os(obj)
@@ -1287,11 +1394,17 @@ class DemandaPainelListSerializer(serializers.ModelSerializer):
         return max(0, int(delta.total_seconds()))
 
     def get_cluster_acao_visivel(self, obj: Demanda) -> bool:
+        valor = self._do_lote("cluster_acao_visivel_map", obj)
+        if valor is not _FORA_DO_LOTE:
+            return valor
         from core.services.cluster_service import ClusterService
 
         return bool(ClusterService().demanda_elegivel_cluster(obj).get("elegivel"))
 
     def get_fluxo_automatico(self, obj: Demanda) -> bool:
+        valor = self._do_lote("fluxo_automatico_map", obj)
+        if valor is not _FORA_DO_LOTE:
+            return valor
         from core.services.fluxo_protocolo_service import FluxoProtocoloService
 
         return FluxoProtocoloService().despacho_automatico_habilitado(obj)
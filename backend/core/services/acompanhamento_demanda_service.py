@@ -36,6 +36,19 @@ class AcompanhamentoDemandaService:
     def demanda_em_operacao(self, demanda: Demanda) -> bool:
         return (demanda.status or "") in STATUS_OPERACIONAL
 
+    def _escopo_participacao(self, user) -> tuple[list[int], list[int]] | None:
+        """Órgãos e unidades do usuário para `usuario_participou_demanda` (None: sem escopo)."""
+        if user.perfil == "SECRETARIA":
+            oid = getattr(user, "sinapse_orgao_id", None)
+            if not oid:
+                return None
+            orgao_ids = [int(oid)]
+        else:
+            orgao_ids = orgaos_escopo_gestor(user)
+            if not orgao_ids:
+                return None
+        return orgao_ids, [int(u) for u in _ids_unidades_usuario(user)]
+
     def usuario_participou_demanda(self, user, demanda: Demanda) -> bool:
         """Processo já passou pelo setor/escopo do usuário."""
         if not self.perfil_elegivel(user):
@@ -48,20 +61,10 @@ class AcompanhamentoDemandaService:
         from core.models_no_operacional import NoOperacional
         from core.models_perna_operacional import PernaOperacional
 
-        orgao_ids: list[int] = []
-        uas: list[int] = []
-
-        if perfil == "SECRETARIA":
-            oid = getattr(user, "sinapse_orgao_id", None)
-            if not oid:
-                return False
-            orgao_ids = [int(oid)]
-            uas = [int(u) for u in _ids_unidades_usuario(user)]
-        else:
-            orgao_ids = orgaos_escopo_gestor(user)
-            if not orgao_ids:
-                return False
-            uas = [int(u) for u in _ids_unidades_usuario(user)]
+        escopo = self._escopo_participacao(user)
+        if escopo is None:
+            return False
+        orgao_ids, uas = escopo
 
         did = int(demanda.pk)
 
@@ -103,6 +106,61 @@ class AcompanhamentoDemandaService:
             return False
         return True
 
+    def demanda_ids_pode_acompanhar(self, user, demandas) -> set[int]:
+        """`pode_acompanhar` para uma listagem: no máximo três consultas no total."""
+        if not self.perfil_elegivel(user):
+            return set()
+        candidatas = {
+            int(d.pk): d
+            for d in demandas
+            if (d.status or "") not in STATUS_TERMINAL and self.demanda_em_operacao(d)
+        }
+        if not candidatas:
+            return set()
+        if user.perfil == "GESTOR" and tipo_gestor(user) == TIPO_GERAL:
+            return set(candidatas)
+        escopo = self._escopo_participacao(user)
+        if escopo is None:
+            return set()
+        orgao_ids, uas = escopo
+
+        from core.models_no_operacional import NoOperacional
+        from core.models_perna_operacional import PernaOperacional
+
+        participou: set[int] = set()
+        if user.perfil == "SECRETARIA":
+            participou.update(
+                pk
+                for pk, d in candidatas.items()
+                if d.sinapse_orgao_id in orgao_ids
+                and (not uas or d.unidade_administrativa_id in uas)
+            )
+        for modelo in (NoOperacional, PernaOperacional):
+            qs = modelo.objects.filter(
+                demanda_id__in=set(candidatas) - participou, sinapse_orgao_id__in=orgao_ids
+            )
+            if uas:
+                qs = qs.filter(unidade_administrativa_id__in=uas)
+            participou.update(qs.values_list("demanda_id", flat=True))
+        if uas and set(candidatas) - participou:
+            participou.update(
+                Tramitacao.objects.filter(
+                    demanda_id__in=set(candidatas) - participou, unidade_destino_id__in=uas
+                ).values_list("demanda_id", flat=True)
+            )
+        return participou
+
+    def demanda_ids_acompanhando_ativos(self, user, demanda_ids) -> set[int]:
+        """`usuario_acompanha_ativo` para vários ids em uma consulta."""
+        ids = {int(pk) for pk in demanda_ids}
+        if not ids or not user or not getattr(user, "is_authenticated", False):
+            return set()
+        return set(
+            DemandaAcompanhamento.objects.filter(
+                usuario_id=user.pk, demanda_id__in=ids, ativo=True
+            ).values_list("demanda_id", flat=True)
+        )
+
     def usuario_acompanha_ativo(self, user, demanda_id: int) -> bool:
         if not user or not getattr(user, "is_authenticated", False):
             return False
@@ -5,6 +5,8 @@ from typing import Any
 import requests
 from django.conf import settings
 
+from core.services.http_externo import UPSTREAM_KERNEL, CircuitoAbertoError, cliente_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,15 +73,16 @@ class AIKernelClient:
         expect_json: bool = True,
     ) -> Any:
         url = f"{self.base_url}{path}"
+        http = cliente_http(UPSTREAM_KERNEL)
         last_error: Exception | None = None
 
         for attempt in range(self.max_retries + 1):
             started_at = time.monotonic()
             try:
                 if method == "GET":
-                    response = requests.get(url, timeout=timeout)
+                    response = http.get(url, timeout=timeout, operacao=path)
                 else:
-                    response = requests.post(url, json=payload, timeout=timeout)
+                    response = http.post(url, json=payload, timeout=timeout, operacao=path)
                 elapsed_ms = round((time.monotonic() - started_at) * 1000, 2)
 
                 if response.status_code >= 500:
@@ -93,6 +96,10 @@ class AIKernelClient:
 
                 logger.info("Kernel request %s %s ok em %sms", method, path, elapsed_ms)
                 return response.json() if expect_json else response.text
+            except CircuitoAbertoError as exc:
+                # Kernel já marcado como fora: sem retry nem backoff.
+                last_error = exc
+                break
             except (requests.Timeout, requests.ConnectionError, AIKernelClientError, ValueError) as exc:
                 elapsed_ms = round((time.monotonic() - started_at) * 1000, 2)
                 last_error = exc
@@ -1832,16 +1832,57 @@ class AssinaturaEletronicaService:
         pares = set(
             demanda.assinaturas_eletronicas.values_list("etapa", "papel")
         )
+        etapas_pendentes = set(
+            AssinaturaValidacaoGestor.objects.filter(
+                demanda=demanda,
+                status=AssinaturaValidacaoGestor.STATUS_PENDENTE,
+            ).values_list("etapa", flat=True)
+        )
+        return self._resumo_assinaturas(pares, etapas_pendentes)
 
+    def resumo_assinaturas_em_lote(
+        self,
+        demandas,
+        integradas: dict[int, dict[str, Any]] | None = None,
+    ) -> dict[int, dict[str, bool]]:
+        """
+        `resumo_assinaturas_demanda` por pk: assinaturas agrupadas por etapa/papel e
+        validações pendentes em uma consulta cada. Seguidoras integradas usam o líder
+        (`integradas` vem de `lideres_integrados_em_lote`; calculado se omitido).
+        """
+        from core.services.cluster_aderencia_service import lideres_integrados_em_lote
+
+        demandas = list(demandas)
+        if integradas is None:
+            integradas = lideres_integrados_em_lote(demandas)
+        origem = {
+            int(d.pk): int(integradas.get(int(d.pk), {}).get("lider_pk") or d.pk)
+            for d in demandas
+        }
+        ids = set(origem.values())
+        pares: dict[int, set[tuple[str, str]]] = {pk: set() for pk in ids}
+        for demanda_id, etapa, papel in AssinaturaEletronica.objects.filter(
+            demanda_id__in=ids
+        ).values_list("demanda_id", "etapa", "papel"):
+            pares[int(demanda_id)].add((etapa, papel))
+        pendentes: dict[int, set[str]] = {pk: set() for pk in ids}
+        for demanda_id, etapa in AssinaturaValidacaoGestor.objects.filter(
+            demanda_id__in=ids,
+            status=AssinaturaValidacaoGestor.STATUS_PENDENTE,
+        ).values_list("demanda_id", "etapa"):
+            pendentes[int(demanda_id)].add(etapa)
+        resumos = {pk: self._resumo_assinaturas(pares[pk], pendentes[pk]) for pk in ids}
+        return {pk: resumos[alvo] for pk, alvo in origem.items()}
+
+    @staticmethod
+    def _resumo_assinaturas(
+        pares: set[tuple[str, str]], etapas_pendentes: set[str]
+    ) -> dict[str, bool]:
         def etapa_completa(etapa: str, papeis: tuple[str, ...]) -> bool:
             return all((etapa, papel) in pares for papel in papeis)
 
         def pendente_gestor(etapa: str) -> bool:
-            return AssinaturaValidacaoGestor.objects.filter(
-                demanda=demanda,
-                etapa=etapa,
-                status=AssinaturaValidacaoGestor.STATUS_PENDENTE,
-            ).exists()
+            return etapa in etapas_pendentes
 
         return {
             "envio_oficio_assinado": (
@@ -3,8 +3,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import timedelta
-
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    QuerySet,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 
 from core.models import Demanda
@@ -27,39 +41,103 @@ class ResultadoVerificacaoAtrasos:
 
 class AtrasoDemandaService:
     STATUS_EM_ANDAMENTO = ["PROTOCOLADO", "EM_EXECUCAO", "AGUARDANDO_TRANSFERENCIA"]
+    # Demandas atrasadas notificadas por transação (destinatários resolvidos em lote).
+    LOTE_NOTIFICACAO = 500
 
-    def executar(self) -> ResultadoVerificacaoAtrasos:
-        hoje = timezone.now().date()
-        resultado = ResultadoVerificacaoAtrasos()
-        notif_svc = NotificacaoService()
-
-        demandas = Demanda.objects.filter(
+    def pendentes(self) -> QuerySet[Demanda]:
+        return Demanda.objects.filter(
             status__in=self.STATUS_EM_ANDAMENTO,
             notificacao_atraso_enviada=False,
             data_inicio_prazo__isnull=False,
         )
-        resultado.demandas_verificadas = demandas.count()
 
-        demandas_atrasadas_ids: list[int] = []
+    def _prazos_por_servico(self, qs: QuerySet[Demanda]) -> dict[int | None, int | None]:
+        """Prazo da política vigente para cada serviço sem snapshot — um resolve por serviço."""
+        from core.services.prazo_demanda_service import PrazoDemandaService
 
-        for demanda in demandas:
-            prazo_dias = demanda.prazo_dias()
-            if prazo_dias is None:
+        prazo_svc = PrazoDemandaService()
+        servicos = (
+            qs.filter(prazo_efetivo_dias__isnull=True)
+            .order_by()
+            .values_list("sinapse_servico_id", flat=True)
+            .distinct()
+        )
+        return {sid: prazo_svc.resolver_servico(sid).dias for sid in servicos}
+
+    def anotar_vencimento(self, qs: QuerySet[Demanda]) -> QuerySet[Demanda]:
+        """
+        Anota `prazo_sla_dias` e `data_vencimento_sla` (início do prazo + dias).
+
+        Mesma regra de `Demanda.prazo_dias()`: snapshot `prazo_efetivo_dias` e, sem
+        ele, o prazo do serviço resolvido uma vez por serviço distinto.
+        """
+        por_prazo: dict[int, list[int]] = {}
+        prazo_sem_servico = None
+        for sid, dias in self._prazos_por_servico(qs).items():
+            if dias is None:
                 continue
+            if sid is None:
+                prazo_sem_servico = dias
+            else:
+                por_prazo.setdefault(int(dias), []).append(int(sid))
+
+        prazo_servico = Case(
+            *[
+                When(sinapse_servico_id__in=sids, then=Value(dias))
+                for dias, sids in por_prazo.items()
+            ],
+            When(sinapse_servico_id__isnull=True, then=Value(prazo_sem_servico)),
+            default=Value(None),
+            output_field=IntegerField(),
+        )
+        return qs.annotate(
+            # Cast: sem serviços resolvidos o CASE só tem NULLs e o Postgres o tipa como texto.
+            prazo_sla_dias=Coalesce(F("prazo_efetivo_dias"), Cast(prazo_servico, IntegerField())),
+        ).annotate(
+            data_vencimento_sla=ExpressionWrapper(
+                F("data_inicio_prazo")
+                + ExpressionWrapper(
+                    F("prazo_sla_dias") * timedelta(days=1),
+                    output_field=DurationField(),
+                ),
+                output_field=DateTimeField(),
+            )
+        )
 
-            data_inicio = demanda.data_inicio_prazo.date()
-            data_vencimento = data_inicio + timedelta(days=prazo_dias)
+    def atrasadas(self, hoje=None) -> QuerySet[Demanda]:
+        """
+        Pendentes vencidas antes de `hoje` (data UTC, como no cálculo original).
 
-            if hoje <= data_vencimento:
-                continue
+        `inicio.date() + prazo < hoje` equivale a `inicio + prazo < hoje 00:00`.
+        """
+        hoje = hoje or timezone.now().date()
+        limite = datetime.combine(hoje, time.min, tzinfo=dt_timezone.utc)
+        return self.anotar_vencimento(self.pendentes()).filter(data_vencimento_sla__lt=limite)
 
-            demandas_atrasadas_ids.append(demanda.id)
-            resultado.notificacoes_criadas += notif_svc.notificar_sla_atraso(demanda)
+    def executar(self) -> ResultadoVerificacaoAtrasos:
+        resultado = ResultadoVerificacaoAtrasos()
+        notif_svc = NotificacaoService()
 
-        if demandas_atrasadas_ids:
-            Demanda.objects.filter(id__in=demandas_atrasadas_ids).update(
-                notificacao_atraso_enviada=True
-            )
-            resultado.demandas_atrasadas = len(demandas_atrasadas_ids)
+        resultado.demandas_verificadas = self.pendentes().count()
+        ids = list(self.atrasadas().order_by("pk").values_list("pk", flat=True))
+
+        for inicio in range(0, len(ids), self.LOTE_NOTIFICACAO):
+            lote_ids = ids[inicio : inicio + self.LOTE_NOTIFICACAO]
+            with transaction.atomic():
+                demandas = list(Demanda.objects.filter(pk__in=lote_ids).order_by("pk"))
+                destinatarios = notif_svc.destinatarios_sla_em_lote(demandas)
+                resultado.notificacoes_criadas += notif_svc.criar_envios_em_lote(
+                    (
+                        (
+                            destinatarios.get(int(demanda.pk), []),
+                            notif_svc.mensagem_sla_atraso(demanda),
+                            notif_svc.link_demanda(demanda.pk),
+                        )
+                        for demanda in demandas
+                    ),
+                    tipo="ATRASO",
+                )
+                Demanda.objects.filter(pk__in=lote_ids).update(notificacao_atraso_enviada=True)
+            resultado.demandas_atrasadas += len(lote_ids)
 
         return resultado
@@ -0,0 +1,431 @@
+"""Busca lexical ranqueada da carta de serviços (full-text Postgres + trigram).
+
+Substitui os `icontains` sem índice das buscas lexicais da carta. O documento de
+busca de cada serviço (`CatalogoBuscaLexical.documento`) é um `tsvector` com a
+configuração `portuguese` e pesos A (título, palavras-chave) e B (texto RAG,
+descrição, documentos), indexado por GIN. Acentos são removidos em Python tanto
+na indexação quanto na consulta — equivalente ao `unaccent`, sem depender da
+extensão no servidor.
+
+A consulta é um OR de prefixos (`termo:*`) dos termos do texto, já expandidos com
+os sinônimos de `expandir_consulta_lexical`, ranqueada por `ts_rank_cd` no banco.
+Quando o `pg_trgm` está instalado, a similaridade por palavra com o título entra
+como alternativa (tolerância a erros de digitação).
+
+Usado por `TriagemService._busca_lexical_sinapse`,
+`sinapse_catalog.buscar_servicos_catalogo` e
+`TriagemOtimizadaService._buscar_lexical_otimizado`. Enquanto a fonte não foi
+indexada (`reindexar_busca_lexical_catalogo`), esses chamadores mantêm o
+`icontains` anterior.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import unicodedata
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Q, QuerySet, Value
+from django.db.models.functions import Cast, Greatest
+
+from core.models_busca_lexical import CatalogoBuscaLexical
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FTS = "portuguese"
+# Normalização 32 do ts_rank_cd: rank / (rank + 1), sempre em [0, 1).
+NORMALIZACAO_RANK = 32
+# word_similarity mínima (0..1) para um título entrar só pelo trigram.
+LIMIAR_TRIGRAM = 0.5
+# Peso do trigram frente ao ts_rank_cd normalizado (que raramente passa de 0.5).
+PESO_TRIGRAM = 0.6
+MAX_TERMOS = 16
+LOTE_INDEXACAO = 500
+
+# Letras/dígitos sem `_`: o token vai cru para `to_tsquery`.
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_STOPWORDS = frozenset(
+    {
+        "de", "da", "do", "em", "na", "no", "para", "com", "por", "e", "o", "a",
+        "que", "um", "uma", "os", "as", "se", "ao", "dos", "das", "nas", "nos",
+        "pelo", "pela", "meu", "minha",
+    }
+)
+
+
+@dataclass(frozen=True)
+class ItemBuscaLexical:
+    servico_id: int
+    titulo: str
+    orgao: str | None
+    categoria: str | None
+    relevancia: float
+
+
+@dataclass(frozen=True)
+class ResultadoBuscaLexical:
+    itens: list[ItemBuscaLexical]
+    # Preenchido só com `contar=True` (paginação do Explorer da Carta).
+    total: int | None = None
+
+    @property
+    def ids(self) -> list[int]:
+        return [item.servico_id for item in self.itens]
+
+
+def sem_acento(texto: str | None) -> str:
+    """Minúsculas sem diacríticos (mesmo efeito de `lower(unaccent(...))`)."""
+    decomposto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+def _tokens(texto: str) -> list[str]:
+    vistos: set[str] = set()
+    tokens: list[str] = []
+    for token in _TOKEN_RE.findall(sem_acento(texto)):
+        if len(token) < 3 or token in _STOPWORDS or token in vistos:
+            continue
+        vistos.add(token)
+        tokens.append(token)
+    return tokens
+
+
+def termos_consulta(texto: str, *, expandir: bool = True) -> list[str]:
+    """Termos normalizados da consulta, com os sinônimos da carta ao final."""
+    if expandir:
+        from core.services.triagem_otimizada_service import expandir_consulta_lexical
+
+        texto = expandir_consulta_lexical(texto or "")
+    return _tokens(texto)[:MAX_TERMOS]
+
+
+def _tsquery(termos: Iterable[str]) -> SearchQuery:
+    return SearchQuery(
+        " | ".join(f"{termo}:*" for termo in termos),
+        search_type="raw",
+        config=CONFIG_FTS,
+    )
+
+
+@lru_cache(maxsize=1)
+def trigram_disponivel() -> bool:
+    """`pg_trgm` instalado na base padrão (consultado uma vez por processo)."""
+    if not getattr(settings, "BUSCA_LEXICAL_TRIGRAM_ENABLED", True):
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            return cursor.fetchone() is not None
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Busca lexical: não foi possível verificar pg_trgm (%s).", exc)
+        return False
+
+
+def indice_lexical_disponivel(fonte: str) -> bool:
+    """Há serviços indexados para `fonte` (senão o chamador usa o `icontains`)."""
+    if not getattr(settings, "BUSCA_LEXICAL_FTS_ENABLED", True):
+        return False
+    try:
+        return CatalogoBuscaLexical.objects.filter(fonte=fonte).exists()
+    except Exception as exc:  # noqa: BLE001 - tabela ausente antes do migrate
+        logger.warning("Busca lexical: índice indisponível (%s).", exc)
+        return False
+
+
+def _consulta_ranqueada(
+    qs: QuerySet[CatalogoBuscaLexical], termos: list[str], termos_trigram: list[str]
+) -> QuerySet[CatalogoBuscaLexical]:
+    query = _tsquery(termos)
+    rank = SearchRank(
+        F("documento"), query, cover_density=True, normalization=Value(NORMALIZACAO_RANK)
+    )
+    condicao = Q(documento=query)
+    if termos_trigram and trigram_disponivel():
+        similaridades = [
+            TrigramWordSimilarity(Value(termo), "titulo_busca") for termo in termos_trigram
+        ]
+        similaridade = similaridades[0] if len(similaridades) == 1 else Greatest(*similaridades)
+        qs = qs.annotate(similaridade_trgm=similaridade)
+        condicao |= Q(similaridade_trgm__gte=LIMIAR_TRIGRAM)
+        relevancia = Greatest(
+            rank, Cast(F("similaridade_trgm") * PESO_TRIGRAM, FloatField())
+        )
+    else:
+        relevancia = rank
+    return (
+        qs.annotate(relevancia=relevancia)
+        .filter(condicao)
+        .order_by("-relevancia", "servico_id")
+    )
+
+
+def buscar_catalogo_lexical(
+    texto: str,
+    *,
+    fonte: str,
+    limit: int = 20,
+    offset: int = 0,
+    orgao_id: int | None = None,
+    expandir: bool = True,
+    contar: bool = False,
+    titulo_com_todos: Iterable[str] = (),
+    titulo_sem_nenhum: Iterable[str] = (),
+) -> ResultadoBuscaLexical:
+    """
+    Serviços ativos de `fonte` que casam com `texto`, do mais ao menos relevante.
+
+    `relevancia` é o `ts_rank_cd` normalizado (ou o trigram ponderado, o maior).
+    `titulo_com_todos` / `titulo_sem_nenhum` restringem, no banco e antes do corte
+    de `limit`, pelas substrings (sem acento) presentes no título.
+    """
+    termos = termos_consulta(texto, expandir=expandir)
+    if not termos or limit <= 0:
+        return ResultadoBuscaLexical(itens=[], total=0 if contar else None)
+
+    qs = CatalogoBuscaLexical.objects.filter(fonte=fonte, ativo=True)
+    if orgao_id:
+        qs = qs.filter(orgao_id=int(orgao_id))
+    for trecho in titulo_com_todos:
+        qs = qs.filter(titulo_busca__contains=sem_acento(trecho))
+    for trecho in titulo_sem_nenhum:
+        qs = qs.exclude(titulo_busca__contains=sem_acento(trecho))
+    # Trigram só com os termos digitados: sinônimos já casam pelo tsvector.
+    qs = _consulta_ranqueada(qs, termos, _tokens(texto)[:6])
+
+    total = qs.count() if contar else None
+    itens = [
+        ItemBuscaLexical(
+            servico_id=int(servico_id),
+            titulo=titulo,
+            orgao=orgao or None,
+            categoria=categoria or None,
+            relevancia=round(float(relevancia or 0.0), 6),
+        )
+        for servico_id, titulo, orgao, categoria, relevancia in qs.values_list(
+            "servico_id", "titulo", "orgao_nome", "categoria_nome", "relevancia"
+        )[offset : offset + limit]
+    ]
+    return ResultadoBuscaLexical(itens=itens, total=total)
+
+
+# --- Indexação -------------------------------------------------------------
+
+_CAMPOS_ATUALIZADOS = [
+    "ativo",
+    "orgao_id",
+    "titulo",
+    "orgao_nome",
+    "categoria_nome",
+    "titulo_busca",
+    "palavras_busca",
+    "corpo_busca",
+    "atualizado_em",
+]
+
+
+def _documento() -> Any:
+    return (
+        SearchVector("titulo_busca", weight="A", config=CONFIG_FTS)
+        + SearchVector("palavras_busca", weight="A", config=CONFIG_FTS)
+        + SearchVector("corpo_busca", weight="B", config=CONFIG_FTS)
+    )
+
+
+def _gravar_linhas(linhas: list[CatalogoBuscaLexical]) -> None:
+    if not linhas:
+        return
+    CatalogoBuscaLexical.objects.bulk_create(
+        linhas,
+        update_conflicts=True,
+        unique_fields=["fonte", "servico_id"],
+        update_fields=_CAMPOS_ATUALIZADOS,
+    )
+    fonte = linhas[0].fonte
+    CatalogoBuscaLexical.objects.filter(
+        fonte=fonte, servico_id__in=[linha.servico_id for linha in linhas]
+    ).update(documento=_documento())
+
+
+def _linha(
+    fonte: str,
+    servico_id: int,
+    *,
+    ativo: bool,
+    titulo: str,
+    palavras: str = "",
+    corpo: str = "",
+    orgao_id: int | None = None,
+    orgao_nome: str | None = None,
+    categoria_nome: str | None = None,
+) -> CatalogoBuscaLexical:
+    titulo = (titulo or "").strip()
+    return CatalogoBuscaLexical(
+        fonte=fonte,
+        servico_id=int(servico_id),
+        ativo=bool(ativo),
+        orgao_id=orgao_id,
+        titulo=titulo,
+        orgao_nome=(orgao_nome or "")[:255],
+        categoria_nome=(categoria_nome or "")[:255],
+        titulo_busca=sem_acento(titulo),
+        palavras_busca=sem_acento(palavras),
+        corpo_busca=sem_acento(corpo),
+    )
+
+
+def _remover_ausentes(fonte: str, vistos: set[int]) -> int:
+    removidos, _ = (
+        CatalogoBuscaLexical.objects.filter(fonte=fonte)
+        .exclude(servico_id__in=vistos)
+        .delete()
+    )
+    return removidos
+
+
+def reindexar_sinapse() -> int:
+    """Reconstrói a fonte SINAPSE a partir do catálogo (lotes de `LOTE_INDEXACAO`)."""
+    from integrations import sinapse_catalog
+    from integrations.models_sinapse import SINAPSE_DB_ALIAS, CatalogServico
+
+    if not sinapse_catalog.catalog_disponivel():
+        logger.warning("Busca lexical: catálogo Sinapse não configurado; nada a indexar.")
+        return 0
+
+    qs = (
+        CatalogServico.objects.using(SINAPSE_DB_ALIAS)
+        .select_related("id_orgao", "id_categoria")
+        .only(
+            "id",
+            "titulo",
+            "status",
+            "texto_limpo_rag",
+            "documentos_necessarios",
+            "id_orgao__nome",
+            "id_categoria__nome",
+        )
+        .order_by("id")
+    )
+    # Primeira carga da fonte numa transação só: `indice_lexical_disponivel` fica
+    # verdadeiro com a primeira linha gravada, e um índice parcial desligaria o
+    # `icontains` dos chamadores (mesma regra de `indexar_servico_otimizado`).
+    primeira_carga = not CatalogoBuscaLexical.objects.filter(
+        fonte=CatalogoBuscaLexical.FONTE_SINAPSE
+    ).exists()
+    vistos: set[int] = set()
+    lote: list[CatalogoBuscaLexical] = []
+    with transaction.atomic() if primeira_carga else nullcontext():
+        for servico in qs.iterator(chunk_size=LOTE_INDEXACAO):
+            vistos.add(int(servico.id))
+            lote.append(
+                _linha(
+                    CatalogoBuscaLexical.FONTE_SINAPSE,
+                    servico.id,
+                    ativo=servico.status == 1,
+                    titulo=servico.titulo,
+                    corpo=" ".join(
+                        (
+                            servico.texto_limpo_rag or "",
+                            sinapse_catalog._strip_html(servico.documentos_necessarios),
+                        )
+                    ),
+                    orgao_id=servico.id_orgao_id,
+                    orgao_nome=getattr(servico.id_orgao, "nome", None),
+                    categoria_nome=getattr(servico.id_categoria, "nome", None),
+                )
+            )
+            if len(lote) >= LOTE_INDEXACAO:
+                with transaction.atomic():
+                    _gravar_linhas(lote)
+                lote = []
+        with transaction.atomic():
+            _gravar_linhas(lote)
+            if vistos:
+                _remover_ausentes(CatalogoBuscaLexical.FONTE_SINAPSE, vistos)
+    return len(vistos)
+
+
+def _linha_otimizada(servico, nomes: dict[int, tuple[str, str]]) -> CatalogoBuscaLexical:
+    orgao_nome, categoria_nome = nomes.get(int(servico.sinapse_servico_id), ("", ""))
+    return _linha(
+        CatalogoBuscaLexical.FONTE_OTIMIZADA,
+        servico.sinapse_servico_id,
+        ativo=servico.ativo,
+        titulo=servico.titulo_otimizado,
+        palavras=" ".join(str(p) for p in (servico.palavras_chave or [])),
+        corpo=" ".join(
+            (servico.descricao_objetiva or "", servico.texto_rag_otimizado or "")
+        ),
+        orgao_nome=orgao_nome,
+        categoria_nome=categoria_nome,
+    )
+
+
+def _nomes_sinapse_indexados(servico_ids: Iterable[int]) -> dict[int, tuple[str, str]]:
+    """Órgão/categoria já indexados na fonte SINAPSE (sem ida ao Sinapse)."""
+    return {
+        int(sid): (orgao, categoria)
+        for sid, orgao, categoria in CatalogoBuscaLexical.objects.filter(
+            fonte=CatalogoBuscaLexical.FONTE_SINAPSE, servico_id__in=list(servico_ids)
+        ).values_list("servico_id", "orgao_nome", "categoria_nome")
+    }
+
+
+def reindexar_otimizada() -> int:
+    """Reconstrói a fonte OTIMIZADA a partir de `ServicoOtimizado`."""
+    from core.models_carta_otimizada import ServicoOtimizado
+
+    servicos = list(
+        ServicoOtimizado.objects.only(
+            "sinapse_servico_id",
+            "ativo",
+            "titulo_otimizado",
+            "palavras_chave",
+            "descricao_objetiva",
+            "texto_rag_otimizado",
+        ).order_by("pk")
+    )
+    vistos = {int(s.sinapse_servico_id) for s in servicos}
+    nomes = _nomes_sinapse_indexados(vistos)
+    with transaction.atomic():
+        for inicio in range(0, len(servicos), LOTE_INDEXACAO):
+            _gravar_linhas(
+                [
+                    _linha_otimizada(s, nomes)
+                    for s in servicos[inicio : inicio + LOTE_INDEXACAO]
+                ]
+            )
+        _remover_ausentes(CatalogoBuscaLexical.FONTE_OTIMIZADA, vistos)
+    return len(vistos)
+
+
+def indexar_servico_otimizado(servico) -> None:
+    """
+    Atualiza um serviço otimizado no índice (chamado pelo signal de save).
+
+    Só age depois da primeira indexação completa da fonte: um índice parcial
+    desligaria o `icontains` dos chamadores com resultados incompletos.
+    """
+    if not CatalogoBuscaLexical.objects.filter(
+        fonte=CatalogoBuscaLexical.FONTE_OTIMIZADA
+    ).exists():
+        return
+    nomes = _nomes_sinapse_indexados([servico.sinapse_servico_id])
+    _gravar_linhas([_linha_otimizada(servico, nomes)])
+
+
+def remover_servico_otimizado(sinapse_servico_id: int) -> None:
+    CatalogoBuscaLexical.objects.filter(
+        fonte=CatalogoBuscaLexical.FONTE_OTIMIZADA, servico_id=int(sinapse_servico_id)
+    ).delete()
@@ -70,6 +70,7 @@ def _frases_via_llm(servico: ServicoOtimizado) -> list[str]:
     raw = llm.completar_texto(
         "Você gera frases de teste para busca semântica em carta de serviços.",
         prompt,
+        cacheavel=True,
     )
     if not raw:
         return []
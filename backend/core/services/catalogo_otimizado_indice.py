@@ -0,0 +1,293 @@
+"""Índice em memória da base otimizada (`ServicoOtimizado`) para a triagem.
+
+A carta ativa tem poucos milhares de serviços: cabe inteira no processo. O índice
+guarda a matriz de embeddings pré-normalizada, títulos, nomes de órgão/categoria
+(lidos do Sinapse uma vez, no carregamento) e um índice invertido de tokens dos
+campos que a busca lexical consulta. Com ele, `TriagemOtimizadaService` faz o
+ranking híbrido vetorial + lexical sem ida ao banco.
+
+Invalidação: `core.signals` chama `invalidar_indice_catalogo_otimizado()` em
+save/delete de `ServicoOtimizado`; a versão fica no cache compartilhado para que
+os demais workers também recarreguem. Atualizações em massa (`.update()`) não
+disparam signal — o TTL cobre esses casos.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+import numpy as np
+from django.core.cache import cache
+
+from core.services.similaridade_vetorial import (
+    CATALOGO_TTL_SEGUNDOS,
+    empilhar_normalizado,
+    similaridades,
+    similaridades_lote,
+    top_k_indices,
+)
+
+logger = logging.getLogger(__name__)
+
+INDICE_VERSAO_KEY = "sgdl:triagem_otimizada:indice:versao"
+
+# Mesmo recorte de `\w` que `_extrair_termos_busca` usa para gerar os termos.
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class ServicoIndexado:
+    servico_id: int
+    titulo: str
+    orgao: str | None
+    categoria: str | None
+    score_qualidade: int | None
+    texto_rag: str
+    titulo_lower: str
+    rag_lower: str
+    palavras_lower: str
+
+
+@dataclass
+class IndiceCatalogoOtimizado:
+    servicos: list[ServicoIndexado]
+    matriz: np.ndarray
+    linhas: list[int]
+    tokens: dict[str, frozenset[int]]
+    versao: int
+    carregado_em: float = field(default_factory=time.monotonic)
+    _postings: dict[str, frozenset[int]] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.servicos)
+
+    def buscar_vetorial(self, embedding: Any, limit: int) -> list[dict[str, Any]]:
+        """Equivalente ao `ORDER BY CosineDistance` da base otimizada."""
+        return self._resultados_vetoriais(similaridades(embedding, self.matriz), limit)
+
+    def buscar_vetorial_lote(
+        self, embeddings: list[Any], limit: int
+    ) -> list[list[dict[str, Any]]]:
+        """`buscar_vetorial` para várias consultas com um único produto de matrizes."""
+        scores = similaridades_lote(embeddings, self.matriz)
+        return [self._resultados_vetoriais(linha, limit) for linha in scores]
+
+    def _resultados_vetoriais(self, scores: np.ndarray, limit: int) -> list[dict[str, Any]]:
+        resultados: list[dict[str, Any]] = []
+        for linha in top_k_indices(scores, int(limit)).tolist():
+            servico = self.servicos[self.linhas[linha]]
+            score = float(scores[linha])
+            resultados.append(
+                {
+                    "servico_id": servico.servico_id,
+                    "titulo": servico.titulo,
+                    "orgao": servico.orgao,
+                    "categoria": servico.categoria,
+                    "score": round(score, 4),
+                    "distancia": round(1.0 - score, 6),
+                    "fonte": "base_otimizada",
+                    "score_qualidade": servico.score_qualidade,
+                    "texto_rag": servico.texto_rag,
+                }
+            )
+        return resultados
+
+    def postings(self, termo: str) -> frozenset[int]:
+        """
+        Serviços cujo título/descrição/texto RAG/palavras-chave contêm `termo`.
+
+        Como os termos só têm caracteres `\\w`, "contém" equivale a algum token
+        do vocabulário conter o termo — mesma semântica do `icontains` anterior.
+        """
+        termo = termo.lower()
+        encontrado = self._postings.get(termo)
+        if encontrado is None:
+            exato = self.tokens.get(termo, frozenset())
+            docs: set[int] = set(exato)
+            for token, posicoes in self.tokens.items():
+                if termo in token and token != termo:
+                    docs.update(posicoes)
+            encontrado = frozenset(docs)
+            self._postings[termo] = encontrado
+        return encontrado
+
+    def buscar_lexical(
+        self,
+        termos: Iterable[str],
+        limit: int,
+        pontuar: Callable[[ServicoIndexado, list[str]], float],
+    ) -> list[dict[str, Any]]:
+        termos = list(termos)
+        candidatos: set[int] = set()
+        for termo in termos:
+            candidatos.update(self.postings(termo))
+
+        pontuados = sorted(
+            ((pontuar(self.servicos[pos], termos), pos) for pos in candidatos),
+            key=lambda item: (-item[0], item[1]),
+        )[: max(0, int(limit))]
+        resultados: list[dict[str, Any]] = []
+        for score, pos in pontuados:
+            servico = self.servicos[pos]
+            resultados.append(
+                {
+                    "servico_id": servico.servico_id,
+                    "titulo": servico.titulo,
+                    "orgao": servico.orgao,
+                    "categoria": servico.categoria,
+                    "score": score,
+                    "distancia": 1.0 - score,
+                    "fonte": "base_otimizada_lexical",
+                    "score_qualidade": servico.score_qualidade,
+                }
+            )
+        return resultados
+
+
+def texto_rag_resumido(texto: str) -> str:
+    return texto[:200] + "..." if len(texto) > 200 else texto
+
+
+def nomes_sinapse(servico_ids: list[int]) -> dict[int, tuple[str | None, str | None]]:
+    """(órgão, categoria) por serviço — consultas em lote ao Sinapse, só no carregamento."""
+    from integrations.models_sinapse import SINAPSE_DB_ALIAS, CatalogServico
+
+    nomes: dict[int, tuple[str | None, str | None]] = {}
+    try:
+        for inicio in range(0, len(servico_ids), 1000):
+            for servico in (
+                CatalogServico.objects.using(SINAPSE_DB_ALIAS)
+                .filter(id__in=servico_ids[inicio : inicio + 1000])
+                .select_related("id_orgao", "id_categoria")
+                .only("id", "id_orgao__nome", "id_categoria__nome")
+            ):
+                nomes[int(servico.id)] = (
+                    getattr(servico.id_orgao, "nome", None),
+                    getattr(servico.id_categoria, "nome", None),
+                )
+    except Exception as exc:  # noqa: BLE001 - Sinapse fora: nomes ficam vazios
+        logger.warning("Índice da base otimizada sem nomes do Sinapse: %s", exc)
+    return nomes
+
+
+def _carregar_indice(versao: int) -> IndiceCatalogoOtimizado:
+    from core.models_carta_otimizada import ServicoOtimizado
+
+    linhas_db = list(
+        ServicoOtimizado.objects.filter(ativo=True)
+        .order_by("pk")
+        .values_list(
+            "sinapse_servico_id",
+            "titulo_otimizado",
+            "descricao_objetiva",
+            "texto_rag_otimizado",
+            "palavras_chave",
+            "score_qualidade_otimizado",
+            "embedding_otimizado",
+        )
+    )
+    nomes = nomes_sinapse([int(row[0]) for row in linhas_db])
+
+    servicos: list[ServicoIndexado] = []
+    vetores: list[Any] = []
+    posicoes_vetor: list[int] = []
+    tokens: dict[str, set[int]] = {}
+    for sid, titulo, descricao, rag, palavras, qualidade, embedding in linhas_db:
+        titulo = titulo or ""
+        rag = rag or ""
+        palavras_txt = " ".join(str(p) for p in (palavras or []))
+        orgao, categoria = nomes.get(int(sid), (None, None))
+        pos = len(servicos)
+        servicos.append(
+            ServicoIndexado(
+                servico_id=int(sid),
+                titulo=titulo,
+                orgao=orgao,
+                categoria=categoria,
+                score_qualidade=qualidade,
+                texto_rag=texto_rag_resumido(rag),
+                titulo_lower=titulo.lower(),
+                rag_lower=rag.lower(),
+                palavras_lower=palavras_txt.lower(),
+            )
+        )
+        for campo in (titulo, descricao or "", rag, palavras_txt):
+            for token in _TOKEN_RE.findall(campo.lower()):
+                tokens.setdefault(token, set()).add(pos)
+        if embedding is not None:
+            vetores.append(embedding)
+            posicoes_vetor.append(pos)
+
+    matriz, aceitos = empilhar_normalizado(vetores)
+    return IndiceCatalogoOtimizado(
+        servicos=servicos,
+        matriz=matriz,
+        linhas=[posicoes_vetor[i] for i in aceitos],
+        tokens={token: frozenset(pos) for token, pos in tokens.items()},
+        versao=versao,
+    )
+
+
+def _versao_indice() -> int:
+    try:
+        versao = cache.get(INDICE_VERSAO_KEY)
+        if versao is None:
+            cache.add(INDICE_VERSAO_KEY, 1, None)
+            versao = cache.get(INDICE_VERSAO_KEY) or 1
+        return int(versao)
+    except Exception:  # noqa: BLE001 - cache fora: vale só o TTL
+        return 0
+
+
+_indice_lock = threading.Lock()
+_indice: IndiceCatalogoOtimizado | None = None
+
+
+def _vigente(indice: IndiceCatalogoOtimizado | None, versao: int) -> bool:
+    return (
+        indice is not None
+        and indice.versao == versao
+        and time.monotonic() - indice.carregado_em < CATALOGO_TTL_SEGUNDOS
+    )
+
+
+def indice_catalogo_otimizado() -> IndiceCatalogoOtimizado:
+    """Índice do processo; recarrega quando a versão muda ou o TTL expira."""
+    global _indice
+    versao = _versao_indice()
+    indice = _indice
+    if _vigente(indice, versao):
+        return indice
+    with _indice_lock:
+        indice = _indice
+        if not _vigente(indice, versao):
+            inicio = time.perf_counter()
+            indice = _carregar_indice(versao)
+            _indice = indice
+            logger.info(
+                "Índice da base otimizada carregado: %s serviços, %s com embedding, "
+                "%s tokens em %.0f ms.",
+                len(indice),
+                len(indice.linhas),
+                len(indice.tokens),
+                (time.perf_counter() - inicio) * 1000,
+            )
+        return indice
+
+
+def invalidar_indice_catalogo_otimizado() -> None:
+    """Descarta o índice deste processo e avisa os demais (nova versão no cache)."""
+    global _indice
+    with _indice_lock:
+        _indice = None
+    try:
+        cache.incr(INDICE_VERSAO_KEY)
+    except ValueError:
+        cache.set(INDICE_VERSAO_KEY, 1, None)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Não foi possível publicar nova versão do índice: %s", exc)
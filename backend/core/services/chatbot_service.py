@@ -23,7 +23,7 @@ import time
 import uuid
 from decimal import Decimal
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import requests
 from django.conf import settings
@@ -50,6 +50,9 @@ from .copiloto_faq_competencia import (
     normalizar_competencia_llm,
 )
 from .copiloto_config import copiloto_faq_habilitada, copiloto_tendencias_habilitadas
+from .copiloto_stream import ExtratorCampoJson, ler_stream_groq
+from . import llm_cache_service
+from .http_externo import UPSTREAM_GROQ, cliente_http
 from .geocoding_service import GeocodingService
 from .tendencia_service import TendenciaService
 from .triagem_service import TriagemService
@@ -488,7 +491,9 @@ _VALOR_ENDERECO_INVALIDO_RE = re.compile(
 class ChatbotService:
     """Orquestra uma rodada de conversa com memória e triagem Sinapse."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, ao_fragmento: Callable[[str], None] | None = None) -> None:
+        """`ao_fragmento`: recebe trechos de `resposta_agente` enquanto a Groq gera (streaming)."""
+        self.ao_fragmento = ao_fragmento
         self.api_key: str = getattr(settings, "GROQ_API_KEY", "") or ""
         self.base_url: str = getattr(
             settings,
@@ -2623,6 +2628,7 @@ class ChatbotService:
     ) -> None:
         """Executa (ou refaz) triagem Sinapse para itens do rascunho."""
         texto_sessao = self._texto_usuario_da_sessao(session)
+        pendentes: list[dict[str, Any]] = []
         for item in items:
             if not isinstance(item, dict):
                 continue
@@ -2636,7 +2642,12 @@ class ChatbotService:
                 continue
             item.pop("sinapse_servico_id_sugerido", None)
             item.pop("servico_local_id", None)
-            cands = self._triagem_sinapse_consolidada(item, texto_sessao=texto_sessao)
+            pendentes.append(item)
+        if not pendentes:
+            return
+        # Itens de pedido composto triados juntos (um lote de embeddings, uma busca).
+        lote = self._triagem_sinapse_em_lote(pendentes, texto_sessao=texto_sessao)
+        for item, cands in zip(pendentes, lote):
             item["candidatos_sinapse"] = cands
             item["candidatos_revisao"] = int(item.get("candidatos_revisao") or 0) + 1
 
@@ -2690,15 +2701,27 @@ class ChatbotService:
         """Executa embedding + TriagemService; devolve (mensagem system, candidatos UI, blocos por demanda)."""
         blocos: list[dict[str, Any]] = []
 
-        for idx, item in enumerate(itens):
-            if isinstance(item, dict) and self._item_trilha_ouvidoria(item):
-                continue
-            candidatos = self._triagem_sinapse_consolidada(item)
+        alvos = [
+            (idx, item)
+            for idx, item in enumerate(itens)
+            if not (isinstance(item, dict) and self._item_trilha_ouvidoria(item))
+        ]
+        # Todos os itens numa passada: um lote de embeddings e uma busca vetorial.
+        lote = self._triagem_sinapse_em_lote([item for _, item in alvos])
+        textos_emb = [
+            (variantes[0] if variantes else "")
+            for variantes in (
+                self._variantes_consulta_triagem_sinapse(item) for _, item in alvos
+            )
+        ]
+        # Mesmos textos do lote acima: com o cache de embeddings, não voltam ao Kernel.
+        vetores = VectorService().generate_embeddings(textos_emb) if any(textos_emb) else []
+
+        for pos, ((idx, item), candidatos) in enumerate(zip(alvos, lote)):
             if not candidatos:
                 continue
-            variantes = self._variantes_consulta_triagem_sinapse(item)
-            texto_emb = variantes[0] if variantes else ""
-            vetor = VectorService().generate_embedding(texto_emb) if texto_emb else None
+            texto_emb = textos_emb[pos]
+            vetor = vetores[pos] if texto_emb else None
             embedding_dims = len(vetor) if vetor else 0
 
             enriquecidos = []
@@ -3381,7 +3404,8 @@ class ChatbotService:
             {"role": "system", "content": self._system_prompt_copiloto()},
             *self._sanitizar_historico(historico_sem_system),
         ]
-        raw = self._post_groq(messages)
+        # Mesmo histórico (e mesmo contexto injetado) → mesma resposta do copiloto.
+        raw = self._post_groq(messages, cacheavel=True)
         return self._parse_json_resposta(raw)
 
     def _sanitizar_historico(
@@ -3400,7 +3424,21 @@ class ChatbotService:
             out.append({"role": role, "content": content})
         return out
 
-    def _post_groq(self, messages: list[dict[str, str]]) -> str:
+    def _post_groq(self, messages: list[dict[str, str]], *, cacheavel: bool = False) -> str:
+        """Chat completion JSON; prompts repetidos saem do `llm_cache_service` (sem 429)."""
+        chave = None
+        if llm_cache_service.cacheavel(self.temperature, explicito=cacheavel):
+            chave = llm_cache_service.chave_prompt(
+                self.model, messages, self.temperature, {"type": "json_object"}
+            )
+            guardado = llm_cache_service.buscar(chave)
+            if guardado is not None:
+                if self.ao_fragmento:
+                    trecho = ExtratorCampoJson().alimentar(guardado)
+                    if trecho:
+                        self.ao_fragmento(trecho)
+                return guardado
+
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -3411,10 +3449,17 @@ class ChatbotService:
             "response_format": {"type": "json_object"},
             "temperature": self.temperature,
         }
+        if self.ao_fragmento:
+            payload["stream"] = True
         for tentativa in range(2):
             try:
-                response = requests.post(
-                    self.base_url, headers=headers, json=payload, timeout=self.timeout
+                response = cliente_http(UPSTREAM_GROQ).post(
+                    self.base_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                    operacao="copiloto",
+                    stream=bool(self.ao_fragmento),
                 )
             except requests.Timeout:
                 logger.error("Timeout (%ss) Groq chat.", self.timeout)
@@ -3437,13 +3482,29 @@ class ChatbotService:
                 )
                 return "{}"
 
-            try:
-                data = response.json()
-            except ValueError:
-                logger.error("Groq retornou corpo não JSON.")
-                return "{}"
+            if self.ao_fragmento:
+                try:
+                    bruto, tokens = ler_stream_groq(
+                        response.iter_lines(decode_unicode=True), self.ao_fragmento
+                    )
+                except requests.RequestException as exc:
+                    logger.error("Stream Groq interrompido: %s", exc)
+                    return "{}"
+                finally:
+                    response.close()
+                content = bruto.strip() or "{}"
+            else:
+                try:
+                    data = response.json()
+                except ValueError:
+                    logger.error("Groq retornou corpo não JSON.")
+                    return "{}"
+                content = self._extrair_content_string(data)
+                tokens = llm_cache_service.tokens_da_resposta(data)
 
-            return self._extrair_content_string(data)
+            if chave and content.strip() not in ("", "{}"):
+                llm_cache_service.gravar(chave, content, tokens)
+            return content
 
         return "{}"
 
@@ -3953,6 +4014,7 @@ class ChatbotService:
             return
         texto_sessao = self._texto_usuario_da_sessao(session)
         alterou = False
+        pendentes: list[dict[str, Any]] = []
         for item in items:
             if not isinstance(item, dict):
                 continue
@@ -3971,13 +4033,20 @@ class ChatbotService:
                 item["pedido_integral"] = relato
                 item["texto_para_embedding"] = f"{relato} {ultimo_texto}".strip()[:500]
             self._normalizar_sinapse_id_rascunho(item)
+            pendentes.append(item)
+
+        lote = (
+            self._triagem_sinapse_em_lote(pendentes, texto_sessao=texto_sessao)
+            if pendentes
+            else []
+        )
+        for item, cands in zip(pendentes, lote):
             antigos = item.get("candidatos_sinapse")
             antigo_ids = tuple(
                 c.get("servico_id")
                 for c in (antigos if isinstance(antigos, list) else [])
                 if isinstance(c, dict)
             )
-            cands = self._triagem_sinapse_consolidada(item, texto_sessao=texto_sessao)
             if not cands:
                 continue
             item["candidatos_sinapse"] = cands
@@ -6095,35 +6164,57 @@ class ChatbotService:
         self, item: dict[str, Any], *, texto_sessao: str = ""
     ) -> list[dict[str, Any]]:
         """Executa triagem para cada variante e mantém o melhor score por servico_id."""
-        variantes = self._variantes_consulta_triagem_sinapse(item, texto_sessao=texto_sessao)
-        if not variantes:
-            return []
+        return self._triagem_sinapse_em_lote([item], texto_sessao=texto_sessao)[0]
+
+    def _triagem_sinapse_em_lote(
+        self, itens: list[dict[str, Any]], *, texto_sessao: str = ""
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Triagem de vários itens do rascunho numa passada: um lote de embeddings para
+        todas as variantes e uma busca vetorial para todos os vetores. Devolve, por
+        item, os candidatos com o melhor score por servico_id.
+        """
+        variantes_por_item = [
+            self._variantes_consulta_triagem_sinapse(item, texto_sessao=texto_sessao)
+            for item in itens
+        ]
+        textos = [texto for variantes in variantes_por_item for texto in variantes]
+        if not textos:
+            return [[] for _ in itens]
 
         # Usar triagem otimizada se configurado
-        from django.conf import settings
         usar_base_otimizada = getattr(settings, 'USAR_BASE_SERVICOS_OTIMIZADA', True)
         triagem = AdapterTriagemOtimizada(usar_base_otimizada=usar_base_otimizada)
-        vector_svc = VectorService()
-        por_id: dict[int, dict[str, Any]] = {}
 
-        for texto_emb in variantes:
-            try:
-                vetor = vector_svc.generate_embedding(texto_emb)
-            except Exception:
-                logger.warning(
-                    "Copiloto triagem: falha ao gerar embedding para variante=%s",
-                    texto_emb[:80],
-                    exc_info=True,
-                )
-                continue
-            if not vetor or len(vetor) != 1024:
-                logger.warning(
-                    "Copiloto triagem: embedding vazio para variante=%s", texto_emb[:80]
-                )
-                continue
-            for c in triagem.buscar_servico_sinapse(
-                vetor, top_k=8, texto_consulta=texto_emb
-            ):
+        try:
+            vetores = VectorService().generate_embeddings(textos)
+        except Exception:
+            logger.warning(
+                "Copiloto triagem: falha ao gerar embeddings para %s variante(s)",
+                len(textos),
+                exc_info=True,
+            )
+            return [[] for _ in itens]
+
+        consultas: list[tuple[list[float], str]] = []
+        donos: list[int] = []
+        vetores_iter = iter(vetores)
+        for idx, variantes in enumerate(variantes_por_item):
+            for texto_emb in variantes:
+                vetor = next(vetores_iter)
+                if not vetor or len(vetor) != 1024:
+                    logger.warning(
+                        "Copiloto triagem: embedding vazio para variante=%s", texto_emb[:80]
+                    )
+                    continue
+                consultas.append((vetor, texto_emb))
+                donos.append(idx)
+
+        por_item: list[dict[int, dict[str, Any]]] = [{} for _ in itens]
+        resultados = triagem.buscar_servicos_em_lote(consultas, top_k=8) if consultas else []
+        for idx, candidatos in zip(donos, resultados):
+            por_id = por_item[idx]
+            for c in candidatos:
                 if not isinstance(c, dict) or c.get("servico_id") is None:
                     continue
                 sid = int(c["servico_id"])
@@ -6137,11 +6228,14 @@ class ChatbotService:
                         "score": c.get("score"),
                     }
 
-        return sorted(
-            por_id.values(),
-            key=lambda x: float(x.get("score") or 0.0),
-            reverse=True,
-        )
+        return [
+            sorted(
+                por_id.values(),
+                key=lambda x: float(x.get("score") or 0.0),
+                reverse=True,
+            )
+            for por_id in por_item
+        ]
 
     @staticmethod
     def _limiar_carta_dominio() -> float:
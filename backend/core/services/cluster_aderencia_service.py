@@ -107,6 +107,55 @@ def protocolo_executivo_efetivo(demanda: Demanda) -> str | None:
     return lider.protocolo_executivo if lider else None
 
 
+def lideres_integrados_em_lote(demandas) -> dict[int, dict[str, Any]]:
+    """
+    `demanda_integrada_ao_lider` para uma listagem: pk da seguidora integrada →
+    `{"lider_pk", "protocolo_executivo"}` do líder. Duas consultas no total.
+    """
+    candidatas = [d for d in demandas if not d.protocolo_executivo and d.cluster_id]
+    if not candidatas:
+        return {}
+    membros: dict[int, list[dict[str, Any]]] = {}
+    for row in Demanda.objects.filter(
+        cluster_id__in={int(d.cluster_id) for d in candidatas}
+    ).values("pk", "cluster_id", "protocolo_executivo", "status", "nos_ativos"):
+        membros.setdefault(int(row["cluster_id"]), []).append(row)
+    lideres: dict[int, dict[str, Any]] = {}
+    for cid, rows in membros.items():
+        lider_pk = ClusterService._lider_de_linhas(rows)
+        lideres[cid] = next(r for r in rows if r["pk"] == lider_pk)
+
+    seguidoras = [
+        d
+        for d in candidatas
+        if int(d.cluster_id) in lideres and int(lideres[int(d.cluster_id)]["pk"]) != int(d.pk)
+    ]
+    aderiram: set[int] = set()
+    if seguidoras:
+        aderiram.update(
+            Tramitacao.objects.filter(
+                demanda_id__in=[d.pk for d in seguidoras],
+                tipo="COMENTARIO",
+                metadata__acao="ADERIR_LIDER",
+            ).values_list("demanda_id", flat=True)
+        )
+
+    integradas: dict[int, dict[str, Any]] = {}
+    for demanda in seguidoras:
+        lider = lideres[int(demanda.cluster_id)]
+        if demanda.pk not in aderiram:
+            ordem = STATUS_ORDEM_GRUPO.get(demanda.status)
+            if ordem is None or ordem <= STATUS_ORDEM_GRUPO["AGUARDANDO_PROTOCOLO"]:
+                continue
+            if not lider["protocolo_executivo"]:
+                continue
+        integradas[int(demanda.pk)] = {
+            "lider_pk": int(lider["pk"]),
+            "protocolo_executivo": lider["protocolo_executivo"],
+        }
+    return integradas
+
+
 class ClusterAderenciaService:
     def __init__(self) -> None:
         self._cluster = ClusterService()
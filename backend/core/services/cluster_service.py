@@ -5,14 +5,22 @@ from __future__ import annotations
 import logging
 import math
 from datetime import timedelta
-from typing import Any
+from typing import Any, Iterable
 
+import numpy as np
 from django.conf import settings
-from django.db import transaction
-from django.db.models import Count, Min, Q, QuerySet
+from django.db import connection, transaction
+from django.db.models import Count, Min, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from core.models import ClusterExecucao, Demanda, Tramitacao
+from core.services.resolvedor_catalogo import ResolvedorCatalogo
+from core.services.similaridade_vetorial import (
+    cosine_similarity_lote,
+    media_vetores,
+    vetor_float32,
+)
 from core.services.triagem_service import cosine_similarity
 from integrations import sinapse_catalog
 from integrations.sinapse_catalog import _strip_html
@@ -79,17 +87,18 @@ def _embedding_list(vetor: Any) -> list[float]:
 
 
 def _media_embeddings(vetores: list[list[float]]) -> list[float]:
-    if not vetores:
-        return []
-    dim = len(vetores[0])
-    acc = [0.0] * dim
-    for vetor in vetores:
-        if len(vetor) != dim:
-            continue
-        for i, val in enumerate(vetor):
-            acc[i] += val
-    n = len(vetores)
-    return [x / n for x in acc]
+    return media_vetores(vetores)
+
+
+def _soma_de_bytes(dados: Any) -> np.ndarray | None:
+    """Soma corrente persistida (`ClusterExecucao.centroide_soma`, float64 little-endian)."""
+    if not dados:
+        return None
+    return np.frombuffer(bytes(dados), dtype="<f8").copy()
+
+
+def _soma_para_bytes(soma: np.ndarray) -> bytes:
+    return np.asarray(soma, dtype="<f8").tobytes()
 
 
 def haversine_metros(
@@ -122,6 +131,7 @@ class ClusterService:
         self.requer_mesmo_servico = bool(
             getattr(settings, "CLUSTER_REQUER_MESMO_SERVICO", True)
         )
+        self.ann_top_k = max(1, int(getattr(settings, "CLUSTER_ANN_TOP_K", 20)))
 
     def atribuir_demanda_pk(self, demanda_pk: int) -> ClusterExecucao | None:
         try:
@@ -167,7 +177,7 @@ class ClusterService:
             with transaction.atomic():
                 demanda.cluster = cluster
                 demanda.save(update_fields=["cluster"])
-                self._recalcular_centroide(cluster)
+                self._centroide_vincular(cluster, vetor)
             logger.info(
                 "Demanda pk=%s agrupada no cluster pk=%s (%s)",
                 demanda.pk,
@@ -329,6 +339,178 @@ class ClusterService:
             "min_demandas": CLUSTER_MIN_DEMANDAS,
         }
 
+    def acao_cluster_visivel_em_lote(self, demandas: Iterable[Demanda]) -> dict[int, bool]:
+        """
+        Só o `elegivel` de `demanda_elegivel_cluster`, por pk, para listagens.
+
+        Tamanho dos clusters em uma consulta agrupada; a busca de candidatos (ANN)
+        roda apenas para demandas soltas que ainda podem formar cluster.
+        """
+        demandas = list(demandas)
+        resultado = {int(d.pk): False for d in demandas}
+        if not self.enabled:
+            return resultado
+        aptas = [
+            d
+            for d in demandas
+            if d.sinapse_servico_id
+            and embedding_presente(d.embedding)
+            and d.status in DEMANDA_STATUS_CLUSTERIZAVEL
+        ]
+        cluster_ids = {int(d.cluster_id) for d in aptas if d.cluster_id}
+        tamanhos: dict[int, int] = {}
+        if cluster_ids:
+            tamanhos = dict(
+                Demanda.objects.filter(cluster_id__in=cluster_ids)
+                .values("cluster_id")
+                .annotate(total=Count("pk"))
+                .values_list("cluster_id", "total")
+            )
+        soltas = [d for d in aptas if not d.cluster_id]
+        com_candidato = self._soltas_com_cluster_compativel_lote(soltas)
+        com_candidato |= self._soltas_com_par_compativel_lote(
+            [d for d in soltas if int(d.pk) not in com_candidato]
+        )
+        for demanda in aptas:
+            if demanda.cluster_id:
+                elegivel = tamanhos.get(int(demanda.cluster_id), 0) >= CLUSTER_MIN_DEMANDAS
+            else:
+                elegivel = int(demanda.pk) in com_candidato
+            resultado[int(demanda.pk)] = elegivel
+        return resultado
+
+    @staticmethod
+    def _valores_consulta_lote(demandas: list[Demanda]) -> tuple[str, list[Any]]:
+        """`VALUES (pk, embedding, serviço)` das demandas, para `CROSS JOIN LATERAL`."""
+        valores = ", ".join(["(%s, %s::vector, %s)"] * len(demandas))
+        params: list[Any] = []
+        for demanda in demandas:
+            params.extend(
+                [
+                    int(demanda.pk),
+                    "[" + ",".join(repr(x) for x in _embedding_list(demanda.embedding)) + "]",
+                    int(demanda.sinapse_servico_id),
+                ]
+            )
+        return valores, params
+
+    def _soltas_com_cluster_compativel_lote(self, demandas: list[Demanda]) -> set[int]:
+        """
+        `_candidatos_cluster_ann` + `_geo_compativel` de várias demandas em duas consultas.
+
+        O top-k por demanda sai de um `CROSS JOIN LATERAL` com os mesmos filtros
+        (status, janela, serviço, limiar); os membros georreferenciados dos
+        clusters candidatos vêm numa consulta só.
+        """
+        if not demandas:
+            return set()
+        valores, params = self._valores_consulta_lote(demandas)
+        tabela_cluster = connection.ops.quote_name(ClusterExecucao._meta.db_table)
+        tabela_demanda = connection.ops.quote_name(Demanda._meta.db_table)
+        filtros = ["c.status = ANY(%s)", "c.centroide IS NOT NULL"]
+        params.append(list(CLUSTER_STATUS_ABERTOS))
+        if self.janela_agregacao_dias > 0:
+            filtros.append("c.atualizado_em >= %s")
+            params.append(timezone.now() - timedelta(days=self.janela_agregacao_dias))
+        if self.requer_mesmo_servico:
+            # Mesmo critério de _servico_id_do_cluster: serviço do cluster ou do 1º membro.
+            filtros.append(
+                f"""COALESCE(c.sinapse_servico_id, (
+                    SELECT m.sinapse_servico_id FROM {tabela_demanda} m
+                    WHERE m.cluster_id = c.id AND m.sinapse_servico_id IS NOT NULL
+                    ORDER BY m.id LIMIT 1
+                )) = q.servico"""
+            )
+        filtros.append("(c.centroide <=> q.emb) <= %s")
+        params.extend([1.0 - self.semantic_threshold, self.ann_top_k])
+        sql = f"""
+            SELECT q.pk, s.id, s.bairro_referencia
+            FROM (VALUES {valores}) AS q(pk, emb, servico)
+            CROSS JOIN LATERAL (
+                SELECT c.id, c.bairro_referencia
+                FROM {tabela_cluster} c
+                WHERE {" AND ".join(filtros)}
+                ORDER BY c.centroide <=> q.emb, c.id
+                LIMIT %s
+            ) s
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            pares = cursor.fetchall()
+        if not pares:
+            return set()
+
+        membros: dict[int, list[Demanda]] = {}
+        for membro in (
+            Demanda.objects.filter(cluster_id__in={cluster_id for _pk, cluster_id, _b in pares})
+            .exclude(latitude__isnull=True)
+            .exclude(longitude__isnull=True)
+            .only("pk", "cluster_id", "latitude", "longitude", "logradouro", "bairro", "cep")
+        ):
+            membros.setdefault(int(membro.cluster_id), []).append(membro)
+
+        por_pk = {int(d.pk): d for d in demandas}
+        compativeis: set[int] = set()
+        for pk, cluster_id, bairro_referencia in pares:
+            demanda = por_pk[int(pk)]
+            if not sinapse_catalog.servico_requer_localizacao(
+                int(demanda.sinapse_servico_id)
+            ) or self._geo_compativel_membros(
+                demanda, bairro_referencia, membros.get(int(cluster_id), [])
+            ):
+                compativeis.add(int(pk))
+        return compativeis
+
+    def _soltas_com_par_compativel_lote(self, demandas: list[Demanda]) -> set[int]:
+        """`_contar_soltas_compatíveis(...) > 0` de várias demandas numa consulta."""
+        if not demandas:
+            return set()
+        valores, params = self._valores_consulta_lote(demandas)
+        tabela = connection.ops.quote_name(Demanda._meta.db_table)
+        params.extend(
+            [
+                list(DEMANDA_STATUS_PAR_FORMACAO - DEMANDA_STATUS_BLOQUEIA_CLUSTER),
+                1.0 - self.semantic_threshold,
+            ]
+        )
+        sql = f"""
+            SELECT q.pk, s.id, s.sinapse_servico_id, s.latitude, s.longitude,
+                   s.logradouro, s.bairro, s.cep
+            FROM (VALUES {valores}) AS q(pk, emb, servico)
+            CROSS JOIN LATERAL (
+                SELECT d.id, d.sinapse_servico_id, d.latitude, d.longitude,
+                       d.logradouro, d.bairro, d.cep
+                FROM {tabela} d
+                WHERE d.sinapse_servico_id = q.servico
+                  AND d.status = ANY(%s)
+                  AND d.cluster_id IS NULL
+                  AND d.id <> q.pk
+                  AND d.embedding IS NOT NULL
+                  AND (d.embedding <=> q.emb) <= %s
+            ) s
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            linhas = cursor.fetchall()
+
+        por_pk = {int(d.pk): d for d in demandas}
+        encontrados: set[int] = set()
+        for pk, outra_pk, servico_id, lat, lng, logradouro, bairro, cep in linhas:
+            if int(pk) in encontrados:
+                continue
+            outra = Demanda(
+                pk=outra_pk,
+                sinapse_servico_id=servico_id,
+                latitude=lat,
+                longitude=lng,
+                logradouro=logradouro,
+                bairro=bairro,
+                cep=cep,
+            )
+            if self._demandas_geo_compatíveis(por_pk[int(pk)], outra):
+                encontrados.add(int(pk))
+        return encontrados
+
     def vincular_demanda_manual(
         self,
         demanda: Demanda,
@@ -360,7 +542,7 @@ class ClusterService:
             if not cluster.sinapse_servico_id:
                 cluster.sinapse_servico_id = demanda.sinapse_servico_id
                 cluster.save(update_fields=["sinapse_servico_id", "atualizado_em"])
-            self._recalcular_centroide(cluster)
+            self._centroide_vincular(cluster, demanda.embedding)
             Tramitacao.objects.create(
                 demanda=demanda,
                 responsavel=usuario,
@@ -559,7 +741,9 @@ class ClusterService:
                 tipo="COMENTARIO",
                 descricao=f"Desvinculação manual do cluster Super OS #{cluster_id}.",
             )
-            self._reavaliar_cluster_apos_desvinculo(cluster)
+            self._reavaliar_cluster_apos_desvinculo(
+                cluster, vetor_removido=demanda.embedding
+            )
 
         logger.info(
             "Demanda pk=%s desvinculada do cluster pk=%s por user=%s",
@@ -580,6 +764,10 @@ class ClusterService:
                 "pk", "protocolo_executivo", "status", "nos_ativos"
             )
         )
+        return self._lider_de_linhas(rows)
+
+    @staticmethod
+    def _lider_de_linhas(rows: list[dict]) -> int | None:
         if not rows:
             return None
 
@@ -614,14 +802,40 @@ class ClusterService:
         lider_demanda = (
             Demanda.objects.filter(pk=int(lider_id)).first() if lider_id else None
         )
+        return self._montar_metadata_cluster(
+            cluster,
+            demandas=demandas,
+            multi=multi,
+            lider_id=lider_id,
+            lider_demanda=lider_demanda,
+        )
+
+    def _montar_metadata_cluster(
+        self,
+        cluster: ClusterExecucao,
+        *,
+        demandas: list[dict[str, Any]],
+        multi: bool,
+        lider_id: int | None,
+        lider_demanda: Demanda | None,
+        resolvedor: ResolvedorCatalogo | None = None,
+    ) -> dict[str, Any]:
+        if resolvedor is None:
+            resolvedor = ResolvedorCatalogo()
+        resolvedor.registrar(
+            orgaos=[row.get("sinapse_orgao_id") for row in demandas]
+            + [getattr(lider_demanda, "sinapse_orgao_id", None)],
+            servicos=(
+                cluster.sinapse_servico_id,
+                getattr(lider_demanda, "sinapse_servico_id", None),
+            ),
+        )
 
         orgaos_map: dict[int, str] = {}
         for row in demandas:
             oid = row.get("sinapse_orgao_id")
             if oid and int(oid) not in orgaos_map:
-                orgaos_map[int(oid)] = (
-                    sinapse_catalog.get_orgao_nome(int(oid)) or f"Órgão #{oid}"
-                )
+                orgaos_map[int(oid)] = resolvedor.nome_orgao(oid) or f"Órgão #{oid}"
         orgaos_envolvidos = [
             {"sinapse_orgao_id": oid, "orgao_nome": nome}
             for oid, nome in sorted(orgaos_map.items(), key=lambda x: x[1])
@@ -631,13 +845,11 @@ class ClusterService:
         orgao_carta_id = None
         orgao_carta_nome = None
         if cluster.sinapse_servico_id:
-            svc = sinapse_catalog.get_servico(int(cluster.sinapse_servico_id))
+            svc = resolvedor.servico(cluster.sinapse_servico_id)
             servico_nome = (svc.titulo or "").strip() if svc else None
-            orgao_carta_id = sinapse_catalog.get_orgao_id_for_servico(
-                int(cluster.sinapse_servico_id)
-            )
+            orgao_carta_id = int(svc.id_orgao_id) if svc and svc.id_orgao_id else None
             if orgao_carta_id:
-                orgao_carta_nome = sinapse_catalog.get_orgao_nome(int(orgao_carta_id))
+                orgao_carta_nome = resolvedor.nome_orgao(orgao_carta_id)
 
         descricao = _strip_html(cluster.descricao_resumo or "")
         if not descricao:
@@ -670,9 +882,7 @@ class ClusterService:
             if bairro_lider:
                 bairro = bairro_lider
             if lider_demanda.sinapse_orgao_id:
-                orgao_lider = sinapse_catalog.get_orgao_nome(
-                    int(lider_demanda.sinapse_orgao_id)
-                )
+                orgao_lider = resolvedor.nome_orgao(lider_demanda.sinapse_orgao_id)
                 if orgao_lider:
                     secretaria = orgao_lider
                     orgao_carta_id = int(lider_demanda.sinapse_orgao_id)
@@ -683,9 +893,7 @@ class ClusterService:
             if desc_lider:
                 descricao = desc_lider[:2000]
             if lider_demanda.sinapse_servico_id:
-                svc_lider = sinapse_catalog.get_servico(
-                    int(lider_demanda.sinapse_servico_id)
-                )
+                svc_lider = resolvedor.servico(lider_demanda.sinapse_servico_id)
                 if svc_lider and (svc_lider.titulo or "").strip():
                     servico_nome = (svc_lider.titulo or "").strip()
 
@@ -806,8 +1014,9 @@ class ClusterService:
         meta = tram.metadata if isinstance(tram.metadata, dict) else {}
         return meta.get("modo_conclusao") == "individual"
 
-    def info_operacional_super_os(self, demanda: Demanda) -> dict[str, Any]:
-        base_vazio = {
+    @staticmethod
+    def _info_super_os_vazio(demanda: Demanda) -> dict[str, Any]:
+        return {
             "ativo": False,
             "eh_lider": True,
             "lider_id": demanda.pk,
@@ -821,21 +1030,105 @@ class ClusterService:
             "orgaos_envolvidos": [],
             "orgao_competente_nome": None,
         }
+
+    def info_operacional_super_os(self, demanda: Demanda) -> dict[str, Any]:
         if not demanda.cluster_id:
-            return base_vazio
+            return self._info_super_os_vazio(demanda)
+        return self.info_operacional_super_os_em_lote([demanda])[int(demanda.pk)]
 
-        cluster = demanda.cluster
-        total = Demanda.objects.filter(cluster_id=demanda.cluster_id).count()
-        lider_pk = self.lider_cluster_pk(int(demanda.cluster_id))
-        super_os_ativo = self.grupo_super_os_ativo(demanda)
-
-        vinculadas: list[dict[str, Any]] = []
-        if total >= CLUSTER_MIN_DEMANDAS:
-            for d in Demanda.objects.filter(cluster_id=demanda.cluster_id).order_by("pk"):
-                orgao_nome = None
-                if d.sinapse_orgao_id:
-                    orgao_nome = sinapse_catalog.get_orgao_nome(int(d.sinapse_orgao_id))
-                vinculadas.append(
+    def info_operacional_super_os_em_lote(
+        self, demandas: Iterable[Demanda]
+    ) -> dict[int, dict[str, Any]]:
+        """
+        `info_operacional_super_os` de várias demandas (por pk) em consultas fixas.
+
+        Uma consulta para os clusters, uma para todos os membros (contagem, líder,
+        órgãos e metadata saem dela) e uma para as conclusões finais que decidem
+        a conclusão individual; nomes de órgão/serviço via `ResolvedorCatalogo`.
+        """
+        from core.models_operacional import EventoOperacional
+
+        demandas = list(demandas)
+        cluster_ids = {int(d.cluster_id) for d in demandas if d.cluster_id}
+        resultado = {
+            int(d.pk): self._info_super_os_vazio(d) for d in demandas if not d.cluster_id
+        }
+        if not cluster_ids:
+            return resultado
+
+        clusters = ClusterExecucao.objects.in_bulk(cluster_ids)
+        membros: dict[int, list[Demanda]] = {cid: [] for cid in cluster_ids}
+        for membro in (
+            Demanda.objects.filter(cluster_id__in=cluster_ids)
+            .defer("embedding")
+            .order_by("pk")
+        ):
+            membros[int(membro.cluster_id)].append(membro)
+
+        grupos: dict[int, dict[str, Any]] = {}
+        for cid, lista in membros.items():
+            lider_pk = self._lider_de_linhas(
+                [
+                    {
+                        "pk": m.pk,
+                        "protocolo_executivo": m.protocolo_executivo,
+                        "status": m.status,
+                        "nos_ativos": m.nos_ativos,
+                    }
+                    for m in lista
+                ]
+            )
+            total = len(lista)
+            multi = len({m.sinapse_orgao_id for m in lista if m.sinapse_orgao_id is not None}) > 1
+            grupos[cid] = {
+                "total": total,
+                "lider_pk": lider_pk,
+                "multi": multi,
+                "ativo": total >= CLUSTER_MIN_DEMANDAS and not multi,
+            }
+
+        resolvedor = ResolvedorCatalogo()
+        for cid, lista in membros.items():
+            if grupos[cid]["total"] >= CLUSTER_MIN_DEMANDAS:
+                resolvedor.registrar(orgaos=(m.sinapse_orgao_id for m in lista))
+
+        # Conclusão individual: marca na própria demanda ou modo da última conclusão do líder.
+        ativas = {int(d.pk) for d in demandas if d.cluster_id and grupos[int(d.cluster_id)]["ativo"]}
+        lideres = {
+            int(grupos[int(d.cluster_id)]["lider_pk"])
+            for d in demandas
+            if int(d.pk) in ativas and grupos[int(d.cluster_id)]["lider_pk"]
+        }
+        marcadas: set[int] = set()
+        ultima_conclusao: dict[int, dict[str, Any]] = {}
+        if ativas:
+            for demanda_id, meta in (
+                Tramitacao.objects.filter(
+                    demanda_id__in=ativas | lideres,
+                    tipo=EventoOperacional.CONCLUSAO_FINAL,
+                )
+                .order_by("demanda_id", "-timestamp", "-pk")
+                .values_list("demanda_id", "metadata")
+            ):
+                meta = meta if isinstance(meta, dict) else {}
+                ultima_conclusao.setdefault(int(demanda_id), meta)
+                if meta.get("super_os_conclusao_individual") is True:
+                    marcadas.add(int(demanda_id))
+
+        metas: dict[int, dict[str, Any]] = {}
+        for demanda in demandas:
+            if not demanda.cluster_id:
+                continue
+            cid = int(demanda.cluster_id)
+            grupo = grupos[cid]
+            cluster = clusters.get(cid)
+            total = grupo["total"]
+            lider_pk = grupo["lider_pk"]
+            super_os_ativo = grupo["ativo"]
+
+            vinculadas: list[dict[str, Any]] = []
+            if total >= CLUSTER_MIN_DEMANDAS:
+                vinculadas = [
                     {
                         "id": d.pk,
                         "protocolo_executivo": d.protocolo_executivo,
@@ -844,31 +1137,62 @@ class ClusterService:
                         "status": d.status,
                         "status_display": d.get_status_display(),
                         "sinapse_orgao_id": d.sinapse_orgao_id,
-                        "orgao_nome": orgao_nome,
+                        "orgao_nome": (
+                            resolvedor.nome_orgao(d.sinapse_orgao_id)
+                            if d.sinapse_orgao_id
+                            else None
+                        ),
                     }
+                    for d in membros[cid]
+                ]
+
+            meta: dict[str, Any] = {}
+            if cluster and total >= CLUSTER_MIN_DEMANDAS:
+                if cid not in metas:
+                    metas[cid] = self._montar_metadata_cluster(
+                        cluster,
+                        demandas=[
+                            {
+                                "pk": d.pk,
+                                "sinapse_orgao_id": d.sinapse_orgao_id,
+                                "bairro": d.bairro,
+                                "status": d.status,
+                            }
+                            for d in membros[cid]
+                        ],
+                        multi=grupo["multi"],
+                        lider_id=lider_pk,
+                        lider_demanda=next(
+                            (d for d in membros[cid] if d.pk == lider_pk), None
+                        ),
+                        resolvedor=resolvedor,
+                    )
+                meta = metas[cid]
+
+            conclusao_individual = False
+            if super_os_ativo:
+                conclusao_individual = int(demanda.pk) in marcadas or (
+                    bool(lider_pk)
+                    and ultima_conclusao.get(int(lider_pk), {}).get("modo_conclusao")
+                    == "individual"
                 )
 
-        meta: dict[str, Any] = {}
-        if cluster and total >= CLUSTER_MIN_DEMANDAS:
-            meta = self.metadata_cluster(cluster)
-
-        conclusao_individual = self.conclusao_individual_super_os_ativa(demanda)
-
-        return {
-            "ativo": super_os_ativo,
-            "eh_lider": int(demanda.pk) == int(lider_pk) if lider_pk else True,
-            "lider_id": lider_pk,
-            "cluster_id": cluster.pk if cluster else demanda.cluster_id,
-            "protocolo_super_os": cluster.protocolo_super_os if cluster else None,
-            "total_vinculados": total,
-            "demandas_vinculadas": vinculadas,
-            "tramitacao_apenas_lider": super_os_ativo and not conclusao_individual,
-            "conclusao_individual_ativa": conclusao_individual,
-            "tipo": meta.get("tipo"),
-            "tipo_display": meta.get("tipo_display"),
-            "orgaos_envolvidos": meta.get("orgaos_envolvidos") or [],
-            "orgao_competente_nome": meta.get("orgao_competente_nome"),
-        }
+            resultado[int(demanda.pk)] = {
+                "ativo": super_os_ativo,
+                "eh_lider": int(demanda.pk) == int(lider_pk) if lider_pk else True,
+                "lider_id": lider_pk,
+                "cluster_id": cluster.pk if cluster else demanda.cluster_id,
+                "protocolo_super_os": cluster.protocolo_super_os if cluster else None,
+                "total_vinculados": total,
+                "demandas_vinculadas": vinculadas,
+                "tramitacao_apenas_lider": super_os_ativo and not conclusao_individual,
+                "conclusao_individual_ativa": conclusao_individual,
+                "tipo": meta.get("tipo"),
+                "tipo_display": meta.get("tipo_display"),
+                "orgaos_envolvidos": meta.get("orgaos_envolvidos") or [],
+                "orgao_competente_nome": meta.get("orgao_competente_nome"),
+            }
+        return resultado
 
     def filtrar_listagem_apenas_lideres(self, qs: QuerySet) -> QuerySet:
         """Oculta filhos de Super OS na listagem operacional (secretaria vê só o líder)."""
@@ -1099,26 +1423,11 @@ class ClusterService:
         if not vetor:
             return 0
 
-        count = 0
-        candidatos = ClusterExecucao.objects.filter(
-            status__in=CLUSTER_STATUS_ABERTOS
-        ).exclude(centroide__isnull=True)
-
-        cutoff = None
-        if self.janela_agregacao_dias > 0:
-            cutoff = timezone.now() - timedelta(days=self.janela_agregacao_dias)
-
-        for cluster in candidatos:
-            if cutoff is not None and cluster.atualizado_em < cutoff:
-                continue
-            if not self._mesmo_servico(demanda, cluster):
-                continue
-            if not self._geo_compativel(demanda, cluster):
-                continue
-            centroide = _embedding_list(cluster.centroide)
-            if centroide and cosine_similarity(vetor, centroide) >= self.semantic_threshold:
-                count += 1
-
+        count = sum(
+            1
+            for cluster in self._candidatos_cluster_ann(demanda, vetor)
+            if self._geo_compativel(demanda, cluster)
+        )
         count += self._contar_soltas_compatíveis(demanda, vetor)
 
         return count
@@ -1126,13 +1435,25 @@ class ClusterService:
     def _contar_soltas_compatíveis(
         self, demanda: Demanda, vetor: list[float]
     ) -> int:
-        count = 0
-        for outra in self._iter_soltas_par_formacao(demanda):
-            if self._demandas_geo_compatíveis(demanda, outra):
-                score = cosine_similarity(vetor, _embedding_list(outra.embedding))
-                if score >= self.semantic_threshold:
-                    count += 1
-        return count
+        return sum(
+            1
+            for _outra, score in self._soltas_geo_compatíveis_com_score(demanda, vetor)
+            if score >= self.semantic_threshold
+        )
+
+    def _soltas_geo_compatíveis_com_score(
+        self, demanda: Demanda, vetor: list[float]
+    ) -> list[tuple[Demanda, float]]:
+        """Pares soltos no entorno, pontuados em lote (um produto matriz-vetor)."""
+        soltas = [
+            outra
+            for outra in self._iter_soltas_par_formacao(demanda)
+            if self._demandas_geo_compatíveis(demanda, outra)
+        ]
+        if not soltas:
+            return []
+        scores = cosine_similarity_lote(vetor, [outra.embedding for outra in soltas])
+        return list(zip(soltas, scores))
 
     def _iter_soltas_par_formacao(self, demanda: Demanda):
         return (
@@ -1149,6 +1470,60 @@ class ClusterService:
     def _buscar_cluster_compativel(
         self, demanda: Demanda, vetor: list[float]
     ) -> ClusterExecucao | None:
+        """Cluster aberto mais próximo (cosseno) que também passa no filtro geográfico."""
+        for cluster in self._candidatos_cluster_ann(demanda, vetor):
+            if self._geo_compativel(demanda, cluster):
+                return cluster
+        return None
+
+    def _candidatos_cluster_ann(
+        self, demanda: Demanda, vetor: list[float]
+    ) -> list[ClusterExecucao]:
+        """
+        Top-k clusters abertos por similaridade, resolvidos numa única query pgvector.
+
+        Serviço, janela de agregação e limiar semântico ficam no WHERE; a ordenação
+        por `CosineDistance` usa o índice HNSW de `centroide`. O filtro geográfico
+        (mais caro) fica a cargo do chamador, só para estes sobreviventes.
+        """
+        from pgvector.django import CosineDistance
+
+        if not vetor:
+            return []
+
+        qs = ClusterExecucao.objects.filter(
+            status__in=CLUSTER_STATUS_ABERTOS
+        ).exclude(centroide__isnull=True)
+
+        if self.janela_agregacao_dias > 0:
+            cutoff = timezone.now() - timedelta(days=self.janela_agregacao_dias)
+            qs = qs.filter(atualizado_em__gte=cutoff)
+
+        if self.requer_mesmo_servico:
+            if not demanda.sinapse_servico_id:
+                return []
+            # Mesmo critério de _servico_id_do_cluster: serviço do cluster ou do 1º membro.
+            servico_primeiro_membro = Subquery(
+                Demanda.objects.filter(cluster_id=OuterRef("pk"))
+                .exclude(sinapse_servico_id__isnull=True)
+                .order_by("pk")
+                .values("sinapse_servico_id")[:1]
+            )
+            qs = qs.annotate(
+                servico_efetivo=Coalesce("sinapse_servico_id", servico_primeiro_membro)
+            ).filter(servico_efetivo=int(demanda.sinapse_servico_id))
+
+        qs = (
+            qs.annotate(distancia=CosineDistance("centroide", vetor))
+            .filter(distancia__lte=1.0 - self.semantic_threshold)
+            .order_by("distancia", "pk")
+        )
+        return list(qs[: self.ann_top_k])
+
+    def _buscar_cluster_compativel_varredura(
+        self, demanda: Demanda, vetor: list[float]
+    ) -> ClusterExecucao | None:
+        """Varredura Python legada (referência para `benchmark_cluster_matching`)."""
         candidatos = ClusterExecucao.objects.filter(
             status__in=CLUSTER_STATUS_ABERTOS
         ).exclude(centroide__isnull=True)
@@ -1209,7 +1584,15 @@ class ClusterService:
             .exclude(latitude__isnull=True)
             .exclude(longitude__isnull=True)
         )
+        return self._geo_compativel_membros(demanda, cluster.bairro_referencia, list(dems_geo))
 
+    def _geo_compativel_membros(
+        self,
+        demanda: Demanda,
+        bairro_referencia: str | None,
+        dems_geo: list[Demanda],
+    ) -> bool:
+        """Regra geográfica de `_geo_compativel` sobre os membros georreferenciados já lidos."""
         lat = demanda.latitude
         lon = demanda.longitude
         if lat is not None and lon is not None:
@@ -1227,11 +1610,11 @@ class ClusterService:
                 )
                 if dist <= self.radius_m:
                     return True
-            if dems_geo.exists():
+            if dems_geo:
                 return False
-            return self._mesmo_bairro(demanda.bairro, cluster.bairro_referencia)
+            return self._mesmo_bairro(demanda.bairro, bairro_referencia)
 
-        return self._mesmo_bairro(demanda.bairro, cluster.bairro_referencia) or not dems_geo.exists()
+        return self._mesmo_bairro(demanda.bairro, bairro_referencia) or not dems_geo
 
     def _demandas_geo_compatíveis(self, a: Demanda, b: Demanda) -> bool:
         servico_id = a.sinapse_servico_id or b.sinapse_servico_id
@@ -1309,24 +1692,152 @@ class ClusterService:
             centroide=vetor,
         )
 
-    def _recalcular_centroide(self, cluster: ClusterExecucao) -> None:
-        vetores: list[list[float]] = []
+    def _centroide_real(self, cluster: ClusterExecucao) -> tuple[np.ndarray | None, int]:
+        """Soma (float64) e quantidade dos embeddings atuais dos membros — O(membros × dim)."""
+        soma: np.ndarray | None = None
+        membros = 0
         for emb in (
             Demanda.objects.filter(cluster=cluster)
             .exclude(embedding__isnull=True)
             .values_list("embedding", flat=True)
+            .iterator(chunk_size=200)
         ):
-            lista = _embedding_list(emb)
-            if lista:
-                vetores.append(lista)
+            arr = vetor_float32(emb)
+            if arr is None:
+                continue
+            if soma is None:
+                soma = np.zeros(arr.size, dtype=np.float64)
+            if arr.size != soma.size:
+                continue
+            soma += arr
+            membros += 1
+        return soma, membros
+
+    def _recalcular_centroide(
+        self, cluster: ClusterExecucao, *, tocar_atualizado: bool = True
+    ) -> None:
+        """
+        Recalcula soma, contagem e centróide do zero (corrige drift do incremental).
+
+        `tocar_atualizado=False` no recálculo periódico: `atualizado_em` define a
+        janela de agregação e não deve andar sem mudança de membros.
+        """
+        soma, membros = self._centroide_real(cluster)
+        campos: dict[str, Any] = {"centroide_soma": None, "centroide_membros": 0}
+        if soma is not None and membros:
+            campos = {
+                "centroide_soma": _soma_para_bytes(soma),
+                "centroide_membros": membros,
+                "centroide": (soma / membros).astype(np.float32).tolist(),
+            }
+        self._gravar_centroide(cluster, campos, tocar_atualizado=tocar_atualizado)
+
+    @staticmethod
+    def _gravar_centroide(
+        cluster: ClusterExecucao, campos: dict[str, Any], *, tocar_atualizado: bool
+    ) -> None:
+        if tocar_atualizado:
+            campos = {**campos, "atualizado_em": timezone.now()}
+        ClusterExecucao.objects.filter(pk=cluster.pk).update(**campos)
+        for nome, valor in campos.items():
+            setattr(cluster, nome, valor)
+
+    def _centroide_vincular(self, cluster: ClusterExecucao, vetor: Any) -> None:
+        self._centroide_incremental(cluster, vetor, +1)
+
+    def _centroide_desvincular(self, cluster: ClusterExecucao, vetor: Any) -> None:
+        self._centroide_incremental(cluster, vetor, -1)
+
+    def _centroide_incremental(self, cluster: ClusterExecucao, vetor: Any, sinal: int) -> None:
+        """
+        Aplica um vínculo (+1) ou desvínculo (-1) à soma corrente em O(dim).
 
-        if not vetores:
+        Chamar depois de gravar `demanda.cluster`: se a soma ainda não existe
+        (cluster legado) ou não bate com o vetor, cai no recálculo completo, que
+        já enxerga o vínculo novo.
+        """
+        arr = vetor_float32(vetor)
+        if arr is None:
             return
+        with transaction.atomic():
+            atual = (
+                ClusterExecucao.objects.select_for_update()
+                .only("pk", "centroide_soma", "centroide_membros")
+                .get(pk=cluster.pk)
+            )
+            soma = _soma_de_bytes(atual.centroide_soma)
+            membros = int(atual.centroide_membros or 0) + sinal
+            if soma is None or soma.size != arr.size or membros < 0:
+                self._recalcular_centroide(cluster)
+                return
+
+            soma += sinal * arr.astype(np.float64)
+            campos: dict[str, Any] = {
+                "centroide_soma": _soma_para_bytes(soma),
+                "centroide_membros": membros,
+            }
+            if membros:
+                # Sem membros com embedding o centróide anterior é mantido (como no legado).
+                campos["centroide"] = (soma / membros).astype(np.float32).tolist()
+            self._gravar_centroide(cluster, campos, tocar_atualizado=True)
 
-        cluster.centroide = _media_embeddings(vetores)
-        cluster.save(update_fields=["centroide", "atualizado_em"])
+    def verificar_centroides(
+        self,
+        *,
+        tolerancia: float = 1e-4,
+        corrigir: bool = False,
+        apenas_abertos: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Compara o centróide gravado com a média real dos membros.
 
-    def _reavaliar_cluster_apos_desvinculo(self, cluster: ClusterExecucao) -> None:
+        Retorna os clusters cuja distância de cosseno passa de `tolerancia` ou
+        cuja contagem incremental diverge; com `corrigir` recalcula cada um.
+        """
+        qs = ClusterExecucao.objects.order_by("pk")
+        if apenas_abertos:
+            qs = qs.filter(status__in=CLUSTER_STATUS_ABERTOS)
+        divergentes: list[dict[str, Any]] = []
+        for cluster in qs.iterator(chunk_size=100):
+            soma, membros = self._centroide_real(cluster)
+            if soma is None or not membros:
+                continue
+            real = (soma / membros).astype(np.float32)
+            gravado = vetor_float32(cluster.centroide)
+            if gravado is None or gravado.size != real.size:
+                distancia = 1.0
+            else:
+                distancia = 1.0 - float(cosine_similarity_lote(real, [gravado])[0])
+            contagem_ok = int(cluster.centroide_membros or 0) == membros
+            if distancia <= tolerancia and contagem_ok:
+                continue
+            divergentes.append(
+                {
+                    "cluster_id": int(cluster.pk),
+                    "distancia_cosseno": round(distancia, 6),
+                    "membros": membros,
+                    "membros_registrados": int(cluster.centroide_membros or 0),
+                    "corrigido": corrigir,
+                }
+            )
+            if corrigir:
+                self._recalcular_centroide(cluster, tocar_atualizado=False)
+        return divergentes
+
+    def recalcular_centroides(self, *, apenas_abertos: bool = True) -> int:
+        """Recálculo completo periódico (task `sgdl.recalcular_centroides_clusters`)."""
+        qs = ClusterExecucao.objects.order_by("pk")
+        if apenas_abertos:
+            qs = qs.filter(status__in=CLUSTER_STATUS_ABERTOS)
+        total = 0
+        for cluster in qs.iterator(chunk_size=100):
+            self._recalcular_centroide(cluster, tocar_atualizado=False)
+            total += 1
+        return total
+
+    def _reavaliar_cluster_apos_desvinculo(
+        self, cluster: ClusterExecucao, *, vetor_removido: Any = None
+    ) -> None:
         restantes = Demanda.objects.filter(cluster=cluster).count()
         if restantes == 0:
             cluster.delete()
@@ -1336,7 +1847,10 @@ class ClusterService:
             Demanda.objects.filter(cluster=cluster).update(cluster=None)
             cluster.delete()
             return
-        self._recalcular_centroide(cluster)
+        if vetor_removido is None:
+            self._recalcular_centroide(cluster)
+        else:
+            self._centroide_desvincular(cluster, vetor_removido)
 
     def _dissolver_cluster_insuficiente(self, cluster_id: int) -> None:
         try:
@@ -1363,10 +1877,7 @@ class ClusterService:
     ) -> Demanda | None:
         melhor: Demanda | None = None
         melhor_score = -1.0
-        for outra in self._iter_soltas_par_formacao(demanda):
-            if not self._demandas_geo_compatíveis(demanda, outra):
-                continue
-            score = cosine_similarity(vetor, _embedding_list(outra.embedding))
+        for outra, score in self._soltas_geo_compatíveis_com_score(demanda, vetor):
             if score >= self.semantic_threshold and score > melhor_score:
                 melhor_score = score
                 melhor = outra
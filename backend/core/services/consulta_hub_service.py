@@ -5,6 +5,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
 from django.utils import timezone
 
 from core.filters import DemandaFilter
@@ -13,6 +16,25 @@ from core.services.demanda_visibilidade import aplicar_escopo_demanda
 from core.services.oficio_service import OficioService
 
 
+CONTADORES_VERSAO_KEY = "sgdl:hub:contadores:versao"
+
+
+def invalidar_contadores_hub() -> None:
+    """Descarta todos os contadores em cache (nova versão de chave)."""
+    try:
+        cache.incr(CONTADORES_VERSAO_KEY)
+    except ValueError:
+        cache.set(CONTADORES_VERSAO_KEY, 1, None)
+
+
+def _versao_contadores() -> int:
+    versao = cache.get(CONTADORES_VERSAO_KEY)
+    if versao is None:
+        cache.add(CONTADORES_VERSAO_KEY, 1, None)
+        versao = cache.get(CONTADORES_VERSAO_KEY) or 1
+    return int(versao)
+
+
 @dataclass(frozen=True)
 class AtalhoConsulta:
     id: str
@@ -47,7 +69,9 @@ class ConsultaHubService:
             qs = ClusterService().filtrar_listagem_apenas_lideres(qs)
         return qs
 
-    def _count(self, user, params: dict[str, str]) -> int:
+    def _qs_atalho(self, user, params: dict[str, str]):
+        """Queryset (não avaliado) do atalho — mesmo caminho da listagem. None se inválido."""
+
         class _Req:
             pass
 
@@ -64,16 +88,53 @@ class ConsultaHubService:
             )
         filt = DemandaFilter(data=params, queryset=qs, request=req)
         if not filt.is_valid():
-            return 0
-        return filt.qs.count()
+            return None
+        return filt.qs
 
-    def _atrasadas_count(self, user, extra: dict[str, str] | None = None) -> int:
-        params = {"consulta": "atrasadas", **(extra or {})}
-        return self._count(user, params)
+    def _count(self, user, params: dict[str, str]) -> int:
+        qs = self._qs_atalho(user, params)
+        return 0 if qs is None else qs.count()
+
+    @staticmethod
+    def _escopo_cache(user) -> str:
+        """Protocolo enxerga a mesma fila para todos; demais perfis dependem do usuário."""
+        if getattr(user, "perfil", None) == "PROTOCOLO":
+            return "todos"
+        return f"u{user.pk}"
+
+    def _contagens(self, user, grupo: str, atalhos: dict[str, dict[str, str]]) -> dict[str, int]:
+        """
+        Contagens de vários atalhos num único SELECT (COUNT ... FILTER por atalho).
+
+        Cacheado por (perfil, escopo) durante `CONSULTA_HUB_CONTADORES_TTL`; sinais de
+        Demanda/Tramitacao/NoOperacional trocam a versão da chave.
+        """
+        ttl = int(getattr(settings, "CONSULTA_HUB_CONTADORES_TTL", 60))
+        perfil = getattr(user, "perfil", None) or "-"
+        chave = (
+            f"sgdl:hub:contadores:{_versao_contadores()}:{perfil}:"
+            f"{self._escopo_cache(user)}:{grupo}"
+        )
+        if ttl > 0:
+            em_cache = cache.get(chave)
+            if em_cache is not None:
+                return em_cache
+
+        agregados = {}
+        for nome, params in atalhos.items():
+            qs = self._qs_atalho(user, params)
+            if qs is not None:
+                agregados[nome] = Count("pk", filter=Q(pk__in=qs.values("pk")))
+        resultado = {nome: 0 for nome in atalhos}
+        if agregados:
+            base = aplicar_escopo_demanda(Demanda.objects.all(), user)
+            for nome, total in base.aggregate(**agregados).items():
+                resultado[nome] = int(total or 0)
+        if ttl > 0:
+            cache.set(chave, resultado, ttl)
+        return resultado
 
     def resumo_painel_protocolo(self, user) -> dict[str, int]:
-        from django.db.models import Count, Q
-
         from core.services.demanda_sla_service import contar_demandas_atrasadas
 
         qs = self._base_qs(user)
@@ -208,6 +269,23 @@ class ConsultaHubService:
 
     def _atalhos_camara(self, user) -> list[dict[str, Any]]:
         uid = str(user.pk)
+        contagem = self._contagens(
+            user,
+            "camara",
+            {
+                "rascunhos": {"autor": uid, "status": "RASCUNHO", "tipo_legislativo": "INDICACAO"},
+                "aguardando": {
+                    "autor": uid,
+                    "status": "AGUARDANDO_PROTOCOLO",
+                    "tipo_legislativo": "INDICACAO",
+                },
+                "tramitacao": {
+                    "autor": uid,
+                    "tipo_legislativo": "INDICACAO",
+                    "status__in": "PROTOCOLADO,EM_EXECUCAO,AGUARDANDO_TRANSFERENCIA",
+                },
+            },
+        )
         return [
             AtalhoConsulta(
                 "rascunhos",
@@ -215,7 +293,7 @@ class ConsultaHubService:
                 "Indicações ainda não protocoladas",
                 "/demandas",
                 {"status": "RASCUNHO"},
-                self._count(user, {"autor": uid, "status": "RASCUNHO", "tipo_legislativo": "INDICACAO"}),
+                contagem["rascunhos"],
                 "pi pi-file-edit",
             ).as_dict(),
             AtalhoConsulta(
@@ -224,7 +302,7 @@ class ConsultaHubService:
                 "Enviadas à fila do Protocolo Executivo",
                 "/demandas",
                 {"status": "AGUARDANDO_PROTOCOLO"},
-                self._count(user, {"autor": uid, "status": "AGUARDANDO_PROTOCOLO", "tipo_legislativo": "INDICACAO"}),
+                contagem["aguardando"],
                 "pi pi-send",
             ).as_dict(),
             AtalhoConsulta(
@@ -233,14 +311,7 @@ class ConsultaHubService:
                 "Indicações protocoladas em execução",
                 "/demandas",
                 {"status__in": "PROTOCOLADO,EM_EXECUCAO,AGUARDANDO_TRANSFERENCIA"},
-                self._count(
-                    user,
-                    {
-                        "autor": uid,
-                        "tipo_legislativo": "INDICACAO",
-                        "status__in": "PROTOCOLADO,EM_EXECUCAO,AGUARDANDO_TRANSFERENCIA",
-                    },
-                ),
+                contagem["tramitacao"],
                 "pi pi-sync",
             ).as_dict(),
             AtalhoConsulta(
@@ -256,6 +327,15 @@ class ConsultaHubService:
 
     def _atalhos_vereador(self, user) -> list[dict[str, Any]]:
         uid = str(user.pk)
+        contagem = self._contagens(
+            user,
+            "vereador",
+            {
+                "rascunhos": {"autor": uid, "status": "RASCUNHO"},
+                "aguardando": {"autor": uid, "status": "AGUARDANDO_PROTOCOLO"},
+                "indicacoes": {"autor": uid, "tipo_legislativo": "INDICACAO"},
+            },
+        )
         return [
             AtalhoConsulta(
                 "rascunhos",
@@ -263,7 +343,7 @@ class ConsultaHubService:
                 "Ofícios ainda não enviados ao Protocolo",
                 "/demandas",
                 {"status": "RASCUNHO"},
-                self._count(user, {"autor": uid, "status": "RASCUNHO"}),
+                contagem["rascunhos"],
                 "pi pi-file-edit",
             ).as_dict(),
             AtalhoConsulta(
@@ -272,7 +352,7 @@ class ConsultaHubService:
                 "Enviados e na fila do Protocolo",
                 "/demandas",
                 {"status": "AGUARDANDO_PROTOCOLO"},
-                self._count(user, {"autor": uid, "status": "AGUARDANDO_PROTOCOLO"}),
+                contagem["aguardando"],
                 "pi pi-send",
             ).as_dict(),
             AtalhoConsulta(
@@ -290,13 +370,7 @@ class ConsultaHubService:
                 "Indicações da Câmara em que você está vinculado",
                 "/demandas",
                 {"tipo_legislativo": "INDICACAO"},
-                self._count(
-                    user,
-                    {
-                        "autor": uid,
-                        "tipo_legislativo": "INDICACAO",
-                    },
-                ),
+                contagem["indicacoes"],
                 "pi pi-bookmark",
             ).as_dict(),
         ]
@@ -310,6 +384,11 @@ class ConsultaHubService:
         except Exception:
             pass
 
+        contagem = self._contagens(
+            user,
+            "protocolo",
+            {fila: {"fila": fila} for fila in ("protocolados", "operacionais", "devolutivas")},
+        )
         return [
             AtalhoConsulta(
                 "protocolados",
@@ -317,7 +396,7 @@ class ConsultaHubService:
                 "Ofícios aguardando despacho",
                 "/demandas",
                 {"fila": "protocolados"},
-                self._count(user, {"fila": "protocolados"}),
+                contagem["protocolados"],
                 "pi pi-inbox",
             ).as_dict(),
             AtalhoConsulta(
@@ -326,7 +405,7 @@ class ConsultaHubService:
                 "Demandas em execução nas secretarias",
                 "/demandas",
                 {"fila": "operacionais"},
-                self._count(user, {"fila": "operacionais"}),
+                contagem["operacionais"],
                 "pi pi-cog",
             ).as_dict(),
             AtalhoConsulta(
@@ -335,7 +414,7 @@ class ConsultaHubService:
                 "Aguardando resposta ou retorno ao vereador",
                 "/demandas",
                 {"fila": "devolutivas"},
-                self._count(user, {"fila": "devolutivas"}),
+                contagem["devolutivas"],
                 "pi pi-reply",
             ).as_dict(),
             AtalhoConsulta(
@@ -354,6 +433,14 @@ class ConsultaHubService:
         if getattr(user, "sinapse_orgao_id", None):
             extra["secretaria_destino"] = str(user.sinapse_orgao_id)
         filtro_setor = {**extra, "fila": "operacionais", "minha_unidade": "1"}
+        contagem = self._contagens(
+            user,
+            "secretaria",
+            {
+                "minha_unidade": filtro_setor,
+                "atrasadas": {**filtro_setor, "consulta": "atrasadas"},
+            },
+        )
         return [
             AtalhoConsulta(
                 "minha_unidade",
@@ -361,7 +448,7 @@ class ConsultaHubService:
                 "Demandas operacionais do seu setor",
                 "/demandas",
                 {"fila": "operacionais", "minha_unidade": "1"},
-                self._count(user, filtro_setor),
+                contagem["minha_unidade"],
                 "pi pi-sitemap",
             ).as_dict(),
             AtalhoConsulta(
@@ -379,7 +466,7 @@ class ConsultaHubService:
                 "SLA estourado no seu setor",
                 "/demandas",
                 {"fila": "operacionais", "minha_unidade": "1", "consulta": "atrasadas"},
-                self._atrasadas_count(user, filtro_setor),
+                contagem["atrasadas"],
                 "pi pi-clock",
             ).as_dict(),
             AtalhoConsulta(
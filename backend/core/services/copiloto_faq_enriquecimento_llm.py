@@ -22,6 +22,7 @@ from core.services.copiloto_faq_service import (
     carregar_catalogo_faq,
     listar_categorias_para_prompt,
 )
+from core.services.http_externo import UPSTREAM_GROQ, cliente_http
 
 logger = logging.getLogger(__name__)
 
@@ -218,11 +219,12 @@ saneamento SABESP; demandas estaduais (DETRAN, DER, Polícia) e federais não s
         }
         for tentativa in range(2):
             try:
-                response = requests.post(
+                response = cliente_http(UPSTREAM_GROQ).post(
                     self.base_url,
                     headers=headers,
                     json=payload,
                     timeout=self.timeout,
+                    operacao="faq_enriquecimento",
                 )
             except requests.Timeout:
                 logger.error("Timeout (%ss) Groq FAQ enriquecimento.", self.timeout)
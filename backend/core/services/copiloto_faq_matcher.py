@@ -0,0 +1,151 @@
+"""Detecção de FAQ em uma passada: pré-filtro por literais + regex por prioridade.
+
+Cada regex cadastrada é analisada (`re._parser`) para extrair um conjunto de
+fragmentos literais dos quais pelo menos um precisa aparecer no texto para que
+ela possa casar — ex.: `\\bconta\\s+de\\s+luz\\b` exige "conta"; `(?:furto|roubo)`
+exige "furto" ou "roubo". Todos os fragmentos do catálogo viram uma única
+alternância (`(?=(...))`), percorrida uma vez sobre o texto em casefold; só as
+regras cujos fragmentos apareceram rodam o `search` completo, na ordem de
+prioridade (`ordem` da FAQ e do padrão). Regras sem fragmento útil (ex.: só
+classes de caracteres) são sempre testadas. Resultado idêntico ao laço que testa
+todas as regex em ordem.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Generic, Iterable, TypeVar
+
+try:  # Python 3.11+
+    from re import _constants as sre_c
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_constants as sre_c  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
+T = TypeVar("T")
+
+# Fragmentos menores que isso filtram pouco: a regra fica sem pré-filtro.
+TAMANHO_MINIMO_LITERAL = 3
+
+_REPETICOES = (sre_c.MAX_REPEAT, sre_c.MIN_REPEAT, getattr(sre_c, "POSSESSIVE_REPEAT", None))
+
+
+def _melhor(candidatos: list[frozenset[str]]) -> frozenset[str] | None:
+    """Entre requisitos alternativos (todos obrigatórios), o mais seletivo."""
+    if not candidatos:
+        return None
+    return max(candidatos, key=lambda c: (min(len(x) for x in c), -len(c)))
+
+
+def _requisito_sequencia(itens: Any) -> frozenset[str] | None:
+    candidatos: list[frozenset[str]] = []
+    run: list[str] = []
+
+    def fechar() -> None:
+        if run:
+            candidatos.append(frozenset({"".join(run).casefold()}))
+            run.clear()
+
+    for op, av in itens:
+        if op is sre_c.LITERAL:
+            run.append(chr(av))
+            continue
+        fechar()
+        if op is sre_c.SUBPATTERN:
+            req = _requisito_sequencia(av[-1])
+        elif op is sre_c.BRANCH:
+            req = _requisito_ramos(av[1])
+        elif op in _REPETICOES and op is not None:
+            minimo, _maximo, conteudo = av
+            req = _requisito_sequencia(conteudo) if minimo >= 1 else None
+        elif op is getattr(sre_c, "ATOMIC_GROUP", None):
+            req = _requisito_sequencia(av)
+        else:
+            # Classes, âncoras, lookarounds, backrefs: nada obrigatório a extrair.
+            req = None
+        if req:
+            candidatos.append(req)
+    fechar()
+    return _melhor(candidatos)
+
+
+def _requisito_ramos(ramos: Any) -> frozenset[str] | None:
+    uniao: set[str] = set()
+    for ramo in ramos:
+        req = _requisito_sequencia(ramo)
+        if not req:
+            return None
+        uniao.update(req)
+    return frozenset(uniao)
+
+
+def literais_obrigatorios(padrao: re.Pattern[str]) -> frozenset[str] | None:
+    """
+    Fragmentos (em casefold) dos quais ao menos um ocorre em todo texto que casa
+    com `padrao`. `None` quando não há fragmento útil — a regra é sempre testada.
+    """
+    try:
+        arvore = sre_parse.parse(padrao.pattern, padrao.flags)
+    except Exception:  # noqa: BLE001 - parser interno: na dúvida, sem pré-filtro
+        return None
+    req = _requisito_sequencia(arvore)
+    if not req or min(len(x) for x in req) < TAMANHO_MINIMO_LITERAL:
+        return None
+    return req
+
+
+@dataclass(frozen=True)
+class RegraFaq(Generic[T]):
+    padrao: re.Pattern[str]
+    alvo: T
+    literais: frozenset[str] | None
+
+
+@dataclass
+class MatcherPrioritario(Generic[T]):
+    """Regras em ordem de prioridade; `candidatos` devolve as que podem casar, na ordem."""
+
+    regras: tuple[RegraFaq[T], ...]
+    _prefiltro: re.Pattern[str] | None = field(init=False, repr=False)
+    _prefixos: dict[str, tuple[str, ...]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        literais = sorted(
+            {lit for regra in self.regras for lit in (regra.literais or ())},
+            key=lambda x: (-len(x), x),
+        )
+        # Na mesma posição o lookahead só reporta a alternativa mais longa; os
+        # literais que são prefixo dela estão presentes também.
+        self._prefixos = {
+            lit: tuple(p for p in literais if lit.startswith(p)) for lit in literais
+        }
+        self._prefiltro = (
+            re.compile("(?=(" + "|".join(re.escape(x) for x in literais) + "))")
+            if literais
+            else None
+        )
+
+    @classmethod
+    def construir(cls, regras: Iterable[tuple[re.Pattern[str], T]]) -> "MatcherPrioritario[T]":
+        return cls(
+            tuple(RegraFaq(padrao, alvo, literais_obrigatorios(padrao)) for padrao, alvo in regras)
+        )
+
+    def _presentes(self, texto: str) -> set[str]:
+        if self._prefiltro is None:
+            return set()
+        presentes: set[str] = set()
+        for m in self._prefiltro.finditer(texto.casefold()):
+            presentes.update(self._prefixos[m.group(1)])
+        return presentes
+
+    def candidatos(self, texto: str) -> Iterable[RegraFaq[T]]:
+        """Regras que casam com `texto`, em ordem de prioridade (avaliação preguiçosa)."""
+        presentes = self._presentes(texto)
+        for regra in self.regras:
+            if regra.literais is not None and presentes.isdisjoint(regra.literais):
+                continue
+            if regra.padrao.search(texto):
+                yield regra
@@ -1,14 +1,20 @@
 """
 Carrega a FAQ do Copiloto a partir do banco e expõe API interna para automação LLM.
+
+O catálogo, as categorias e o matcher compilado (`copiloto_faq_matcher`) ficam em
+memória no processo; `invalidar_cache_faq` publica nova versão no cache
+compartilhado e os demais workers descartam os seus na próxima consulta.
 """
 
 from __future__ import annotations
 
 import logging
 import re
+import uuid
 from dataclasses import dataclass
 from typing import Any
 
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
@@ -16,11 +22,17 @@ from django.utils import timezone
 from django.utils.text import slugify
 
 from core.models_copiloto_faq import CopilotoFaqOrientacao, CopilotoFaqPadraoRegex
+from core.services.copiloto_faq_matcher import MatcherPrioritario
 
 logger = logging.getLogger(__name__)
 
+FAQ_VERSAO_KEY = "sgdl:copiloto_faq:versao"
+
 _CACHE: list[FaqOrientacaoRegistro] | None = None
 _CATEGORIAS_CACHE: frozenset[str] | None = None
+# Matcher por município ("" = catálogo completo): regras da FAQ + fallback, em prioridade.
+_MATCHERS: dict[str, MatcherPrioritario[FaqOrientacaoRegistro | str]] = {}
+_VERSAO_LOCAL: str | None = None
 
 
 @dataclass(frozen=True)
@@ -38,10 +50,45 @@ class FaqOrientacaoRegistro:
     patterns: tuple[re.Pattern[str], ...]
 
 
-def invalidar_cache_faq() -> None:
+def _limpar_cache_local() -> None:
     global _CACHE, _CATEGORIAS_CACHE
     _CACHE = None
     _CATEGORIAS_CACHE = None
+    _MATCHERS.clear()
+
+
+def _nova_versao() -> str:
+    """Token aleatório: uma chave despejada do cache nunca volta com um valor já visto."""
+    return uuid.uuid4().hex
+
+
+def _versao_faq() -> str:
+    try:
+        versao = cache.get(FAQ_VERSAO_KEY)
+        if versao is None:
+            cache.add(FAQ_VERSAO_KEY, _nova_versao(), None)
+            versao = cache.get(FAQ_VERSAO_KEY) or ""
+        return str(versao)
+    except Exception:  # noqa: BLE001 - cache fora: vale o cache local
+        return ""
+
+
+def _sincronizar_versao() -> None:
+    """Descarta o cache local se outro processo publicou nova versão da FAQ."""
+    global _VERSAO_LOCAL
+    versao = _versao_faq()
+    if versao != _VERSAO_LOCAL:
+        _limpar_cache_local()
+        _VERSAO_LOCAL = versao
+
+
+def invalidar_cache_faq() -> None:
+    """Descarta o cache deste processo e avisa os demais workers (nova versão no cache)."""
+    _limpar_cache_local()
+    try:
+        cache.set(FAQ_VERSAO_KEY, _nova_versao(), None)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Não foi possível publicar nova versão da FAQ: %s", exc)
 
 
 def _compilar_padroes(faq: CopilotoFaqOrientacao) -> tuple[re.Pattern[str], ...]:
@@ -69,6 +116,7 @@ def carregar_catalogo_faq(*, municipio: str | None = None) -> list[FaqOrientacao
     Opcionalmente filtra por municipio_referencia (case-insensitive contains).
     """
     global _CACHE
+    _sincronizar_versao()
     if _CACHE is not None and municipio is None:
         return _CACHE
 
@@ -106,6 +154,7 @@ def carregar_catalogo_faq(*, municipio: str | None = None) -> list[FaqOrientacao
 
 def categorias_orientacao_ativas() -> frozenset[str]:
     global _CATEGORIAS_CACHE
+    _sincronizar_versao()
     if _CATEGORIAS_CACHE is not None:
         return _CATEGORIAS_CACHE
     cats = frozenset(
@@ -239,29 +288,32 @@ def _faq_por_categoria_com_alias(
     return None
 
 
-def _detectar_faq_fallback_por_texto(
-    texto: str, *, municipio: str | None = None
-) -> FaqOrientacaoRegistro | None:
-    t = (texto or "").strip()
-    if not t:
-        return None
-    for pat, cat in _FALLBACK_FAQ_CATEGORIA_RE:
-        if pat.search(t):
-            faq = _faq_por_categoria_com_alias(cat, municipio=municipio)
-            if faq:
-                return faq
-    return None
+def _matcher_faq(municipio: str | None = None) -> MatcherPrioritario[FaqOrientacaoRegistro | str]:
+    """Regras na ordem do laço original: padrões de cada FAQ (por `ordem`), depois o fallback."""
+    _sincronizar_versao()
+    chave = (municipio or "").strip().casefold()
+    matcher = _MATCHERS.get(chave)
+    if matcher is None:
+        regras: list[tuple[re.Pattern[str], FaqOrientacaoRegistro | str]] = [
+            (pat, faq) for faq in carregar_catalogo_faq(municipio=municipio) for pat in faq.patterns
+        ]
+        regras.extend(_FALLBACK_FAQ_CATEGORIA_RE)
+        matcher = MatcherPrioritario.construir(regras)
+        _MATCHERS[chave] = matcher
+    return matcher
 
 
 def detectar_faq_por_texto(texto: str, *, municipio: str | None = None) -> FaqOrientacaoRegistro | None:
     t = (texto or "").strip()
     if not t:
         return None
-    for faq in carregar_catalogo_faq(municipio=municipio):
-        for pat in faq.patterns:
-            if pat.search(t):
-                return faq
-    return _detectar_faq_fallback_por_texto(t, municipio=municipio)
+    for regra in _matcher_faq(municipio).candidatos(t):
+        if isinstance(regra.alvo, FaqOrientacaoRegistro):
+            return regra.alvo
+        faq = _faq_por_categoria_com_alias(regra.alvo, municipio=municipio)
+        if faq:
+            return faq
+    return None
 
 
 def faq_por_categoria(
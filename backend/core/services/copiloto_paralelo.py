@@ -0,0 +1,73 @@
+"""Consultas independentes de um turno do copiloto em paralelo (asyncio).
+
+A triagem em lote (`TriagemOtimizadaService.buscar_servicos_em_lote`) resolve a
+busca vetorial de todos os itens numa passada; o que sobra por consulta — a
+carta Sinapse direta e o fallback quando a base otimizada devolve pouco — é I/O
+puro e independente. `mapear_em_paralelo` roda essas chamadas com
+`asyncio.gather` + `asyncio.to_thread`, limitado a
+`COPILOTO_ENRIQUECIMENTO_MAX_PARALELO`, e devolve os resultados na ordem de
+entrada.
+
+Cai para o laço sequencial quando:
+
+- `COPILOTO_ENRIQUECIMENTO_PARALELO` está desligado ou há um só item;
+- a conexão está dentro de `transaction.atomic` (outras threads não enxergariam
+  os dados ainda não commitados — inclusive nos `TestCase`);
+- já existe event loop rodando nesta thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable, Iterable, TypeVar
+
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _max_paralelo() -> int:
+    return max(1, int(getattr(settings, "COPILOTO_ENRIQUECIMENTO_MAX_PARALELO", 4)))
+
+
+def paralelismo_disponivel() -> bool:
+    if not getattr(settings, "COPILOTO_ENRIQUECIMENTO_PARALELO", True) or _max_paralelo() < 2:
+        return False
+    if connection.in_atomic_block:
+        return False
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return True
+    return False
+
+
+def _executar_na_thread(funcao: Callable[[T], R], item: T) -> R:
+    try:
+        return funcao(item)
+    finally:
+        # As threads do executor morrem com o `asyncio.run`: não deixar conexão aberta.
+        connections.close_all()
+
+
+async def _gather(funcao: Callable[[T], R], itens: list[T]) -> list[R]:
+    vagas = asyncio.Semaphore(_max_paralelo())
+
+    async def _um(item: T) -> R:
+        async with vagas:
+            return await asyncio.to_thread(_executar_na_thread, funcao, item)
+
+    return list(await asyncio.gather(*(_um(item) for item in itens)))
+
+
+def mapear_em_paralelo(funcao: Callable[[T], R], itens: Iterable[T]) -> list[R]:
+    """`[funcao(i) for i in itens]`, com as chamadas concorrentes quando possível."""
+    itens = list(itens)
+    if len(itens) < 2 or not paralelismo_disponivel():
+        return [funcao(item) for item in itens]
+    return asyncio.run(_gather(funcao, itens))
@@ -0,0 +1,115 @@
+"""Leitura incremental da resposta da Groq para o endpoint de chat em streaming.
+
+O copiloto pede `response_format=json_object`; o texto que o cidadão vê está no
+campo `resposta_agente` desse JSON. `ExtratorCampoJson` acompanha o JSON parcial
+que chega pelo stream e devolve só os trechos novos desse campo (escapes já
+decodificados), para a UI mostrar a resposta enquanto ela é gerada. O conteúdo
+completo continua sendo parseado ao final, como na chamada sem stream.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Iterable
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class ExtratorCampoJson:
+    """Extrai, pedaço a pedaço, o valor string de um campo de nível superior."""
+
+    def __init__(self, campo: str = "resposta_agente") -> None:
+        self._inicio_re = re.compile(r'"%s"\s*:\s*"' % re.escape(campo))
+        self._buffer = ""
+        self._pos: int | None = None
+        self.concluido = False
+
+    def alimentar(self, pedaco: str) -> str:
+        """Acrescenta `pedaco` ao JSON parcial; retorna o texto novo do campo."""
+        if self.concluido or not pedaco:
+            return ""
+        self._buffer += pedaco
+        if self._pos is None:
+            m = self._inicio_re.search(self._buffer)
+            if not m:
+                return ""
+            self._pos = m.end()
+
+        saida: list[str] = []
+        buf, i = self._buffer, self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.concluido = True
+                i += 1
+                break
+            if ch != "\\":
+                saida.append(ch)
+                i += 1
+                continue
+            # Escape incompleto no fim do pedaço: espera o próximo.
+            if i + 1 >= len(buf):
+                break
+            marcador = buf[i + 1]
+            if marcador == "u":
+                if i + 6 > len(buf):
+                    break
+                try:
+                    saida.append(chr(int(buf[i + 2 : i + 6], 16)))
+                except ValueError:
+                    pass
+                i += 6
+                continue
+            saida.append(_ESCAPES.get(marcador, marcador))
+            i += 2
+        self._pos = i
+        return "".join(saida)
+
+
+def ler_stream_groq(
+    linhas: Iterable[str | bytes],
+    ao_fragmento: Callable[[str], None],
+    *,
+    campo: str = "resposta_agente",
+) -> tuple[str, int]:
+    """
+    Consome as linhas SSE (`data: {...}`) de um chat completion com `stream=true`.
+
+    Repassa a `ao_fragmento` os trechos de `campo` à medida que chegam e retorna
+    `(conteúdo completo, total_tokens)` — tokens vêm de `x_groq.usage` no último
+    chunk, quando presente.
+    """
+    extrator = ExtratorCampoJson(campo)
+    partes: list[str] = []
+    tokens = 0
+    for linha in linhas:
+        if isinstance(linha, bytes):
+            linha = linha.decode("utf-8", errors="replace")
+        linha = (linha or "").strip()
+        if not linha.startswith("data:"):
+            continue
+        dado = linha[5:].strip()
+        if dado == "[DONE]":
+            break
+        try:
+            chunk: Any = json.loads(dado)
+        except ValueError:
+            continue
+        if not isinstance(chunk, dict):
+            continue
+        usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+        if isinstance(usage, dict) and usage.get("total_tokens"):
+            tokens = int(usage["total_tokens"])
+        choices = chunk.get("choices")
+        if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+            continue
+        delta = choices[0].get("delta")
+        texto = delta.get("content") if isinstance(delta, dict) else None
+        if not isinstance(texto, str) or not texto:
+            continue
+        partes.append(texto)
+        novo = extrator.alimentar(texto)
+        if novo:
+            ao_fragmento(novo)
+    return "".join(partes), tokens
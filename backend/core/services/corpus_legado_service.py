@@ -6,8 +6,12 @@ import csv
 import hashlib
 import json
 import logging
+import math
 import re
+import threading
 import unicodedata
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -33,6 +37,33 @@ _EIXOS_TEMATICOS: tuple[tuple[str, str], ...] = (
     ("terreno_zeladoria", r"terreno|muro|limpeza do terreno"),
 )
 
+_EIXOS_TEMATICOS_RE: dict[str, re.Pattern[str]] = {
+    eixo_id: re.compile(pat) for eixo_id, pat in _EIXOS_TEMATICOS
+}
+
+# Padrões explícitos antes do match genérico (evita «manutenção de estrada» → tapa buraco).
+_PRIORIDADE_EIXOS_RE: tuple[tuple[str, re.Pattern[str]], ...] = tuple(
+    (eixo_id, re.compile(pat))
+    for eixo_id, pat in (
+        (
+            "vias_buracos_nivelamento",
+            r"manuten[cç][aã]o de estrada|manuten[cç][aã]o estrada|nivelamento|cascalh",
+        ),
+        ("iluminacao", r"ilumina"),
+        ("sinalizacao", r"sinaliza|lombad|semáforo|semaforo"),
+        ("vias_buracos", r"tapa|burac"),
+        ("limpeza_rocada", r"limpeza|roçag|rocag|varri"),
+        ("poda_arvore", r"poda|árvore|arvore|galho"),
+        ("seguranca", r"gcm|ronda"),
+    )
+)
+
+_TOKEN_RE = re.compile(r"[a-záàâãéêíóôõúç]{4,}")
+
+# BM25 (Okapi) sobre as trends: saturação de frequência e normalização por tamanho.
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
 _ROTULO_EIXO = {
     "vias_buracos_nivelamento": "Manutenção de estrada",
     "vias_buracos": "Vias e buracos",
@@ -146,6 +177,12 @@ def corpus_legado_json_path() -> Path:
     return (_repo_root() / p).resolve()
 
 
+def corpus_legado_indice_path(json_path: Path | None = None) -> Path:
+    """Índice invertido das trends, gravado ao lado do JSON do relatório."""
+    base = json_path or corpus_legado_json_path()
+    return base.with_name(f"{base.stem}.indice.json")
+
+
 def corpus_legado_depara_path() -> Path:
     rel = getattr(
         settings,
@@ -211,7 +248,7 @@ def carregar_linhas_csv(path: Path | None = None) -> list[dict[str, str]]:
 
 def analisar_corpus(linhas: list[dict[str, str]], *, checksum: str = "") -> dict[str, Any]:
     """Agrega estatísticas e top trends a partir das linhas normalizadas."""
-    from collections import Counter, defaultdict
+    from collections import defaultdict
 
     n = len(linhas)
     tipos = Counter()
@@ -235,8 +272,8 @@ def analisar_corpus(linhas: list[dict[str, str]], *, checksum: str = "") -> dict
             bairros[b] += 1
 
         blob = f"{row['assunto']} {row['detalhamento']}".lower()
-        for eixo_id, pat in _EIXOS_TEMATICOS:
-            if re.search(pat, blob):
+        for eixo_id, pat in _EIXOS_TEMATICOS_RE.items():
+            if pat.search(blob):
                 eixos[eixo_id] += 1
 
         chave = (serv, setor)
@@ -316,6 +353,107 @@ def _atalho_curto(servico: str) -> str:
     return mapa.get(servico, servico)
 
 
+def _tokens(texto: str) -> list[str]:
+    return _TOKEN_RE.findall((texto or "").lower())
+
+
+def _texto_trend(trend: dict[str, Any]) -> str:
+    return " ".join(
+        [
+            trend.get("titulo") or "",
+            trend.get("servico_legado") or "",
+            trend.get("atalho_sugerido") or "",
+            " ".join(trend.get("exemplos_assunto") or []),
+        ]
+    )
+
+
+@dataclass(frozen=True)
+class IndiceTrends:
+    """Postings token → (posição da trend em `top_trends`, tf), com IDF BM25 pré-calculado."""
+
+    checksum_csv: str
+    postings: dict[str, tuple[tuple[int, int], ...]]
+    idf: dict[str, float]
+    comprimentos: tuple[int, ...]
+    vocabulario_por_trend: tuple[int, ...]
+
+    @classmethod
+    def construir(cls, relatorio: dict[str, Any]) -> "IndiceTrends":
+        postings: dict[str, list[tuple[int, int]]] = {}
+        comprimentos: list[int] = []
+        vocabulario: list[int] = []
+        for pos, trend in enumerate(relatorio.get("top_trends") or []):
+            contagem = Counter(_tokens(_texto_trend(trend)))
+            comprimentos.append(sum(contagem.values()))
+            vocabulario.append(len(contagem))
+            for token, tf in contagem.items():
+                postings.setdefault(token, []).append((pos, tf))
+        n = len(comprimentos)
+        return cls(
+            checksum_csv=str(relatorio.get("checksum_csv") or ""),
+            postings={t: tuple(p) for t, p in postings.items()},
+            idf={
+                t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in postings.items()
+            },
+            comprimentos=tuple(comprimentos),
+            vocabulario_por_trend=tuple(vocabulario),
+        )
+
+    @classmethod
+    def de_dict(cls, dados: dict[str, Any]) -> "IndiceTrends":
+        return cls(
+            checksum_csv=str(dados.get("checksum_csv") or ""),
+            postings={
+                t: tuple((int(pos), int(tf)) for pos, tf in p)
+                for t, p in (dados.get("postings") or {}).items()
+            },
+            idf={t: float(v) for t, v in (dados.get("idf") or {}).items()},
+            comprimentos=tuple(int(x) for x in dados.get("comprimentos") or ()),
+            vocabulario_por_trend=tuple(int(x) for x in dados.get("vocabulario_por_trend") or ()),
+        )
+
+    def para_dict(self) -> dict[str, Any]:
+        return {
+            "versao": 1,
+            "checksum_csv": self.checksum_csv,
+            "bm25": {"k1": _BM25_K1, "b": _BM25_B},
+            "comprimentos": list(self.comprimentos),
+            "vocabulario_por_trend": list(self.vocabulario_por_trend),
+            "idf": self.idf,
+            "postings": {t: [list(x) for x in p] for t, p in self.postings.items()},
+        }
+
+    def buscar(self, tokens: set[str]) -> list[tuple[int, float, int]]:
+        """(posição da trend, score BM25 normalizado em [0, 1], tokens em comum)."""
+        if not self.comprimentos:
+            return []
+        media = sum(self.comprimentos) / len(self.comprimentos) or 1.0
+        acumulado: dict[int, float] = {}
+        em_comum: dict[int, int] = {}
+        teto = 0.0
+        for token in tokens:
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            teto += idf * (_BM25_K1 + 1)
+            for pos, tf in self.postings[token]:
+                norma = _BM25_K1 * (1 - _BM25_B + _BM25_B * self.comprimentos[pos] / media)
+                acumulado[pos] = acumulado.get(pos, 0.0) + idf * tf * (_BM25_K1 + 1) / (tf + norma)
+                em_comum[pos] = em_comum.get(pos, 0) + 1
+        if teto <= 0:
+            return []
+        return [(pos, score / teto, em_comum[pos]) for pos, score in acumulado.items()]
+
+
+def gravar_indice_corpus(relatorio: dict[str, Any], json_path: Path) -> IndiceTrends:
+    indice = IndiceTrends.construir(relatorio)
+    corpus_legado_indice_path(json_path).write_text(
+        json.dumps(indice.para_dict(), ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    return indice
+
+
 def gerar_relatorio_corpus(
     *,
     csv_path: Path | None = None,
@@ -328,6 +466,7 @@ def gerar_relatorio_corpus(
     relatorio = analisar_corpus(linhas, checksum=checksum)
     json_p.parent.mkdir(parents=True, exist_ok=True)
     json_p.write_text(json.dumps(relatorio, ensure_ascii=False, indent=2), encoding="utf-8")
+    gravar_indice_corpus(relatorio, json_p)
     logger.info(
         "Corpus legado gerado: %s registros → %s",
         relatorio["total_registros"],
@@ -336,11 +475,68 @@ def gerar_relatorio_corpus(
     return relatorio
 
 
+@dataclass(frozen=True)
+class _CorpusCarregado:
+    assinatura: tuple[int, int]
+    relatorio: dict[str, Any]
+    indice: IndiceTrends
+
+
+_corpus_lock = threading.Lock()
+_corpus_por_caminho: dict[Path, _CorpusCarregado] = {}
+
+
+def _ler_indice(relatorio: dict[str, Any], json_path: Path) -> IndiceTrends:
+    """Índice gravado pelo `analisar_corpus_legado`; refeito em memória se o CSV mudou."""
+    path = corpus_legado_indice_path(json_path)
+    checksum = str(relatorio.get("checksum_csv") or "")
+    try:
+        indice = IndiceTrends.de_dict(json.loads(path.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        indice = None
+    except (OSError, ValueError, TypeError):
+        logger.warning("Índice do corpus legado ilegível: %s", path, exc_info=True)
+        indice = None
+    if indice is not None and indice.checksum_csv == checksum:
+        return indice
+    logger.info(
+        "Índice do corpus legado ausente ou de outro CSV (%s); reconstruindo em memória. "
+        "Rode `analisar_corpus_legado` para gravá-lo.",
+        path,
+    )
+    return IndiceTrends.construir(relatorio)
+
+
+def _corpus_carregado(path: Path, *, force_reload: bool = False) -> _CorpusCarregado | None:
+    """Relatório + índice do processo; relidos só quando o JSON muda (mtime/tamanho)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    assinatura = (st.st_mtime_ns, st.st_size)
+    carregado = _corpus_por_caminho.get(path)
+    if carregado is not None and carregado.assinatura == assinatura and not force_reload:
+        return carregado
+    with _corpus_lock:
+        carregado = _corpus_por_caminho.get(path)
+        if carregado is not None and carregado.assinatura == assinatura and not force_reload:
+            return carregado
+        try:
+            relatorio = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            logger.exception("Falha ao ler corpus legado: %s", path)
+            return None
+        carregado = _CorpusCarregado(assinatura, relatorio, _ler_indice(relatorio, path))
+        _corpus_por_caminho[path] = carregado
+        return carregado
+
+
 class CorpusLegadoService:
     """Leitura do JSON gerado — camada opcional, sem efeito colateral no fluxo principal."""
 
     def __init__(self) -> None:
         self._cache: dict[str, Any] | None = None
+        self._indice: IndiceTrends | None = None
         self._depara_cache: dict[str, Any] | None = None
         self._depara_index: dict[str, dict[str, Any]] | None = None
 
@@ -351,14 +547,11 @@ class CorpusLegadoService:
             return None
         if self._cache is not None and not force_reload:
             return self._cache
-        path = corpus_legado_json_path()
-        if not path.is_file():
-            return None
-        try:
-            self._cache = json.loads(path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            logger.exception("Falha ao ler corpus legado: %s", path)
+        carregado = _corpus_carregado(corpus_legado_json_path(), force_reload=force_reload)
+        if carregado is None:
             return None
+        self._cache = carregado.relatorio
+        self._indice = carregado.indice
         return self._cache
 
     def top_trends(self, *, limite: int = 20) -> list[dict[str, Any]]:
@@ -376,37 +569,27 @@ class CorpusLegadoService:
     def sugerir_por_texto(self, texto: str, *, limite: int = 3) -> list[dict[str, Any]]:
         """
         Sugestão assistiva por sobreposição lexical — não altera triagem Sinapse.
-        Retorna trends do histórico com score simples.
+        Retorna trends do histórico ranqueadas por BM25 no índice invertido
+        (`score_sugestao` normalizado em [0, 1]); exige ao menos 2 tokens em comum.
         """
         rel = self.relatorio()
-        if not rel or not (texto or "").strip():
+        if not rel or self._indice is None or not (texto or "").strip():
             return []
 
-        tokens = set(re.findall(r"[a-záàâãéêíóôõúç]{4,}", (texto or "").lower()))
+        tokens = set(_tokens(texto))
         if len(tokens) < 2:
             return []
 
-        candidatos: list[tuple[float, dict[str, Any]]] = []
-        for trend in rel.get("top_trends") or []:
-            blob = " ".join(
-                [
-                    trend.get("titulo") or "",
-                    trend.get("servico_legado") or "",
-                    trend.get("atalho_sugerido") or "",
-                    " ".join(trend.get("exemplos_assunto") or []),
-                ]
-            ).lower()
-            tb = set(re.findall(r"[a-záàâãéêíóôõúç]{4,}", blob))
-            if not tb:
-                continue
-            inter = tokens & tb
-            if len(inter) < 2:
-                continue
-            score = len(inter) / max(len(tokens), len(tb), 1)
-            candidatos.append((score, {**trend, "score_sugestao": round(score, 3)}))
-
-        candidatos.sort(key=lambda x: x[0], reverse=True)
-        return [t for _, t in candidatos[:limite]]
+        trends = rel.get("top_trends") or []
+        candidatos = [
+            (score, pos)
+            for pos, score, em_comum in self._indice.buscar(tokens)
+            if em_comum >= 2 and pos < len(trends)
+        ]
+        candidatos.sort(key=lambda x: (-x[0], x[1]))
+        return [
+            {**trends[pos], "score_sugestao": round(score, 3)} for score, pos in candidatos[:limite]
+        ]
 
     def depara_legado_sinapse(self, *, force_reload: bool = False) -> dict[str, Any] | None:
         from core.services.copiloto_config import corpus_legado_habilitado
@@ -656,34 +839,19 @@ class CorpusLegadoService:
         blob = (texto or "").lower()
         if len(blob) < 6:
             return None
-        # Padrões explícitos antes do match genérico (evita «manutenção de estrada» → tapa buraco).
-        prioridade: tuple[tuple[str, str], ...] = (
-            (
-                "vias_buracos_nivelamento",
-                r"manuten[cç][aã]o de estrada|manuten[cç][aã]o estrada|nivelamento|cascalh",
-            ),
-            ("iluminacao", r"ilumina"),
-            ("sinalizacao", r"sinaliza|lombad|semáforo|semaforo"),
-            ("vias_buracos", r"tapa|burac"),
-            ("limpeza_rocada", r"limpeza|roçag|rocag|varri"),
-            ("poda_arvore", r"poda|árvore|arvore|galho"),
-            ("seguranca", r"gcm|ronda"),
-        )
-        for eixo_id, pat in prioridade:
-            if re.search(pat, blob):
+        for eixo_id, pat in _PRIORIDADE_EIXOS_RE:
+            if pat.search(blob):
                 meta = self.meta_pedido_frequente(eixo_id)
                 if meta:
                     return meta
         melhor: tuple[int, dict[str, Any]] | None = None
         for meta in _PEDIDOS_FREQUENTES_META:
-            eixo_id = meta.get("eixo_id") or ""
-            pat = next((p for eid, p in _EIXOS_TEMATICOS if eid == eixo_id), None)
-            if not pat:
+            pat = _EIXOS_TEMATICOS_RE.get(meta.get("eixo_id") or "")
+            if pat is None:
                 continue
-            if re.search(pat, blob):
-                peso = len(re.findall(pat, blob))
-                if melhor is None or peso > melhor[0]:
-                    melhor = (peso, meta)
+            peso = len(pat.findall(blob))
+            if peso and (melhor is None or peso > melhor[0]):
+                melhor = (peso, meta)
         return melhor[1] if melhor else None
 
     def hints_carta_por_texto(self, texto: str, *, limite: int = 5) -> list[dict[str, Any]]:
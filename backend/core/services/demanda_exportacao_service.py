@@ -0,0 +1,95 @@
+"""Exportação em streaming da listagem de demandas (NDJSON ou CSV).
+
+O queryset é percorrido com `.iterator()` em blocos de `TAMANHO_BLOCO`; cada
+bloco passa pelo `DemandaPainelListSerializer(many=True)`, que já pré-carrega
+em lote o que a listagem precisa (Super OS, localização operacional). A memória
+fica limitada a um bloco, independentemente do tamanho da exportação.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+TAMANHO_BLOCO = 200
+
+FORMATOS_EXPORTACAO = ("ndjson", "csv")
+
+CSV_HEADERS = [
+    "id",
+    "protocolo_legislativo",
+    "protocolo_executivo",
+    "titulo",
+    "tipo_legislativo",
+    "status",
+    "autor",
+    "servico",
+    "secretaria",
+    "setor",
+    "super_os",
+    "data_criacao",
+    "data_entrada_etapa",
+    "data_finalizacao",
+]
+
+
+def iterar_blocos(queryset, tamanho: int = TAMANHO_BLOCO) -> Iterator[list]:
+    iterador = queryset.iterator(chunk_size=tamanho)
+    while bloco := list(islice(iterador, tamanho)):
+        yield bloco
+
+
+def iterar_itens_serializados(queryset, context: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    from core.serializers import DemandaPainelListSerializer
+
+    for bloco in iterar_blocos(queryset):
+        yield from DemandaPainelListSerializer(bloco, many=True, context=context).data
+
+
+def _linha_csv(item: dict[str, Any]) -> list[Any]:
+    autor = item.get("autor") or {}
+    servico = item.get("servico") or {}
+    secretaria = item.get("secretaria_destino") or {}
+    unidade = item.get("unidade_administrativa") or {}
+    super_os = item.get("super_os") or {}
+    return [
+        item.get("id"),
+        item.get("protocolo_legislativo") or "",
+        item.get("protocolo_executivo") or "",
+        item.get("titulo") or "",
+        item.get("tipo_legislativo") or "",
+        item.get("status_display") or item.get("status") or "",
+        " ".join(filter(None, (autor.get("first_name"), autor.get("last_name"))))
+        or autor.get("username")
+        or "",
+        servico.get("nome") or "",
+        secretaria.get("nome") or "",
+        unidade.get("sigla") or unidade.get("nome") or "",
+        super_os.get("protocolo_super_os") or "",
+        item.get("data_criacao") or "",
+        item.get("data_entrada_etapa") or "",
+        item.get("data_finalizacao") or "",
+    ]
+
+
+def linhas_exportacao(
+    itens: Iterable[dict[str, Any]], formato: str
+) -> Iterator[str]:
+    """Linhas de texto prontas para `StreamingHttpResponse`."""
+    if formato == "csv":
+
+        class Echo:
+            def write(self, value):
+                return value
+
+        writer = csv.writer(Echo())
+        yield writer.writerow(CSV_HEADERS)
+        for item in itens:
+            yield writer.writerow(_linha_csv(item))
+        return
+    for item in itens:
+        yield json.dumps(item, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
@@ -50,17 +50,23 @@ def _item_localizacao(
     return item
 
 
-def demanda_em_fluxo_direto_sem_scatter(demanda: Demanda) -> bool:
-    """Demanda titular do órgão em fluxo direto, sem nós/pernas scatter ativos."""
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
+def _fluxo_direto_pelos_campos(demanda: Demanda) -> bool:
+    """Parte de `demanda_em_fluxo_direto_sem_scatter` que só lê a própria demanda."""
     from core.models_operacional import FluxoRoteamento
-    from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
 
     if demanda.status not in _STATUS_OPERACIONAIS:
         return False
     fluxo = demanda.fluxo_roteamento or ""
     nos = int(demanda.nos_ativos or 0)
-    if fluxo == FluxoRoteamento.FLUXO_TRANSVERSAL or nos > 0:
+    return fluxo != FluxoRoteamento.FLUXO_TRANSVERSAL and nos <= 0
+
+
+def demanda_em_fluxo_direto_sem_scatter(demanda: Demanda) -> bool:
+    """Demanda titular do órgão em fluxo direto, sem nós/pernas scatter ativos."""
+    from core.models_no_operacional import NoOperacional, StatusNoOperacional
+    from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
+
+    if not _fluxo_direto_pelos_campos(demanda):
         return False
     if PernaOperacional.objects.filter(
         demanda_id=demanda.pk,
@@ -189,7 +195,8 @@ def map_localizacao_operacional_aberta(demanda_ids: list[int]) -> dict[int, list
         for demanda in Demanda.objects.filter(pk__in=faltantes).select_related(
             "unidade_administrativa"
         ):
-            if not demanda_em_fluxo_direto_sem_scatter(demanda):
+            # Sem nó aberto nem perna ativa (consultas acima): basta olhar os campos.
+            if not _fluxo_direto_pelos_campos(demanda):
                 continue
             resultado[int(demanda.pk)].append(
                 _item_localizacao(
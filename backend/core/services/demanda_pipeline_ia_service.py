@@ -0,0 +1,264 @@
+"""Pipeline de IA pós-save da Demanda (embedding, triagem, cluster e fluxo automático).
+
+Agendado por `core.signals` após o commit. Com `CELERY_ENABLED` cada demanda vira
+uma task `sgdl.pipeline_ia_demanda` na fila `sgdl_default` — concorrência limitada
+pelo worker, sobrevive a restart do gunicorn e refaz com backoff enquanto o Kernel
+estiver fora. Sem Celery (dev/testes ou broker indisponível) roda de forma síncrona.
+
+Deduplicação: uma chave por demanda no cache (`cache.add`) impede enfileirar a
+mesma pk de novo enquanto a task anterior não terminou.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import Demanda
+
+logger = logging.getLogger(__name__)
+
+# Score minimo de cosseno (Carta de Servicos Sinapse) para preencher
+# `ia_categoria` quando o LLM Groq nao tiver dado um valor — modo assistivo
+# conforme regra `evolucao-sinapse-mova`: sugestao com validacao humana.
+SINAPSE_AUTOFILL_THRESHOLD = 0.6
+
+PIPELINE_LOCK_PREFIX = "sgdl:pipeline_ia:demanda:"
+CLUSTER_LOCK_PREFIX = "sgdl:cluster:demanda:"
+
+
+@dataclass
+class ResultadoPipelineIA:
+    demanda_pk: int
+    executado: bool = False
+    campos_atualizados: list[str] = field(default_factory=list)
+    embedding_pendente: bool = False
+
+    def as_dict(self) -> dict:
+        return {
+            "demanda_pk": self.demanda_pk,
+            "executado": self.executado,
+            "campos_atualizados": list(self.campos_atualizados),
+            "embedding_pendente": self.embedding_pendente,
+        }
+
+
+def montar_texto_embedding_demanda(demanda: Demanda) -> str:
+    partes: list[str] = []
+    if demanda.titulo:
+        t = demanda.titulo.strip()
+        if t:
+            partes.append(t)
+    if demanda.descricao:
+        d = demanda.descricao.strip()
+        if d:
+            partes.append(d)
+    if not partes:
+        return ""
+    if len(partes) == 1:
+        return partes[0]
+    return f"{partes[0]}\n\n{partes[1]}"
+
+
+def executar_pipeline_ia(demanda_pk: int) -> ResultadoPipelineIA:
+    """Pipeline de IA pós-commit: embedding (Kernel) + triagem (Groq).
+
+    Idempotente: cada etapa só roda se o respectivo campo ainda estiver vazio.
+    `ia_processado` só vira True se *pelo menos uma* etapa preencheu algo;
+    `embedding_pendente` sinaliza ao chamador (task Celery) que vale reagendar.
+    """
+    from core.services.llm_service import LLMService
+    from core.services.triagem_service import TriagemService
+    from core.services.vector_service import VectorService
+
+    resultado = ResultadoPipelineIA(demanda_pk=int(demanda_pk))
+    try:
+        demanda = Demanda.objects.get(pk=demanda_pk)
+    except Demanda.DoesNotExist:
+        logger.warning("Demanda pk=%s não encontrada para pipeline IA.", demanda_pk)
+        return resultado
+
+    precisa_embedding = demanda.embedding is None
+    precisa_triagem = not (demanda.ia_categoria or "").strip()
+
+    if not precisa_embedding and not precisa_triagem:
+        return resultado
+
+    texto = montar_texto_embedding_demanda(demanda)
+    if not texto:
+        logger.debug("Demanda pk=%s sem texto utilizável; pulando pipeline IA.", demanda_pk)
+        return resultado
+
+    resultado.executado = True
+    update_fields: list[str] = []
+
+    if precisa_embedding:
+        vetor = VectorService().generate_embedding(texto)
+        if vetor:
+            demanda.embedding = vetor
+            update_fields.append("embedding")
+        else:
+            resultado.embedding_pendente = True
+            logger.info("Embedding indisponível agora para demanda pk=%s; retry futuro.", demanda_pk)
+
+    if precisa_triagem:
+        dados = LLMService().extrair_entidades(demanda.titulo or "", demanda.descricao or "")
+        if dados:
+            categoria = (dados.get("categoria_principal") or "").strip()
+            sentimento = (dados.get("sentimento_municipe") or "").strip()
+            if categoria:
+                demanda.ia_categoria = categoria[:100]
+                update_fields.append("ia_categoria")
+            if sentimento:
+                demanda.ia_sentimento = sentimento[:20]
+                update_fields.append("ia_sentimento")
+        else:
+            logger.info("Triagem indisponível agora para demanda pk=%s; retry futuro.", demanda_pk)
+
+    # 3. Triagem cruzada com a Carta de Servicos do Sinapse (modo assistivo).
+    #    Roda quando temos um vetor: o resultado fica no log de auditoria;
+    #    so preenche `ia_categoria` se ela ainda estiver vazia e o top
+    #    score for confiante (>= SINAPSE_AUTOFILL_THRESHOLD).
+    vetor_para_triagem = demanda.embedding if demanda.embedding is not None else None
+    if vetor_para_triagem is not None:
+        try:
+            sinapse_top = TriagemService().buscar_servico_sinapse(
+                list(vetor_para_triagem), top_k=3
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Triagem Sinapse falhou para demanda pk=%s: %s", demanda_pk, exc
+            )
+            sinapse_top = []
+
+        if sinapse_top:
+            logger.info(
+                "Triagem Sinapse demanda pk=%s top=%s",
+                demanda_pk,
+                [
+                    (item["servico_id"], item["titulo"][:40], item["score"])
+                    for item in sinapse_top
+                ],
+            )
+            top1 = sinapse_top[0]
+            categoria_sinapse = (top1.get("categoria") or "").strip()
+            if (
+                categoria_sinapse
+                and not (demanda.ia_categoria or "").strip()
+                and float(top1.get("score", 0.0)) >= SINAPSE_AUTOFILL_THRESHOLD
+            ):
+                demanda.ia_categoria = categoria_sinapse[:100]
+                if "ia_categoria" not in update_fields:
+                    update_fields.append("ia_categoria")
+
+    if not update_fields:
+        return resultado
+
+    demanda.ia_processado = True
+    update_fields.append("ia_processado")
+    demanda.save(update_fields=update_fields)
+    resultado.campos_atualizados = update_fields
+
+    demanda.refresh_from_db(fields=["status", "sinapse_servico_id", "embedding"])
+    if demanda.embedding is not None and demanda.status not in (
+        "RASCUNHO",
+        "CANCELADO",
+    ):
+        clusterizar_demanda(int(demanda.pk))
+        try:
+            from core.services.fluxo_protocolo_service import FluxoProtocoloService
+
+            if demanda.sinapse_servico_id and demanda.status == "AGUARDANDO_PROTOCOLO":
+                FluxoProtocoloService().processar_cohorte_servico(
+                    int(demanda.sinapse_servico_id)
+                )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Fluxo automático pós-IA falhou demanda pk=%s: %s", demanda_pk, exc
+            )
+    return resultado
+
+
+def clusterizar_demanda(demanda_pk: int) -> None:
+    from core.services.cluster_service import ClusterService
+
+    try:
+        ClusterService().atribuir_demanda_pk(int(demanda_pk))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Clusterização falhou para demanda pk=%s: %s", demanda_pk, exc)
+
+
+def _lock_ttl() -> int:
+    return int(getattr(settings, "DEMANDA_PIPELINE_IA_LOCK_TTL", 900))
+
+
+def liberar_pipeline_ia(demanda_pk: int) -> None:
+    cache.delete(f"{PIPELINE_LOCK_PREFIX}{int(demanda_pk)}")
+
+
+def renovar_pipeline_ia(demanda_pk: int, espera: int) -> None:
+    """Estende o lock pela espera do próximo retry, para um save não abrir outra cadeia."""
+    cache.set(f"{PIPELINE_LOCK_PREFIX}{int(demanda_pk)}", 1, timeout=int(espera) + _lock_ttl())
+
+
+def liberar_clusterizacao(demanda_pk: int) -> None:
+    cache.delete(f"{CLUSTER_LOCK_PREFIX}{int(demanda_pk)}")
+
+
+def _enfileirar(task, demanda_pk: int) -> bool:
+    """True se a task foi publicada no broker; False → chamador roda síncrono."""
+    if not getattr(settings, "CELERY_ENABLED", False):
+        return False
+    try:
+        task.delay(int(demanda_pk))
+    except Exception as exc:  # noqa: BLE001 - broker fora do ar
+        logger.warning(
+            "Broker Celery indisponível (%s); executando %s pk=%s de forma síncrona.",
+            exc,
+            task.name,
+            demanda_pk,
+        )
+        return False
+    return True
+
+
+def agendar_pipeline_ia(demanda_pk: int) -> bool:
+    """
+    Agenda o pipeline IA da demanda (chamar em `transaction.on_commit`).
+
+    Retorna False quando já existe execução pendente para a mesma pk.
+    """
+    from core.tasks import pipeline_ia_demanda_task
+
+    pk = int(demanda_pk)
+    if not cache.add(f"{PIPELINE_LOCK_PREFIX}{pk}", 1, timeout=_lock_ttl()):
+        logger.debug("Pipeline IA da demanda pk=%s já agendado; ignorando.", pk)
+        return False
+    if _enfileirar(pipeline_ia_demanda_task, pk):
+        return True
+    try:
+        executar_pipeline_ia(pk)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Pipeline IA síncrono falhou demanda pk=%s: %s", pk, exc)
+    finally:
+        liberar_pipeline_ia(pk)
+    return True
+
+
+def agendar_clusterizacao(demanda_pk: int) -> bool:
+    """Agenda clusterização isolada (mudança de status com embedding já presente)."""
+    from core.tasks import clusterizar_demanda_task
+
+    pk = int(demanda_pk)
+    if not cache.add(f"{CLUSTER_LOCK_PREFIX}{pk}", 1, timeout=_lock_ttl()):
+        return False
+    if _enfileirar(clusterizar_demanda_task, pk):
+        return True
+    try:
+        clusterizar_demanda(pk)
+    finally:
+        liberar_clusterizacao(pk)
+    return True
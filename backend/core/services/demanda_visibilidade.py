@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from django.db.models import Q, QuerySet
+from django.db.models import Exists, OuterRef, Q, QuerySet
 
 from core.models import Demanda
 from core.services.gestor_escopo import (
@@ -14,59 +14,149 @@ from core.services.gestor_escopo import (
 )
 
 
-def demanda_ids_pendencia_operacional(orgao_id: int) -> list[int]:
-    """
-    Demandas em que o órgão ainda tem trabalho operacional pendente.
+STATUS_FILA_FLUXO_DIRETO = ("PROTOCOLADO", "EM_EXECUCAO", "AGUARDANDO_TRANSFERENCIA")
 
-    Scatter/transversal: só enquanto houver perna ou nó aberto do órgão.
-    Fluxo direto: enquanto a demanda titular do órgão estiver na fila operacional.
-    """
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
-    from core.models_operacional import FluxoRoteamento
+# Filas operacionais como expressões Q sobre Demanda (EXISTS/NOT EXISTS correlacionados).
+# Compõem em `qs.filter(...)` sem materializar listas de ids em Python; as funções
+# `demanda_ids_*` abaixo só avaliam a mesma expressão numa única query.
+
+
+def _existe_perna_ativa(**filtros) -> Exists:
     from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
-    from core.services.devolutiva_alerta_service import demanda_ids_alerta_devolutiva
+
+    return Exists(
+        PernaOperacional.objects.filter(
+            demanda_id=OuterRef("pk"),
+            status__in=StatusPernaOperacional.ATIVOS,
+            **filtros,
+        )
+    )
+
+
+def _existe_no(**filtros) -> Exists:
+    from core.models_no_operacional import NoOperacional
+
+    return Exists(NoOperacional.objects.filter(demanda_id=OuterRef("pk"), **filtros))
+
+
+def _escopo_no(orgao_id: int, uas: list[int] | None = None) -> dict:
+    escopo: dict = {"sinapse_orgao_id": int(orgao_id)}
+    if uas:
+        escopo["unidade_administrativa_id__in"] = [int(u) for u in uas]
+    return escopo
+
+
+def _q_scatter_encerrado(orgao_id: int, uas: list[int] | None = None) -> Q:
+    """Órgão (ou seus setores `uas`) teve nós scatter e nenhum segue aberto."""
+    from core.models_no_operacional import StatusNoOperacional
+
+    escopo = _escopo_no(orgao_id, uas)
+    return Q(_existe_no(**escopo)) & ~Q(_existe_no(status=StatusNoOperacional.ABERTO, **escopo))
+
+
+def _q_fluxo_direto_pendente(orgao_id: int, uas: list[int] | None = None) -> Q:
+    """Titular do órgão na fila operacional sem perna/nó (fluxo direto)."""
+    from core.models_no_operacional import StatusNoOperacional
+    from core.models_operacional import FluxoRoteamento
+
+    q = Q(
+        sinapse_orgao_id=int(orgao_id),
+        status__in=STATUS_FILA_FLUXO_DIRETO,
+        nos_ativos=0,
+    ) & ~Q(fluxo_roteamento=FluxoRoteamento.FLUXO_TRANSVERSAL)
+    if not uas:
+        return q & ~Q(_existe_perna_ativa())
+    uas_norm = [int(u) for u in uas]
+    return (
+        q
+        & Q(unidade_administrativa_id__in=uas_norm)
+        & ~Q(_existe_perna_ativa(unidade_administrativa_id__in=uas_norm))
+        & ~Q(
+            _existe_no(
+                status=StatusNoOperacional.ABERTO,
+                unidade_administrativa_id__in=uas_norm,
+            )
+        )
+    )
+
+
+def filtro_pendencia_operacional(orgao_id: int) -> Q:
+    """Q de `demanda_ids_pendencia_operacional` (órgão inteiro)."""
+    from core.models_no_operacional import StatusNoOperacional
+    from core.services.devolutiva_alerta_service import filtro_alerta_devolutiva
 
     oid = int(orgao_id)
-    ids: set[int] = set()
-
-    for perna in PernaOperacional.objects.filter(
-        sinapse_orgao_id=oid,
-        status__in=StatusPernaOperacional.ATIVOS,
-    ).only("demanda_id", "pk"):
-        did = int(perna.demanda_id)
-        if _scatter_orgao_encerrado(did, oid):
-            continue
-        ids.add(did)
-
-    ids.update(
-        NoOperacional.objects.filter(
-            sinapse_orgao_id=oid,
-            status=StatusNoOperacional.ABERTO,
-        ).values_list("demanda_id", flat=True)
+    return (
+        (Q(_existe_perna_ativa(sinapse_orgao_id=oid)) & ~_q_scatter_encerrado(oid))
+        | Q(_existe_no(sinapse_orgao_id=oid, status=StatusNoOperacional.ABERTO))
+        | _q_fluxo_direto_pendente(oid)
+        | filtro_alerta_devolutiva(oid)
     )
 
-    candidatas = Demanda.objects.filter(
-        sinapse_orgao_id=oid,
-        status__in=("PROTOCOLADO", "EM_EXECUCAO", "AGUARDANDO_TRANSFERENCIA"),
-    ).values("pk", "fluxo_roteamento", "nos_ativos")
-
-    for row in candidatas:
-        pk = int(row["pk"])
-        if pk in ids:
-            continue
-        fluxo = row.get("fluxo_roteamento") or ""
-        nos = int(row.get("nos_ativos") or 0)
-        if fluxo == FluxoRoteamento.FLUXO_TRANSVERSAL or nos > 0:
-            continue
-        if PernaOperacional.objects.filter(
-            demanda_id=pk,
-            status__in=StatusPernaOperacional.ATIVOS,
-        ).exists():
-            continue
-        ids.add(pk)
 
-    ids.update(demanda_ids_alerta_devolutiva(oid))
-    return list(ids)
+def filtro_pendencia_orgao_uas(orgao_id: int, uas: list[int]) -> Q:
+    """Pendência operacional de um órgão restrita aos setores `uas`."""
+    from core.models_no_operacional import StatusNoOperacional
+    from core.services.devolutiva_alerta_service import filtro_alerta_devolutiva
+
+    oid = int(orgao_id)
+    uas_norm = [int(u) for u in uas]
+    return (
+        (
+            Q(_existe_perna_ativa(sinapse_orgao_id=oid, unidade_administrativa_id__in=uas_norm))
+            & ~_q_scatter_encerrado(oid, uas_norm)
+        )
+        | Q(_existe_no(status=StatusNoOperacional.ABERTO, **_escopo_no(oid, uas_norm)))
+        | _q_fluxo_direto_pendente(oid, uas_norm)
+        | filtro_alerta_devolutiva(oid)
+    )
+
+
+def filtro_em_operacao_orgao_uas(orgao_id: int, uas: list[int]) -> Q:
+    """Execução aberta nos setores `uas` (nó/perna do setor ou fluxo direto)."""
+    from core.models_no_operacional import StatusNoOperacional
+
+    oid = int(orgao_id)
+    uas_norm = [int(u) for u in uas]
+    aberto_no_setor = Q(
+        _existe_no(status=StatusNoOperacional.ABERTO, unidade_administrativa_id__in=uas_norm)
+    ) | Q(_existe_perna_ativa(unidade_administrativa_id__in=uas_norm))
+    return (aberto_no_setor & ~_q_scatter_encerrado(oid, uas_norm)) | _q_fluxo_direto_pendente(
+        oid, uas_norm
+    )
+
+
+def filtro_pendencia_setor(user) -> Q:
+    """Q da fila operacional da secretaria (setores vinculados ou órgão inteiro)."""
+    orgao_id = getattr(user, "sinapse_orgao_id", None)
+    if not orgao_id:
+        return Q(pk__in=[])
+    ids_ua = _ids_unidades_usuario(user)
+    if not ids_ua:
+        return filtro_pendencia_operacional(int(orgao_id))
+    return filtro_pendencia_orgao_uas(int(orgao_id), ids_ua)
+
+
+def filtro_em_operacao_setor(user) -> Q:
+    ids_ua = _ids_unidades_usuario(user)
+    orgao_id = getattr(user, "sinapse_orgao_id", None)
+    if not ids_ua or not orgao_id:
+        return Q(pk__in=[])
+    return filtro_em_operacao_orgao_uas(int(orgao_id), ids_ua)
+
+
+def _ids_por_filtro(filtro: Q) -> list[int]:
+    return list(Demanda.objects.filter(filtro).values_list("pk", flat=True))
+
+
+def demanda_ids_pendencia_operacional(orgao_id: int) -> list[int]:
+    """
+    Demandas em que o órgão ainda tem trabalho operacional pendente.
+
+    Scatter/transversal: só enquanto houver perna ou nó aberto do órgão.
+    Fluxo direto: enquanto a demanda titular do órgão estiver na fila operacional.
+    """
+    return _ids_por_filtro(filtro_pendencia_operacional(int(orgao_id)))
 
 
 def _ids_unidades_usuario(user) -> list[int]:
@@ -95,24 +185,6 @@ def _filtro_ua_estrito(ids_ua: list[int]):
     return Q(unidade_administrativa_id__in=ids_ua)
 
 
-def _scatter_setor_encerrado(demanda_id: int, orgao_id: int, ids_ua: list[int]) -> bool:
-    """True quando não restam nós abertos do órgão nos setores informados."""
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
-
-    if not ids_ua:
-        return _scatter_orgao_encerrado(demanda_id, orgao_id)
-
-    oid = int(orgao_id)
-    qs = NoOperacional.objects.filter(
-        demanda_id=int(demanda_id),
-        sinapse_orgao_id=oid,
-        unidade_administrativa_id__in=[int(u) for u in ids_ua],
-    )
-    if not qs.exists():
-        return False
-    return not qs.filter(status=StatusNoOperacional.ABERTO).exists()
-
-
 def _scatter_orgao_encerrado(demanda_id: int, orgao_id: int) -> bool:
     """True quando o órgão já teve nós scatter e todos foram concluídos."""
     from core.models_no_operacional import NoOperacional, StatusNoOperacional
@@ -131,26 +203,18 @@ def _scatter_orgao_encerrado(demanda_id: int, orgao_id: int) -> bool:
 
 def demanda_ids_participacao_scatter_encerrada(orgao_id: int) -> list[int]:
     """Demandas em que o órgão concluiu a participação scatter (qualquer setor)."""
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
+    from core.models_no_operacional import StatusNoOperacional
 
     oid = int(orgao_id)
-    ids: set[int] = set()
-    for did in (
-        NoOperacional.objects.filter(
-            sinapse_orgao_id=oid,
-            status=StatusNoOperacional.CONCLUIDO,
-        )
-        .values_list("demanda_id", flat=True)
-        .distinct()
-    ):
-        if _scatter_orgao_encerrado(int(did), oid):
-            ids.add(int(did))
-    return list(ids)
+    return _ids_por_filtro(
+        Q(_existe_no(sinapse_orgao_id=oid, status=StatusNoOperacional.CONCLUIDO))
+        & _q_scatter_encerrado(oid)
+    )
 
 
 def demanda_ids_participacao_scatter_encerrada_setor(user) -> list[int]:
     """Demandas em que o setor do usuário concluiu a participação scatter."""
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
+    from core.models_no_operacional import StatusNoOperacional
 
     orgao_id = getattr(user, "sinapse_orgao_id", None)
     ids_ua = _ids_unidades_usuario(user)
@@ -160,142 +224,27 @@ def demanda_ids_participacao_scatter_encerrada_setor(user) -> list[int]:
     if not ids_ua:
         return demanda_ids_participacao_scatter_encerrada(oid)
 
-    ids: set[int] = set()
     uas = [int(u) for u in ids_ua]
-    for did in (
-        NoOperacional.objects.filter(
-            sinapse_orgao_id=oid,
-            status=StatusNoOperacional.CONCLUIDO,
-            unidade_administrativa_id__in=uas,
-        )
-        .values_list("demanda_id", flat=True)
-        .distinct()
-    ):
-        if _scatter_setor_encerrado(int(did), oid, uas):
-            ids.add(int(did))
-    return list(ids)
+    return _ids_por_filtro(
+        Q(_existe_no(status=StatusNoOperacional.CONCLUIDO, **_escopo_no(oid, uas)))
+        & _q_scatter_encerrado(oid, uas)
+    )
 
 
 def demanda_ids_pendencia_setor(user) -> list[int]:
     """Pendência operacional restrita aos setores vinculados ao usuário."""
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
-    from core.models_operacional import FluxoRoteamento
-    from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
-    from core.services.devolutiva_alerta_service import demanda_ids_alerta_devolutiva
-
-    orgao_id = getattr(user, "sinapse_orgao_id", None)
-    ids_ua = _ids_unidades_usuario(user)
-    if not orgao_id:
+    if not getattr(user, "sinapse_orgao_id", None):
         return []
-    oid = int(orgao_id)
-    if not ids_ua:
-        return demanda_ids_pendencia_operacional(oid)
-
-    uas = [int(u) for u in ids_ua]
-    ua_q = _filtro_ua_estrito(uas)
-    ids: set[int] = set()
-
-    for perna in PernaOperacional.objects.filter(
-        sinapse_orgao_id=oid,
-        status__in=StatusPernaOperacional.ATIVOS,
-    ).filter(ua_q):
-        did = int(perna.demanda_id)
-        if _scatter_setor_encerrado(did, oid, uas):
-            continue
-        ids.add(did)
-
-    for did in NoOperacional.objects.filter(
-        sinapse_orgao_id=oid,
-        status=StatusNoOperacional.ABERTO,
-    ).filter(ua_q).values_list("demanda_id", flat=True):
-        if _scatter_setor_encerrado(int(did), oid, uas):
-            continue
-        ids.add(int(did))
-
-    for row in Demanda.objects.filter(
-        unidade_administrativa_id__in=uas,
-        sinapse_orgao_id=oid,
-        status__in=("PROTOCOLADO", "EM_EXECUCAO", "AGUARDANDO_TRANSFERENCIA"),
-    ).values("pk", "fluxo_roteamento", "nos_ativos"):
-        pk = int(row["pk"])
-        if pk in ids:
-            continue
-        fluxo = row.get("fluxo_roteamento") or ""
-        nos = int(row.get("nos_ativos") or 0)
-        if fluxo == FluxoRoteamento.FLUXO_TRANSVERSAL or nos > 0:
-            continue
-        if PernaOperacional.objects.filter(
-            demanda_id=pk,
-            status__in=StatusPernaOperacional.ATIVOS,
-        ).filter(ua_q).exists():
-            continue
-        if NoOperacional.objects.filter(
-            demanda_id=pk,
-            status=StatusNoOperacional.ABERTO,
-        ).filter(ua_q).exists():
-            continue
-        ids.add(pk)
-
-    ids.update(demanda_ids_alerta_devolutiva(oid))
-    return list(ids)
+    return _ids_por_filtro(filtro_pendencia_setor(user))
 
 
 def demanda_ids_em_operacao_setor(user) -> list[int]:
     """Demandas com pendência aberta nos setores vinculados ao usuário."""
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
-    from core.models_operacional import FluxoRoteamento
-    from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
-
     ids_ua = _ids_unidades_usuario(user)
     orgao_id = getattr(user, "sinapse_orgao_id", None)
     if not ids_ua or not orgao_id:
         return []
-
-    oid = int(orgao_id)
-    uas = [int(u) for u in ids_ua]
-    ua_q = _filtro_ua_estrito(uas)
-    demanda_ids: set[int] = set()
-
-    demanda_ids.update(
-        NoOperacional.objects.filter(ua_q, status=StatusNoOperacional.ABERTO).values_list(
-            "demanda_id", flat=True
-        )
-    )
-    demanda_ids.update(
-        PernaOperacional.objects.filter(
-            ua_q,
-            status__in=StatusPernaOperacional.ATIVOS,
-        ).values_list("demanda_id", flat=True)
-    )
-    for did in list(demanda_ids):
-        if _scatter_setor_encerrado(int(did), oid, uas):
-            demanda_ids.discard(int(did))
-
-    for row in Demanda.objects.filter(
-        unidade_administrativa_id__in=uas,
-        sinapse_orgao_id=oid,
-        status__in=("PROTOCOLADO", "EM_EXECUCAO", "AGUARDANDO_TRANSFERENCIA"),
-    ).values("pk", "fluxo_roteamento", "nos_ativos"):
-        pk = int(row["pk"])
-        if pk in demanda_ids:
-            continue
-        fluxo = row.get("fluxo_roteamento") or ""
-        nos = int(row.get("nos_ativos") or 0)
-        if fluxo == FluxoRoteamento.FLUXO_TRANSVERSAL or nos > 0:
-            continue
-        if PernaOperacional.objects.filter(
-            demanda_id=pk,
-            status__in=StatusPernaOperacional.ATIVOS,
-        ).filter(ua_q).exists():
-            continue
-        if NoOperacional.objects.filter(
-            demanda_id=pk,
-            status=StatusNoOperacional.ABERTO,
-        ).filter(ua_q).exists():
-            continue
-        demanda_ids.add(pk)
-
-    return list(demanda_ids)
+    return _ids_por_filtro(filtro_em_operacao_orgao_uas(int(orgao_id), ids_ua))
 
 
 def demanda_ids_encerrado_setor(user) -> list[int]:
@@ -362,10 +311,7 @@ def demanda_ids_encerrado_setor(user) -> list[int]:
 
 
 def filtrar_demandas_em_operacao_setor(qs: QuerySet[Demanda], user) -> QuerySet[Demanda]:
-    ids = demanda_ids_em_operacao_setor(user)
-    if not ids:
-        return qs.none()
-    return qs.filter(pk__in=ids)
+    return qs.filter(filtro_em_operacao_setor(user))
 
 
 def filtrar_demandas_encerrado_setor(qs: QuerySet[Demanda], user) -> QuerySet[Demanda]:
@@ -384,17 +330,9 @@ def aplicar_escopo_fila_operacional(qs: QuerySet[Demanda], user) -> QuerySet[Dem
     """Restringe fila operacional às demandas com pendência real do órgão/setor."""
     if getattr(user, "perfil", None) != "SECRETARIA":
         return qs
-    orgao_id = getattr(user, "sinapse_orgao_id", None)
-    if not orgao_id:
+    if not getattr(user, "sinapse_orgao_id", None):
         return qs.none()
-    ids_ua = _ids_unidades_usuario(user)
-    if ids_ua:
-        pendencia = demanda_ids_pendencia_setor(user)
-    else:
-        pendencia = demanda_ids_pendencia_operacional(int(orgao_id))
-    if not pendencia:
-        return qs.none()
-    return qs.filter(pk__in=pendencia)
+    return qs.filter(filtro_pendencia_setor(user))
 
 
 def _mapa_uas_gestor_por_orgao(user, orgaos: list[int]) -> dict[int, list[int]]:
@@ -415,112 +353,12 @@ def _mapa_uas_gestor_por_orgao(user, orgaos: list[int]) -> dict[int, list[int]]:
 
 def _demanda_ids_pendencia_para_orgao_uas(orgao_id: int, uas: list[int]) -> list[int]:
     """Pendência operacional de um órgão restrita a setores (UAs)."""
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
-    from core.models_operacional import FluxoRoteamento
-    from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
-    from core.services.devolutiva_alerta_service import demanda_ids_alerta_devolutiva
-
-    oid = int(orgao_id)
-    uas_norm = [int(u) for u in uas]
-    ua_q = _filtro_ua_estrito(uas_norm)
-    ids: set[int] = set()
-
-    for perna in PernaOperacional.objects.filter(
-        sinapse_orgao_id=oid,
-        status__in=StatusPernaOperacional.ATIVOS,
-    ).filter(ua_q):
-        did = int(perna.demanda_id)
-        if _scatter_setor_encerrado(did, oid, uas_norm):
-            continue
-        ids.add(did)
-
-    for did in NoOperacional.objects.filter(
-        sinapse_orgao_id=oid,
-        status=StatusNoOperacional.ABERTO,
-    ).filter(ua_q).values_list("demanda_id", flat=True):
-        if _scatter_setor_encerrado(int(did), oid, uas_norm):
-            continue
-        ids.add(int(did))
-
-    for row in Demanda.objects.filter(
-        unidade_administrativa_id__in=uas_norm,
-        sinapse_orgao_id=oid,
-        status__in=("PROTOCOLADO", "EM_EXECUCAO", "AGUARDANDO_TRANSFERENCIA"),
-    ).values("pk", "fluxo_roteamento", "nos_ativos"):
-        pk = int(row["pk"])
-        if pk in ids:
-            continue
-        fluxo = row.get("fluxo_roteamento") or ""
-        nos = int(row.get("nos_ativos") or 0)
-        if fluxo == FluxoRoteamento.FLUXO_TRANSVERSAL or nos > 0:
-            continue
-        if PernaOperacional.objects.filter(
-            demanda_id=pk,
-            status__in=StatusPernaOperacional.ATIVOS,
-        ).filter(ua_q).exists():
-            continue
-        if NoOperacional.objects.filter(
-            demanda_id=pk,
-            status=StatusNoOperacional.ABERTO,
-        ).filter(ua_q).exists():
-            continue
-        ids.add(pk)
-
-    ids.update(demanda_ids_alerta_devolutiva(oid))
-    return list(ids)
+    return _ids_por_filtro(filtro_pendencia_orgao_uas(orgao_id, uas))
 
 
 def _demanda_ids_em_operacao_para_orgao_uas(orgao_id: int, uas: list[int]) -> list[int]:
     """Demandas com execução aberta nos setores informados."""
-    from core.models_no_operacional import NoOperacional, StatusNoOperacional
-    from core.models_operacional import FluxoRoteamento
-    from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
-
-    oid = int(orgao_id)
-    uas_norm = [int(u) for u in uas]
-    ua_q = _filtro_ua_estrito(uas_norm)
-    demanda_ids: set[int] = set()
-
-    demanda_ids.update(
-        NoOperacional.objects.filter(ua_q, status=StatusNoOperacional.ABERTO).values_list(
-            "demanda_id", flat=True
-        )
-    )
-    demanda_ids.update(
-        PernaOperacional.objects.filter(
-            ua_q,
-            status__in=StatusPernaOperacional.ATIVOS,
-        ).values_list("demanda_id", flat=True)
-    )
-    for did in list(demanda_ids):
-        if _scatter_setor_encerrado(int(did), oid, uas_norm):
-            demanda_ids.discard(int(did))
-
-    for row in Demanda.objects.filter(
-        unidade_administrativa_id__in=uas_norm,
-        sinapse_orgao_id=oid,
-        status__in=("PROTOCOLADO", "EM_EXECUCAO", "AGUARDANDO_TRANSFERENCIA"),
-    ).values("pk", "fluxo_roteamento", "nos_ativos"):
-        pk = int(row["pk"])
-        if pk in demanda_ids:
-            continue
-        fluxo = row.get("fluxo_roteamento") or ""
-        nos = int(row.get("nos_ativos") or 0)
-        if fluxo == FluxoRoteamento.FLUXO_TRANSVERSAL or nos > 0:
-            continue
-        if PernaOperacional.objects.filter(
-            demanda_id=pk,
-            status__in=StatusPernaOperacional.ATIVOS,
-        ).filter(ua_q).exists():
-            continue
-        if NoOperacional.objects.filter(
-            demanda_id=pk,
-            status=StatusNoOperacional.ABERTO,
-        ).filter(ua_q).exists():
-            continue
-        demanda_ids.add(pk)
-
-    return list(demanda_ids)
+    return _ids_por_filtro(filtro_em_operacao_orgao_uas(orgao_id, uas))
 
 
 def demanda_ids_com_validacao_gestor_pendente(user) -> list[int]:
@@ -540,61 +378,63 @@ def demanda_ids_com_validacao_gestor_pendente(user) -> list[int]:
     return list(dict.fromkeys(ids))
 
 
-def demanda_ids_pendencia_gestor_setorial(user) -> list[int]:
+def filtro_pendencia_gestor_setorial(user) -> Q:
+    """Q da fila do gestor setorial: validações pendentes + pendência por órgão/setor."""
     from core.services.gestor_escopo import TIPO_SETORIAL, orgaos_escopo_gestor, tipo_gestor
 
     if getattr(user, "perfil", None) != "GESTOR" or tipo_gestor(user) != TIPO_SETORIAL:
-        return []
+        return Q(pk__in=[])
     orgaos = orgaos_escopo_gestor(user)
     if not orgaos:
-        return []
+        return Q(pk__in=[])
     ua_map = _mapa_uas_gestor_por_orgao(user, orgaos)
-    ids: set[int] = set()
-    ids.update(demanda_ids_com_validacao_gestor_pendente(user))
+    filtro = Q(pk__in=demanda_ids_com_validacao_gestor_pendente(user))
     for oid in orgaos:
         uas = ua_map.get(int(oid), [])
         if uas:
-            ids.update(_demanda_ids_pendencia_para_orgao_uas(int(oid), uas))
+            filtro |= filtro_pendencia_orgao_uas(int(oid), uas)
         else:
-            ids.update(demanda_ids_pendencia_operacional(int(oid)))
-    return list(dict.fromkeys(ids))
+            filtro |= filtro_pendencia_operacional(int(oid))
+    return filtro
 
 
-def demanda_ids_em_operacao_gestor_setorial(user) -> list[int]:
+def filtro_em_operacao_gestor_setorial(user) -> Q:
     from core.services.gestor_escopo import TIPO_SETORIAL, orgaos_escopo_gestor, tipo_gestor
 
     if getattr(user, "perfil", None) != "GESTOR" or tipo_gestor(user) != TIPO_SETORIAL:
-        return []
+        return Q(pk__in=[])
     orgaos = orgaos_escopo_gestor(user)
     if not orgaos:
-        return []
+        return Q(pk__in=[])
     ua_map = _mapa_uas_gestor_por_orgao(user, orgaos)
-    ids: set[int] = set()
+    filtro = Q(pk__in=[])
     for oid in orgaos:
         uas = ua_map.get(int(oid), [])
         if uas:
-            ids.update(_demanda_ids_em_operacao_para_orgao_uas(int(oid), uas))
+            filtro |= filtro_em_operacao_orgao_uas(int(oid), uas)
         else:
-            ids.update(demanda_ids_pendencia_operacional(int(oid)))
-    return list(ids)
+            filtro |= filtro_pendencia_operacional(int(oid))
+    return filtro
+
+
+def demanda_ids_pendencia_gestor_setorial(user) -> list[int]:
+    return _ids_por_filtro(filtro_pendencia_gestor_setorial(user))
+
+
+def demanda_ids_em_operacao_gestor_setorial(user) -> list[int]:
+    return _ids_por_filtro(filtro_em_operacao_gestor_setorial(user))
 
 
 def aplicar_escopo_fila_operacional_gestor_setorial(
     qs: QuerySet[Demanda], user
 ) -> QuerySet[Demanda]:
-    pendencia = demanda_ids_pendencia_gestor_setorial(user)
-    if not pendencia:
-        return qs.none()
-    return qs.filter(pk__in=pendencia)
+    return qs.filter(filtro_pendencia_gestor_setorial(user))
 
 
 def filtrar_demandas_em_operacao_gestor_setorial(
     qs: QuerySet[Demanda], user
 ) -> QuerySet[Demanda]:
-    ids = demanda_ids_em_operacao_gestor_setorial(user)
-    if not ids:
-        return qs.none()
-    return qs.filter(pk__in=ids)
+    return qs.filter(filtro_em_operacao_gestor_setorial(user))
 
 
 def filtrar_demandas_por_unidades(
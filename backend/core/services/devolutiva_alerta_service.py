@@ -5,23 +5,40 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from django.db.models import Exists, OuterRef, Q
+
 from core.models import Demanda, Notificacao, Tramitacao, Usuario
 
 logger = logging.getLogger(__name__)
 
 
+TIPOS_TRAMITACAO_DEVOLUTIVA = ("DEVOLUTIVA_PROTOCOLO", "CONCLUSAO_FINAL")
+
+
+def _tramitacoes_alerta_devolutiva(orgao_id: int):
+    """Tramitações de devolutiva cujo `metadata.alerta_destinos` inclui o órgão (JSONB @>)."""
+    oid = int(orgao_id)
+    return Tramitacao.objects.filter(tipo__in=TIPOS_TRAMITACAO_DEVOLUTIVA).filter(
+        Q(metadata__alerta_destinos__contains=[{"secretaria_id": oid}])
+        | Q(metadata__alerta_destinos__contains=[{"secretaria_id": str(oid)}])
+    )
+
+
+def filtro_alerta_devolutiva(orgao_id: int) -> Q:
+    """Q sobre Demanda — alerta de devolutiva final para o órgão (subquery EXISTS)."""
+    return Q(
+        Exists(_tramitacoes_alerta_devolutiva(orgao_id).filter(demanda_id=OuterRef("pk")))
+    )
+
+
 def demanda_ids_alerta_devolutiva(orgao_id: int) -> list[int]:
     """Demandas em que o órgão recebeu alerta de devolutiva final (somente leitura)."""
-    ids: set[int] = set()
-    for tram in Tramitacao.objects.filter(
-        tipo__in=("DEVOLUTIVA_PROTOCOLO", "CONCLUSAO_FINAL"),
-    ).only("demanda_id", "metadata"):
-        meta = tram.metadata if isinstance(tram.metadata, dict) else {}
-        for dest in meta.get("alerta_destinos") or []:
-            if int(dest.get("secretaria_id") or 0) == int(orgao_id):
-                ids.add(int(tram.demanda_id))
-                break
-    return list(ids)
+    return list(
+        _tramitacoes_alerta_devolutiva(orgao_id)
+        .order_by()
+        .values_list("demanda_id", flat=True)
+        .distinct()
+    )
 
 
 def usuario_tem_alerta_devolutiva_leitura(user, demanda: Demanda) -> bool:
@@ -0,0 +1,177 @@
+"""Cache de embeddings em dois níveis: LRU em memória + tabela `EmbeddingCacheEntrada`.
+
+Chave = sha256(modelo + texto normalizado): o mesmo texto com o mesmo modelo
+nunca volta ao Kernel. Trocar `AI_KERNEL_EMBEDDING_MODEL` muda todas as chaves;
+as linhas do modelo antigo são apagadas na primeira consulta do processo.
+Vetores ficam como float32 little-endian (4 KB para 1024 dims).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_lru: OrderedDict[str, list[float]] = OrderedDict()
+_contadores = {"hits_memoria": 0, "hits_banco": 0, "misses": 0, "gravados": 0}
+_modelos_purgados: set[str] = set()
+
+
+def cache_habilitado() -> bool:
+    return bool(getattr(settings, "EMBEDDING_CACHE_ENABLED", True))
+
+
+def _tamanho_lru() -> int:
+    return max(0, int(getattr(settings, "EMBEDDING_CACHE_LRU_SIZE", 2048)))
+
+
+def normalizar_texto_embedding(texto: str) -> str:
+    """NFC + espaços colapsados; caixa preservada (o modelo distingue)."""
+    return " ".join(unicodedata.normalize("NFC", texto or "").split())
+
+
+def chave_embedding(modelo: str, texto: str) -> str:
+    bruto = f"{modelo}\n{normalizar_texto_embedding(texto)}".encode("utf-8")
+    return hashlib.sha256(bruto).hexdigest()
+
+
+def vetor_para_bytes(vetor: list[float]) -> bytes:
+    return np.asarray(vetor, dtype="<f4").tobytes()
+
+
+def bytes_para_vetor(dados: bytes | memoryview) -> list[float]:
+    return np.frombuffer(bytes(dados), dtype="<f4").tolist()
+
+
+def _lru_get(chave: str) -> list[float] | None:
+    with _lock:
+        vetor = _lru.get(chave)
+        if vetor is not None:
+            _lru.move_to_end(chave)
+        return vetor
+
+
+def _lru_set(chave: str, vetor: list[float]) -> None:
+    limite = _tamanho_lru()
+    if not limite:
+        return
+    with _lock:
+        _lru[chave] = vetor
+        _lru.move_to_end(chave)
+        while len(_lru) > limite:
+            _lru.popitem(last=False)
+
+
+def _contar(nome: str, n: int = 1) -> None:
+    if n:
+        with _lock:
+            _contadores[nome] += n
+
+
+def _purgar_modelos_antigos(modelo: str) -> None:
+    from core.models import EmbeddingCacheEntrada
+
+    if modelo in _modelos_purgados:
+        return
+    _modelos_purgados.add(modelo)
+    try:
+        with transaction.atomic():
+            removidas, _ = EmbeddingCacheEntrada.objects.exclude(modelo=modelo).delete()
+    except DatabaseError:
+        logger.warning("Cache de embeddings: falha ao purgar modelos antigos.", exc_info=True)
+        return
+    if removidas:
+        logger.info("Cache de embeddings: %s entrada(s) de outros modelos removidas.", removidas)
+
+
+def buscar(modelo: str, textos: list[str]) -> dict[str, list[float]]:
+    """{texto: vetor} para os textos já conhecidos (memória, depois banco)."""
+    from core.models import EmbeddingCacheEntrada
+
+    encontrados: dict[str, list[float]] = {}
+    faltando: dict[str, str] = {}
+    for texto in dict.fromkeys(textos):
+        chave = chave_embedding(modelo, texto)
+        vetor = _lru_get(chave)
+        if vetor is not None:
+            encontrados[texto] = vetor
+            _contar("hits_memoria")
+        else:
+            faltando[chave] = texto
+
+    if faltando:
+        _purgar_modelos_antigos(modelo)
+        try:
+            linhas = list(
+                EmbeddingCacheEntrada.objects.filter(pk__in=list(faltando)).values_list(
+                    "chave", "vetor"
+                )
+            )
+        except DatabaseError:
+            logger.warning("Cache de embeddings: leitura do banco falhou.", exc_info=True)
+            linhas = []
+        for chave, dados in linhas:
+            vetor = bytes_para_vetor(dados)
+            encontrados[faltando.pop(chave)] = vetor
+            _lru_set(chave, vetor)
+        _contar("hits_banco", len(linhas))
+        _contar("misses", len(faltando))
+    return encontrados
+
+
+def gravar(modelo: str, vetores: dict[str, list[float]]) -> None:
+    """Grava vetores novos nos dois níveis; falha de banco só gera log."""
+    from core.models import EmbeddingCacheEntrada
+
+    entradas = []
+    for texto, vetor in vetores.items():
+        if not vetor:
+            continue
+        chave = chave_embedding(modelo, texto)
+        _lru_set(chave, list(vetor))
+        entradas.append(
+            EmbeddingCacheEntrada(
+                chave=chave,
+                modelo=modelo,
+                dimensoes=len(vetor),
+                vetor=vetor_para_bytes(vetor),
+            )
+        )
+    if not entradas:
+        return
+    try:
+        with transaction.atomic():
+            EmbeddingCacheEntrada.objects.bulk_create(entradas, ignore_conflicts=True)
+    except DatabaseError:
+        logger.warning("Cache de embeddings: gravação no banco falhou.", exc_info=True)
+        return
+    _contar("gravados", len(entradas))
+
+
+def estatisticas() -> dict:
+    with _lock:
+        dados = dict(_contadores)
+        dados["entradas_memoria"] = len(_lru)
+    consultas = dados["hits_memoria"] + dados["hits_banco"] + dados["misses"]
+    dados["taxa_acerto"] = (
+        round((dados["hits_memoria"] + dados["hits_banco"]) / consultas, 4) if consultas else 0.0
+    )
+    return dados
+
+
+def limpar_memoria() -> None:
+    """Zera LRU, contadores e o controle de purga deste processo."""
+    with _lock:
+        _lru.clear()
+        for nome in _contadores:
+            _contadores[nome] = 0
+        _modelos_purgados.clear()
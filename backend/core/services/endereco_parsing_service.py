@@ -17,6 +17,7 @@ import requests
 from django.conf import settings
 
 from core.services.endereco_normalizacao import normalizar_bairro, normalizar_logradouro
+from core.services.http_externo import UPSTREAM_GROQ, cliente_http
 
 logger = logging.getLogger(__name__)
 
@@ -103,11 +104,12 @@ class EnderecoParsingService:
             "temperature": self.temperature,
         }
         try:
-            response = requests.post(
+            response = cliente_http(UPSTREAM_GROQ).post(
                 self.base_url,
                 headers=headers,
                 json=payload,
                 timeout=self.timeout,
+                operacao="parsing_endereco",
             )
         except requests.RequestException as exc:
             logger.warning("Endereco LLM parsing indisponível: %s", exc)
@@ -116,11 +118,12 @@ class EnderecoParsingService:
         if response.status_code == 429:
             time.sleep(2.0)
             try:
-                response = requests.post(
+                response = cliente_http(UPSTREAM_GROQ).post(
                     self.base_url,
                     headers=headers,
                     json=payload,
                     timeout=self.timeout,
+                    operacao="parsing_endereco",
                 )
             except requests.RequestException:
                 return None
@@ -31,16 +31,36 @@ class FluxoProtocoloService:
             return ServicoFluxoProtocolo.MODO_AUTOMATICO
         return ServicoFluxoProtocolo.MODO_MANUAL
 
-    def despacho_automatico_habilitado(self, demanda: Demanda) -> bool:
+    @staticmethod
+    def _servico_despacho_automatico(demanda: Demanda) -> int | None:
+        """Serviço cuja config decide o despacho automático (None: nunca automático)."""
         if demanda.origem_vinculo == Demanda.ORIGEM_VINCULO_TENDENCIA:
-            return False
+            return None
         if demanda.tendencia_id:
-            return False
+            return None
         if not demanda.sinapse_servico_id:
+            return None
+        return int(demanda.sinapse_servico_id)
+
+    def despacho_automatico_habilitado(self, demanda: Demanda) -> bool:
+        sid = self._servico_despacho_automatico(demanda)
+        if sid is None:
             return False
-        cfg = self.get_config(int(demanda.sinapse_servico_id))
+        cfg = self.get_config(sid)
         return bool(cfg and cfg.despacho_automatico)
 
+    def despacho_automatico_em_lote(self, demandas) -> dict[int, bool]:
+        """`despacho_automatico_habilitado` por pk, com uma consulta de configs por serviço."""
+        servicos = {int(d.pk): self._servico_despacho_automatico(d) for d in demandas}
+        automaticos = {
+            int(cfg.sinapse_servico_id)
+            for cfg in ServicoFluxoProtocolo.objects.filter(
+                sinapse_servico_id__in={s for s in servicos.values() if s is not None}
+            )
+            if cfg.despacho_automatico
+        }
+        return {pk: sid is not None and sid in automaticos for pk, sid in servicos.items()}
+
     def _tem_pares_aguardando_cluster(self, demanda: Demanda) -> bool:
         """Outras demandas do mesmo serviço ainda aguardando embedding/cluster."""
         return (
@@ -0,0 +1,167 @@
+"""Geocodificação em lote com cache persistente (`GeocodeEnderecoCache`).
+
+O mapa nunca chama o Nominatim: lê coordenadas da tabela em uma consulta por
+bloco e registra os endereços ainda desconhecidos como pendentes. A task
+`sgdl.geocodificar_enderecos_pendentes` (ou `manage.py geocodificar_enderecos`)
+resolve os pendentes respeitando o intervalo mínimo do `GeocodingService` e
+para no primeiro sinal de backoff/circuito aberto, deixando o restante para a
+próxima rodada. A tabela é compartilhada entre workers e sobrevive a restart.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import Demanda
+from core.models_geocode_cache import GeocodeEnderecoCache
+from core.services.endereco_normalizacao import chave_endereco_canonica, endereco_minimo_para_geocode
+
+logger = logging.getLogger(__name__)
+
+LOTE_LOCK_KEY = "sgdl:geocode:lote"
+
+
+def chave_geocode_demanda(demanda: Demanda) -> str | None:
+    """Chave canônica do endereço da demanda (None se não há endereço geocodificável)."""
+    if not endereco_minimo_para_geocode(demanda.logradouro, demanda.bairro):
+        return None
+    return chave_endereco_canonica(demanda.logradouro, demanda.bairro, demanda.cep)
+
+
+def coords_do_resultado(geo: dict[str, Any]) -> tuple[float, float] | None:
+    """Coordenadas validadas ou, na falta delas, as brutas (mesmo critério do mapa)."""
+    lat, lng = geo.get("latitude"), geo.get("longitude")
+    if lat is None or lng is None:
+        lat, lng = geo.get("latitude_bruta"), geo.get("longitude_bruta")
+    if lat is None or lng is None:
+        return None
+    return float(lat), float(lng)
+
+
+def buscar_em_lote(chaves: Iterable[str]) -> dict[str, GeocodeEnderecoCache]:
+    chaves = {c for c in chaves if c}
+    if not chaves:
+        return {}
+    return {g.chave: g for g in GeocodeEnderecoCache.objects.filter(chave__in=chaves)}
+
+
+def registrar_pendentes(demandas_por_chave: dict[str, Demanda]) -> int:
+    """Cria entradas pendentes para chaves novas (ignora as que já existem)."""
+    if not demandas_por_chave:
+        return 0
+    criadas = GeocodeEnderecoCache.objects.bulk_create(
+        [
+            GeocodeEnderecoCache(
+                chave=chave,
+                logradouro=(demanda.logradouro or "")[:255],
+                bairro=(demanda.bairro or "")[:120],
+                cep=(demanda.cep or "")[:10],
+            )
+            for chave, demanda in demandas_por_chave.items()
+        ],
+        ignore_conflicts=True,
+    )
+    return len(criadas)
+
+
+def registrar_pendentes_de_demandas(queryset) -> int:
+    """Semeia a tabela com endereços de demandas ainda sem coordenadas."""
+    novas: dict[str, Demanda] = {}
+    for demanda in queryset.filter(Q(latitude__isnull=True) | Q(longitude__isnull=True)).only(
+        "pk", "logradouro", "bairro", "cep"
+    ).iterator(chunk_size=500):
+        chave = chave_geocode_demanda(demanda)
+        if chave and chave not in novas:
+            novas[chave] = demanda
+    existentes = set(
+        GeocodeEnderecoCache.objects.filter(chave__in=novas).values_list("chave", flat=True)
+    )
+    return registrar_pendentes({c: d for c, d in novas.items() if c not in existentes})
+
+
+def agendar_geocodificacao() -> bool:
+    """Publica a task de lote (uma por janela de `GEOCODING_LOTE_LOCK_TTL`)."""
+    if not getattr(settings, "CELERY_ENABLED", False):
+        return False
+    ttl = int(getattr(settings, "GEOCODING_LOTE_LOCK_TTL", 600))
+    if not cache.add(f"{LOTE_LOCK_KEY}:agendado", 1, timeout=ttl):
+        return False
+    from core.tasks import geocodificar_enderecos_pendentes_task
+
+    try:
+        geocodificar_enderecos_pendentes_task.delay()
+    except Exception as exc:  # noqa: BLE001 - broker fora do ar
+        cache.delete(f"{LOTE_LOCK_KEY}:agendado")
+        logger.warning("Broker Celery indisponível (%s); geocode em lote fica para o beat.", exc)
+        return False
+    return True
+
+
+def _pendentes():
+    dias = int(getattr(settings, "GEOCODING_REVALIDAR_SEM_RESULTADO_DIAS", 7))
+    filtro = Q(status=GeocodeEnderecoCache.STATUS_PENDENTE)
+    if dias > 0:
+        filtro |= Q(
+            status=GeocodeEnderecoCache.STATUS_SEM_RESULTADO,
+            geocodificado_em__lt=timezone.now() - timedelta(days=dias),
+        )
+    return GeocodeEnderecoCache.objects.filter(filtro).order_by("tentativas", "criado_em")
+
+
+def geocodificar_pendentes(limite: int | None = None, *, geocoder=None) -> dict[str, int]:
+    """
+    Resolve até `limite` endereços pendentes (`GEOCODING_LOTE_MAX` por padrão).
+
+    Cada endereço passa pelo `GeocodingService`, que já espaça as consultas ao
+    Nominatim; o lote para quando o serviço entra em backoff (429) ou o circuito
+    abre, sem consumir tentativas dos endereços restantes. `SEM_RESULTADO` só
+    é gravado quando o Nominatim respondeu vazio; falhas de transporte deixam
+    o endereço pendente (`adiados`).
+    """
+    if geocoder is None:
+        from core.services.geocoding_service import GeocodingService
+
+        geocoder = GeocodingService()
+    limite = int(limite or getattr(settings, "GEOCODING_LOTE_MAX", 50))
+    resumo = {"resolvidos": 0, "sem_resultado": 0, "adiados": 0, "interrompido": 0}
+
+    ttl = int(getattr(settings, "GEOCODING_LOTE_LOCK_TTL", 600))
+    if not cache.add(LOTE_LOCK_KEY, 1, timeout=ttl):
+        logger.info("Geocode em lote já em execução; ignorando.")
+        return resumo
+    try:
+        for entrada in list(_pendentes()[:limite]):
+            if not geocoder.nominatim_disponivel():
+                resumo["interrompido"] = 1
+                break
+            geo = geocoder.resolver_endereco_geocode(entrada.logradouro, entrada.bairro, entrada.cep)
+            resolvido = coords_do_resultado(geo) is not None
+            if not resolvido and not geocoder.nominatim_disponivel():
+                # Falha por rate limit/circuito: não conta como "sem resultado".
+                resumo["interrompido"] = 1
+                break
+            if not resolvido and geo.get("consulta_incompleta"):
+                # Timeout/erro de rede/5xx: o Nominatim não respondeu; segue pendente.
+                resumo["adiados"] += 1
+                continue
+            entrada.resultado = {k: v for k, v in geo.items() if v is not None}
+            entrada.status = (
+                GeocodeEnderecoCache.STATUS_RESOLVIDO
+                if resolvido
+                else GeocodeEnderecoCache.STATUS_SEM_RESULTADO
+            )
+            entrada.tentativas += 1
+            entrada.geocodificado_em = timezone.now()
+            entrada.save(update_fields=["resultado", "status", "tentativas", "geocodificado_em"])
+            resumo["resolvidos" if resolvido else "sem_resultado"] += 1
+    finally:
+        cache.delete(LOTE_LOCK_KEY)
+        cache.delete(f"{LOTE_LOCK_KEY}:agendado")
+    return resumo
@@ -20,6 +20,7 @@ from core.services.endereco_normalizacao import (
     normalizar_logradouro,
     variantes_tipo_via_logradouro,
 )
+from core.services.http_externo import UPSTREAM_NOMINATIM, UPSTREAM_VIACEP, cliente_http
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +70,9 @@ class GeocodingService:
         self._429_backoff_seconds = int(
             getattr(settings, "GEOCODING_NOMINATIM_429_BACKOFF", 90)
         )
+        # Alguma consulta da última busca falhou no transporte (timeout, 429, 5xx):
+        # "sem coordenadas" nesse caso não é resposta definitiva do Nominatim.
+        self._consulta_incompleta = False
 
     def buscar_coordenadas_com_fonte(
         self,
@@ -131,6 +135,7 @@ class GeocodingService:
             "latitude_bruta": lat,
             "longitude_bruta": lng,
             "fonte_bruta": fonte,
+            "consulta_incompleta": lat is None and self._consulta_incompleta,
         }
 
     def buscar_endereco_por_coordenadas(
@@ -152,7 +157,7 @@ class GeocodingService:
             if rev_entry and rev_entry[1] > time.monotonic():
                 return rev_entry[0]
 
-        if self._nominatim_em_backoff():
+        if self._nominatim_indisponivel():
             return None
 
         self._aguardar_intervalo_nominatim()
@@ -168,11 +173,12 @@ class GeocodingService:
             "Accept": "application/json",
         }
         try:
-            response = requests.get(
+            response = cliente_http(UPSTREAM_NOMINATIM).get(
                 NOMINATIM_REVERSE_URL,
                 params=params,
                 headers=headers,
                 timeout=self.timeout,
+                operacao="reverse",
             )
         except requests.RequestException as exc:
             logger.warning("Nominatim reverse indisponível lat=%s lng=%s: %s", lat, lng, exc)
@@ -267,6 +273,7 @@ class GeocodingService:
         Prioriza via pública (nome enxuto compatível com OSM), depois bairro+CEP; CEP sozinho por último.
         CEP é normalizado via ViaCEP quando possível.
         """
+        self._consulta_incompleta = False
         logr, bai, cep_fmt, cep_limpo, via_viacep = self._preparar_endereco(
             logradouro, bairro, cep
         )
@@ -328,6 +335,7 @@ class GeocodingService:
 
         for query, fonte in tentativas:
             if self._nominatim_em_backoff():
+                self._consulta_incompleta = True
                 break
             coords = self._consultar_nominatim(query)
             if coords[0] is not None:
@@ -587,7 +595,7 @@ class GeocodingService:
     def _consultar_nominatim_lista(
         self, query: str, *, limit: int = 8
     ) -> list[dict[str, Any]]:
-        if self._nominatim_em_backoff():
+        if self._nominatim_indisponivel():
             return []
 
         self._aguardar_intervalo_nominatim()
@@ -607,11 +615,12 @@ class GeocodingService:
             "Accept": "application/json",
         }
         try:
-            response = requests.get(
+            response = cliente_http(UPSTREAM_NOMINATIM).get(
                 NOMINATIM_SEARCH_URL,
                 params=params,
                 headers=headers,
                 timeout=self.timeout,
+                operacao="search",
             )
         except requests.RequestException as exc:
             logger.warning("Nominatim lista indisponível query=%s: %s", query[:120], exc)
@@ -641,7 +650,9 @@ class GeocodingService:
         url = VIACEP_URL.format(cep=cep_limpo)
         headers = {"User-Agent": self.user_agent, "Accept": "application/json"}
         try:
-            response = requests.get(url, headers=headers, timeout=self.timeout)
+            response = cliente_http(UPSTREAM_VIACEP).get(
+                url, headers=headers, timeout=self.timeout, operacao="cep"
+            )
         except requests.RequestException as exc:
             logger.warning("ViaCEP indisponível cep=%s: %s", cep_limpo, exc)
             return None
@@ -668,6 +679,17 @@ class GeocodingService:
     def _nominatim_em_backoff(self) -> bool:
         return time.monotonic() < _nominatim_backoff_until
 
+    def nominatim_disponivel(self) -> bool:
+        """False durante backoff de 429 ou com o circuito aberto (lotes devem parar)."""
+        return not self._nominatim_indisponivel()
+
+    def _nominatim_indisponivel(self) -> bool:
+        """Backoff de 429 ou circuito aberto: falha sem esperar o intervalo mínimo."""
+        return (
+            self._nominatim_em_backoff()
+            or cliente_http(UPSTREAM_NOMINATIM).circuito.aberto()
+        )
+
     def _aguardar_intervalo_nominatim(self) -> None:
         global _last_nominatim_request_at
         with _nominatim_lock:
@@ -687,7 +709,8 @@ class GeocodingService:
         )
 
     def _consultar_nominatim(self, query: str) -> tuple[float | None, float | None]:
-        if self._nominatim_em_backoff():
+        if self._nominatim_indisponivel():
+            self._consulta_incompleta = True
             return None, None
 
         cache_q = f"q:{query.strip().lower()}"
@@ -712,18 +735,21 @@ class GeocodingService:
             "Accept": "application/json",
         }
         try:
-            response = requests.get(
+            response = cliente_http(UPSTREAM_NOMINATIM).get(
                 NOMINATIM_SEARCH_URL,
                 params=params,
                 headers=headers,
                 timeout=self.timeout,
+                operacao="search",
             )
         except requests.RequestException as exc:
             logger.warning("Nominatim indisponível para query=%s: %s", query[:120], exc)
+            self._consulta_incompleta = True
             return None, None
 
         if response.status_code == 429:
             self._registrar_backoff_429()
+            self._consulta_incompleta = True
             return None, None
 
         if not response.ok:
@@ -733,11 +759,13 @@ class GeocodingService:
                     response.status_code,
                     query[:120],
                 )
+                self._consulta_incompleta = True
             return None, None
 
         try:
             resultados = response.json()
         except ValueError:
+            self._consulta_incompleta = True
             return None, None
 
         if not isinstance(resultados, list) or not resultados:
@@ -0,0 +1,303 @@
+"""Cliente HTTP de saída compartilhado (Kernel AI, Groq, Nominatim, ViaCEP).
+
+Cada host tem uma `requests.Session` por processo (pool com keep-alive), então o
+handshake TCP/TLS acontece uma vez por conexão e não a cada chamada. Por upstream:
+
+- circuit breaker: após `HTTP_EXTERNO_CIRCUITO_FALHAS` falhas seguidas (timeout,
+  conexão, HTTP 5xx) o circuito abre e as chamadas falham na hora com
+  `CircuitoAbertoError` por `HTTP_EXTERNO_CIRCUITO_ABERTO_SEGUNDOS`; depois uma
+  chamada de teste decide se fecha de novo;
+- limite de chamadas simultâneas (`HTTP_EXTERNO_MAX_CONCORRENTES`);
+- histograma de latência por (upstream, operação), exposto por
+  `metricas_http_externo()` e por `GET /api/integrations/http-externo/metricas/`.
+
+`CircuitoAbertoError` herda de `requests.ConnectionError`: os chamadores que já
+tratam indisponibilidade do upstream não precisam mudar.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_KERNEL = "kernel"
+UPSTREAM_GROQ = "groq"
+UPSTREAM_NOMINATIM = "nominatim"
+UPSTREAM_VIACEP = "viacep"
+
+# Limites superiores (ms) dos buckets do histograma; o último bucket é +inf.
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class CircuitoAbertoError(requests.ConnectionError):
+    """Upstream marcado como fora do ar: a chamada nem chega a sair."""
+
+    def __init__(self, upstream: str, motivo: str = "circuito aberto") -> None:
+        super().__init__(f"{upstream}: {motivo}")
+        self.upstream = upstream
+
+
+class HistogramaLatencia:
+    """Contagem por bucket + soma, no formato dos histogramas do Prometheus."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._contagens = [0] * (len(BUCKETS_MS) + 1)
+        self._soma_ms = 0.0
+        self._erros = 0
+
+    def registrar(self, ms: float, *, erro: bool = False) -> None:
+        with self._lock:
+            self._contagens[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+            self._soma_ms += ms
+            if erro:
+                self._erros += 1
+
+    def _percentil(self, contagens: list[int], total: int, fracao: float) -> float | None:
+        if not total:
+            return None
+        alvo = fracao * total
+        acumulado = 0
+        for i, n in enumerate(contagens):
+            acumulado += n
+            if acumulado >= alvo:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            contagens = list(self._contagens)
+            soma, erros = self._soma_ms, self._erros
+        total = sum(contagens)
+        rotulos = [f"le_{limite}" for limite in BUCKETS_MS] + ["le_inf"]
+        return {
+            "total": total,
+            "erros": erros,
+            "soma_ms": round(soma, 2),
+            "media_ms": round(soma / total, 2) if total else None,
+            # Limite superior do bucket que contém o percentil.
+            "p50_ms": self._percentil(contagens, total, 0.5),
+            "p95_ms": self._percentil(contagens, total, 0.95),
+            "buckets": dict(zip(rotulos, contagens)),
+        }
+
+
+class CircuitBreaker:
+    FECHADO = "FECHADO"
+    ABERTO = "ABERTO"
+    MEIO_ABERTO = "MEIO_ABERTO"
+
+    def __init__(self, upstream: str, *, limite_falhas: int, aberto_segundos: float) -> None:
+        self.upstream = upstream
+        self.limite_falhas = max(1, int(limite_falhas))
+        self.aberto_segundos = max(0.0, float(aberto_segundos))
+        self._lock = threading.Lock()
+        self._estado = self.FECHADO
+        self._falhas = 0
+        self._aberto_em = 0.0
+        self._teste_em_andamento = False
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            return self._estado
+
+    def aberto(self) -> bool:
+        """Aberto e ainda dentro da janela (consulta sem consumir a chamada de teste)."""
+        with self._lock:
+            return (
+                self._estado == self.ABERTO
+                and time.monotonic() - self._aberto_em < self.aberto_segundos
+            )
+
+    def permitir(self) -> bool:
+        with self._lock:
+            if self._estado == self.FECHADO:
+                return True
+            if self._estado == self.ABERTO:
+                if time.monotonic() - self._aberto_em < self.aberto_segundos:
+                    return False
+                self._estado = self.MEIO_ABERTO
+                self._teste_em_andamento = False
+            # Meio-aberto: uma única chamada de teste por vez.
+            if self._teste_em_andamento:
+                return False
+            self._teste_em_andamento = True
+            return True
+
+    def registrar_sucesso(self) -> None:
+        with self._lock:
+            if self._estado != self.FECHADO:
+                logger.info("HTTP externo: circuito %s fechado.", self.upstream)
+            self._estado = self.FECHADO
+            self._falhas = 0
+            self._teste_em_andamento = False
+
+    def registrar_falha(self) -> None:
+        with self._lock:
+            self._falhas += 1
+            self._teste_em_andamento = False
+            if self._estado == self.MEIO_ABERTO or self._falhas >= self.limite_falhas:
+                if self._estado != self.ABERTO:
+                    logger.warning(
+                        "HTTP externo: circuito %s aberto após %s falha(s); "
+                        "chamadas falham na hora por %.0fs.",
+                        self.upstream,
+                        self._falhas,
+                        self.aberto_segundos,
+                    )
+                self._estado = self.ABERTO
+                self._aberto_em = time.monotonic()
+
+    def liberar_teste(self) -> None:
+        with self._lock:
+            self._teste_em_andamento = False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {"estado": self._estado, "falhas_seguidas": self._falhas}
+
+
+class ClienteHttpExterno:
+    """Chamadas a um upstream: Session do host, circuito, limite e histograma."""
+
+    def __init__(self, upstream: str, *, max_concorrentes: int | None = None) -> None:
+        self.upstream = upstream
+        self.circuito = CircuitBreaker(
+            upstream,
+            limite_falhas=int(getattr(settings, "HTTP_EXTERNO_CIRCUITO_FALHAS", 5)),
+            aberto_segundos=float(getattr(settings, "HTTP_EXTERNO_CIRCUITO_ABERTO_SEGUNDOS", 30)),
+        )
+        self.timeout_padrao = float(getattr(settings, "HTTP_EXTERNO_TIMEOUT_PADRAO", 15))
+        if max_concorrentes is None:
+            max_concorrentes = int(getattr(settings, "HTTP_EXTERNO_MAX_CONCORRENTES", 16))
+        maximo = max(1, int(max_concorrentes))
+        self._vagas = threading.BoundedSemaphore(maximo)
+        self._pool_maxsize = maximo
+        self._sessoes: dict[str, requests.Session] = {}
+        self._histogramas: dict[str, HistogramaLatencia] = {}
+        self._lock = threading.Lock()
+
+    def _sessao(self, url: str) -> requests.Session:
+        partes = urlsplit(url)
+        host = f"{partes.scheme}://{partes.netloc}"
+        sessao = self._sessoes.get(host)
+        if sessao is None:
+            with self._lock:
+                sessao = self._sessoes.get(host)
+                if sessao is None:
+                    sessao = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_maxsize)
+                    sessao.mount("http://", adapter)
+                    sessao.mount("https://", adapter)
+                    self._sessoes[host] = sessao
+        return sessao
+
+    def _histograma(self, operacao: str) -> HistogramaLatencia:
+        histograma = self._histogramas.get(operacao)
+        if histograma is None:
+            with self._lock:
+                histograma = self._histogramas.setdefault(operacao, HistogramaLatencia())
+        return histograma
+
+    def request(
+        self, method: str, url: str, *, operacao: str | None = None, **kwargs: Any
+    ) -> requests.Response:
+        """`Session.request` instrumentado; 4xx volta normalmente para o chamador."""
+        operacao = operacao or urlsplit(url).path or "/"
+        kwargs.setdefault("timeout", self.timeout_padrao)
+        timeout = kwargs["timeout"]
+        espera = timeout[0] if isinstance(timeout, tuple) else timeout
+        if not self._vagas.acquire(timeout=espera):
+            raise CircuitoAbertoError(self.upstream, "limite de chamadas simultâneas")
+        try:
+            if not self.circuito.permitir():
+                self._histograma(operacao).registrar(0.0, erro=True)
+                raise CircuitoAbertoError(self.upstream)
+
+            inicio = time.perf_counter()
+            try:
+                response = self._sessao(url).request(method, url, **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                self.circuito.registrar_falha()
+                self._histograma(operacao).registrar(
+                    (time.perf_counter() - inicio) * 1000, erro=True
+                )
+                raise
+            except Exception:
+                # Erro do próprio pedido (URL inválida etc.): não diz nada do upstream.
+                self.circuito.liberar_teste()
+                raise
+        finally:
+            self._vagas.release()
+
+        falhou = response.status_code >= 500
+        if falhou:
+            self.circuito.registrar_falha()
+        else:
+            self.circuito.registrar_sucesso()
+        self._histograma(operacao).registrar((time.perf_counter() - inicio) * 1000, erro=falhou)
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            histogramas = dict(self._histogramas)
+        return {
+            "circuito": self.circuito.snapshot(),
+            "operacoes": {op: h.snapshot() for op, h in sorted(histogramas.items())},
+        }
+
+
+_clientes_lock = threading.Lock()
+_clientes: dict[str, ClienteHttpExterno] = {}
+
+# Upstreams com limite próprio (setting já existente) em vez de HTTP_EXTERNO_MAX_CONCORRENTES.
+_SETTING_LIMITE = {UPSTREAM_KERNEL: "AI_KERNEL_POOL_MAXSIZE"}
+
+
+def cliente_http(upstream: str) -> ClienteHttpExterno:
+    """Cliente do processo para `upstream` (criado na primeira chamada)."""
+    cliente = _clientes.get(upstream)
+    if cliente is None:
+        with _clientes_lock:
+            cliente = _clientes.get(upstream)
+            if cliente is None:
+                setting = _SETTING_LIMITE.get(upstream)
+                limite = getattr(settings, setting, None) if setting else None
+                cliente = _clientes[upstream] = ClienteHttpExterno(
+                    upstream, max_concorrentes=limite
+                )
+    return cliente
+
+
+def metricas_http_externo() -> dict[str, Any]:
+    """Circuitos e histogramas deste processo, por upstream."""
+    with _clientes_lock:
+        clientes = dict(_clientes)
+    return {upstream: cliente.snapshot() for upstream, cliente in sorted(clientes.items())}
+
+
+def resetar_clientes_http() -> None:
+    """Descarta sessões, circuitos e métricas (testes / reconfiguração)."""
+    with _clientes_lock:
+        clientes = list(_clientes.values())
+        _clientes.clear()
+    for cliente in clientes:
+        for sessao in cliente._sessoes.values():
+            sessao.close()
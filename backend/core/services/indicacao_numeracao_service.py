@@ -7,6 +7,12 @@ from django.utils import timezone
 
 from core.models import Demanda
 from core.models_config import NumeracaoIndicacaoCamara
+from core.services.sequencia_numeracao_service import (
+    ESCOPO_INDICACAO_CAMARA,
+    avancar_para,
+    definir_ultimo,
+    proximo_numero,
+)
 
 
 class IndicacaoNumeracaoService:
@@ -64,18 +70,24 @@ class IndicacaoNumeracaoService:
     ) -> tuple[int, int, str]:
         cfg = self.carregar_config()
         ano_ref = int(ano or cfg.ano)
-        if numero is None:
-            numero = int(cfg.ultimo_numero) + 1
-        numero = int(numero)
+        informado = numero is not None
+        if informado:
+            numero = int(numero)
+        else:
+            # Contador atômico; o último número informado pela Câmara é o piso.
+            piso = int(cfg.ultimo_numero) if ano_ref == cfg.ano else 0
+            numero = proximo_numero(ESCOPO_INDICACAO_CAMARA, ano_ref, piso=piso)
         self.validar_numero(numero, ano_ref, excluir_demanda_id=excluir_demanda_id)
+        if informado:
+            avancar_para(ESCOPO_INDICACAO_CAMARA, ano_ref, numero)
         protocolo = self.formatar(numero, ano_ref, cfg.mascara)
         if Demanda.objects.filter(protocolo_legislativo=protocolo).exclude(
             pk=excluir_demanda_id or 0
         ).exists():
             raise ValueError(f"Protocolo «{protocolo}» já está em uso.")
-        if ano_ref == cfg.ano and numero > cfg.ultimo_numero:
-            cfg.ultimo_numero = numero
-            cfg.save(update_fields=["ultimo_numero", "atualizado_em"])
+        NumeracaoIndicacaoCamara.objects.filter(
+            pk_fixo=1, ano=ano_ref, ultimo_numero__lt=numero
+        ).update(ultimo_numero=numero, atualizado_em=timezone.now())
         return numero, ano_ref, protocolo
 
     def atualizar_ultimo_informado(self, ultimo_numero: int, ano: int | None = None, mascara: str | None = None) -> dict:
@@ -89,6 +101,7 @@ class IndicacaoNumeracaoService:
             cfg.mascara = str(mascara).strip() or cfg.mascara
         cfg.ultimo_numero = ultimo
         cfg.save()
+        definir_ultimo(ESCOPO_INDICACAO_CAMARA, cfg.ano, ultimo)
         return self.proximo_numero_sugerido()
 
 
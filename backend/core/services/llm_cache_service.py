@@ -0,0 +1,165 @@
+"""Cache de respostas do LLM (Groq) endereçado pelo prompt.
+
+Chave = sha256(modelo + mensagens + temperatura + formato de resposta): o mesmo
+prompt não volta à Groq enquanto a entrada viver (`LLM_CACHE_TTL`) — nem passa
+pelo rate limit (429). Dois níveis, como o cache de embeddings: LRU em memória
+(`LLM_CACHE_MAX_ENTRADAS`) e o cache compartilhado do Django, para os demais
+workers. Respostas acima de `LLM_CACHE_MAX_BYTES` não são guardadas.
+
+Só entram chamadas determinísticas: temperatura 0 ou marcadas como cacheáveis
+pelo chamador (`LLMService.extrair_entidades`, `ChatbotService._chamar_groq_json`).
+`estatisticas()` traz taxa de acerto e tokens economizados (pelo `usage` gravado).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PREFIXO_CHAVE = "sgdl:llm:resposta:"
+
+_lock = threading.Lock()
+# chave -> (conteúdo, tokens da chamada original, expira_em monotônico)
+_lru: OrderedDict[str, tuple[str, int, float]] = OrderedDict()
+_contadores = {
+    "hits_memoria": 0,
+    "hits_compartilhado": 0,
+    "misses": 0,
+    "gravados": 0,
+    "tokens_economizados": 0,
+}
+
+
+def cache_habilitado() -> bool:
+    return bool(getattr(settings, "LLM_CACHE_ENABLED", True))
+
+
+def _ttl() -> int:
+    return max(0, int(getattr(settings, "LLM_CACHE_TTL", 3600)))
+
+
+def _max_entradas() -> int:
+    return max(0, int(getattr(settings, "LLM_CACHE_MAX_ENTRADAS", 512)))
+
+
+def cacheavel(temperatura: float, *, explicito: bool = False) -> bool:
+    """Temperatura 0 sempre; acima disso só quando o chamador declara a chamada cacheável."""
+    return cache_habilitado() and _ttl() > 0 and (explicito or float(temperatura) == 0.0)
+
+
+def chave_prompt(
+    modelo: str,
+    mensagens: list[dict[str, Any]],
+    temperatura: float,
+    formato_resposta: dict[str, Any] | None = None,
+) -> str:
+    bruto = json.dumps(
+        {
+            "modelo": modelo,
+            "mensagens": mensagens,
+            "temperatura": float(temperatura),
+            "formato": formato_resposta or {},
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(bruto.encode("utf-8")).hexdigest()
+
+
+def tokens_da_resposta(data: Any) -> int:
+    """`usage.total_tokens` da resposta OpenAI-compatible (0 se ausente)."""
+    usage = data.get("usage") if isinstance(data, dict) else None
+    try:
+        return int((usage or {}).get("total_tokens") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _contar(nome: str, n: int = 1) -> None:
+    if n:
+        with _lock:
+            _contadores[nome] += n
+
+
+def _lru_set(chave: str, conteudo: str, tokens: int) -> None:
+    limite = _max_entradas()
+    if not limite:
+        return
+    with _lock:
+        _lru[chave] = (conteudo, tokens, time.monotonic() + _ttl())
+        _lru.move_to_end(chave)
+        while len(_lru) > limite:
+            _lru.popitem(last=False)
+
+
+def buscar(chave: str) -> str | None:
+    """Conteúdo guardado para o prompt (memória, depois cache compartilhado)."""
+    with _lock:
+        entrada = _lru.get(chave)
+        if entrada is not None:
+            if entrada[2] > time.monotonic():
+                _lru.move_to_end(chave)
+            else:
+                _lru.pop(chave, None)
+                entrada = None
+    if entrada is not None:
+        _contar("hits_memoria")
+        _contar("tokens_economizados", entrada[1])
+        return entrada[0]
+
+    try:
+        guardado = cache.get(PREFIXO_CHAVE + chave)
+    except Exception:  # noqa: BLE001 - cache fora: segue para a Groq
+        logger.warning("Cache de LLM: leitura do cache compartilhado falhou.", exc_info=True)
+        guardado = None
+    if isinstance(guardado, (list, tuple)) and len(guardado) == 2:
+        conteudo, tokens = str(guardado[0]), int(guardado[1] or 0)
+        _lru_set(chave, conteudo, tokens)
+        _contar("hits_compartilhado")
+        _contar("tokens_economizados", tokens)
+        return conteudo
+
+    _contar("misses")
+    return None
+
+
+def gravar(chave: str, conteudo: str, tokens: int = 0) -> None:
+    if not conteudo:
+        return
+    if len(conteudo.encode("utf-8")) > int(getattr(settings, "LLM_CACHE_MAX_BYTES", 65536)):
+        return
+    _lru_set(chave, conteudo, int(tokens or 0))
+    try:
+        cache.set(PREFIXO_CHAVE + chave, (conteudo, int(tokens or 0)), _ttl())
+    except Exception:  # noqa: BLE001
+        logger.warning("Cache de LLM: gravação no cache compartilhado falhou.", exc_info=True)
+    _contar("gravados")
+
+
+def estatisticas() -> dict:
+    with _lock:
+        dados = dict(_contadores)
+        dados["entradas_memoria"] = len(_lru)
+    hits = dados["hits_memoria"] + dados["hits_compartilhado"]
+    consultas = hits + dados["misses"]
+    dados["taxa_acerto"] = round(hits / consultas, 4) if consultas else 0.0
+    return dados
+
+
+def limpar_memoria() -> None:
+    """Zera LRU e contadores deste processo (o cache compartilhado expira pelo TTL)."""
+    with _lock:
+        _lru.clear()
+        for nome in _contadores:
+            _contadores[nome] = 0
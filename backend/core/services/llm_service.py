@@ -15,6 +15,9 @@ from typing import Any
 import requests
 from django.conf import settings
 
+from core.services import llm_cache_service
+from core.services.http_externo import UPSTREAM_GROQ, cliente_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,9 +82,23 @@ class LLMService:
             "temperature": self.temperature,
         }
 
+        # Mesma demanda, mesma extração: cacheável mesmo com temperatura > 0.
+        chave = None
+        if llm_cache_service.cacheavel(self.temperature, explicito=True):
+            chave = llm_cache_service.chave_prompt(
+                self.model, payload["messages"], self.temperature, payload["response_format"]
+            )
+            guardado = llm_cache_service.buscar(chave)
+            if guardado is not None:
+                return json.loads(guardado)
+
         try:
-            response = requests.post(
-                self.base_url, headers=headers, json=payload, timeout=self.timeout
+            response = cliente_http(UPSTREAM_GROQ).post(
+                self.base_url,
+                headers=headers,
+                json=payload,
+                timeout=self.timeout,
+                operacao="extrair_entidades",
             )
         except requests.Timeout:
             logger.error("Timeout (%ss) chamando Groq em %s.", self.timeout, self.base_url)
@@ -106,7 +123,14 @@ class LLMService:
             logger.error("Groq não retornou JSON parseável: %s", exc)
             return {}
 
-        return self._parse_content(data)
+        parsed = self._parse_content(data)
+        if chave and parsed:
+            llm_cache_service.gravar(
+                chave,
+                json.dumps(parsed, ensure_ascii=False),
+                llm_cache_service.tokens_da_resposta(data),
+            )
+        return parsed
 
     @staticmethod
     def _parse_content(data: dict[str, Any]) -> dict[str, Any]:
@@ -141,8 +165,14 @@ class LLMService:
             return {}
         return parsed
 
-    def completar_texto(self, system_prompt: str, user_prompt: str) -> str:
-        """Chat completion Groq retornando texto livre (sem JSON forçado)."""
+    def completar_texto(
+        self, system_prompt: str, user_prompt: str, *, cacheavel: bool = False
+    ) -> str:
+        """Chat completion Groq retornando texto livre (sem JSON forçado).
+
+        `cacheavel=True` reaproveita a resposta de um prompt idêntico (ver
+        `llm_cache_service`); com temperatura 0 o cache vale sempre.
+        """
         if not self.api_key:
             logger.warning("GROQ_API_KEY não configurada.")
             return ""
@@ -160,10 +190,23 @@ class LLMService:
             "temperature": self.temperature,
         }
 
+        chave = None
+        if llm_cache_service.cacheavel(self.temperature, explicito=cacheavel):
+            chave = llm_cache_service.chave_prompt(
+                self.model, payload["messages"], self.temperature
+            )
+            guardado = llm_cache_service.buscar(chave)
+            if guardado is not None:
+                return guardado
+
         for tentativa in range(3):
             try:
-                response = requests.post(
-                    self.base_url, headers=headers, json=payload, timeout=self.timeout
+                response = cliente_http(UPSTREAM_GROQ).post(
+                    self.base_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                    operacao="completar_texto",
                 )
             except requests.Timeout:
                 logger.error("Timeout (%ss) Groq chat.", self.timeout)
@@ -198,4 +241,7 @@ class LLMService:
             return ""
         message = choices[0].get("message") if isinstance(choices[0], dict) else None
         content = message.get("content") if isinstance(message, dict) else None
-        return content.strip() if isinstance(content, str) else ""
+        texto = content.strip() if isinstance(content, str) else ""
+        if chave and texto:
+            llm_cache_service.gravar(chave, texto, llm_cache_service.tokens_da_resposta(data))
+        return texto
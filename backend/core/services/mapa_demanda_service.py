@@ -5,6 +5,7 @@ from __future__ import annotations
 from collections import defaultdict
 from datetime import datetime, timedelta
 from decimal import Decimal
+from itertools import islice
 from typing import Any, Iterator
 
 from django.db.models import Q, QuerySet
@@ -12,8 +13,7 @@ from django.utils import timezone
 
 from core.models import Demanda
 from core.services.demanda_visibilidade import aplicar_escopo_demanda
-from core.services.endereco_normalizacao import endereco_minimo_para_geocode
-from integrations import sinapse_catalog
+from core.services.resolvedor_catalogo import ResolvedorCatalogo
 
 
 STATUS_ABERTO = [
@@ -25,6 +25,11 @@ STATUS_ABERTO = [
     'DEVOLVIDO_VEREADOR',
 ]
 
+# Demandas por consulta de Super OS em lote na montagem do mapa.
+_LOTE_SUPER_OS_MAPA = 500
+# Demandas por consulta ao cache de geocode (`GeocodeEnderecoCache`).
+_LOTE_GEOCODE_MAPA = 200
+
 _FILTRO_MAPA_COORDS_OU_ENDERECO = Q(
     latitude__isnull=False,
     longitude__isnull=False,
@@ -124,10 +129,6 @@ def _demanda_atrasada(demanda: Demanda, agora) -> bool:
     return False
 
 
-def _demanda_endereco_geocodificavel(demanda: Demanda) -> bool:
-    return endereco_minimo_para_geocode(demanda.logradouro, demanda.bairro)
-
-
 def _persistir_coords_indicacao(demanda: Demanda, geo: dict[str, Any]) -> None:
     """Persiste coordenadas resolvidas para indicações ainda sem lat/lng."""
     if demanda.tipo_legislativo != Demanda.TIPO_LEGISLATIVO_INDICACAO:
@@ -156,59 +157,76 @@ def _persistir_coords_indicacao(demanda: Demanda, geo: dict[str, Any]) -> None:
         setattr(demanda, campo, valor)
 
 
-def _resolver_coords_demanda_mapa(
-    demanda: Demanda,
-    geocoder,
+def _coords_bloco_mapa(
+    bloco: list[Demanda],
     *,
-    persistir_geocode: bool = True,
-) -> tuple[float, float] | None:
-    """Retorna lat/lng da demanda; geocodifica indicações com endereço quando necessário."""
-    if demanda.latitude is not None and demanda.longitude is not None:
-        return float(demanda.latitude), float(demanda.longitude)
-
-    if not _demanda_endereco_geocodificavel(demanda):
-        return None
-
-    geo = geocoder.resolver_endereco_geocode(
-        demanda.logradouro,
-        demanda.bairro,
-        demanda.cep,
+    persistir_geocode: bool,
+) -> tuple[list[tuple[Demanda, float, float]], dict[str, Demanda]]:
+    """
+    Coordenadas de um bloco de demandas: salvas na própria demanda ou lidas do
+    `GeocodeEnderecoCache` (uma consulta por bloco). Endereços sem entrada no
+    cache voltam em `faltantes` para serem registrados como pendentes.
+    """
+    from core.services.geocode_cache_service import (
+        buscar_em_lote,
+        chave_geocode_demanda,
+        coords_do_resultado,
     )
-    lat = geo.get('latitude')
-    lng = geo.get('longitude')
-    if lat is None or lng is None:
-        lat = geo.get('latitude_bruta')
-        lng = geo.get('longitude_bruta')
-    if lat is None or lng is None:
-        return None
-
-    if persistir_geocode:
-        _persistir_coords_indicacao(demanda, geo)
 
-    return float(lat), float(lng)
+    chaves: dict[int, str] = {}
+    for demanda in bloco:
+        if demanda.latitude is None or demanda.longitude is None:
+            chave = chave_geocode_demanda(demanda)
+            if chave:
+                chaves[int(demanda.pk)] = chave
+    cache_geo = buscar_em_lote(chaves.values())
+
+    pontos: list[tuple[Demanda, float, float]] = []
+    faltantes: dict[str, Demanda] = {}
+    for demanda in bloco:
+        if demanda.latitude is not None and demanda.longitude is not None:
+            pontos.append((demanda, float(demanda.latitude), float(demanda.longitude)))
+            continue
+        chave = chaves.get(int(demanda.pk))
+        if not chave:
+            continue
+        entrada = cache_geo.get(chave)
+        if entrada is None:
+            faltantes.setdefault(chave, demanda)
+            continue
+        coords = coords_do_resultado(entrada.resultado or {})
+        if coords is None:
+            continue
+        if persistir_geocode:
+            _persistir_coords_indicacao(demanda, entrada.resultado)
+        pontos.append((demanda, coords[0], coords[1]))
+    return pontos, faltantes
 
 
 def iter_demandas_geolocalizadas_mapa(
     queryset,
     *,
-    geocoder=None,
     persistir_geocode: bool = True,
 ) -> Iterator[tuple[Demanda, float, float]]:
-    """Demandas com coordenadas válidas para exibição no mapa (salvas ou resolvidas)."""
-    if geocoder is None:
-        from core.services.geocoding_service import GeocodingService
+    """
+    Demandas com coordenadas válidas para exibição no mapa (salvas ou em cache).
 
-        geocoder = GeocodingService()
+    Não geocodifica durante a requisição: endereços ainda sem cache são
+    registrados como pendentes e a geocodificação em lote é agendada.
+    """
+    from core.services.geocode_cache_service import agendar_geocodificacao, registrar_pendentes
 
-    for demanda in queryset.iterator(chunk_size=200):
-        coords = _resolver_coords_demanda_mapa(
-            demanda,
-            geocoder,
-            persistir_geocode=persistir_geocode,
-        )
-        if coords is None:
-            continue
-        yield demanda, coords[0], coords[1]
+    faltantes: dict[str, Demanda] = {}
+    iterador = queryset.iterator(chunk_size=_LOTE_GEOCODE_MAPA)
+    while bloco := list(islice(iterador, _LOTE_GEOCODE_MAPA)):
+        pontos, faltantes_bloco = _coords_bloco_mapa(bloco, persistir_geocode=persistir_geocode)
+        for chave, demanda in faltantes_bloco.items():
+            faltantes.setdefault(chave, demanda)
+        yield from pontos
+
+    if faltantes:
+        registrar_pendentes(faltantes)
+        agendar_geocodificacao()
 
 
 def serializar_locations(queryset, *, super_os_only: bool = False) -> list[dict[str, Any]]:
@@ -217,50 +235,70 @@ def serializar_locations(queryset, *, super_os_only: bool = False) -> list[dict[
     cluster_svc = ClusterService()
     agora = timezone.now()
     locations: list[dict[str, Any]] = []
+    pontos = iter_demandas_geolocalizadas_mapa(queryset)
+    while bloco := list(islice(pontos, _LOTE_SUPER_OS_MAPA)):
+        super_os_map = cluster_svc.info_operacional_super_os_em_lote(
+            demanda for demanda, _lat, _lng in bloco
+        )
+        for demanda, lat, lng in bloco:
+            super_info = super_os_map[int(demanda.pk)]
+            if super_os_only and not super_info.get('ativo'):
+                continue
+            locations.append(_location_mapa(demanda, lat, lng, super_info, agora))
 
-    for demanda, lat, lng in iter_demandas_geolocalizadas_mapa(queryset):
-        super_info = cluster_svc.info_operacional_super_os(demanda)
-        if super_os_only and not super_info.get('ativo'):
-            continue
-
-        is_atrasada = _demanda_atrasada(demanda, agora)
-        unidade = demanda.unidade_administrativa
-        locations.append({
-            'id': demanda.id,
-            'lat': lat,
-            'lng': lng,
-            'titulo': demanda.titulo,
-            'protocolo': demanda.protocolo_executivo or demanda.protocolo_legislativo,
-            'protocolo_legislativo': demanda.protocolo_legislativo,
-            'protocolo_executivo': demanda.protocolo_executivo,
-            'status': demanda.status,
-            'status_display': demanda.get_status_display(),
-            'is_atrasada': is_atrasada,
-            'bairro': demanda.bairro or '',
-            'sinapse_servico_id': demanda.sinapse_servico_id,
-            'servico_nome': _nome_servico(demanda.sinapse_servico_id),
-            'data_criacao': demanda.data_criacao.isoformat() if demanda.data_criacao else None,
-            'sinapse_orgao_id': demanda.sinapse_orgao_id,
-            'unidade_sigla': unidade.sigla if unidade else None,
-            'unidade_nome': unidade.nome if unidade else None,
-            'super_os': {
-                'ativo': super_info.get('ativo', False),
-                'protocolo_super_os': super_info.get('protocolo_super_os'),
-                'eh_lider': super_info.get('eh_lider', True),
-                'cluster_id': super_info.get('cluster_id'),
-                'total_vinculados': super_info.get('total_vinculados', 0),
-            },
-        })
+    # Nomes de serviço resolvidos de uma vez ao fim (o queryset é percorrido em streaming).
+    resolvedor = ResolvedorCatalogo().registrar(
+        servicos=(loc['sinapse_servico_id'] for loc in locations)
+    )
+    for loc in locations:
+        loc['servico_nome'] = _nome_servico(loc['sinapse_servico_id'], resolvedor)
 
     return locations
 
 
-def _nome_servico(servico_id: int | None) -> str:
+def _location_mapa(
+    demanda: Demanda,
+    lat: float,
+    lng: float,
+    super_info: dict[str, Any],
+    agora: datetime,
+) -> dict[str, Any]:
+    is_atrasada = _demanda_atrasada(demanda, agora)
+    unidade = demanda.unidade_administrativa
+    return {
+        'id': demanda.id,
+        'lat': lat,
+        'lng': lng,
+        'titulo': demanda.titulo,
+        'protocolo': demanda.protocolo_executivo or demanda.protocolo_legislativo,
+        'protocolo_legislativo': demanda.protocolo_legislativo,
+        'protocolo_executivo': demanda.protocolo_executivo,
+        'status': demanda.status,
+        'status_display': demanda.get_status_display(),
+        'is_atrasada': is_atrasada,
+        'bairro': demanda.bairro or '',
+        'sinapse_servico_id': demanda.sinapse_servico_id,
+        'servico_nome': None,
+        'data_criacao': demanda.data_criacao.isoformat() if demanda.data_criacao else None,
+        'sinapse_orgao_id': demanda.sinapse_orgao_id,
+        'unidade_sigla': unidade.sigla if unidade else None,
+        'unidade_nome': unidade.nome if unidade else None,
+        'super_os': {
+            'ativo': super_info.get('ativo', False),
+            'protocolo_super_os': super_info.get('protocolo_super_os'),
+            'eh_lider': super_info.get('eh_lider', True),
+            'cluster_id': super_info.get('cluster_id'),
+            'total_vinculados': super_info.get('total_vinculados', 0),
+        },
+    }
+
+
+def _nome_servico(servico_id: int | None, resolvedor: ResolvedorCatalogo) -> str:
     if not servico_id:
         return 'Sem serviço'
-    svc = sinapse_catalog.get_servico(int(servico_id))
-    if svc and svc.titulo:
-        return svc.titulo.strip()
+    titulo = resolvedor.titulo_servico(servico_id)
+    if titulo:
+        return titulo.strip()
     return f'Serviço {servico_id}'
 
 
@@ -314,12 +352,13 @@ def agregar_espacial_sazonal_de_locations(
         if mes_label:
             matriz_counter[(bairro, sid, mes_label)] += 1
 
+    resolvedor = ResolvedorCatalogo().registrar(servicos=(sid for _b, sid in hotspot_counter))
     matriz = sorted(
         [
             {
                 'bairro': bairro,
                 'sinapse_servico_id': sid,
-                'servico_nome': _nome_servico(sid),
+                'servico_nome': _nome_servico(sid, resolvedor),
                 'mes': mes,
                 'total': total,
             }
@@ -352,7 +391,7 @@ def agregar_espacial_sazonal_de_locations(
             {
                 'bairro': b,
                 'sinapse_servico_id': sid,
-                'servico_nome': _nome_servico(sid),
+                'servico_nome': _nome_servico(sid, resolvedor),
                 'total': total,
             }
             for (b, sid), total in hotspot_counter.items()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass, field
 from datetime import timedelta
 from typing import Iterable
 
@@ -24,6 +25,15 @@ logger = logging.getLogger(__name__)
 DEDUPE_JANELA = timedelta(minutes=3)
 
 
+@dataclass
+class _MapasSecretaria:
+    """Setores → órgão, responsáveis SECRETARIA por setor e SECRETARIA por órgão (fallback)."""
+
+    orgao_por_unidade: dict[int, int] = field(default_factory=dict)
+    responsaveis_por_unidade: dict[int, list[Usuario]] = field(default_factory=dict)
+    secretarias_por_orgao: dict[int, list[Usuario]] = field(default_factory=dict)
+
+
 class NotificacaoService:
     # ------------------------------------------------------------------ util
 
@@ -75,17 +85,60 @@ class NotificacaoService:
         link: str,
         dedupe: bool = True,
     ) -> int:
-        criadas = 0
-        vistos: set[int] = set()
-        for usuario in destinatarios:
-            if not usuario or not usuario.is_active or usuario.pk in vistos:
-                continue
-            vistos.add(int(usuario.pk))
-            if self.criar(
-                usuario, tipo=tipo, mensagem=mensagem, link=link, dedupe=dedupe
-            ):
-                criadas += 1
-        return criadas
+        return self.criar_envios_em_lote(
+            [(destinatarios, mensagem, link)], tipo=tipo, dedupe=dedupe
+        )
+
+    def criar_envios_em_lote(
+        self,
+        envios: Iterable[tuple[Iterable[Usuario], str, str]],
+        *,
+        tipo: str,
+        dedupe: bool = True,
+    ) -> int:
+        """
+        Grava várias mensagens `(destinatarios, mensagem, link)` do mesmo tipo.
+
+        Mesma regra de `criar`: ignora inativos, repetidos na mensagem e envios
+        idênticos na janela de dedupe — mas com uma consulta e um `bulk_create`.
+        """
+        pendentes: list[Notificacao] = []
+        for destinatarios, mensagem, link in envios:
+            vistos: set[int] = set()
+            for usuario in destinatarios:
+                if not usuario or not usuario.is_active or usuario.pk in vistos:
+                    continue
+                vistos.add(int(usuario.pk))
+                pendentes.append(
+                    Notificacao(
+                        destinatario=usuario,
+                        tipo=tipo,
+                        mensagem=mensagem,
+                        link=link,
+                    )
+                )
+        if not pendentes:
+            return 0
+
+        if dedupe:
+            existentes = set(
+                Notificacao.objects.filter(
+                    tipo=tipo,
+                    destinatario_id__in={n.destinatario_id for n in pendentes},
+                    link__in={n.link for n in pendentes},
+                    data_criacao__gte=timezone.now() - DEDUPE_JANELA,
+                ).values_list("destinatario_id", "mensagem", "link")
+            )
+            if existentes:
+                pendentes = [
+                    n
+                    for n in pendentes
+                    if (n.destinatario_id, n.mensagem, n.link) not in existentes
+                ]
+        if not pendentes:
+            return 0
+        Notificacao.objects.bulk_create(pendentes, batch_size=500)
+        return len(pendentes)
 
     def _destinatarios_acompanhamento(self, demanda: Demanda) -> list[Usuario]:
         from core.services.acompanhamento_demanda_service import AcompanhamentoDemandaService
@@ -224,65 +277,125 @@ class NotificacaoService:
 
         return orgaos, unidades
 
+    def _mapas_secretaria(self, orgaos: set[int], unidades: set[int]) -> _MapasSecretaria:
+        """Três consultas para qualquer quantidade de setores/órgãos (uso em lote no SLA)."""
+        from core.models_unidade_administrativa import (
+            UnidadeAdministrativa,
+            UnidadeAdministrativaResponsavel,
+        )
+
+        mapas = _MapasSecretaria()
+        if unidades:
+            for uid, oid in UnidadeAdministrativa.objects.filter(pk__in=unidades).values_list(
+                "pk", "sinapse_orgao_id"
+            ):
+                if oid is not None:
+                    mapas.orgao_por_unidade[int(uid)] = int(oid)
+            for resp in UnidadeAdministrativaResponsavel.objects.filter(
+                unidade_id__in=unidades,
+                ativo=True,
+                usuario__perfil="SECRETARIA",
+                usuario__is_active=True,
+            ).select_related("usuario"):
+                mapas.responsaveis_por_unidade.setdefault(int(resp.unidade_id), []).append(
+                    resp.usuario
+                )
+
+        orgaos_alvo = set(orgaos) | set(mapas.orgao_por_unidade.values())
+        if orgaos_alvo:
+            for u in Usuario.objects.filter(
+                perfil="SECRETARIA",
+                sinapse_orgao_id__in=orgaos_alvo,
+                is_active=True,
+            ):
+                mapas.secretarias_por_orgao.setdefault(int(u.sinapse_orgao_id), []).append(u)
+        return mapas
+
     def _usuarios_secretaria_setores(
         self,
         orgaos: set[int],
         unidades: set[int],
         *,
         fallback_orgao_sem_setor: bool = True,
+        mapas: _MapasSecretaria | None = None,
     ) -> list[Usuario]:
         """Secretarias vinculadas aos setores; fallback por órgão quando não há setor."""
-        from core.models_unidade_administrativa import (
-            UnidadeAdministrativa,
-            UnidadeAdministrativaResponsavel,
-        )
+        if mapas is None:
+            mapas = self._mapas_secretaria(orgaos, unidades)
 
         usuarios: list[Usuario] = []
         vistos: set[int] = set()
 
         unidades_por_orgao: dict[int, set[int]] = {}
-        if unidades:
-            for uid, oid in UnidadeAdministrativa.objects.filter(pk__in=unidades).values_list(
-                "pk", "sinapse_orgao_id"
-            ):
-                if oid is not None:
-                    unidades_por_orgao.setdefault(int(oid), set()).add(int(uid))
+        for uid in unidades:
+            oid = mapas.orgao_por_unidade.get(int(uid))
+            if oid is not None:
+                unidades_por_orgao.setdefault(oid, set()).add(int(uid))
 
         orgaos_alvo = set(orgaos) | set(unidades_por_orgao.keys())
 
         for orgao_id in orgaos_alvo:
             setores_org = unidades_por_orgao.get(orgao_id, set())
             if setores_org:
-                for resp in (
-                    UnidadeAdministrativaResponsavel.objects.filter(
-                        unidade_id__in=setores_org,
-                        ativo=True,
-                        usuario__perfil="SECRETARIA",
-                        usuario__is_active=True,
-                    ).select_related("usuario")
-                ):
-                    u = resp.usuario
-                    if u.pk not in vistos:
-                        vistos.add(int(u.pk))
-                        usuarios.append(u)
+                candidatos = [
+                    u for uid in setores_org for u in mapas.responsaveis_por_unidade.get(uid, [])
+                ]
             elif fallback_orgao_sem_setor:
-                for u in Usuario.objects.filter(
-                    perfil="SECRETARIA",
-                    sinapse_orgao_id=int(orgao_id),
-                    is_active=True,
-                ):
-                    if u.pk not in vistos:
-                        vistos.add(int(u.pk))
-                        usuarios.append(u)
+                candidatos = mapas.secretarias_por_orgao.get(int(orgao_id), [])
+            else:
+                candidatos = []
+            for u in candidatos:
+                if u.pk not in vistos:
+                    vistos.add(int(u.pk))
+                    usuarios.append(u)
 
         return usuarios
 
+    def _perfis_gestores_setoriais(self) -> list[tuple[Usuario, set[int], set[int]]]:
+        """(gestor setorial, órgãos do escopo, setores geridos) — resolvido uma vez por chamada."""
+        perfis: list[tuple[Usuario, set[int], set[int]]] = []
+        for usuario in Usuario.objects.filter(perfil="GESTOR", is_active=True).prefetch_related(
+            "unidades_responsaveis"
+        ):
+            if tipo_gestor(usuario) != TIPO_SETORIAL:
+                continue
+            perfis.append(
+                (
+                    usuario,
+                    set(orgaos_escopo_gestor(usuario)),
+                    set(UnidadeAdministrativaService().ids_unidades_do_usuario(usuario)),
+                )
+            )
+        return perfis
+
+    @staticmethod
+    def _gestor_envolvido_no_processo(
+        usuario: Usuario,
+        escopo_orgaos: set[int],
+        ids_geridos: set[int],
+        orgaos: set[int],
+        unidades: set[int],
+        orgao_por_unidade: dict[int, int],
+    ) -> bool:
+        """Gestor setorial alcançado pelos setores envolvidos no processo (SLA / encerramento)."""
+        if unidades:
+            if ids_geridos.intersection(unidades):
+                return True
+            if not usuario.sinapse_orgao_id:
+                return False
+            oid = int(usuario.sinapse_orgao_id)
+            envolvidos_org = {orgao_por_unidade[u] for u in unidades if u in orgao_por_unidade}
+            return oid in envolvidos_org or oid in orgaos
+        return not (orgaos and escopo_orgaos.isdisjoint(orgaos))
+
     def _gestores_setoriais_envolvidos(
         self,
         orgaos: set[int],
         unidades: set[int],
         *,
         unidades_destino: set[int] | None = None,
+        perfis: list[tuple[Usuario, set[int], set[int]]] | None = None,
+        orgao_por_unidade: dict[int, int] | None = None,
     ) -> list[Usuario]:
         """
         Gestor setorial:
@@ -295,26 +408,24 @@ class NotificacaoService:
         gestores: list[Usuario] = []
         vistos: set[int] = set()
 
-        qs = Usuario.objects.filter(perfil="GESTOR", is_active=True).prefetch_related(
-            "unidades_responsaveis"
-        )
-
-        unidades_map: dict[int, UnidadeAdministrativa] = {}
-        if alvo_unidades:
-            unidades_map = {
-                u.pk: u
-                for u in UnidadeAdministrativa.objects.filter(pk__in=alvo_unidades)
-            }
-
-        for usuario in qs:
-            if tipo_gestor(usuario) != TIPO_SETORIAL:
-                continue
-            escopo_orgaos = set(orgaos_escopo_gestor(usuario))
+        if orgao_por_unidade is None:
+            orgao_por_unidade = {}
+            if alvo_unidades:
+                orgao_por_unidade = {
+                    int(pk): int(oid)
+                    for pk, oid in UnidadeAdministrativa.objects.filter(
+                        pk__in=alvo_unidades
+                    ).values_list("pk", "sinapse_orgao_id")
+                    if oid
+                }
+
+        if perfis is None:
+            perfis = self._perfis_gestores_setoriais()
+
+        for usuario, escopo_orgaos, ids_geridos in perfis:
             if orgaos and not escopo_orgaos.intersection(orgaos):
                 continue
 
-            ids_geridos = set(UnidadeAdministrativaService().ids_unidades_do_usuario(usuario))
-
             if unidades_destino is not None:
                 if not alvo_unidades:
                     if not usuario.sinapse_orgao_id or int(usuario.sinapse_orgao_id) not in orgaos:
@@ -323,30 +434,16 @@ class NotificacaoService:
                     if not ids_geridos and usuario.sinapse_orgao_id:
                         oid = int(usuario.sinapse_orgao_id)
                         dest_orgaos = {
-                            unidades_map[u].sinapse_orgao_id
-                            for u in alvo_unidades
-                            if u in unidades_map and unidades_map[u].sinapse_orgao_id
+                            orgao_por_unidade[u] for u in alvo_unidades if u in orgao_por_unidade
                         }
                         if oid not in dest_orgaos:
                             continue
                     else:
                         continue
-            else:
-                if alvo_unidades:
-                    if not ids_geridos.intersection(alvo_unidades):
-                        if usuario.sinapse_orgao_id:
-                            oid = int(usuario.sinapse_orgao_id)
-                            envolvidos_org = {
-                                unidades_map[u].sinapse_orgao_id
-                                for u in alvo_unidades
-                                if u in unidades_map and unidades_map[u].sinapse_orgao_id
-                            }
-                            if oid not in envolvidos_org and oid not in orgaos:
-                                continue
-                        else:
-                            continue
-                elif orgaos and escopo_orgaos.isdisjoint(orgaos):
-                    continue
+            elif not self._gestor_envolvido_no_processo(
+                usuario, escopo_orgaos, ids_geridos, orgaos, alvo_unidades, orgao_por_unidade
+            ):
+                continue
 
             if usuario.pk not in vistos:
                 vistos.add(int(usuario.pk))
@@ -373,6 +470,101 @@ class NotificacaoService:
                     destinatarios.append(u)
         return destinatarios
 
+    def setores_envolvidos_em_lote(
+        self, demandas: Iterable[Demanda]
+    ) -> dict[int, tuple[set[int], set[int]]]:
+        """`setores_envolvidos_demanda` para várias demandas com três consultas no total."""
+        from core.models_perna_operacional import PernaOperacional
+        from core.models_unidade_administrativa import UnidadeAdministrativa
+
+        setores: dict[int, tuple[set[int], set[int]]] = {}
+        for demanda in demandas:
+            orgaos: set[int] = set()
+            unidades: set[int] = set()
+            if demanda.sinapse_orgao_id:
+                orgaos.add(int(demanda.sinapse_orgao_id))
+            if demanda.unidade_administrativa_id:
+                unidades.add(int(demanda.unidade_administrativa_id))
+            setores[int(demanda.pk)] = (orgaos, unidades)
+        if not setores:
+            return setores
+
+        for modelo in (NoOperacional, PernaOperacional):
+            for did, oid, uid in modelo.objects.filter(demanda_id__in=setores).values_list(
+                "demanda_id", "sinapse_orgao_id", "unidade_administrativa_id"
+            ):
+                orgaos, unidades = setores[int(did)]
+                if oid is not None:
+                    orgaos.add(int(oid))
+                if uid is not None:
+                    unidades.add(int(uid))
+
+        todas_unidades = {uid for _, unidades in setores.values() for uid in unidades}
+        if todas_unidades:
+            orgao_por_unidade = {
+                int(uid): int(oid)
+                for uid, oid in UnidadeAdministrativa.objects.filter(
+                    pk__in=todas_unidades
+                ).values_list("pk", "sinapse_orgao_id")
+                if oid is not None
+            }
+            for orgaos, unidades in setores.values():
+                orgaos.update(orgao_por_unidade[u] for u in unidades if u in orgao_por_unidade)
+        return setores
+
+    def destinatarios_sla_em_lote(self, demandas: Iterable[Demanda]) -> dict[int, list[Usuario]]:
+        """
+        `destinatarios_sla` para um lote de demandas (verificação diária de atrasos).
+
+        Protocolo, gestores e setores são carregados uma vez para o lote inteiro;
+        o custo deixa de crescer em consultas por demanda.
+        """
+        from core.models_acompanhamento import DemandaAcompanhamento
+
+        demandas = list(demandas)
+        setores = self.setores_envolvidos_em_lote(demandas)
+        todos_orgaos = {oid for orgaos, _ in setores.values() for oid in orgaos}
+        todas_unidades = {uid for _, unidades in setores.values() for uid in unidades}
+        mapas = self._mapas_secretaria(todos_orgaos, todas_unidades)
+        perfis = self._perfis_gestores_setoriais()
+        protocolo = self.usuarios_protocolo()
+        gerais = self.gestores_gerais()
+
+        acompanhantes: dict[int, list[Usuario]] = {}
+        for acomp in (
+            DemandaAcompanhamento.objects.filter(
+                demanda_id__in=setores,
+                ativo=True,
+                usuario__is_active=True,
+            )
+            .select_related("usuario")
+            .order_by("pk")
+        ):
+            acompanhantes.setdefault(int(acomp.demanda_id), []).append(acomp.usuario)
+
+        resultado: dict[int, list[Usuario]] = {}
+        for pk, (orgaos, unidades) in setores.items():
+            destinatarios: list[Usuario] = []
+            vistos: set[int] = set()
+            for lista in (
+                protocolo,
+                self._usuarios_secretaria_setores(orgaos, unidades, mapas=mapas),
+                self._gestores_setoriais_envolvidos(
+                    orgaos,
+                    unidades,
+                    perfis=perfis,
+                    orgao_por_unidade=mapas.orgao_por_unidade,
+                ),
+                gerais,
+                acompanhantes.get(pk, []),
+            ):
+                for u in lista:
+                    if u.pk not in vistos:
+                        vistos.add(int(u.pk))
+                        destinatarios.append(u)
+            resultado[pk] = destinatarios
+        return resultado
+
     # ------------------------------------------------------------------ eventos — vereador
 
     def _notificar_vereadores(
@@ -546,17 +738,16 @@ class NotificacaoService:
             link=link,
         ) + self._notificar_acompanhantes(demanda, "ATUALIZACAO", mensagem)
 
-    def notificar_sla_atraso(self, demanda: Demanda) -> int:
+    def mensagem_sla_atraso(self, demanda: Demanda) -> str:
         protocolo = self.protocolo_rotulo(demanda)
-        link = self.link_demanda(demanda.pk)
-        mensagem = (
-            f"Alerta SLA: processo {protocolo} ({demanda.titulo}) está atrasado."
-        )
+        return f"Alerta SLA: processo {protocolo} ({demanda.titulo}) está atrasado."
+
+    def notificar_sla_atraso(self, demanda: Demanda) -> int:
         return self.criar_em_lote(
             self.destinatarios_sla(demanda),
             tipo="ATRASO",
-            mensagem=mensagem,
-            link=link,
+            mensagem=self.mensagem_sla_atraso(demanda),
+            link=self.link_demanda(demanda.pk),
         )
 
     def cancelar_notificacoes_pos_despacho_inicial(
@@ -19,6 +19,7 @@ from integrations.models import SinapseServiceSync
 from .assinatura_pdf import contexto_assinatura_pdf
 from .oficio_corpo_pdf import preparar_corpo_pdf
 from .oficio_texto import montar_texto_oficio, montar_texto_oficio_lote
+from .resolvedor_catalogo import ResolvedorCatalogo
 
 logger = logging.getLogger(__name__)
 
@@ -165,16 +166,20 @@ class OficioService:
         ref = demandas[0]
         itens_pdf: list[dict[str, str]] = []
         itens_texto: list[dict[str, Any]] = []
+        resolvedor = ResolvedorCatalogo().registrar(
+            orgaos=(d.sinapse_orgao_id for d in demandas),
+            servicos=(d.sinapse_servico_id for d in demandas),
+        )
 
         for d in demandas:
-            catalog = sinapse_catalog.get_servico(d.sinapse_servico_id)
-            orgao = sinapse_catalog.get_orgao_nome(d.sinapse_orgao_id) or ""
+            servico_nome = resolvedor.titulo_servico(d.sinapse_servico_id) or ""
+            orgao = resolvedor.nome_orgao(d.sinapse_orgao_id) or ""
             relato_curto = (d.descricao or d.titulo or "")[:500]
             itens_pdf.append(
                 {
                     "titulo": d.titulo,
                     "corpo": d.descricao or relato_curto,
-                    "servico_nome": catalog.titulo if catalog else "",
+                    "servico_nome": servico_nome,
                     "secretaria": orgao,
                 }
             )
@@ -182,7 +187,7 @@ class OficioService:
                 {
                     "titulo": d.titulo,
                     "relato": relato_curto,
-                    "servico_nome": catalog.titulo if catalog else "",
+                    "servico_nome": servico_nome,
                     "orgao_nome": orgao,
                 }
             )
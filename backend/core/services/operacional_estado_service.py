@@ -28,6 +28,7 @@ from core.services.demanda_despacho_destinos import orgao_competente_servico
 from core.services import operacional_permissions as perm
 from core.services.envio_oficial_service import demanda_trilha_tendencia
 from core.services.perna_operacional_service import PernaOperacionalService
+from core.services.resolvedor_catalogo import ResolvedorCatalogo
 from integrations import sinapse_catalog
 
 logger = logging.getLogger(__name__)
@@ -1292,12 +1293,16 @@ class OperacionalEstadoService:
             return ua.sigla or ua.nome
         return None
 
-    def _enriquecer_metadata_timeline(self, meta: dict[str, Any]) -> dict[str, Any]:
+    def _enriquecer_metadata_timeline(
+        self, meta: dict[str, Any], resolvedor: ResolvedorCatalogo | None = None
+    ) -> dict[str, Any]:
         from core.services.scatter_gather_service import _enriquecer_destinos_scatter
 
+        if resolvedor is None:
+            resolvedor = ResolvedorCatalogo().registrar_metadata(meta)
         destinos = meta.get("destinos")
         if isinstance(destinos, list) and destinos:
-            meta["destinos"] = _enriquecer_destinos_scatter(destinos)
+            meta["destinos"] = _enriquecer_destinos_scatter(destinos, resolvedor)
 
         pernas = meta.get("pernas")
         if not isinstance(pernas, list):
@@ -1309,10 +1314,10 @@ class OperacionalEstadoService:
             item = dict(p)
             sid = item.get("secretaria_id")
             if sid and not item.get("orgao_nome"):
-                item["orgao_nome"] = sinapse_catalog.get_orgao_nome(int(sid))
+                item["orgao_nome"] = resolvedor.nome_orgao(sid)
             uid = item.get("unidade_administrativa_id")
             if uid and not item.get("setor_nome"):
-                item["setor_nome"] = self._nome_setor_timeline(uid)
+                item["setor_nome"] = resolvedor.nome_setor(uid)
             enriquecidas.append(item)
         meta["pernas"] = enriquecidas
         return meta
@@ -1358,6 +1363,23 @@ class OperacionalEstadoService:
 
         return ClusterService().conclusao_individual_super_os_ativa(lider)
 
+    @staticmethod
+    def _resolvedor_timeline(trams: list[Tramitacao]) -> ResolvedorCatalogo:
+        """Registra todo órgão/setor citado pela timeline para resolver em lote."""
+        resolvedor = ResolvedorCatalogo()
+        for tram in trams:
+            if isinstance(tram.metadata, dict):
+                resolvedor.registrar_metadata(tram.metadata)
+            resolvedor.registrar(
+                orgaos=(
+                    tram.demanda.sinapse_orgao_id,
+                    getattr(tram.unidade_destino, "sinapse_orgao_id", None),
+                    getattr(tram.unidade_origem, "sinapse_orgao_id", None),
+                ),
+                unidades=(tram.unidade_destino_id,),
+            )
+        return resolvedor
+
     def montar_timeline_operacional(
         self, demanda: Demanda, usuario=None
     ) -> list[dict[str, Any]]:
@@ -1368,6 +1390,7 @@ class OperacionalEstadoService:
             Tramitacao.objects.filter(demanda_id__in=demanda_ids, tipo__in=tipos)
             .select_related(
                 "demanda",
+                "demanda__unidade_administrativa",
                 "responsavel",
                 "unidade_destino",
                 "unidade_origem",
@@ -1376,6 +1399,7 @@ class OperacionalEstadoService:
             .order_by("timestamp")
         )
         trams_list = list(trams)
+        resolvedor = self._resolvedor_timeline(trams_list)
         demandas_com_conclusao_final = {
             t.demanda_id
             for t in trams_list
@@ -1419,7 +1443,7 @@ class OperacionalEstadoService:
             meta = dict(tram.metadata if isinstance(tram.metadata, dict) else {})
             if meta.get("espelhada_do_lider"):
                 continue
-            meta = self._enriquecer_metadata_timeline(meta)
+            meta = self._enriquecer_metadata_timeline(meta, resolvedor)
             tipo_exibicao = tram.tipo
             if meta.get("acao") == "ABERTURA_PERNAS_TRANSVERSAL":
                 tipo_exibicao = "ABERTURA_PERNAS_TRANSVERSAL"
@@ -1454,11 +1478,11 @@ class OperacionalEstadoService:
                 ):
                     continue
             orgao_id = meta.get("orgao_id") or tram.demanda.sinapse_orgao_id
-            orgao_nome = meta.get("orgao_nome") or sinapse_catalog.get_orgao_nome(orgao_id)
+            orgao_nome = meta.get("orgao_nome") or resolvedor.nome_orgao(orgao_id)
             uid = meta.get("unidade_administrativa_id")
-            setor_nome = meta.get("setor_nome") or self._nome_setor_timeline(uid)
+            setor_nome = meta.get("setor_nome") or resolvedor.nome_setor(uid)
             if not setor_nome and tram.unidade_destino_id:
-                setor_nome = self._nome_setor_timeline(tram.unidade_destino_id)
+                setor_nome = resolvedor.nome_setor(tram.unidade_destino_id)
             tipo_rotulo = tipo_exibicao
             if tipo_exibicao in ("CONCLUSAO_PARCIAL", "CONCLUSAO_TECNICA"):
                 tipo_rotulo = "CONCLUSAO"
@@ -1485,6 +1509,7 @@ class OperacionalEstadoService:
                     tipo_rotulo,
                     demanda=tram.demanda,
                     tramitacao=tram,
+                    resolvedor=resolvedor,
                 ),
                 "anexos": anexos_payload,
                 "no_id": meta.get("no_id"),
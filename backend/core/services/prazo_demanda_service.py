@@ -36,8 +36,49 @@ class PrazoResolvido:
 
 
 class PrazoDemandaService:
+    """
+    Configuração e prazo bruto por serviço ficam memoizados na instância: uma
+    listagem que reutiliza o mesmo serviço resolve cada `sinapse_servico_id` uma vez.
+    """
+
+    def __init__(self) -> None:
+        self._cfg: ConfiguracaoCarta | None = None
+        self._brutos: dict[int, tuple[int | None, str]] = {}
+
     def _config(self) -> ConfiguracaoCarta:
-        return ConfiguracaoCarta.carregar()
+        if self._cfg is None:
+            self._cfg = ConfiguracaoCarta.carregar()
+        return self._cfg
+
+    def precarregar_servicos(self, sinapse_servico_ids) -> None:
+        """Prazo bruto de vários serviços com uma consulta por fonte local."""
+        from core.models_carta_metadata import ServicoMetadataRico
+        from core.models_carta_otimizada import ServicoOtimizado
+
+        sids = {int(s) for s in sinapse_servico_ids if s} - self._brutos.keys()
+        if not sids:
+            return
+        otimizados: dict[int, int] = {}
+        for sid, prazo in ServicoOtimizado.objects.filter(
+            sinapse_servico_id__in=sids, ativo=True, prazo_dias__isnull=False
+        ).values_list("sinapse_servico_id", "prazo_dias"):
+            otimizados.setdefault(int(sid), int(prazo))
+        metadados: dict[int, int] = {}
+        for sid, prazo in ServicoMetadataRico.objects.filter(
+            sinapse_servico_id__in=sids, prazo_dias_numericos__isnull=False
+        ).values_list("sinapse_servico_id", "prazo_dias_numericos"):
+            metadados.setdefault(int(sid), int(prazo))
+        for sid in sids:
+            if sid in otimizados:
+                self._brutos[sid] = (otimizados[sid], "CARTA")
+                continue
+            prazo_sinapse = sinapse_catalog.prazo_dias(sid)
+            if prazo_sinapse is not None:
+                self._brutos[sid] = (int(prazo_sinapse), "SINAPSE")
+            elif sid in metadados:
+                self._brutos[sid] = (metadados[sid], "METADADO")
+            else:
+                self._brutos[sid] = (None, "INDEFINIDO")
 
     def prazo_servico_bruto(self, sinapse_servico_id: int | None) -> tuple[int | None, str]:
         """Prioridade: ServicoOtimizado → Sinapse → ServicoMetadataRico."""
@@ -45,7 +86,11 @@ class PrazoDemandaService:
             return None, "INDEFINIDO"
 
         sid = int(sinapse_servico_id)
+        if sid not in self._brutos:
+            self._brutos[sid] = self._prazo_servico_bruto(sid)
+        return self._brutos[sid]
 
+    def _prazo_servico_bruto(self, sid: int) -> tuple[int | None, str]:
         from core.models_carta_otimizada import ServicoOtimizado
 
         otimizado = (
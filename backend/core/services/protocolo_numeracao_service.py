@@ -9,6 +9,7 @@ from django.db.models import Q
 from django.utils import timezone
 
 from core.models import Demanda
+from core.services.sequencia_numeracao_service import escopo_oficio_autor, proximo_numero
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +17,8 @@ _PREFIXO_OFICIO = "OFICIO"
 _RE_OFICIO = re.compile(r"^(?:OFICIO-)?(\d{4})-(\d+)(?:-D\d+)?$", re.IGNORECASE)
 
 
-def proximo_protocolo_legislativo(autor_id: int, *, ano: int | None = None) -> str:
-    """Retorna AAAA-NNNN com sequência anual **por autor** (vereador)."""
-    if not autor_id:
-        raise ValueError("Autor da demanda é obrigatório para gerar o número do ofício.")
-
-    ano_ref = ano or timezone.now().year
+def _maior_sequencia_existente(autor_id: int, ano_ref: int) -> int:
+    """Maior número já gravado em `protocolo_legislativo` (semente da sequência no ano)."""
     prefixo_novo = f"{ano_ref}-"
     prefixo_legado = f"{_PREFIXO_OFICIO}-{ano_ref}-"
 
@@ -44,5 +41,23 @@ def proximo_protocolo_legislativo(autor_id: int, *, ano: int | None = None) -> s
                 autor_id,
                 texto,
             )
+    return max_seq
+
 
-    return f"{prefixo_novo}{max_seq + 1:04d}"
+def proximo_protocolo_legislativo(autor_id: int, *, ano: int | None = None) -> str:
+    """
+    Reserva e retorna AAAA-NNNN com sequência anual **por autor** (vereador).
+
+    O número sai do contador `SequenciaNumeracao` do autor no ano; os protocolos
+    já gravados só são lidos na primeira alocação do ano, para semear o contador.
+    """
+    if not autor_id:
+        raise ValueError("Autor da demanda é obrigatório para gerar o número do ofício.")
+
+    ano_ref = ano or timezone.now().year
+    numero = proximo_numero(
+        escopo_oficio_autor(autor_id),
+        ano_ref,
+        piso=lambda: _maior_sequencia_existente(autor_id, ano_ref),
+    )
+    return f"{ano_ref}-{numero:04d}"
@@ -0,0 +1,119 @@
+"""Resolução em lote de nomes de órgão, serviço e setor para uma requisição.
+
+Timelines, mapas e ofícios em lote exibem o nome do órgão/serviço Sinapse e a
+sigla do setor (`UnidadeAdministrativa`) de cada item. Em vez de um lookup por
+item, o chamador registra todos os ids antes de montar a resposta e o
+resolvedor busca cada tipo uma única vez (`get_orgaos`, `get_servicos`, um
+`pk__in` de unidades). Ids consultados sem registro prévio ainda funcionam:
+entram no próximo lote (uma consulta a mais, nunca uma por item repetido).
+
+O resolvedor vive só durante a montagem da resposta; não é cache entre
+requisições.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from integrations import sinapse_catalog
+
+
+def _ids(valores: Iterable[Any]) -> set[int]:
+    ids: set[int] = set()
+    for valor in valores:
+        if valor in (None, ""):
+            continue
+        try:
+            ids.add(int(valor))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+class ResolvedorCatalogo:
+    """Órgãos, serviços e unidades administrativas resolvidos uma vez por tipo."""
+
+    def __init__(self) -> None:
+        self._pendentes: dict[str, set[int]] = {"orgao": set(), "servico": set(), "unidade": set()}
+        self._orgaos: dict[int, Any] = {}
+        self._servicos: dict[int, Any] = {}
+        self._unidades: dict[int, Any] = {}
+
+    def registrar(
+        self,
+        *,
+        orgaos: Iterable[Any] = (),
+        servicos: Iterable[Any] = (),
+        unidades: Iterable[Any] = (),
+    ) -> "ResolvedorCatalogo":
+        self._pendentes["orgao"].update(_ids(orgaos) - self._orgaos.keys())
+        self._pendentes["servico"].update(_ids(servicos) - self._servicos.keys())
+        self._pendentes["unidade"].update(_ids(unidades) - self._unidades.keys())
+        return self
+
+    def registrar_metadata(self, meta: dict[str, Any]) -> "ResolvedorCatalogo":
+        """Ids citados em metadata de tramitação (raiz, `destinos` e `pernas`)."""
+        orgaos: list[Any] = [meta.get("orgao_id")]
+        unidades: list[Any] = [meta.get("unidade_administrativa_id"), meta.get("setor_id")]
+        for chave in ("destinos", "pernas"):
+            itens = meta.get(chave)
+            if not isinstance(itens, list):
+                continue
+            for item in itens:
+                if isinstance(item, dict):
+                    orgaos.append(item.get("secretaria_id"))
+                    unidades.append(item.get("unidade_administrativa_id"))
+        return self.registrar(orgaos=orgaos, unidades=unidades)
+
+    def _resolver(self, tipo: str) -> None:
+        ids = self._pendentes[tipo]
+        if not ids:
+            return
+        self._pendentes[tipo] = set()
+        if tipo == "orgao":
+            encontrados = sinapse_catalog.get_orgaos(ids)
+            destino = self._orgaos
+        elif tipo == "servico":
+            encontrados = sinapse_catalog.get_servicos(ids)
+            destino = self._servicos
+        else:
+            from core.models_unidade_administrativa import UnidadeAdministrativa
+
+            encontrados = UnidadeAdministrativa.objects.in_bulk(ids)
+            destino = self._unidades
+        for id_ in ids:
+            destino[id_] = encontrados.get(id_)
+
+    def _obter(self, tipo: str, destino: dict[int, Any], valor: Any) -> Any:
+        ids = _ids((valor,))
+        if not ids:
+            return None
+        (id_,) = ids
+        if id_ not in destino:
+            self._pendentes[tipo].add(id_)
+            self._resolver(tipo)
+        return destino.get(id_)
+
+    def orgao(self, orgao_id: Any):
+        self._resolver("orgao")
+        return self._obter("orgao", self._orgaos, orgao_id)
+
+    def servico(self, servico_id: Any):
+        self._resolver("servico")
+        return self._obter("servico", self._servicos, servico_id)
+
+    def unidade(self, unidade_id: Any):
+        self._resolver("unidade")
+        return self._obter("unidade", self._unidades, unidade_id)
+
+    def nome_orgao(self, orgao_id: Any) -> str | None:
+        orgao = self.orgao(orgao_id)
+        return orgao.nome if orgao else None
+
+    def titulo_servico(self, servico_id: Any) -> str | None:
+        servico = self.servico(servico_id)
+        return servico.titulo if servico else None
+
+    def nome_setor(self, unidade_id: Any) -> str | None:
+        ua = self.unidade(unidade_id)
+        return (ua.sigla or ua.nome) if ua else None
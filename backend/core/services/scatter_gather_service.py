@@ -13,6 +13,7 @@ from core.models_no_operacional import AcaoNoOperacional, NoOperacional, StatusN
 from core.models_operacional import ESTADO_AGUARDANDO_CONCLUSAO_FINAL, ESTADO_EM_OPERACAO
 from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
 from core.services import operacional_permissions as perm
+from core.services.resolvedor_catalogo import ResolvedorCatalogo
 from integrations import sinapse_catalog
 
 logger = logging.getLogger(__name__)
@@ -117,18 +118,11 @@ def _resumo_texto(descricao: str, max_len: int = 200) -> str:
     return texto[: max_len - 1].rstrip() + "…"
 
 
-def _nome_setor_unidade(uid: int | None) -> str | None:
-    if uid in (None, ""):
-        return None
-    from core.models_unidade_administrativa import UnidadeAdministrativa
-
-    ua = UnidadeAdministrativa.objects.filter(pk=int(uid)).first()
-    if ua:
-        return ua.sigla or ua.nome
-    return None
-
-
-def _enriquecer_destinos_scatter(destinos: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _enriquecer_destinos_scatter(
+    destinos: list[dict[str, Any]], resolvedor: ResolvedorCatalogo | None = None
+) -> list[dict[str, Any]]:
+    if resolvedor is None:
+        resolvedor = ResolvedorCatalogo().registrar_metadata({"destinos": destinos})
     enriquecidos: list[dict[str, Any]] = []
     for dest in destinos:
         if not isinstance(dest, dict):
@@ -136,10 +130,10 @@ def _enriquecer_destinos_scatter(destinos: list[dict[str, Any]]) -> list[dict[st
         item = dict(dest)
         sid = item.get("secretaria_id")
         if sid and not item.get("orgao_nome"):
-            item["orgao_nome"] = sinapse_catalog.get_orgao_nome(int(sid)) or str(sid)
+            item["orgao_nome"] = resolvedor.nome_orgao(sid) or str(sid)
         uid = item.get("unidade_administrativa_id")
         if uid and not item.get("setor_nome"):
-            item["setor_nome"] = _nome_setor_unidade(uid)
+            item["setor_nome"] = resolvedor.nome_setor(uid)
         enriquecidos.append(item)
     return enriquecidos
 
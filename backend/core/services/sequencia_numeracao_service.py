@@ -0,0 +1,85 @@
+"""Alocação de números sequenciais por (escopo, ano) em `SequenciaNumeracao`.
+
+Cada alocação é um único `UPDATE ... RETURNING` (ou `INSERT ... ON CONFLICT DO
+UPDATE ... RETURNING` na primeira vez do ano): o Postgres serializa os
+incrementos pelo lock de linha, então envios concorrentes recebem números
+distintos sem ler o máximo em Python nem depender de retry na constraint única.
+O lock dura até o fim da transação do chamador; se ela for desfeita, o número
+volta para a sequência.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from django.db import connection
+from django.utils import timezone
+
+from core.models_sequencia import SequenciaNumeracao
+
+ESCOPO_INDICACAO_CAMARA = "INDICACAO_CAMARA"
+
+
+def escopo_oficio_autor(autor_id: int) -> str:
+    return f"OFICIO_AUTOR:{int(autor_id)}"
+
+
+def _tabela() -> str:
+    return connection.ops.quote_name(SequenciaNumeracao._meta.db_table)
+
+
+def _upsert(escopo: str, ano: int, valor: int, atualizacao: str) -> int:
+    tabela = _tabela()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {tabela} (escopo, ano, ultimo_numero, atualizado_em) "
+            "VALUES (%s, %s, %s, %s) "
+            f"ON CONFLICT (escopo, ano) DO UPDATE SET ultimo_numero = {atualizacao}, "
+            "atualizado_em = EXCLUDED.atualizado_em "
+            "RETURNING ultimo_numero",
+            [escopo, int(ano), int(valor), timezone.now()],
+        )
+        return int(cursor.fetchone()[0])
+
+
+def _incrementar_existente(escopo: str, ano: int) -> int | None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {_tabela()} SET ultimo_numero = ultimo_numero + 1, atualizado_em = %s "
+            "WHERE escopo = %s AND ano = %s RETURNING ultimo_numero",
+            [timezone.now(), escopo, int(ano)],
+        )
+        linha = cursor.fetchone()
+    return int(linha[0]) if linha else None
+
+
+def proximo_numero(escopo: str, ano: int, *, piso: int | Callable[[], int] = 0) -> int:
+    """
+    Reserva e retorna o próximo número da sequência.
+
+    `piso` é o último número já usado fora do contador (dados legados, valor
+    informado pela Câmara): o resultado nunca fica abaixo de `piso + 1`. Quando
+    é um callable, só é avaliado se a sequência ainda não existe no ano.
+    """
+    if callable(piso):
+        numero = _incrementar_existente(escopo, ano)
+        if numero is not None:
+            return numero
+        piso = piso()
+    tabela = _tabela()
+    return _upsert(
+        escopo,
+        ano,
+        int(piso) + 1,
+        f"GREATEST({tabela}.ultimo_numero + 1, EXCLUDED.ultimo_numero)",
+    )
+
+
+def avancar_para(escopo: str, ano: int, numero: int) -> int:
+    """Registra `numero` como usado (número informado manualmente); nunca retrocede."""
+    return _upsert(escopo, ano, numero, f"GREATEST({_tabela()}.ultimo_numero, EXCLUDED.ultimo_numero)")
+
+
+def definir_ultimo(escopo: str, ano: int, numero: int) -> int:
+    """Sobrescreve o último número (correção administrativa; pode retroceder)."""
+    return _upsert(escopo, ano, numero, "EXCLUDED.ultimo_numero")
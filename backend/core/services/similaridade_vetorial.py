@@ -0,0 +1,245 @@
+"""Kernel vetorizado de similaridade de cosseno (NumPy, float32).
+
+Substitui os laços puro-Python de `triagem_service.cosine_similarity` quando há
+muitos candidatos: os vetores são empilhados numa matriz pré-normalizada e o lote
+inteiro é pontuado com um único produto matriz-vetor; o top-k sai de
+`np.argpartition` (O(n)) em vez de ordenar todos os scores.
+
+Também mantém em memória a matriz normalizada da carta Sinapse
+(`catalogo_sinapse_matriz`), usada pela triagem quando o pgvector não responde.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Recarrega a matriz da carta após este intervalo (catálogo muda pouco).
+CATALOGO_TTL_SEGUNDOS = 15 * 60
+
+
+def vetor_float32(vetor: Any) -> np.ndarray | None:
+    """Converte lista/ndarray/pgvector/JSON em vetor float32 1-D (None se inválido)."""
+    if vetor is None:
+        return None
+    if isinstance(vetor, str):
+        if not vetor.strip():
+            return None
+        try:
+            vetor = json.loads(vetor)
+        except (ValueError, TypeError):
+            return None
+    try:
+        arr = np.asarray(vetor, dtype=np.float32).reshape(-1)
+    except (TypeError, ValueError):
+        return None
+    return arr if arr.size else None
+
+
+def normalizar_linhas(matriz: np.ndarray) -> np.ndarray:
+    """Normaliza cada linha (L2); linhas nulas permanecem zero (score 0.0)."""
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    np.maximum(normas, np.float32(1e-12), out=normas)
+    return (matriz / normas).astype(np.float32, copy=False)
+
+
+def empilhar_normalizado(
+    vetores: Iterable[Any], dim: int | None = None
+) -> tuple[np.ndarray, list[int]]:
+    """
+    Empilha vetores numa matriz float32 normalizada.
+
+    Retorna (matriz, posicoes) — `posicoes` são os índices de entrada aceitos
+    (vetores vazios ou com dimensão divergente são descartados).
+    """
+    linhas: list[np.ndarray] = []
+    posicoes: list[int] = []
+    for i, vetor in enumerate(vetores):
+        arr = vetor_float32(vetor)
+        if arr is None:
+            continue
+        if dim is None:
+            dim = int(arr.size)
+        if arr.size != dim:
+            continue
+        linhas.append(arr)
+        posicoes.append(i)
+    if not linhas:
+        return np.zeros((0, dim or 0), dtype=np.float32), []
+    return normalizar_linhas(np.vstack(linhas)), posicoes
+
+
+def similaridades(consulta: Any, matriz_normalizada: np.ndarray) -> np.ndarray:
+    """Cosseno da consulta contra cada linha da matriz (já normalizada)."""
+    q = vetor_float32(consulta)
+    if (
+        q is None
+        or matriz_normalizada.size == 0
+        or q.size != matriz_normalizada.shape[1]
+    ):
+        return np.zeros(matriz_normalizada.shape[0], dtype=np.float32)
+    norma = float(np.linalg.norm(q))
+    if norma <= 0.0:
+        return np.zeros(matriz_normalizada.shape[0], dtype=np.float32)
+    return matriz_normalizada @ (q / np.float32(norma))
+
+
+def similaridades_lote(consultas: Sequence[Any], matriz_normalizada: np.ndarray) -> np.ndarray:
+    """
+    Cosseno de várias consultas contra a matriz num único produto matriz-matriz.
+
+    Retorna (len(consultas), linhas da matriz); consultas inválidas ficam com zeros.
+    """
+    n_linhas = matriz_normalizada.shape[0]
+    scores = np.zeros((len(consultas), n_linhas), dtype=np.float32)
+    if matriz_normalizada.size == 0 or not len(consultas):
+        return scores
+    q, aceitos = empilhar_normalizado(consultas, dim=matriz_normalizada.shape[1])
+    if aceitos:
+        # Linhas nulas continuam nulas após a normalização: score 0.0, como em `similaridades`.
+        scores[aceitos] = q @ matriz_normalizada.T
+    return scores
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Índices dos k maiores scores, em ordem decrescente (argpartition + sort do top)."""
+    n = int(scores.shape[0])
+    if n == 0 or k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    if k < n:
+        parte = np.argpartition(-scores, k - 1)[:k]
+    else:
+        parte = np.arange(n)
+    return parte[np.argsort(-scores[parte], kind="stable")]
+
+
+def cosine_similarity_lote(consulta: Any, vetores: Sequence[Any]) -> list[float]:
+    """Cosseno da consulta contra cada vetor (0.0 para vetores inválidos), na ordem de entrada."""
+    out = [0.0] * len(vetores)
+    q = vetor_float32(consulta)
+    if q is None or not vetores:
+        return out
+    matriz, posicoes = empilhar_normalizado(vetores, dim=int(q.size))
+    if not posicoes:
+        return out
+    for pos, score in zip(posicoes, similaridades(q, matriz).tolist()):
+        out[pos] = float(score)
+    return out
+
+
+def media_vetores(vetores: Sequence[Any]) -> list[float]:
+    """Média elemento a elemento (descarta vetores com dimensão divergente da primeira)."""
+    if not vetores:
+        return []
+    primeiro = vetor_float32(vetores[0])
+    if primeiro is None:
+        return []
+    dim = int(primeiro.size)
+    linhas = [a for a in (vetor_float32(v) for v in vetores) if a is not None and a.size == dim]
+    # Divide pelo total de entradas, como `_media_embeddings` legado.
+    soma = np.sum(np.vstack(linhas).astype(np.float64), axis=0)
+    return (soma / len(vetores)).tolist()
+
+
+@dataclass
+class CatalogoMatriz:
+    """Matriz pré-normalizada da carta + metadados alinhados por linha."""
+
+    matriz: np.ndarray
+    servico_ids: list[int]
+    titulos: list[str]
+    orgaos: list[str | None]
+    categorias: list[str | None]
+    carregado_em: float = field(default_factory=time.monotonic)
+
+    def __len__(self) -> int:
+        return len(self.servico_ids)
+
+    def buscar(self, consulta: Any, top_k: int) -> list[dict[str, Any]]:
+        """Ranking no formato de `TriagemService.buscar_servico_sinapse`."""
+        scores = similaridades(consulta, self.matriz)
+        resultados: list[dict[str, Any]] = []
+        for idx in top_k_indices(scores, int(top_k)).tolist():
+            score = float(scores[idx])
+            resultados.append(
+                {
+                    "servico_id": self.servico_ids[idx],
+                    "titulo": self.titulos[idx],
+                    "orgao": self.orgaos[idx],
+                    "categoria": self.categorias[idx],
+                    "score": round(score, 4),
+                    "distancia": round(1.0 - score, 4),
+                }
+            )
+        return resultados
+
+
+_catalogo_lock = threading.Lock()
+_catalogo_cache: CatalogoMatriz | None = None
+
+
+def _carregar_catalogo_sinapse(db_alias: str) -> CatalogoMatriz:
+    from integrations.models_sinapse import CatalogServico
+
+    rows = (
+        CatalogServico.objects.using(db_alias)
+        .filter(status=1)
+        .exclude(embedding__isnull=True)
+        .select_related("id_orgao", "id_categoria")
+        .only("id", "titulo", "id_orgao__nome", "id_categoria__nome", "embedding")
+        .iterator(chunk_size=200)
+    )
+    ids: list[int] = []
+    titulos: list[str] = []
+    orgaos: list[str | None] = []
+    categorias: list[str | None] = []
+    vetores: list[Any] = []
+    for servico in rows:
+        ids.append(int(servico.id))
+        titulos.append((servico.titulo or "").strip())
+        orgaos.append(getattr(servico.id_orgao, "nome", None))
+        categorias.append(getattr(servico.id_categoria, "nome", None))
+        vetores.append(servico.embedding)
+
+    matriz, posicoes = empilhar_normalizado(vetores)
+    return CatalogoMatriz(
+        matriz=matriz,
+        servico_ids=[ids[i] for i in posicoes],
+        titulos=[titulos[i] for i in posicoes],
+        orgaos=[orgaos[i] for i in posicoes],
+        categorias=[categorias[i] for i in posicoes],
+    )
+
+
+def catalogo_sinapse_matriz(db_alias: str = "sinapse") -> CatalogoMatriz:
+    """Matriz da carta Sinapse em memória (processo), recarregada após o TTL."""
+    global _catalogo_cache
+    cache = _catalogo_cache
+    if cache is not None and time.monotonic() - cache.carregado_em < CATALOGO_TTL_SEGUNDOS:
+        return cache
+    with _catalogo_lock:
+        cache = _catalogo_cache
+        if cache is None or time.monotonic() - cache.carregado_em >= CATALOGO_TTL_SEGUNDOS:
+            cache = _carregar_catalogo_sinapse(db_alias)
+            _catalogo_cache = cache
+            logger.info(
+                "Matriz da carta Sinapse carregada: %s serviços x %s dims.",
+                len(cache),
+                cache.matriz.shape[1] if cache.matriz.ndim == 2 else 0,
+            )
+        return cache
+
+
+def invalidar_catalogo_sinapse() -> None:
+    """Descarta a matriz em memória (próxima busca recarrega do Sinapse)."""
+    global _catalogo_cache
+    with _catalogo_lock:
+        _catalogo_cache = None
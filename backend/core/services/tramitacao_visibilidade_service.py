@@ -71,11 +71,20 @@ def _rotulo_unidade(unidade) -> str | None:
     return sigla or nome or None
 
 
-def _contexto_orgao_unidade_demanda(demanda) -> tuple[str | None, str | None]:
+def _nome_orgao(orgao_id, resolvedor=None) -> str | None:
+    if not orgao_id:
+        return None
+    if resolvedor is not None:
+        return resolvedor.nome_orgao(orgao_id)
+    return sinapse_catalog.get_orgao_nome(orgao_id)
+
+
+def _contexto_orgao_unidade_demanda(
+    demanda, resolvedor=None
+) -> tuple[str | None, str | None]:
     if demanda is None:
         return None, None
-    orgao_id = getattr(demanda, "sinapse_orgao_id", None)
-    orgao_nome = sinapse_catalog.get_orgao_nome(orgao_id) if orgao_id else None
+    orgao_nome = _nome_orgao(getattr(demanda, "sinapse_orgao_id", None), resolvedor)
     unidade = getattr(demanda, "unidade_administrativa", None)
     if unidade is None and hasattr(demanda, "unidade_administrativa_id"):
         unidade = demanda.unidade_administrativa
@@ -83,14 +92,16 @@ def _contexto_orgao_unidade_demanda(demanda) -> tuple[str | None, str | None]:
     return orgao_nome, unidade_nome
 
 
-def _contexto_orgao_unidade_tramitacao(tramitacao) -> tuple[str | None, str | None]:
+def _contexto_orgao_unidade_tramitacao(
+    tramitacao, resolvedor=None
+) -> tuple[str | None, str | None]:
     if tramitacao is None:
         return None, None
     unidade = getattr(tramitacao, "unidade_destino", None) or getattr(
         tramitacao, "unidade_origem", None
     )
     orgao_id = getattr(unidade, "sinapse_orgao_id", None) if unidade else None
-    orgao_nome = sinapse_catalog.get_orgao_nome(orgao_id) if orgao_id else None
+    orgao_nome = _nome_orgao(orgao_id, resolvedor)
     unidade_nome = _rotulo_unidade(unidade)
     return orgao_nome, unidade_nome
 
@@ -100,14 +111,18 @@ def rotulo_institucional_tramitacao(
     *,
     demanda=None,
     tramitacao=None,
+    resolvedor=None,
 ) -> str:
-    """Rótulo público na timeline do vereador (órgão/setor — sem nome de servidor)."""
+    """Rótulo público na timeline do vereador (órgão/setor — sem nome de servidor).
+
+    `resolvedor` (`ResolvedorCatalogo`) evita um lookup de órgão por item em listas.
+    """
     t = (tipo or "").upper()
     if t in _ROTULO_POR_TIPO:
         return _ROTULO_POR_TIPO[t]
 
-    orgao_tram, unidade_tram = _contexto_orgao_unidade_tramitacao(tramitacao)
-    orgao_dem, unidade_dem = _contexto_orgao_unidade_demanda(demanda)
+    orgao_tram, unidade_tram = _contexto_orgao_unidade_tramitacao(tramitacao, resolvedor)
+    orgao_dem, unidade_dem = _contexto_orgao_unidade_demanda(demanda, resolvedor)
     orgao_nome = orgao_tram or orgao_dem
     unidade_nome = unidade_tram or unidade_dem
 
@@ -10,10 +10,24 @@ Mantém compatibilidade total com a interface original.
 import logging
 import re
 from typing import Any, List, Dict
+from django.conf import settings
+from django.db import connection
 from django.db.models import Q
 from pgvector.django import CosineDistance
 
+from core.models_busca_lexical import CatalogoBuscaLexical
 from core.models_carta_otimizada import ServicoOtimizado
+from core.services.busca_lexical_catalogo import (
+    buscar_catalogo_lexical,
+    indice_lexical_disponivel,
+)
+from core.services.catalogo_otimizado_indice import (
+    ServicoIndexado,
+    indice_catalogo_otimizado,
+    nomes_sinapse,
+    texto_rag_resumido,
+)
+from core.services.copiloto_paralelo import mapear_em_paralelo
 from core.services.triagem_service import TriagemService
 from core.services.vector_service import VectorService
 
@@ -101,6 +115,19 @@ class TriagemOtimizadaService:
     
     def __init__(self):
         self.triagem_original = TriagemService()  # Fallback se necessário
+        self.usar_indice_memoria = bool(
+            getattr(settings, "TRIAGEM_OTIMIZADA_INDICE_MEMORIA", True)
+        )
+
+    def _indice(self):
+        """Índice em memória da carta otimizada (None → consultas ao banco)."""
+        if not self.usar_indice_memoria:
+            return None
+        try:
+            return indice_catalogo_otimizado()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("TriagemOtimizada: índice em memória indisponível - %s", exc)
+            return None
     
     def buscar_servico_sinapse(
         self,
@@ -166,6 +193,160 @@ class TriagemOtimizadaService:
                 embedding_demanda, top_k, texto_consulta
             )
     
+    def buscar_servicos_em_lote(
+        self,
+        consultas: List[tuple[List[float], str | None]],
+        top_k: int = 3,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Equivale a `[buscar_servico_sinapse(emb, top_k, texto) for emb, texto in consultas]`.
+
+        Os embeddings das consultas expandidas saem de um único lote no Kernel e a
+        busca vetorial de todas as consultas é feita numa passada (matriz em memória
+        ou `LATERAL` no pgvector). Reforço lexical e fallback seguem por consulta.
+        """
+        if not consultas:
+            return []
+        try:
+            embeddings = self._embeddings_expandidos_lote(consultas)
+            validos = [i for i, emb in enumerate(embeddings) if emb and len(emb) == 1024]
+            vetoriais = dict(
+                zip(
+                    validos,
+                    self._buscar_pgvector_otimizado_lote(
+                        [embeddings[i] for i in validos], top_k * 3
+                    ),
+                )
+            )
+        except Exception as e:
+            logger.error(f"TriagemOtimizada: erro na busca otimizada em lote: {str(e)}")
+            return [self.buscar_servico_sinapse(emb, top_k, texto) for emb, texto in consultas]
+
+        saida: List[List[Dict[str, Any]]] = []
+        pendentes: List[int] = []
+        for i, (_, texto_consulta) in enumerate(consultas):
+            try:
+                if i not in vetoriais:
+                    logger.warning("TriagemOtimizada: embedding inválido ou dimensão incorreta")
+                    resultados = []
+                else:
+                    resultados = self._combinar_vetorial_lexical(
+                        vetoriais[i], top_k, texto_consulta
+                    )
+            except Exception as e:
+                logger.error(f"TriagemOtimizada: erro na busca otimizada: {str(e)}")
+                resultados = []
+            if len(resultados) >= max(1, top_k // 2):
+                saida.append(resultados[:top_k])
+            else:
+                saida.append([])
+                pendentes.append(i)
+
+        if pendentes:
+            logger.warning(
+                "TriagemOtimizada: %s consulta(s) com poucos resultados na base otimizada, "
+                "usando fallback Sinapse",
+                len(pendentes),
+            )
+            fallback = mapear_em_paralelo(
+                lambda i: self.triagem_original.buscar_servico_sinapse(
+                    consultas[i][0], top_k, consultas[i][1]
+                ),
+                pendentes,
+            )
+            for i, resultados in zip(pendentes, fallback):
+                saida[i] = resultados
+        return saida
+
+    def _embeddings_expandidos_lote(
+        self, consultas: List[tuple[List[float], str | None]]
+    ) -> List[List[float]]:
+        """Embedding final de cada consulta (expansão lexical re-embedada num único lote)."""
+        finais = [emb for emb, _ in consultas]
+        expandir: dict[int, str] = {}
+        for i, (_, texto_consulta) in enumerate(consultas):
+            if not texto_consulta:
+                continue
+            texto_expandido = expandir_consulta_lexical(texto_consulta)
+            if texto_expandido != texto_consulta.lower():
+                logger.info(
+                    "TriagemOtimizada: expandindo '%s' → '%s'",
+                    texto_consulta[:50], texto_expandido[:80]
+                )
+                expandir[i] = texto_expandido
+        if expandir:
+            vetores = VectorService().generate_embeddings(list(expandir.values()))
+            for i, vetor in zip(expandir, vetores):
+                if vetor and len(vetor) == 1024:
+                    finais[i] = vetor
+        return finais
+
+    def _buscar_pgvector_otimizado_lote(
+        self,
+        embeddings: List[List[float]],
+        limit: int,
+    ) -> List[List[Dict[str, Any]]]:
+        """Busca vetorial de várias consultas: produto de matrizes no índice ou LATERAL no banco."""
+        if not embeddings:
+            return []
+        indice = self._indice()
+        if indice is not None:
+            return indice.buscar_vetorial_lote(embeddings, limit)
+        return self._buscar_pgvector_otimizado_db_lote(embeddings, limit)
+
+    def _buscar_pgvector_otimizado_db_lote(
+        self,
+        embeddings: List[List[float]],
+        limit: int,
+    ) -> List[List[Dict[str, Any]]]:
+        """Uma consulta pgvector para todas as consultas (`CROSS JOIN LATERAL`)."""
+        tabela = connection.ops.quote_name(ServicoOtimizado._meta.db_table)
+        valores = ", ".join(["(%s, %s::vector)"] * len(embeddings))
+        params: list[Any] = []
+        for ordem, emb in enumerate(embeddings):
+            params.extend([ordem, "[" + ",".join(repr(float(x)) for x in emb) + "]"])
+        params.append(int(limit))
+        sql = f"""
+            SELECT q.ordem, s.sinapse_servico_id, s.titulo_otimizado,
+                   s.score_qualidade_otimizado, s.texto_rag_otimizado, s.distancia
+            FROM (VALUES {valores}) AS q(ordem, emb)
+            CROSS JOIN LATERAL (
+                SELECT so.sinapse_servico_id, so.titulo_otimizado,
+                       so.score_qualidade_otimizado, so.texto_rag_otimizado,
+                       so.embedding_otimizado <=> q.emb AS distancia
+                FROM {tabela} so
+                WHERE so.ativo AND so.embedding_otimizado IS NOT NULL
+                ORDER BY so.embedding_otimizado <=> q.emb
+                LIMIT %s
+            ) s
+            ORDER BY q.ordem, s.distancia
+        """
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                linhas = cursor.fetchall()
+        except Exception as e:
+            logger.error(f"TriagemOtimizada: erro pgvector em lote - {str(e)}")
+            return [[] for _ in embeddings]
+
+        nomes = nomes_sinapse(sorted({int(linha[1]) for linha in linhas}))
+        saida: List[List[Dict[str, Any]]] = [[] for _ in embeddings]
+        for ordem, sid, titulo, qualidade, rag, distancia in linhas:
+            distancia = float(distancia)
+            orgao, categoria = nomes.get(int(sid), (None, None))
+            saida[ordem].append({
+                "servico_id": sid,
+                "titulo": titulo,
+                "orgao": orgao,
+                "categoria": categoria,
+                "score": round(1.0 - distancia, 4),
+                "distancia": round(distancia, 6),
+                "fonte": "base_otimizada",
+                "score_qualidade": qualidade,
+                "texto_rag": texto_rag_resumido(rag or ""),
+            })
+        return saida
+
     def _buscar_via_base_otimizada(
         self,
         embedding_demanda: List[float], 
@@ -180,7 +361,15 @@ class TriagemOtimizadaService:
         
         # Busca vetorial principal (aumentar fetch para melhor qualidade)
         resultados_vetorial = self._buscar_pgvector_otimizado(embedding_demanda, top_k * 3)
-        
+        return self._combinar_vetorial_lexical(resultados_vetorial, top_k, texto_consulta)
+
+    def _combinar_vetorial_lexical(
+        self,
+        resultados_vetorial: List[Dict[str, Any]],
+        top_k: int,
+        texto_consulta: str | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Reforço lexical, boost de domínio e corte dos resultados vetoriais."""
         # Log para debug
         logger.debug(f"TriagemOtimizada: {len(resultados_vetorial)} resultados vetoriais")
         
@@ -213,7 +402,18 @@ class TriagemOtimizadaService:
         limit: int
     ) -> List[Dict[str, Any]]:
         """Busca vetorial usando embeddings otimizados."""
-        
+        indice = self._indice()
+        if indice is not None:
+            return indice.buscar_vetorial(embedding_demanda, limit)
+        return self._buscar_pgvector_otimizado_db(embedding_demanda, limit)
+
+    def _buscar_pgvector_otimizado_db(
+        self,
+        embedding_demanda: List[float],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Busca vetorial via pgvector (sem índice em memória)."""
+
         try:
             # Query pgvector na base otimizada
             queryset = (
@@ -265,7 +465,68 @@ class TriagemOtimizadaService:
         limit: int
     ) -> List[Dict[str, Any]]:
         """Busca lexical complementar na base otimizada."""
-        
+        indice = self._indice()
+        if indice is None:
+            return self._buscar_lexical_otimizado_db(texto_consulta, limit)
+        termos = self._extrair_termos_busca(texto_consulta)
+        if not termos:
+            return []
+        return indice.buscar_lexical(termos, limit, self._score_lexical_indexado)
+
+    def _buscar_lexical_otimizado_db(
+        self,
+        texto_consulta: str,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Busca lexical no banco (sem índice em memória): full-text ranqueado."""
+        if not indice_lexical_disponivel(CatalogoBuscaLexical.FONTE_OTIMIZADA):
+            return self._buscar_lexical_otimizado_icontains(texto_consulta, limit)
+
+        try:
+            termos = self._extrair_termos_busca(texto_consulta)
+            if not termos:
+                return []
+            busca = buscar_catalogo_lexical(
+                texto_consulta, fonte=CatalogoBuscaLexical.FONTE_OTIMIZADA, limit=limit
+            )
+            por_id = ServicoOtimizado.objects.only(
+                "sinapse_servico_id",
+                "titulo_otimizado",
+                "texto_rag_otimizado",
+                "palavras_chave",
+                "score_qualidade_otimizado",
+            ).in_bulk(busca.ids, field_name="sinapse_servico_id")
+
+            resultados = []
+            # Ordem do ts_rank_cd; o score segue a escala calibrada de `_calcular_score_lexical`.
+            for item in busca.itens:
+                servico = por_id.get(item.servico_id)
+                if servico is None:
+                    continue
+                score_lexical = self._calcular_score_lexical(servico, termos)
+                resultados.append({
+                    "servico_id": item.servico_id,
+                    "titulo": servico.titulo_otimizado,
+                    "orgao": item.orgao,
+                    "categoria": item.categoria,
+                    "score": score_lexical,
+                    "distancia": 1.0 - score_lexical,
+                    "fonte": "base_otimizada_lexical",
+                    "score_qualidade": servico.score_qualidade_otimizado,
+                })
+            return resultados
+
+        except Exception as e:
+            logger.error(f"TriagemOtimizada: erro busca lexical - {str(e)}")
+            return []
+
+    def _buscar_lexical_otimizado_icontains(
+        self,
+        texto_consulta: str,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Busca lexical via `icontains` (base ainda não indexada para full-text)."""
+
         try:
             # Extrair termos de busca
             termos = self._extrair_termos_busca(texto_consulta)
@@ -343,13 +604,25 @@ class TriagemOtimizadaService:
     
     def _calcular_score_lexical(self, servico: ServicoOtimizado, termos: List[str]) -> float:
         """Calcula score de relevância lexical com peso forte no título e palavras-chave."""
+        return self._score_lexical_textos(
+            (servico.titulo_otimizado or "").lower(),
+            (servico.texto_rag_otimizado or "").lower(),
+            " ".join(servico.palavras_chave or []).lower(),
+            termos,
+        )
+
+    def _score_lexical_indexado(self, servico: ServicoIndexado, termos: List[str]) -> float:
+        return self._score_lexical_textos(
+            servico.titulo_lower, servico.rag_lower, servico.palavras_lower, termos
+        )
+
+    @staticmethod
+    def _score_lexical_textos(
+        titulo: str, rag: str, palavras: str, termos: List[str]
+    ) -> float:
         if not termos:
             return 0.0
 
-        titulo = (servico.titulo_otimizado or "").lower()
-        rag = (servico.texto_rag_otimizado or "").lower()
-        palavras = " ".join(servico.palavras_chave or []).lower()
-
         matches_titulo = sum(1 for t in termos if t in titulo)
         matches_rag = sum(1 for t in termos if t in rag)
         matches_kw = sum(1 for t in termos if t in palavras)
@@ -736,4 +1009,18 @@ class AdapterTriagemOtimizada:
         if self.usar_base_otimizada:
             return self.triagem_otimizada.buscar_servico_sinapse(*args, **kwargs)
         else:
-            return self.triagem_original.buscar_servico_sinapse(*args, **kwargs)
\ No newline at end of file
+            return self.triagem_original.buscar_servico_sinapse(*args, **kwargs)
+
+    def buscar_servicos_em_lote(
+        self, consultas: List[tuple[List[float], str | None]], top_k: int = 3
+    ) -> List[List[Dict[str, Any]]]:
+        """Várias consultas `(embedding, texto)` de uma vez; resultados na mesma ordem."""
+        if self.usar_base_otimizada:
+            return self.triagem_otimizada.buscar_servicos_em_lote(consultas, top_k)
+        # Carta Sinapse direta: sem busca em lote, as consultas correm em paralelo.
+        return mapear_em_paralelo(
+            lambda consulta: self.triagem_original.buscar_servico_sinapse(
+                consulta[0], top_k, consulta[1]
+            ),
+            consultas,
+        )
\ No newline at end of file
@@ -25,8 +25,9 @@ Estrategia de calculo:
 - A coluna `catalog_servico.embedding` no Sinapse e `vector(1024)` (pgvector
   0.8.1), nao TextField/JSON. Por isso a similaridade roda *no Postgres do
   Sinapse* via `pgvector.django.CosineDistance` (varredura nativa, sem
-  carregar 557+ vetores para a memoria). Mantemos um fallback puro-Python
-  (sem numpy) caso a coluna seja text/json em algum ambiente legado.
+  carregar 557+ vetores para a memoria). Mantemos um fallback in-memory
+  (matriz NumPy pre-normalizada, `similaridade_vetorial`) caso a coluna seja
+  text/json em algum ambiente legado.
 - Com `texto_consulta`, mescla resultados cujo `titulo` ou `texto_limpo_rag`
   contém termos típicos de zeladoria (ex.: buraco/tapa), para reduzir
   divergência entre o modelo de embedding da consulta e o usado na carta.
@@ -49,7 +50,7 @@ SINAPSE_DB_ALIAS = "sinapse"
 
 
 def cosine_similarity(a: list[float], b: list[float]) -> float:
-    """Cosseno puro Python — fallback quando a base nao usa pgvector."""
+    """Cosseno puro Python para pares avulsos; lotes usam `similaridade_vetorial`."""
     if not a or not b or len(a) != len(b):
         return 0.0
     dot = 0.0
@@ -179,6 +180,22 @@ class TriagemService:
             obrig.extend(["centen", "reserva"])
         return obrig
 
+    @staticmethod
+    def _rows_lexicais_de_itens(
+        itens, *, score: float | None = None, distancia: float | None = None
+    ) -> list[dict[str, Any]]:
+        return [
+            {
+                "servico_id": item.servico_id,
+                "titulo": (item.titulo or "").strip(),
+                "orgao": item.orgao,
+                "categoria": item.categoria,
+                "score": score,
+                "distancia": distancia,
+            }
+            for item in itens
+        ]
+
     def _rows_lexicais_de_queryset(self, qs) -> list[dict[str, Any]]:
         return [
             {
@@ -200,6 +217,12 @@ class TriagemService:
         if not obrig and not needles:
             return []
 
+        from core.models_busca_lexical import CatalogoBuscaLexical
+        from core.services.busca_lexical_catalogo import indice_lexical_disponivel
+
+        if indice_lexical_disponivel(CatalogoBuscaLexical.FONTE_SINAPSE):
+            return self._busca_lexical_sinapse_indexada(obrig, needles, limit)
+
         out: list[dict[str, Any]] = []
         seen: set[int] = set()
 
@@ -250,6 +273,45 @@ class TriagemService:
                     break
         return out
 
+    @classmethod
+    def _busca_lexical_sinapse_indexada(
+        cls, obrig: list[str], needles: list[str], limit: int
+    ) -> list[dict[str, Any]]:
+        """
+        Mesmo contrato de `_busca_lexical_sinapse`, com ranking `ts_rank_cd` no índice local.
+
+        Títulos com todos os termos obrigatórios vêm primeiro (score 0.92), filtrados no
+        banco: não dependem de caber na janela do ranking. Títulos que têm só parte deles
+        ficam de fora, como no filtro por `icontains`.
+        """
+        from core.models_busca_lexical import CatalogoBuscaLexical
+        from core.services.busca_lexical_catalogo import buscar_catalogo_lexical
+
+        texto = " ".join(obrig + needles)
+        limit = int(limit)
+
+        out: list[dict[str, Any]] = []
+        if obrig:
+            fortes = buscar_catalogo_lexical(
+                texto,
+                fonte=CatalogoBuscaLexical.FONTE_SINAPSE,
+                limit=limit,
+                expandir=False,
+                titulo_com_todos=obrig,
+            )
+            out = cls._rows_lexicais_de_itens(fortes.itens, score=0.92, distancia=0.08)
+        if len(out) >= limit:
+            return out
+
+        demais = buscar_catalogo_lexical(
+            texto,
+            fonte=CatalogoBuscaLexical.FONTE_SINAPSE,
+            limit=limit - len(out),
+            expandir=False,
+            titulo_sem_nenhum=obrig,
+        )
+        return out + cls._rows_lexicais_de_itens(demais.itens)
+
     @staticmethod
     def _merge_vetorial_lexical(
         vetorial: list[dict[str, Any]],
@@ -334,55 +396,13 @@ class TriagemService:
     def _buscar_via_fallback(
         self, embedding_demanda: list[float], top_k: int
     ) -> list[dict[str, Any]]:
-        """Fallback: traz vetores e calcula cosseno em Python.
+        """Fallback: cosseno em memoria contra a matriz pre-normalizada da carta.
 
         Usado se em algum ambiente legado a coluna ainda for TextField/JSON
-        (formato MOVA antigo). Iteracao limitada para nao estourar memoria.
+        (formato MOVA antigo). A matriz e carregada uma vez por processo
+        (TTL em `similaridade_vetorial`) e pontuada num unico produto
+        matriz-vetor + `argpartition` top-k.
         """
-        import json
-
-        from integrations.models_sinapse import CatalogServico
-
-        candidatos = (
-            CatalogServico.objects.using(SINAPSE_DB_ALIAS)
-            .filter(status=1)
-            .exclude(embedding__isnull=True)
-            .select_related("id_orgao", "id_categoria")
-            .only("id", "titulo", "id_orgao__nome", "id_categoria__nome", "embedding")
-            .iterator(chunk_size=200)
-        )
-
-        ranking: list[tuple[float, dict[str, Any]]] = []
-        for servico in candidatos:
-            raw = servico.embedding
-            if raw is None:
-                continue
-            if isinstance(raw, (list, tuple)):
-                vetor = list(raw)
-            elif isinstance(raw, str):
-                if not raw.strip():
-                    continue
-                try:
-                    vetor = json.loads(raw)
-                except (ValueError, TypeError):
-                    continue
-            else:
-                continue
-
-            score = cosine_similarity(list(embedding_demanda), list(vetor))
-            ranking.append(
-                (
-                    score,
-                    {
-                        "servico_id": int(servico.id),
-                        "titulo": (servico.titulo or "").strip(),
-                        "orgao": getattr(servico.id_orgao, "nome", None),
-                        "categoria": getattr(servico.id_categoria, "nome", None),
-                        "score": round(score, 4),
-                        "distancia": round(1.0 - score, 4),
-                    },
-                )
-            )
+        from core.services.similaridade_vetorial import catalogo_sinapse_matriz
 
-        ranking.sort(key=lambda item: item[0], reverse=True)
-        return [item[1] for item in ranking[: int(top_k)]]
+        return catalogo_sinapse_matriz(SINAPSE_DB_ALIAS).buscar(embedding_demanda, int(top_k))
@@ -8,12 +8,19 @@ demandas similares já indexadas no banco.
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import TYPE_CHECKING
 
 import requests
 from django.conf import settings
 from django.db.models import QuerySet
 
+from core.services import embedding_cache_service
+from core.services.http_externo import UPSTREAM_KERNEL, ClienteHttpExterno, cliente_http
+
 if TYPE_CHECKING:
     from core.models import Demanda
 
@@ -22,6 +29,68 @@ logger = logging.getLogger(__name__)
 
 EMBEDDING_DIMENSIONS = 1024
 
+def _sessao_kernel() -> ClienteHttpExterno:
+    """Cliente compartilhado do Kernel (Session com keep-alive + circuit breaker)."""
+    return cliente_http(UPSTREAM_KERNEL)
+
+
+class _AgrupadorEmbeddings:
+    """Coalesce chamadas concorrentes de `generate_embedding` em micro-lotes.
+
+    O primeiro chamador vira líder: espera a janela, recolhe o que chegou e faz
+    um único `generate_embeddings`. Os demais só aguardam o próprio Future.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pendentes: list[tuple[str, Future]] = []
+        self._lider_ativo = False
+
+    def submeter(self, servico: "VectorService", texto: str, janela_s: float) -> list[float]:
+        futuro: Future = Future()
+        with self._lock:
+            self._pendentes.append((texto, futuro))
+            lider = not self._lider_ativo
+            if lider:
+                self._lider_ativo = True
+
+        if lider:
+            time.sleep(janela_s)
+            with self._lock:
+                lote, self._pendentes = self._pendentes, []
+                self._lider_ativo = False
+            self._resolver(servico, lote)
+
+        try:
+            # Teto: janela + um POST por chunk do lote do líder.
+            return futuro.result(timeout=janela_s + servico.timeout * 4)
+        except FutureTimeoutError:
+            logger.error("Timeout aguardando micro-lote de embeddings.")
+            return []
+
+    @staticmethod
+    def _resolver(servico: "VectorService", lote: list[tuple[str, Future]]) -> None:
+        vetores: list[list[float]] = []
+        try:
+            vetores = servico._gerar_lote([texto for texto, _ in lote])
+        except Exception:  # noqa: BLE001 - nenhum seguidor pode ficar pendurado
+            logger.exception("Falha inesperada no micro-lote de embeddings.")
+        finally:
+            for i, (_, futuro) in enumerate(lote):
+                futuro.set_result(vetores[i] if i < len(vetores) else [])
+
+
+_agrupadores_lock = threading.Lock()
+_agrupadores: dict[tuple, _AgrupadorEmbeddings] = {}
+
+
+def _agrupador_para(chave: tuple) -> _AgrupadorEmbeddings:
+    with _agrupadores_lock:
+        agrupador = _agrupadores.get(chave)
+        if agrupador is None:
+            agrupador = _agrupadores[chave] = _AgrupadorEmbeddings()
+        return agrupador
+
 
 class VectorService:
     """Encapsula chamadas ao Kernel AI e a busca por similaridade no Postgres.
@@ -31,6 +100,12 @@ class VectorService:
       - "openai"   (OpenAI-compatible / Ollama): {"input": text, "model": ...}
 
     Controle via `settings.AI_KERNEL_EMBEDDING_PAYLOAD` ou env var de mesmo nome.
+
+    `generate_embeddings` envia vários textos por POST (chunks de
+    `AI_KERNEL_EMBEDDING_BATCH_SIZE`) numa Session com keep-alive;
+    `generate_embedding` passa pelo agrupador em micro-lotes quando
+    `AI_KERNEL_EMBEDDING_COALESCE_MS` > 0. Os dois consultam antes o cache
+    de embeddings (`embedding_cache_service`).
     """
 
     def __init__(self) -> None:
@@ -44,12 +119,19 @@ class VectorService:
         self.payload_format = getattr(
             settings, "AI_KERNEL_EMBEDDING_PAYLOAD", "gabinete"
         ).lower()
+        self.batch_size = max(1, int(getattr(settings, "AI_KERNEL_EMBEDDING_BATCH_SIZE", 32)))
+        self.coalesce_ms = max(0, int(getattr(settings, "AI_KERNEL_EMBEDDING_COALESCE_MS", 5)))
 
     def _build_payload(self, text: str) -> dict:
         if self.payload_format == "openai":
             return {"input": text, "model": self.model}
         return {"texts": [text], "model": self.model}
 
+    def _build_payload_lote(self, texts: list[str]) -> dict:
+        if self.payload_format == "openai":
+            return {"input": list(texts), "model": self.model}
+        return {"texts": list(texts), "model": self.model}
+
     def generate_embedding(self, text: str) -> list[float]:
         """Gera o embedding (1024 dim) para o texto informado.
 
@@ -61,51 +143,139 @@ class VectorService:
             logger.debug("generate_embedding chamado com texto vazio; retornando [].")
             return []
 
-        url = f"{self.base_url}/v1/embeddings"
-        payload = self._build_payload(cleaned)
+        em_cache = self._cache_buscar([cleaned])
+        if cleaned in em_cache:
+            return em_cache[cleaned]
+
+        if self.coalesce_ms > 0:
+            chave = (self.base_url, self.model, self.payload_format)
+            embedding = _agrupador_para(chave).submeter(self, cleaned, self.coalesce_ms / 1000.0)
+            self._cache_gravar({cleaned: embedding})
+            return embedding
+
+        data = self._post_embeddings(self._build_payload(cleaned))
+        if data is None:
+            return []
+        embedding = self._extract_embedding(data)
+        if not embedding:
+            logger.error(
+                "Resposta do Kernel AI sem campo de embedding reconhecido: chaves=%s",
+                list(data.keys()) if isinstance(data, dict) else type(data).__name__,
+            )
+            return []
+        self._avisar_dimensao(embedding)
+        self._cache_gravar({cleaned: embedding})
+        return embedding
 
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Embeddings em lote, na mesma ordem de `texts`.
+
+        Textos repetidos ou já presentes no cache de embeddings não vão ao
+        Kernel. Cada posição sem vetor (texto vazio, falha) volta como lista
+        vazia: se o POST de um chunk falhar por HTTP ou vier com contagem
+        divergente, o chunk é refeito texto a texto para que uma entrada ruim
+        não zere o lote inteiro. Falha de conexão/timeout não é refeita.
+        """
+        saida: list[list[float]] = [[] for _ in texts]
+        posicoes: dict[str, list[int]] = {}
+        for i, texto in enumerate(texts):
+            cleaned = (texto or "").strip()
+            if cleaned:
+                posicoes.setdefault(cleaned, []).append(i)
+
+        vetores = self._cache_buscar(list(posicoes))
+        faltando = [t for t in posicoes if t not in vetores]
+        novos = dict(zip(faltando, self._gerar_lote(faltando)))
+        self._cache_gravar(novos)
+        vetores.update(novos)
+
+        for texto, indices in posicoes.items():
+            for i in indices:
+                saida[i] = vetores.get(texto) or []
+        return saida
+
+    def _gerar_lote(self, unicos: list[str]) -> list[list[float]]:
+        """Vetores do Kernel para textos já limpos e únicos (sem cache)."""
+        saida: list[list[float]] = []
+        for inicio in range(0, len(unicos), self.batch_size):
+            saida.extend(self._embeddings_chunk(unicos[inicio : inicio + self.batch_size]))
+        return saida
+
+    def _cache_buscar(self, textos: list[str]) -> dict[str, list[float]]:
+        if not textos or not embedding_cache_service.cache_habilitado():
+            return {}
+        return embedding_cache_service.buscar(self.model, textos)
+
+    def _cache_gravar(self, vetores: dict[str, list[float]]) -> None:
+        if vetores and embedding_cache_service.cache_habilitado():
+            embedding_cache_service.gravar(self.model, vetores)
+
+    def _embeddings_chunk(self, chunk: list[str]) -> list[list[float]]:
+        if len(chunk) == 1:
+            data = self._post_embeddings(self._build_payload(chunk[0]))
+            vetor = self._extract_embedding(data) if data is not None else []
+            self._avisar_dimensao(vetor)
+            return [vetor]
+
+        erro: list[str] = []
+        data = self._post_embeddings(self._build_payload_lote(chunk), erro=erro)
+        if data is None and erro and erro[0] in ("timeout", "conexao"):
+            return [[] for _ in chunk]
+
+        vetores = self._extract_embeddings(data) if data is not None else []
+        if len(vetores) != len(chunk):
+            logger.warning(
+                "Lote de %s embeddings falhou ou veio incompleto (%s); refazendo texto a texto.",
+                len(chunk),
+                len(vetores),
+            )
+            return [self._embeddings_chunk([texto])[0] for texto in chunk]
+
+        for vetor in vetores:
+            self._avisar_dimensao(vetor)
+        return vetores
+
+    def _post_embeddings(self, payload: dict, erro: list[str] | None = None) -> dict | None:
+        """POST no Kernel; None em falha (motivo anexado em `erro`, se informado)."""
+        url = f"{self.base_url}/v1/embeddings"
+        motivo = ""
         try:
-            response = requests.post(url, json=payload, timeout=self.timeout)
+            response = _sessao_kernel().post(url, json=payload, timeout=self.timeout)
             response.raise_for_status()
-            data = response.json()
+            return response.json()
         except requests.Timeout:
+            motivo = "timeout"
             logger.error(
                 "Timeout (%ss) ao gerar embedding no Kernel AI: %s",
                 self.timeout,
                 url,
             )
-            return []
         except requests.ConnectionError as exc:
+            motivo = "conexao"
             logger.error("Falha de conexão com Kernel AI (%s): %s", url, exc)
-            return []
         except requests.HTTPError as exc:
+            motivo = "http"
             status = getattr(exc.response, "status_code", "?")
             body = getattr(exc.response, "text", "")[:300]
             logger.error(
                 "Kernel AI retornou HTTP %s em %s: %s", status, url, body
             )
-            return []
         except ValueError as exc:
+            motivo = "json"
             logger.error("Resposta inválida (JSON) do Kernel AI em %s: %s", url, exc)
-            return []
-
-        embedding = self._extract_embedding(data)
-        if not embedding:
-            logger.error(
-                "Resposta do Kernel AI sem campo de embedding reconhecido: chaves=%s",
-                list(data.keys()) if isinstance(data, dict) else type(data).__name__,
-            )
-            return []
+        if erro is not None:
+            erro.append(motivo)
+        return None
 
-        if len(embedding) != EMBEDDING_DIMENSIONS:
+    @staticmethod
+    def _avisar_dimensao(embedding: list[float]) -> None:
+        if embedding and len(embedding) != EMBEDDING_DIMENSIONS:
             logger.warning(
                 "Dimensão inesperada do embedding: %s (esperado %s).",
                 len(embedding),
                 EMBEDDING_DIMENSIONS,
             )
 
-        return embedding
-
     @staticmethod
     def _extract_embedding(data: dict) -> list[float]:
         """Normaliza formatos comuns: OpenAI-like, Ollama e Kernel Gabinete."""
@@ -122,6 +292,24 @@ class VectorService:
                 return first["embedding"]
         return []
 
+    @staticmethod
+    def _extract_embeddings(data: dict) -> list[list[float]]:
+        """Todos os vetores da resposta em lote (ordem de entrada)."""
+        if not isinstance(data, dict):
+            return []
+        if isinstance(data.get("embeddings"), list):
+            vetores = data["embeddings"]
+            return vetores if all(isinstance(v, list) for v in vetores) else []
+        if isinstance(data.get("data"), list):
+            itens = [i for i in data["data"] if isinstance(i, dict) and isinstance(i.get("embedding"), list)]
+            if len(itens) != len(data["data"]):
+                return []
+            itens.sort(key=lambda i: int(i.get("index", 0)))
+            return [i["embedding"] for i in itens]
+        if isinstance(data.get("embedding"), list):
+            return [data["embedding"]]
+        return []
+
     @staticmethod
     def find_similar_demanda(
         embedding: list[float], threshold: float = 0.7
@@ -1,166 +1,36 @@
 # /var/www/sgdl/backend/core/signals.py
 
 import logging
-import threading
 
 from django.db import transaction
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import Demanda, Tramitacao, Usuario
+from .models import Demanda, NoOperacional, Tramitacao, Usuario
+from .models_carta_otimizada import ServicoOtimizado
+from .services.busca_lexical_catalogo import (
+    indexar_servico_otimizado,
+    remover_servico_otimizado,
+)
+from .services.catalogo_otimizado_indice import invalidar_indice_catalogo_otimizado
 from .services.cluster_service import (
     DEMANDA_STATUS_ELEGIVEIS,
     ClusterService,
     embedding_presente,
 )
-from .services.vector_service import VectorService
-from .services.llm_service import LLMService
-from .services.triagem_service import TriagemService
-
-# Score minimo de cosseno (Carta de Servicos Sinapse) para preencher
-# `ia_categoria` quando o LLM Groq nao tiver dado um valor — modo assistivo
-# conforme regra `evolucao-sinapse-mova`: sugestao com validacao humana.
-SINAPSE_AUTOFILL_THRESHOLD = 0.6
+from .services.consulta_hub_service import invalidar_contadores_hub
+from .services.demanda_pipeline_ia_service import (
+    agendar_clusterizacao,
+    agendar_pipeline_ia,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def _montar_texto_embedding_demanda(demanda: Demanda) -> str:
-    partes: list[str] = []
-    if demanda.titulo:
-        t = demanda.titulo.strip()
-        if t:
-            partes.append(t)
-    if demanda.descricao:
-        d = demanda.descricao.strip()
-        if d:
-            partes.append(d)
-    if not partes:
-        return ""
-    if len(partes) == 1:
-        return partes[0]
-    return f"{partes[0]}\n\n{partes[1]}"
-
-
-def _aplicar_embedding_demanda_async(demanda_pk: int) -> None:
-    """Pipeline de IA pós-commit: embedding (Kernel) + triagem (Groq).
-
-    Idempotente: cada etapa só roda se o respectivo campo ainda estiver vazio.
-    `ia_processado` só vira True se *pelo menos uma* etapa preencheu algo,
-    permitindo retry automático no próximo save quando o serviço estiver de volta.
-    """
-    try:
-        demanda = Demanda.objects.get(pk=demanda_pk)
-    except Demanda.DoesNotExist:
-        logger.warning("Demanda pk=%s não encontrada para pipeline IA.", demanda_pk)
-        return
-
-    precisa_embedding = demanda.embedding is None
-    precisa_triagem = not (demanda.ia_categoria or "").strip()
-
-    if not precisa_embedding and not precisa_triagem:
-        return
-
-    texto = _montar_texto_embedding_demanda(demanda)
-    if not texto:
-        logger.debug("Demanda pk=%s sem texto utilizável; pulando pipeline IA.", demanda_pk)
-        return
-
-    update_fields: list[str] = []
-
-    if precisa_embedding:
-        vetor = VectorService().generate_embedding(texto)
-        if vetor:
-            demanda.embedding = vetor
-            update_fields.append("embedding")
-        else:
-            logger.info("Embedding indisponível agora para demanda pk=%s; retry futuro.", demanda_pk)
-
-    if precisa_triagem:
-        dados = LLMService().extrair_entidades(demanda.titulo or "", demanda.descricao or "")
-        if dados:
-            categoria = (dados.get("categoria_principal") or "").strip()
-            sentimento = (dados.get("sentimento_municipe") or "").strip()
-            if categoria:
-                demanda.ia_categoria = categoria[:100]
-                update_fields.append("ia_categoria")
-            if sentimento:
-                demanda.ia_sentimento = sentimento[:20]
-                update_fields.append("ia_sentimento")
-        else:
-            logger.info("Triagem indisponível agora para demanda pk=%s; retry futuro.", demanda_pk)
-
-    # 3. Triagem cruzada com a Carta de Servicos do Sinapse (modo assistivo).
-    #    Roda quando temos um vetor: o resultado fica no log de auditoria;
-    #    so preenche `ia_categoria` se ela ainda estiver vazia e o top
-    #    score for confiante (>= SINAPSE_AUTOFILL_THRESHOLD).
-    vetor_para_triagem = demanda.embedding if demanda.embedding is not None else None
-    if vetor_para_triagem is not None:
-        try:
-            sinapse_top = TriagemService().buscar_servico_sinapse(
-                list(vetor_para_triagem), top_k=3
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.warning(
-                "Triagem Sinapse falhou para demanda pk=%s: %s", demanda_pk, exc
-            )
-            sinapse_top = []
-
-        if sinapse_top:
-            logger.info(
-                "Triagem Sinapse demanda pk=%s top=%s",
-                demanda_pk,
-                [
-                    (item["servico_id"], item["titulo"][:40], item["score"])
-                    for item in sinapse_top
-                ],
-            )
-            top1 = sinapse_top[0]
-            categoria_sinapse = (top1.get("categoria") or "").strip()
-            if (
-                categoria_sinapse
-                and not (demanda.ia_categoria or "").strip()
-                and float(top1.get("score", 0.0)) >= SINAPSE_AUTOFILL_THRESHOLD
-            ):
-                demanda.ia_categoria = categoria_sinapse[:100]
-                if "ia_categoria" not in update_fields:
-                    update_fields.append("ia_categoria")
-
-    if not update_fields:
-        return
-
-    demanda.ia_processado = True
-    update_fields.append("ia_processado")
-    demanda.save(update_fields=update_fields)
-
-    demanda.refresh_from_db(fields=["status", "sinapse_servico_id", "embedding"])
-    if demanda.embedding is not None and demanda.status not in (
-        "RASCUNHO",
-        "CANCELADO",
-    ):
-        try:
-            ClusterService().atribuir_demanda_pk(int(demanda.pk))
-        except Exception as exc:  # noqa: BLE001
-            logger.warning(
-                "Clusterização falhou para demanda pk=%s: %s", demanda_pk, exc
-            )
-        try:
-            from core.services.fluxo_protocolo_service import FluxoProtocoloService
-
-            if demanda.sinapse_servico_id and demanda.status == "AGUARDANDO_PROTOCOLO":
-                FluxoProtocoloService().processar_cohorte_servico(
-                    int(demanda.sinapse_servico_id)
-                )
-        except Exception as exc:  # noqa: BLE001
-            logger.warning(
-                "Fluxo automático pós-IA falhou demanda pk=%s: %s", demanda_pk, exc
-            )
-
-
 @receiver(post_save, sender=Demanda)
 def demanda_gerar_embedding_post_save(sender, instance, created, **kwargs):
-    """Agenda pipeline IA pós-commit em thread daemon (não bloqueia o request)."""
+    """Agenda pipeline IA pós-commit (task Celery; síncrono sem broker)."""
     if not instance.pk:
         return
 
@@ -170,23 +40,7 @@ def demanda_gerar_embedding_post_save(sender, instance, created, **kwargs):
         return
 
     demanda_pk = int(instance.pk)
-
-    def _start_worker() -> None:
-        threading.Thread(
-            target=_aplicar_embedding_demanda_async,
-            args=(demanda_pk,),
-            daemon=True,
-            name=f"demanda-ia-{demanda_pk}",
-        ).start()
-
-    transaction.on_commit(_start_worker)
-
-
-def _clusterizar_demanda_async(demanda_pk: int) -> None:
-    try:
-        ClusterService().atribuir_demanda_pk(demanda_pk)
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("Clusterização async demanda pk=%s: %s", demanda_pk, exc)
+    transaction.on_commit(lambda: agendar_pipeline_ia(demanda_pk))
 
 
 def _despacho_automatico_async(demanda_pk: int) -> None:
@@ -289,14 +143,7 @@ def demanda_cluster_pos_save(sender, instance, created, **kwargs):
         return
 
     pk = int(instance.pk)
-    transaction.on_commit(
-        lambda: threading.Thread(
-            target=_clusterizar_demanda_async,
-            args=(pk,),
-            daemon=True,
-            name=f"demanda-cluster-{pk}",
-        ).start()
-    )
+    transaction.on_commit(lambda: agendar_clusterizacao(pk))
 
 
 @receiver(pre_save, sender=Demanda)
@@ -392,6 +239,47 @@ def notificar_eventos_demanda(sender, instance, created, **kwargs):
         AcompanhamentoDemandaService().encerrar_acompanhamentos_demanda(instance)
 
 
+def _invalidar_contadores_hub() -> None:
+    # Agora (mesma requisição) e após o commit (leituras concorrentes antes dele).
+    invalidar_contadores_hub()
+    transaction.on_commit(invalidar_contadores_hub)
+
+
+@receiver(post_save, sender=Demanda)
+def demanda_invalidar_contadores_hub(sender, instance, created, **kwargs):
+    if created or getattr(instance, "_status_antigo", None) != instance.status:
+        _invalidar_contadores_hub()
+
+
+@receiver(post_save, sender=Tramitacao)
+@receiver(post_save, sender=NoOperacional)
+@receiver(post_delete, sender=Demanda)
+@receiver(post_delete, sender=Tramitacao)
+@receiver(post_delete, sender=NoOperacional)
+def fila_invalidar_contadores_hub(sender, instance, **kwargs):
+    _invalidar_contadores_hub()
+
+
+@receiver(post_save, sender=ServicoOtimizado)
+@receiver(post_delete, sender=ServicoOtimizado)
+def servico_otimizado_invalidar_indice(sender, instance, **kwargs):
+    """Índice em memória da triagem otimizada recarrega na próxima busca."""
+    invalidar_indice_catalogo_otimizado()
+    transaction.on_commit(invalidar_indice_catalogo_otimizado)
+
+
+@receiver(post_save, sender=ServicoOtimizado)
+def servico_otimizado_indexar_busca_lexical(sender, instance, **kwargs):
+    """Mantém a fonte OTIMIZADA do índice full-text em dia com o serviço salvo."""
+    transaction.on_commit(lambda: indexar_servico_otimizado(instance))
+
+
+@receiver(post_delete, sender=ServicoOtimizado)
+def servico_otimizado_remover_busca_lexical(sender, instance, **kwargs):
+    sid = instance.sinapse_servico_id
+    transaction.on_commit(lambda: remover_servico_otimizado(sid))
+
+
 @receiver(post_save, sender=Tramitacao)
 def abrir_janela_edicao_tramitacao(sender, instance: Tramitacao, created, **kwargs):
     if not created:
@@ -1,6 +1,7 @@
 """Tasks Celery do SGDL — fila exclusiva `sgdl_default`."""
 
 from celery import shared_task
+from django.conf import settings
 
 
 @shared_task(name="sgdl.verificar_atrasos", queue="sgdl_default", ignore_result=True)
@@ -8,3 +9,100 @@ def verificar_atrasos_task() -> dict:
     from core.services.atraso_demanda_service import AtrasoDemandaService
 
     return AtrasoDemandaService().executar().as_dict()
+
+
+def _pipeline_retry_countdown(tentativa: int) -> int:
+    base = int(getattr(settings, "DEMANDA_PIPELINE_IA_RETRY_BACKOFF", 30))
+    teto = int(getattr(settings, "DEMANDA_PIPELINE_IA_RETRY_BACKOFF_MAX", 1800))
+    return min(teto, base * (2 ** max(0, tentativa)))
+
+
+@shared_task(
+    bind=True,
+    name="sgdl.pipeline_ia_demanda",
+    queue="sgdl_default",
+    ignore_result=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def pipeline_ia_demanda_task(self, demanda_pk: int) -> dict:
+    """Embedding + triagem + cluster de uma demanda; reagenda enquanto o Kernel estiver fora."""
+    from core.services.demanda_pipeline_ia_service import (
+        executar_pipeline_ia,
+        liberar_pipeline_ia,
+        renovar_pipeline_ia,
+    )
+
+    max_retries = int(getattr(settings, "DEMANDA_PIPELINE_IA_MAX_RETRIES", 6))
+    tentativa = int(self.request.retries or 0)
+    try:
+        resultado = executar_pipeline_ia(demanda_pk)
+    except Exception as exc:  # noqa: BLE001
+        if tentativa < max_retries:
+            countdown = _pipeline_retry_countdown(tentativa)
+            renovar_pipeline_ia(demanda_pk, countdown)
+            raise self.retry(exc=exc, countdown=countdown, max_retries=max_retries)
+        liberar_pipeline_ia(demanda_pk)
+        raise
+
+    if resultado.embedding_pendente and tentativa < max_retries:
+        countdown = _pipeline_retry_countdown(tentativa)
+        renovar_pipeline_ia(demanda_pk, countdown)
+        raise self.retry(countdown=countdown, max_retries=max_retries)
+    liberar_pipeline_ia(demanda_pk)
+    return resultado.as_dict()
+
+
+@shared_task(
+    name="sgdl.clusterizar_demanda",
+    queue="sgdl_default",
+    ignore_result=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def clusterizar_demanda_task(demanda_pk: int) -> None:
+    from core.services.demanda_pipeline_ia_service import (
+        clusterizar_demanda,
+        liberar_clusterizacao,
+    )
+
+    try:
+        clusterizar_demanda(demanda_pk)
+    finally:
+        liberar_clusterizacao(demanda_pk)
+
+
+@shared_task(
+    name="sgdl.recalcular_centroides_clusters",
+    queue="sgdl_default",
+    ignore_result=True,
+)
+def recalcular_centroides_clusters_task() -> int:
+    """Recálculo completo dos centróides abertos — corrige drift da soma incremental."""
+    from core.services.cluster_service import ClusterService
+
+    return ClusterService().recalcular_centroides()
+
+
+@shared_task(
+    name="sgdl.reindexar_busca_lexical",
+    queue="sgdl_default",
+    ignore_result=True,
+)
+def reindexar_busca_lexical_task() -> dict:
+    """Reconstrói o índice full-text da carta (Sinapse muda fora do SGDL)."""
+    from core.services.busca_lexical_catalogo import reindexar_otimizada, reindexar_sinapse
+
+    return {"sinapse": reindexar_sinapse(), "otimizada": reindexar_otimizada()}
+
+
+@shared_task(
+    name="sgdl.geocodificar_enderecos_pendentes",
+    queue="sgdl_default",
+    ignore_result=True,
+)
+def geocodificar_enderecos_pendentes_task(limite: int | None = None) -> dict:
+    """Preenche o `GeocodeEnderecoCache` dentro do rate limit do Nominatim."""
+    from core.services.geocode_cache_service import geocodificar_pendentes
+
+    return geocodificar_pendentes(limite)
@@ -15,6 +15,23 @@ SINAPSE_ORGAO_A = 2001
 SINAPSE_ORGAO_B = 2002
 
 
+def _fake_orgao_nome(oid):
+    if oid is None:
+        return None
+    return {
+        SINAPSE_ORGAO_A: "Secretaria A",
+        SINAPSE_ORGAO_B: "Secretaria B",
+    }.get(int(oid), f"Orgao {oid}")
+
+
+def _fake_servico(sid):
+    return type(
+        "CatalogServicoFake",
+        (),
+        {"titulo": "Serviço Teste", "id_orgao_id": SINAPSE_ORGAO_A, "prazo": "10 dias"},
+    )()
+
+
 def payload_envio_oficial(demanda):
     from core.services.assinatura_eletronica_service import (
         DECLARACAO_ENVIO,
@@ -35,22 +52,20 @@ class SinapseCatalogTestMixin:
         self._catalog_patch = patch.multiple(
             "integrations.sinapse_catalog",
             servico_existe=lambda sid: True,
+            servicos_existentes=lambda ids: {int(i) for i in ids},
             orgao_existe=lambda oid: int(oid) in (SINAPSE_ORGAO_A, SINAPSE_ORGAO_B),
             get_orgao_id_for_servico=lambda sid: SINAPSE_ORGAO_A,
             prazo_dias=lambda sid: 10,
-            get_orgao_nome=lambda oid: (
-                {
-                    SINAPSE_ORGAO_A: "Secretaria A",
-                    SINAPSE_ORGAO_B: "Secretaria B",
-                }.get(int(oid), f"Orgao {oid}")
-                if oid is not None
-                else None
-            ),
-            get_servico=lambda sid: type(
-                "CatalogServicoFake",
-                (),
-                {"titulo": "Serviço Teste", "id_orgao_id": SINAPSE_ORGAO_A, "prazo": "10 dias"},
-            )(),
+            get_orgao_nome=_fake_orgao_nome,
+            get_servico=_fake_servico,
+            get_orgaos=lambda ids: {
+                int(oid): type(
+                    "CatalogOrgaoFake", (), {"id": int(oid), "nome": _fake_orgao_nome(oid)}
+                )()
+                for oid in ids
+                if oid
+            },
+            get_servicos=lambda ids: {int(sid): _fake_servico(sid) for sid in ids if sid},
             servico_to_dict=lambda s: {
                 "id": SINAPSE_SERVICO_ID,
                 "nome": "Serviço Teste",
@@ -385,7 +400,7 @@ class HomologacaoSmokePorPerfilTests(SinapseCatalogTestMixin, APITestCase):
 
 
 class AIKernelClientContractTests(APITestCase):
-    @patch("core.services.ai_kernel_client.requests.get")
+    @patch("core.services.http_externo.ClienteHttpExterno.get")
     def test_health_success(self, mock_get):
         mock_response = Mock(status_code=200)
         mock_response.json.return_value = {"status": "online"}
@@ -395,7 +410,7 @@ class AIKernelClientContractTests(APITestCase):
         data = client.health()
         self.assertEqual(data["status"], "online")
 
-    @patch("core.services.ai_kernel_client.requests.post")
+    @patch("core.services.http_externo.ClienteHttpExterno.post")
     def test_embeddings_success(self, mock_post):
         mock_response = Mock(status_code=200)
         mock_response.json.return_value = {"embeddings": [[0.1, 0.2]]}
@@ -406,7 +421,7 @@ class AIKernelClientContractTests(APITestCase):
         self.assertEqual(len(embeddings), 1)
         self.assertEqual(embeddings[0][0], 0.1)
 
-    @patch("core.services.ai_kernel_client.requests.post")
+    @patch("core.services.http_externo.ClienteHttpExterno.post")
     def test_timeout_error_raises_custom_exception(self, mock_post):
         import requests
 
@@ -415,7 +430,7 @@ class AIKernelClientContractTests(APITestCase):
         with self.assertRaises(AIKernelClientError):
             client.chat("sistema", "usuario")
 
-    @patch("core.services.ai_kernel_client.requests.post")
+    @patch("core.services.http_externo.ClienteHttpExterno.post")
     def test_http_500_raises_custom_exception(self, mock_post):
         mock_response = Mock(status_code=500, text="internal error")
         mock_post.return_value = mock_response
@@ -423,7 +438,7 @@ class AIKernelClientContractTests(APITestCase):
         with self.assertRaises(AIKernelClientError):
             client.embeddings(["texto"])
 
-    @patch("core.services.ai_kernel_client.requests.post")
+    @patch("core.services.http_externo.ClienteHttpExterno.post")
     def test_safe_fallback_returns_empty_values(self, mock_post):
         import requests
 
@@ -500,9 +515,10 @@ class SinapseSyncContractTests(APITestCase):
         self.assertEqual(mapped["required_documents"], [])
         self.assertEqual(mapped["channels"], [])
 
+    @patch("integrations.sinapse_catalog.servicos_existentes", side_effect=lambda ids: set(ids))
     @patch("integrations.sinapse_catalog.servico_existe", return_value=True)
     @patch("integrations.services.sinapse_sync_service.SinapseClient")
-    def test_full_sync_idempotente(self, mock_client_cls, _mock_catalog):
+    def test_full_sync_idempotente(self, mock_client_cls, _mock_catalog, _mock_catalog_lote):
         rows = [
             {
                 "id": 1,
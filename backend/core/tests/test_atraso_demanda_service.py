@@ -1,8 +1,27 @@
+import importlib.util
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from core.models import Demanda, Notificacao, Usuario
+from core.models_acompanhamento import DemandaAcompanhamento
+from core.models_no_operacional import NoOperacional
+from core.models_unidade_administrativa import (
+    UnidadeAdministrativa,
+    UnidadeAdministrativaResponsavel,
+)
 from core.services.atraso_demanda_service import AtrasoDemandaService
+from core.services.notificacao_service import NotificacaoService
+
+_spec = importlib.util.spec_from_file_location("core_tests_legacy", "core/tests.py")
+_legacy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_legacy)
+SINAPSE_ORGAO_A = _legacy.SINAPSE_ORGAO_A
+SINAPSE_ORGAO_B = _legacy.SINAPSE_ORGAO_B
+SinapseCatalogTestMixin = _legacy.SinapseCatalogTestMixin
 
 
 class AtrasoDemandaServiceTests(TestCase):
@@ -54,3 +73,123 @@ class AtrasoDemandaServiceTests(TestCase):
         self.assertFalse(
             Notificacao.objects.filter(destinatario=autor, tipo="ATRASO").exists()
         )
+
+
+class AtrasoDemandaLoteTests(SinapseCatalogTestMixin, TestCase):
+    """Vencimento em SQL e destinatários em lote — mesmo resultado do cálculo por demanda."""
+
+    def setUp(self):
+        super().setUp()
+        self.autor = Usuario.objects.create_user(
+            username="ver_atraso_lote", password="x", perfil="VEREADOR"
+        )
+        self.protocolo = Usuario.objects.create_user(
+            username="prot_atraso_lote", password="x", perfil="PROTOCOLO"
+        )
+        Usuario.objects.create_user(username="gest_geral_lote", password="x", perfil="GESTOR")
+        self.gestor_setorial = Usuario.objects.create_user(
+            username="gest_set_lote",
+            password="x",
+            perfil="GESTOR",
+            sinapse_orgao_id=SINAPSE_ORGAO_B,
+        )
+        self.sec_setor = Usuario.objects.create_user(
+            username="sec_setor_lote",
+            password="x",
+            perfil="SECRETARIA",
+            sinapse_orgao_id=SINAPSE_ORGAO_A,
+        )
+        self.sec_orgao_b = Usuario.objects.create_user(
+            username="sec_orgao_b_lote",
+            password="x",
+            perfil="SECRETARIA",
+            sinapse_orgao_id=SINAPSE_ORGAO_B,
+        )
+        self.setor_a = UnidadeAdministrativa.objects.create(
+            sinapse_orgao_id=SINAPSE_ORGAO_A, nome="Setor lote", sigla="SLT", ativo=True
+        )
+        UnidadeAdministrativaResponsavel.objects.create(
+            unidade=self.setor_a, usuario=self.sec_setor, ativo=True, pode_tramitar=True
+        )
+        self.acompanhante = Usuario.objects.create_user(
+            username="acomp_lote", password="x", perfil="GESTOR", sinapse_orgao_id=SINAPSE_ORGAO_A
+        )
+
+    def _demanda(self, *, dias_atras, prazo=None, servico=None, orgao=None, setor=None):
+        return Demanda.objects.create(
+            titulo=f"SLA {dias_atras}/{prazo}/{servico}",
+            descricao="x",
+            status="EM_EXECUCAO",
+            autor=self.autor,
+            data_inicio_prazo=timezone.now() - timedelta(days=dias_atras),
+            prazo_efetivo_dias=prazo,
+            prazo_origem="PADRAO" if prazo is not None else "",
+            sinapse_servico_id=servico,
+            sinapse_orgao_id=orgao,
+            unidade_administrativa=setor,
+        )
+
+    def _massa(self):
+        vencida_setor = self._demanda(dias_atras=40, prazo=10, orgao=SINAPSE_ORGAO_A, setor=self.setor_a)
+        vencida_orgao = self._demanda(dias_atras=40, prazo=5, orgao=SINAPSE_ORGAO_B)
+        NoOperacional.objects.create(demanda=vencida_orgao, sinapse_orgao_id=SINAPSE_ORGAO_A)
+        DemandaAcompanhamento.objects.create(usuario=self.acompanhante, demanda=vencida_setor)
+        return [
+            vencida_setor,
+            vencida_orgao,
+            self._demanda(dias_atras=3, prazo=10),
+            self._demanda(dias_atras=10, prazo=10),
+            self._demanda(dias_atras=45),
+            self._demanda(dias_atras=5),
+            self._demanda(dias_atras=400, servico=80, orgao=SINAPSE_ORGAO_A),
+            self._demanda(dias_atras=1, servico=80),
+        ]
+
+    def test_vencimento_sql_igual_ao_calculo_por_demanda(self):
+        demandas = self._massa()
+        hoje = timezone.now().date()
+        esperado = set()
+        for demanda in demandas:
+            prazo = demanda.prazo_dias()
+            if prazo is not None and hoje > demanda.data_inicio_prazo.date() + timedelta(days=prazo):
+                esperado.add(demanda.pk)
+
+        obtido = set(AtrasoDemandaService().atrasadas().values_list("pk", flat=True))
+        self.assertEqual(obtido, esperado)
+        self.assertIn(demandas[0].pk, obtido)
+        self.assertNotIn(demandas[2].pk, obtido)
+
+    def test_destinatarios_em_lote_iguais_aos_individuais(self):
+        demandas = self._massa()[:2] + [self._demanda(dias_atras=40, prazo=1)]
+        svc = NotificacaoService()
+        em_lote = svc.destinatarios_sla_em_lote(demandas)
+        for demanda in demandas:
+            self.assertEqual(
+                {u.pk for u in em_lote[demanda.pk]},
+                {u.pk for u in svc.destinatarios_sla(demanda)},
+                demanda.titulo,
+            )
+        self.assertIn(self.sec_setor.pk, {u.pk for u in em_lote[demandas[0].pk]})
+        self.assertIn(self.acompanhante.pk, {u.pk for u in em_lote[demandas[0].pk]})
+        self.assertIn(self.gestor_setorial.pk, {u.pk for u in em_lote[demandas[1].pk]})
+
+    def test_consultas_nao_crescem_com_demandas_atrasadas(self):
+        def consultas(qtd):
+            for i in range(qtd):
+                self._demanda(dias_atras=40 + i, prazo=5, orgao=SINAPSE_ORGAO_A, setor=self.setor_a)
+            with CaptureQueriesContext(connection) as ctx:
+                resultado = AtrasoDemandaService().executar()
+            self.assertEqual(resultado.demandas_atrasadas, qtd)
+            return len(ctx)
+
+        self.assertEqual(consultas(2), consultas(6))
+        self.assertEqual(
+            Notificacao.objects.filter(destinatario=self.sec_setor, tipo="ATRASO").count(), 8
+        )
+
+    def test_envios_em_lote_respeitam_dedupe(self):
+        svc = NotificacaoService()
+        envio = ([self.protocolo, self.protocolo, self.sec_setor], "Mensagem", "/demandas/detalhes/1")
+        self.assertEqual(svc.criar_envios_em_lote([envio], tipo="ATRASO"), 2)
+        self.assertEqual(svc.criar_envios_em_lote([envio], tipo="ATRASO"), 0)
+        self.assertEqual(svc.criar_envios_em_lote([envio], tipo="ATRASO", dedupe=False), 2)
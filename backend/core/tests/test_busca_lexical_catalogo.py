@@ -0,0 +1,190 @@
+"""Busca lexical full-text da carta (`core.services.busca_lexical_catalogo`)."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from core.models_busca_lexical import CatalogoBuscaLexical
+from core.models_carta_otimizada import ServicoOtimizado
+from core.services import busca_lexical_catalogo as busca
+from core.services.triagem_otimizada_service import TriagemOtimizadaService
+from core.services.triagem_service import TriagemService
+
+SINAPSE = CatalogoBuscaLexical.FONTE_SINAPSE
+OTIMIZADA = CatalogoBuscaLexical.FONTE_OTIMIZADA
+
+
+def _catalogo_que_falha_no_meio(*ids):
+    """`CatalogServico` falso: entrega `ids` e quebra antes de terminar a leitura."""
+
+    def servicos():
+        for sid in ids:
+            yield SimpleNamespace(
+                id=sid, titulo=f"Serviço {sid}", status=1, texto_limpo_rag="",
+                documentos_necessarios="", id_orgao_id=None, id_orgao=None, id_categoria=None,
+            )
+        raise RuntimeError("conexão com o Sinapse caiu")
+
+    modelo = MagicMock()
+    modelo.objects.using.return_value.select_related.return_value.only.return_value.order_by.return_value.iterator.return_value = servicos()
+    return modelo
+
+
+class BuscaLexicalCatalogoTests(TestCase):
+    def setUp(self):
+        # `trigram_disponivel` é memoizado por processo; sem limpar, a contagem
+        # de consultas dependeria de outro teste já ter aquecido o cache.
+        busca.trigram_disponivel.cache_clear()
+        self.addCleanup(busca.trigram_disponivel.cache_clear)
+        busca._gravar_linhas(
+            [
+                busca._linha(
+                    SINAPSE, 1, ativo=True, titulo="Tapa-buraco em via pública",
+                    corpo="Reparo de buraco no asfalto.", orgao_id=10,
+                    orgao_nome="Secretaria de Obras", categoria_nome="Zeladoria",
+                ),
+                busca._linha(
+                    SINAPSE, 2, ativo=True, titulo="Recapeamento asfáltico",
+                    corpo="Quando há muito buraco a via é recapeada.", orgao_id=10,
+                ),
+                busca._linha(
+                    SINAPSE, 3, ativo=True, titulo="Iluminação pública — troca de lâmpada",
+                    corpo="Poste apagado.", orgao_id=20,
+                ),
+                busca._linha(
+                    SINAPSE, 4, ativo=False, titulo="Tapa-buraco (desativado)", corpo="buraco",
+                ),
+                busca._linha(
+                    SINAPSE, 5, ativo=True, titulo="Implantação de lombada",
+                    corpo="Redutor de velocidade.", orgao_id=30,
+                ),
+            ]
+        )
+
+    def test_ranking_prioriza_titulo_e_ignora_inativos(self):
+        resultado = busca.buscar_catalogo_lexical("buraco na minha rua", fonte=SINAPSE)
+        self.assertEqual(resultado.ids[:2], [1, 2])
+        self.assertNotIn(4, resultado.ids)
+        self.assertEqual(resultado.itens[0].orgao, "Secretaria de Obras")
+        self.assertGreater(resultado.itens[0].relevancia, resultado.itens[1].relevancia)
+
+    def test_consulta_sem_acento_e_com_acento_casam_igual(self):
+        for texto in ("iluminacao", "ILUMINAÇÃO", "lampada queimada"):
+            with self.subTest(texto=texto):
+                self.assertEqual(busca.buscar_catalogo_lexical(texto, fonte=SINAPSE).ids, [3])
+
+    def test_sinonimos_da_carta_expandem_a_consulta(self):
+        self.assertIn(1, busca.buscar_catalogo_lexical("cratera enorme", fonte=SINAPSE).ids)
+        self.assertEqual(
+            busca.buscar_catalogo_lexical("cratera enorme", fonte=SINAPSE, expandir=False).ids,
+            [],
+        )
+
+    def test_paginacao_total_e_filtro_por_orgao(self):
+        resultado = busca.buscar_catalogo_lexical(
+            "buraco", fonte=SINAPSE, limit=1, offset=1, contar=True
+        )
+        self.assertEqual(resultado.total, 2)
+        self.assertEqual(resultado.ids, [2])
+        self.assertEqual(
+            busca.buscar_catalogo_lexical("buraco", fonte=SINAPSE, orgao_id=20).ids, []
+        )
+
+    def test_triagem_sinapse_usa_indice_com_termos_obrigatorios(self):
+        self.assertTrue(busca.indice_lexical_disponivel(SINAPSE))
+        # Verificação do pg_trgm (uma vez por processo) + índice + títulos fortes + ranking.
+        with self.assertNumQueries(4):
+            rows = TriagemService()._busca_lexical_sinapse("tem um buraco enorme", limit=5)
+        self.assertEqual(rows[0]["servico_id"], 1)
+        self.assertEqual(rows[0]["score"], 0.92)
+        self.assertEqual(rows[0]["categoria"], "Zeladoria")
+        # Título com só parte dos obrigatórios («tapa» sem «burac») fica de fora.
+        self.assertNotIn(4, [r["servico_id"] for r in rows])
+
+    def test_titulo_com_todos_os_obrigatorios_nao_depende_da_janela_do_ranking(self):
+        # Vinte serviços com «tapa»/«buraco» repetidos no corpo (mas não no título)
+        # ranqueiam acima do título forte, que mesmo assim vem primeiro.
+        busca._gravar_linhas(
+            [
+                busca._linha(
+                    SINAPSE, 100 + i, ativo=True, titulo=f"Manutenção viária {i}",
+                    palavras="tapa buraco tapa buraco", corpo="tapa buraco " * 20,
+                )
+                for i in range(20)
+            ]
+            + [busca._linha(SINAPSE, 200, ativo=True, titulo="Tapa buraco")]
+        )
+        ranking = busca.buscar_catalogo_lexical("tapa burac", fonte=SINAPSE, limit=30).ids
+        self.assertGreater(ranking.index(200), 1 + 8)
+
+        rows = TriagemService()._busca_lexical_sinapse("tapa buraco", limit=2)
+        self.assertEqual([r["servico_id"] for r in rows[:2]], [1, 200])
+        self.assertEqual({r["score"] for r in rows}, {0.92})
+
+    def _reindexar_sinapse_com_falha(self):
+        with patch("integrations.sinapse_catalog.catalog_disponivel", return_value=True), patch(
+            "integrations.models_sinapse.CatalogServico", _catalogo_que_falha_no_meio(201, 202)
+        ), patch.object(busca, "LOTE_INDEXACAO", 1):
+            with self.assertRaises(RuntimeError):
+                busca.reindexar_sinapse()
+
+    def test_primeira_carga_sinapse_nao_expoe_indice_parcial(self):
+        CatalogoBuscaLexical.objects.filter(fonte=SINAPSE).delete()
+        self._reindexar_sinapse_com_falha()
+        self.assertFalse(busca.indice_lexical_disponivel(SINAPSE))
+
+    def test_reindexacao_de_indice_existente_grava_por_lote(self):
+        self._reindexar_sinapse_com_falha()
+        self.assertTrue(
+            CatalogoBuscaLexical.objects.filter(fonte=SINAPSE, servico_id=202).exists()
+        )
+
+    def test_fonte_sem_indice_volta_ao_icontains(self):
+        self.assertFalse(busca.indice_lexical_disponivel(OTIMIZADA))
+        with self.settings(BUSCA_LEXICAL_FTS_ENABLED=False):
+            self.assertFalse(busca.indice_lexical_disponivel(SINAPSE))
+
+
+class BuscaLexicalBaseOtimizadaTests(TestCase):
+    def setUp(self):
+        busca._gravar_linhas(
+            [busca._linha(SINAPSE, 101, ativo=True, titulo="x", orgao_nome="Obras",
+                          categoria_nome="Zeladoria")]
+        )
+        for sid, titulo, palavras in (
+            (101, "Tapa-buraco", ["buraco", "asfalto"]),
+            (102, "Poda de árvore", ["galho"]),
+        ):
+            ServicoOtimizado.objects.create(
+                sinapse_servico_id=sid,
+                titulo_otimizado=titulo,
+                descricao_objetiva=titulo,
+                texto_rag_otimizado=f"{titulo}. Atendimento da prefeitura.",
+                palavras_chave=palavras,
+            )
+        self.assertEqual(busca.reindexar_otimizada(), 2)
+
+    def test_triagem_otimizada_ranqueia_no_banco_com_nomes_do_indice(self):
+        svc = TriagemOtimizadaService()
+        resultados = svc._buscar_lexical_otimizado_db("buraco na rua", 5)
+        self.assertEqual([r["servico_id"] for r in resultados], [101])
+        self.assertEqual(resultados[0]["orgao"], "Obras")
+        self.assertEqual(resultados[0]["fonte"], "base_otimizada_lexical")
+        self.assertGreater(resultados[0]["score"], 0.5)
+
+    def test_save_e_delete_atualizam_a_fonte_otimizada(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            novo = ServicoOtimizado.objects.create(
+                sinapse_servico_id=103,
+                titulo_otimizado="Castração de animais",
+                descricao_objetiva="Castração gratuita",
+                texto_rag_otimizado="Castração de cães e gatos",
+            )
+        self.assertEqual(busca.buscar_catalogo_lexical("castracao", fonte=OTIMIZADA).ids, [103])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            novo.delete()
+        self.assertEqual(busca.buscar_catalogo_lexical("castracao", fonte=OTIMIZADA).ids, [])
@@ -0,0 +1,120 @@
+"""Índice em memória da base otimizada usado por `TriagemOtimizadaService`."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import numpy as np
+from django.test import TestCase
+
+from core.models_carta_otimizada import ServicoOtimizado
+from core.services import catalogo_otimizado_indice as indice_mod
+from core.services.triagem_otimizada_service import TriagemOtimizadaService
+
+
+def _vetor(seed: int) -> list[float]:
+    return np.random.default_rng(seed).standard_normal(1024).astype(np.float32).tolist()
+
+
+def _nomes_falsos(ids):
+    return {int(i): (f"Órgão {i}", f"Categoria {i}") for i in ids}
+
+
+@patch.object(indice_mod, "nomes_sinapse", side_effect=_nomes_falsos)
+class IndiceCatalogoOtimizadoTests(TestCase):
+    def setUp(self):
+        indice_mod.invalidar_indice_catalogo_otimizado()
+        self.addCleanup(indice_mod.invalidar_indice_catalogo_otimizado)
+        textos = [
+            ("Tapa-buraco em via pública", ["buraco", "asfalto"]),
+            ("Poda de árvore", ["galho", "arvore"]),
+            ("Troca de lâmpada da iluminação pública", ["poste", "lampada"]),
+            ("Limpeza de boca de lobo", ["bueiro", "entupido"]),
+            ("Recapeamento asfáltico", ["asfalto", "pavimento"]),
+        ]
+        for i, (titulo, palavras) in enumerate(textos, start=1):
+            ServicoOtimizado.objects.create(
+                sinapse_servico_id=100 + i,
+                titulo_otimizado=titulo,
+                descricao_objetiva=f"Descrição do serviço {titulo.lower()}",
+                texto_rag_otimizado=f"{titulo}. Atendimento da prefeitura.",
+                palavras_chave=palavras,
+                embedding_otimizado=_vetor(i),
+            )
+        ServicoOtimizado.objects.create(
+            sinapse_servico_id=999,
+            titulo_otimizado="Serviço inativo de asfalto",
+            descricao_objetiva="Inativo",
+            texto_rag_otimizado="Inativo",
+            palavras_chave=["asfalto"],
+            embedding_otimizado=_vetor(1),
+            ativo=False,
+        )
+        self.svc = TriagemOtimizadaService()
+
+    def test_busca_vetorial_igual_ao_pgvector(self, _nomes):
+        consulta = (np.array(_vetor(3)) + 0.3 * np.array(_vetor(77))).tolist()
+        via_indice = self.svc._buscar_pgvector_otimizado(consulta, 4)
+        with patch.object(
+            TriagemOtimizadaService, "_obter_orgao_nome", return_value=None
+        ), patch.object(TriagemOtimizadaService, "_obter_categoria_nome", return_value=None):
+            via_banco = self.svc._buscar_pgvector_otimizado_db(consulta, 4)
+
+        self.assertEqual(
+            [r["servico_id"] for r in via_indice], [r["servico_id"] for r in via_banco]
+        )
+        self.assertEqual(via_indice[0]["servico_id"], 103)
+        self.assertEqual(via_indice[0]["orgao"], "Órgão 103")
+        for a, b in zip(via_indice, via_banco):
+            self.assertAlmostEqual(a["score"], b["score"], places=3)
+
+    def test_busca_lexical_mesmos_candidatos_do_banco_ordenados_por_score(self, _nomes):
+        with patch.object(
+            TriagemOtimizadaService, "_obter_orgao_nome", return_value=None
+        ), patch.object(TriagemOtimizadaService, "_obter_categoria_nome", return_value=None):
+            via_banco = self.svc._buscar_lexical_otimizado_db("asfalto na rua", 50)
+        via_indice = self.svc._buscar_lexical_otimizado("asfalto na rua", 50)
+
+        self.assertEqual(
+            {r["servico_id"] for r in via_indice}, {r["servico_id"] for r in via_banco}
+        )
+        self.assertNotIn(999, {r["servico_id"] for r in via_indice})
+        scores = [r["score"] for r in via_indice]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_termo_parcial_casa_como_icontains(self, _nomes):
+        ids = {r["servico_id"] for r in self.svc._buscar_lexical_otimizado("ilumina", 10)}
+        self.assertEqual(ids, {103})
+
+    def test_busca_hibrida_sem_consultas_com_indice_carregado(self, _nomes):
+        indice_mod.indice_catalogo_otimizado()
+        with self.assertNumQueries(0):
+            resultados = self.svc._buscar_via_base_otimizada(_vetor(1), 3, "buraco no asfalto")
+        self.assertEqual(resultados[0]["servico_id"], 101)
+
+    def test_save_e_delete_recarregam_indice(self, _nomes):
+        antes = indice_mod.indice_catalogo_otimizado()
+        novo = ServicoOtimizado.objects.create(
+            sinapse_servico_id=200,
+            titulo_otimizado="Castração de animais",
+            descricao_objetiva="Castração gratuita",
+            texto_rag_otimizado="Castração gratuita de cães e gatos",
+            palavras_chave=["castracao"],
+            embedding_otimizado=_vetor(200),
+        )
+        depois = indice_mod.indice_catalogo_otimizado()
+        self.assertIsNot(antes, depois)
+        self.assertIn(200, {s.servico_id for s in depois.servicos})
+
+        novo.delete()
+        self.assertNotIn(
+            200, {s.servico_id for s in indice_mod.indice_catalogo_otimizado().servicos}
+        )
+
+    def test_indice_desligado_usa_banco(self, _nomes):
+        self.svc.usar_indice_memoria = False
+        with patch.object(
+            TriagemOtimizadaService, "_buscar_pgvector_otimizado_db", return_value=[]
+        ) as db:
+            self.svc._buscar_pgvector_otimizado(_vetor(1), 3)
+        db.assert_called_once()
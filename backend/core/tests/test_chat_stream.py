@@ -0,0 +1,155 @@
+"""Chat do copiloto em streaming: NDJSON, leitura incremental da Groq e triagem paralela."""
+
+from __future__ import annotations
+
+import json
+import threading
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from core.services.chatbot_service import ChatbotService
+from core.services.copiloto_paralelo import mapear_em_paralelo
+from core.services.copiloto_stream import ExtratorCampoJson, ler_stream_groq
+from core.services.http_externo import ClienteHttpExterno
+
+_CONTEUDO = json.dumps(
+    {"resposta_agente": "Certo, \"buraco\" na Rua A.\nQual o bairro?", "estado_atual": "COLETA"},
+    ensure_ascii=False,
+)
+
+
+def _linhas_sse(conteudo: str, tamanho: int = 7) -> list[str]:
+    linhas = [
+        "data: " + json.dumps({"choices": [{"delta": {"content": conteudo[i : i + tamanho]}}]})
+        for i in range(0, len(conteudo), tamanho)
+    ]
+    linhas.append("data: " + json.dumps({"choices": [], "x_groq": {"usage": {"total_tokens": 42}}}))
+    return linhas + ["", "data: [DONE]"]
+
+
+class CopilotoStreamLeituraTests(SimpleTestCase):
+    def test_extrator_decodifica_escapes_quebrados_entre_pedacos(self):
+        extrator = ExtratorCampoJson()
+        texto = "".join(extrator.alimentar(_CONTEUDO[i : i + 3]) for i in range(0, len(_CONTEUDO), 3))
+        self.assertEqual(texto, json.loads(_CONTEUDO)["resposta_agente"])
+        self.assertTrue(extrator.concluido)
+
+    def test_extrator_unicode_escapado(self):
+        bruto = json.dumps({"resposta_agente": "Iluminação pública"})
+        extrator = ExtratorCampoJson()
+        texto = "".join(extrator.alimentar(bruto[i : i + 4]) for i in range(0, len(bruto), 4))
+        self.assertEqual(texto, "Iluminação pública")
+
+    def test_ler_stream_groq_devolve_conteudo_completo_e_tokens(self):
+        fragmentos: list[str] = []
+        conteudo, tokens = ler_stream_groq(_linhas_sse(_CONTEUDO), fragmentos.append)
+        self.assertEqual(conteudo, _CONTEUDO)
+        self.assertEqual(tokens, 42)
+        self.assertGreater(len(fragmentos), 1)
+        self.assertEqual("".join(fragmentos), json.loads(_CONTEUDO)["resposta_agente"])
+
+    @override_settings(GROQ_API_KEY="test-key", LLM_CACHE_ENABLED=False)
+    def test_post_groq_em_stream_igual_ao_sem_stream(self):
+        mensagens = [{"role": "user", "content": "buraco"}]
+        normal = Mock(status_code=200, ok=True, text="")
+        normal.json.return_value = {"choices": [{"message": {"content": _CONTEUDO}}]}
+        with patch.object(ClienteHttpExterno, "post", return_value=normal):
+            sem_stream = ChatbotService()._post_groq(mensagens)
+
+        fragmentos: list[str] = []
+        em_stream = Mock(status_code=200, ok=True, text="")
+        em_stream.iter_lines.return_value = iter(_linhas_sse(_CONTEUDO))
+        with patch.object(ClienteHttpExterno, "post", return_value=em_stream) as post:
+            com_stream = ChatbotService(ao_fragmento=fragmentos.append)._post_groq(mensagens)
+
+        self.assertEqual(com_stream, sem_stream)
+        self.assertTrue(post.call_args.kwargs["stream"])
+        self.assertTrue(post.call_args.kwargs["json"]["stream"])
+        self.assertEqual("".join(fragmentos), json.loads(_CONTEUDO)["resposta_agente"])
+
+
+class CopilotoParaleloTests(SimpleTestCase):
+    @override_settings(COPILOTO_ENRIQUECIMENTO_PARALELO=True, COPILOTO_ENRIQUECIMENTO_MAX_PARALELO=4)
+    def test_mapear_em_paralelo_concorre_e_preserva_ordem(self):
+        itens = [3, 1, 2, 0]
+        # Só passa se as quatro chamadas estiverem em andamento ao mesmo tempo;
+        # em execução sequencial a barreira estoura o timeout (BrokenBarrierError).
+        barreira = threading.Barrier(len(itens), timeout=5)
+        threads: set[int] = set()
+
+        def lento(n: int) -> int:
+            threads.add(threading.get_ident())
+            barreira.wait()
+            return n * 10
+
+        self.assertEqual(mapear_em_paralelo(lento, itens), [30, 10, 20, 0])
+        self.assertEqual(len(threads), len(itens))
+
+    @override_settings(COPILOTO_ENRIQUECIMENTO_PARALELO=False)
+    def test_desligado_roda_sequencial_na_thread_atual(self):
+        threads: set[int] = set()
+        mapear_em_paralelo(lambda n: threads.add(threading.get_ident()), [1, 2, 3])
+        self.assertEqual(threads, {threading.get_ident()})
+
+
+class ChatInteragirStreamViewTests(SimpleTestCase):
+    def setUp(self):
+        self.usuario = Mock(is_authenticated=True)
+        patcher = patch(
+            "rest_framework_simplejwt.authentication.JWTAuthentication.authenticate",
+            return_value=(self.usuario, None),
+        )
+        self.autenticar = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse("chat-interagir-stream")
+
+    async def _eventos(self, resposta) -> list[dict]:
+        corpo = b"".join([parte async for parte in resposta.streaming_content])
+        return [json.loads(linha) for linha in corpo.decode("utf-8").splitlines() if linha]
+
+    async def test_fragmentos_antes_do_payload_final(self):
+        payload = {"session_id": "s1", "resposta_agente": "Qual o bairro?", "estado_atual": "COLETA"}
+
+        def interagir(servico, **kwargs):
+            self.assertEqual(kwargs["mensagem"], "tem um buraco")
+            self.assertIs(kwargs["usuario"], self.usuario)
+            servico.ao_fragmento("Qual o ")
+            servico.ao_fragmento("bairro?")
+            return payload
+
+        with patch.object(ChatbotService, "interagir", autospec=True, side_effect=interagir):
+            resposta = await self.async_client.post(
+                self.url, {"mensagem": "tem um buraco"}, content_type="application/json"
+            )
+            eventos = await self._eventos(resposta)
+
+        self.assertEqual(resposta["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            eventos,
+            [
+                {"tipo": "fragmento", "texto": "Qual o "},
+                {"tipo": "fragmento", "texto": "bairro?"},
+                {"tipo": "final", "status": 200, "dados": payload},
+            ],
+        )
+
+    async def test_erros_do_turno_mantem_status_da_view_sincrona(self):
+        with patch.object(ChatbotService, "interagir", side_effect=PermissionError()):
+            resposta = await self.async_client.post(
+                self.url, {"mensagem": "oi"}, content_type="application/json"
+            )
+            eventos = await self._eventos(resposta)
+        self.assertEqual(eventos[-1]["tipo"], "final")
+        self.assertEqual(eventos[-1]["status"], 403)
+
+    async def test_valida_corpo_e_autenticacao_antes_do_stream(self):
+        resposta = await self.async_client.post(self.url, {}, content_type="application/json")
+        self.assertEqual(resposta.status_code, 400)
+
+        self.autenticar.return_value = None
+        resposta = await self.async_client.post(
+            self.url, {"mensagem": "oi"}, content_type="application/json"
+        )
+        self.assertEqual(resposta.status_code, 401)
@@ -0,0 +1,134 @@
+"""Busca de cluster compatível via pgvector (top-k) — equivalência com a varredura legada."""
+
+import importlib.util
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import ClusterExecucao, Demanda
+from core.services.cluster_service import ClusterService, _embedding_list
+
+_spec = importlib.util.spec_from_file_location("core_tests_legacy", "core/tests.py")
+_legacy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_legacy)
+SINAPSE_ORGAO_A = _legacy.SINAPSE_ORGAO_A
+SinapseCatalogTestMixin = _legacy.SinapseCatalogTestMixin
+
+
+@override_settings(
+    CLUSTER_ENABLED=True,
+    CLUSTER_SEMANTIC_THRESHOLD=0.7,
+    CLUSTER_RADIUS_METERS=300,
+    CLUSTER_JANELA_AGREGACAO_DIAS=90,
+    CLUSTER_ANN_TOP_K=5,
+)
+class ClusterAnnMatchingTests(SinapseCatalogTestMixin, TestCase):
+    SERVICO = 80
+    OUTRO_SERVICO = 86
+
+    def setUp(self):
+        super().setUp()
+        self.vereador = _legacy.Usuario.objects.create_user(
+            username="ver_cluster_ann", password="x", perfil="VEREADOR"
+        )
+        self.svc = ClusterService()
+        self.vetor_base = [1.0] + [0.0] * 1023
+        self.vetor_proximo = [0.99] + [0.01] * 1023
+        self.vetor_medio = [0.9] + [0.01] * 1023
+        self.vetor_distante = [0.0, 1.0] + [0.0] * 1022
+
+    def _cluster(self, *, vetor, servico=SERVICO, lat=-23.5365, lon=-46.2097, status="ABERTO"):
+        cluster = ClusterExecucao.objects.create(
+            titulo="Cluster ANN",
+            status=status,
+            sinapse_servico_id=servico,
+            bairro_referencia="Vila Lavinia",
+            centroide=vetor,
+        )
+        Demanda.objects.create(
+            titulo="Membro",
+            descricao="Membro",
+            autor=self.vereador,
+            status="PROTOCOLADO",
+            sinapse_servico_id=servico,
+            sinapse_orgao_id=SINAPSE_ORGAO_A,
+            latitude=lat,
+            longitude=lon,
+            bairro="Vila Lavinia",
+            embedding=vetor,
+            cluster=cluster,
+        )
+        return cluster
+
+    def _nova_demanda(self, vetor):
+        return Demanda.objects.create(
+            titulo="Nova",
+            descricao="Nova",
+            autor=self.vereador,
+            status="AGUARDANDO_PROTOCOLO",
+            sinapse_servico_id=self.SERVICO,
+            sinapse_orgao_id=SINAPSE_ORGAO_A,
+            latitude=-23.5366,
+            longitude=-46.2098,
+            bairro="Vila Lavinia",
+            embedding=vetor,
+        )
+
+    def _ambos(self, demanda):
+        vetor = _embedding_list(demanda.embedding)
+        return (
+            self.svc._buscar_cluster_compativel(demanda, vetor),
+            self.svc._buscar_cluster_compativel_varredura(demanda, vetor),
+        )
+
+    def test_escolhe_cluster_mais_proximo_como_varredura(self):
+        self._cluster(vetor=self.vetor_medio)
+        melhor = self._cluster(vetor=self.vetor_proximo)
+        self._cluster(vetor=self.vetor_distante)
+        demanda = self._nova_demanda(self.vetor_base)
+
+        ann, varredura = self._ambos(demanda)
+        self.assertEqual(ann, melhor)
+        self.assertEqual(ann, varredura)
+
+    def test_filtra_servico_e_janela_na_query(self):
+        self._cluster(vetor=self.vetor_proximo, servico=self.OUTRO_SERVICO)
+        antigo = self._cluster(vetor=self.vetor_proximo)
+        ClusterExecucao.objects.filter(pk=antigo.pk).update(
+            atualizado_em=timezone.now() - timedelta(days=120)
+        )
+        demanda = self._nova_demanda(self.vetor_base)
+
+        ann, varredura = self._ambos(demanda)
+        self.assertIsNone(ann)
+        self.assertIsNone(varredura)
+
+    def test_servico_herdado_do_primeiro_membro(self):
+        cluster = self._cluster(vetor=self.vetor_proximo)
+        ClusterExecucao.objects.filter(pk=cluster.pk).update(sinapse_servico_id=None)
+        demanda = self._nova_demanda(self.vetor_base)
+
+        ann, varredura = self._ambos(demanda)
+        self.assertEqual(ann, cluster)
+        self.assertEqual(ann, varredura)
+
+    def test_geo_descarta_sobrevivente_e_segue_para_o_proximo(self):
+        self._cluster(vetor=self.vetor_proximo, lat=-23.60, lon=-46.30)
+        perto = self._cluster(vetor=self.vetor_medio)
+        demanda = self._nova_demanda(self.vetor_base)
+
+        ann, varredura = self._ambos(demanda)
+        self.assertEqual(ann, perto)
+        self.assertEqual(ann, varredura)
+
+    def test_geo_so_roda_para_top_k(self):
+        for _ in range(8):
+            self._cluster(vetor=self.vetor_proximo)
+        demanda = self._nova_demanda(self.vetor_base)
+
+        with self.assertNumQueries(1):
+            candidatos = self.svc._candidatos_cluster_ann(
+                demanda, _embedding_list(demanda.embedding)
+            )
+        self.assertEqual(len(candidatos), 5)
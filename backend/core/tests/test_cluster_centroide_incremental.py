@@ -0,0 +1,125 @@
+"""Centróide de cluster mantido como soma corrente + contagem (vínculo/desvínculo em O(dim))."""
+
+import importlib.util
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import ClusterExecucao, Demanda
+from core.services.cluster_service import ClusterService
+
+_spec = importlib.util.spec_from_file_location("core_tests_legacy", "core/tests.py")
+_legacy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_legacy)
+SINAPSE_ORGAO_A = _legacy.SINAPSE_ORGAO_A
+SinapseCatalogTestMixin = _legacy.SinapseCatalogTestMixin
+
+
+def _vetor(*inicio):
+    return list(inicio) + [0.0] * (1024 - len(inicio))
+
+
+@override_settings(CLUSTER_ENABLED=True)
+class ClusterCentroideIncrementalTests(SinapseCatalogTestMixin, TestCase):
+    SERVICO = 80
+
+    def setUp(self):
+        super().setUp()
+        self.vereador = _legacy.Usuario.objects.create_user(
+            username="ver_centroide", password="x", perfil="VEREADOR"
+        )
+        self.svc = ClusterService()
+        self.cluster = ClusterExecucao.objects.create(
+            titulo="Cluster centróide",
+            status="ABERTO",
+            sinapse_servico_id=self.SERVICO,
+            centroide=_vetor(1.0),
+        )
+        self.membros = [
+            self._demanda(_vetor(1.0, 0.2), cluster=self.cluster),
+            self._demanda(_vetor(0.8, 0.4), cluster=self.cluster),
+        ]
+        self.svc._recalcular_centroide(self.cluster)
+
+    def _demanda(self, vetor, cluster=None):
+        return Demanda.objects.create(
+            titulo="Membro",
+            descricao="Membro",
+            autor=self.vereador,
+            status="PROTOCOLADO",
+            sinapse_servico_id=self.SERVICO,
+            sinapse_orgao_id=SINAPSE_ORGAO_A,
+            embedding=vetor,
+            cluster=cluster,
+        )
+
+    def _media_real(self):
+        vetores = Demanda.objects.filter(cluster=self.cluster).values_list("embedding", flat=True)
+        return np.mean(np.asarray([list(v) for v in vetores], dtype=np.float64), axis=0)
+
+    def _assert_centroide_real(self):
+        self.cluster.refresh_from_db()
+        np.testing.assert_allclose(
+            np.asarray(self.cluster.centroide, dtype=np.float64), self._media_real(), atol=1e-6
+        )
+
+    def test_recalculo_inicializa_soma_e_contagem(self):
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.centroide_membros, 2)
+        self.assertIsNotNone(self.cluster.centroide_soma)
+        self._assert_centroide_real()
+
+    def test_vinculo_e_desvinculo_sem_reler_membros(self):
+        nova = self._demanda(_vetor(0.0, 1.0))
+        nova.cluster = self.cluster
+        nova.save(update_fields=["cluster"])
+        # lock da linha + update do cluster (savepoints inclusos); nenhum SELECT em demandas.
+        with self.assertNumQueries(4):
+            self.svc._centroide_vincular(self.cluster, nova.embedding)
+        self.assertEqual(self.cluster.centroide_membros, 3)
+        self._assert_centroide_real()
+
+        saida = self.membros[0]
+        saida.cluster = None
+        saida.save(update_fields=["cluster"])
+        self.svc._centroide_desvincular(self.cluster, saida.embedding)
+        self.assertEqual(self.cluster.centroide_membros, 2)
+        self._assert_centroide_real()
+
+    def test_cluster_legado_sem_soma_recalcula_completo(self):
+        ClusterExecucao.objects.filter(pk=self.cluster.pk).update(
+            centroide_soma=None, centroide_membros=0
+        )
+        nova = self._demanda(_vetor(0.5, 0.5), cluster=self.cluster)
+        self.svc._centroide_vincular(self.cluster, nova.embedding)
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.centroide_membros, 3)
+        self._assert_centroide_real()
+
+    def test_verificacao_relata_e_corrige_drift_sem_mover_janela(self):
+        self.assertEqual(self.svc.verificar_centroides(), [])
+
+        antigo = timezone.now() - timedelta(days=10)
+        ClusterExecucao.objects.filter(pk=self.cluster.pk).update(
+            centroide=_vetor(0.0, 0.0, 1.0), atualizado_em=antigo
+        )
+        out = StringIO()
+        call_command("verificar_centroides_clusters", stdout=out)
+        self.assertIn(f"cluster {self.cluster.pk}", out.getvalue())
+
+        divergentes = self.svc.verificar_centroides(corrigir=True)
+        self.assertEqual([d["cluster_id"] for d in divergentes], [self.cluster.pk])
+        self._assert_centroide_real()
+        self.assertEqual(self.cluster.atualizado_em, antigo)
+        self.assertEqual(self.svc.verificar_centroides(), [])
+
+    def test_recalculo_periodico_corrige_contagem(self):
+        ClusterExecucao.objects.filter(pk=self.cluster.pk).update(centroide_membros=7)
+        self.assertEqual(len(self.svc.verificar_centroides()), 1)
+        self.assertEqual(self.svc.recalcular_centroides(), 1)
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.centroide_membros, 2)
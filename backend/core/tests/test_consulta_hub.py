@@ -131,3 +131,59 @@ class ConsultaHubAPITests(SinapseCatalogTestMixin, APITestCase):
         self.client.force_authenticate(assessor)
         r = self.client.get("/api/consulta/hub/")
         self.assertEqual(r.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ConsultaHubContadoresTests(SinapseCatalogTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        from django.core.cache import cache
+
+        cache.clear()
+        self.suffix = uuid.uuid4().hex[:8]
+        self.vereador = Usuario.objects.create_user(
+            username=f"ver_cnt_{self.suffix}", password="x", perfil="VEREADOR"
+        )
+        self.protocolo = Usuario.objects.create_user(
+            username=f"prot_cnt_{self.suffix}", password="x", perfil="PROTOCOLO"
+        )
+        for status_demanda in (
+            "RASCUNHO",
+            "AGUARDANDO_PROTOCOLO",
+            "AGUARDANDO_PROTOCOLO",
+            "EM_EXECUCAO",
+            "DEVOLVIDO_VEREADOR",
+        ):
+            Demanda.objects.create(
+                titulo="Contador",
+                descricao="x",
+                autor=self.vereador,
+                status=status_demanda,
+                sinapse_orgao_id=SINAPSE_ORGAO_A,
+            )
+        self.svc = ConsultaHubService()
+
+    def _por_id(self, user):
+        return {a["id"]: a["contagem"] for a in self.svc.atalhos(user)}
+
+    def test_agregado_igual_ao_count_por_atalho(self):
+        contagem = self._por_id(self.protocolo)
+        for fila in ("protocolados", "operacionais", "devolutivas"):
+            self.assertEqual(contagem[fila], self.svc._count(self.protocolo, {"fila": fila}))
+        self.assertEqual(contagem["protocolados"], 2)
+
+        contagem = self._por_id(self.vereador)
+        uid = str(self.vereador.pk)
+        self.assertEqual(contagem["rascunhos"], self.svc._count(self.vereador, {"autor": uid, "status": "RASCUNHO"}))
+        self.assertEqual(contagem["aguardando"], 2)
+
+    def test_segunda_chamada_vem_do_cache(self):
+        self._por_id(self.protocolo)
+        with self.assertNumQueries(1):  # só a contagem de tendências
+            self._por_id(self.protocolo)
+
+    def test_mudanca_de_status_invalida(self):
+        self.assertEqual(self._por_id(self.protocolo)["protocolados"], 2)
+        demanda = Demanda.objects.filter(status="AGUARDANDO_PROTOCOLO").first()
+        demanda.status = "PROTOCOLADO"
+        demanda.save(update_fields=["status"])
+        self.assertEqual(self._por_id(self.protocolo)["protocolados"], 1)
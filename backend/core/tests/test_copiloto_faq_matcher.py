@@ -0,0 +1,141 @@
+"""Detecção de FAQ com matcher compilado: mesma prioridade do laço e versão entre workers."""
+
+from __future__ import annotations
+
+import re
+from unittest.mock import Mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from core.models_copiloto_faq import CopilotoFaqOrientacao, CopilotoFaqPadraoRegex
+from core.services import copiloto_faq_service as faq_service
+from core.services.copiloto_faq_matcher import (
+    MatcherPrioritario,
+    RegraFaq,
+    literais_obrigatorios,
+)
+
+
+def _literais(expr: str):
+    return literais_obrigatorios(re.compile(expr, re.IGNORECASE))
+
+
+class LiteraisObrigatoriosTests(SimpleTestCase):
+    def test_extrai_fragmentos_obrigatorios(self):
+        self.assertEqual(_literais(r"\bconta\s+de\s+luz\b"), {"conta"})
+        self.assertEqual(_literais(r"\b(?:furto|roubo)\b"), {"furto", "roubo"})
+        self.assertEqual(_literais(r"(?:abc)?xyzw"), {"xyzw"})
+        self.assertEqual(_literais(r"CPFL"), {"cpfl"})
+
+    def test_sem_fragmento_seguro_a_regra_fica_sem_prefiltro(self):
+        self.assertIsNone(_literais(r"[a-z]+\d"))
+        # Um ramo sem literal útil ("ju[ií]z") invalida a alternância inteira.
+        self.assertIsNone(_literais(r"\b(?:ju[ií]z|promotor)\b"))
+        self.assertIsNone(_literais(r"(?:ab)?c"))
+
+    def test_mesmo_resultado_que_testar_todas_as_regex_em_ordem(self):
+        padroes = [
+            r"\bconta\s+de\s+luz\b",
+            r"\bluz\b",
+            r"energia|cpfl",
+            r"ilumina[cç][aã]o\s+p[uú]blica",
+            r"\d{3,}",
+            r"\bcont(?:a|as)\b",
+        ]
+        regras = [(re.compile(p, re.IGNORECASE), i) for i, p in enumerate(padroes)]
+        matcher = MatcherPrioritario.construir(regras)
+        textos = [
+            "Minha CONTA DE LUZ veio alta",
+            "falta luz na rua",
+            "Iluminação pública apagada",
+            "protocolo 12345 da CPFL",
+            "contas atrasadas",
+            "buraco na calçada",
+            "",
+        ]
+        for texto in textos:
+            esperado = [i for pat, i in regras if pat.search(texto)]
+            self.assertEqual([r.alvo for r in matcher.candidatos(texto)], esperado, texto)
+
+    def test_prefiltro_evita_search_das_regras_ausentes(self):
+        ausente = Mock(search=Mock(return_value=True))
+        sem_prefiltro = Mock(search=Mock(return_value=False))
+        matcher = MatcherPrioritario(
+            (
+                RegraFaq(ausente, "luz", literais_obrigatorios(re.compile(r"\bconta\s+de\s+luz\b"))),
+                RegraFaq(re.compile(r"buraco", re.IGNORECASE), "buraco", frozenset({"buraco"})),
+                RegraFaq(sem_prefiltro, "classe", None),
+            )
+        )
+        self.assertEqual([r.alvo for r in matcher.candidatos("BURACO na rua")], ["buraco"])
+        ausente.search.assert_not_called()
+        sem_prefiltro.search.assert_called_once_with("BURACO na rua")
+
+
+class DetectarFaqMatcherTests(TestCase):
+    def setUp(self):
+        CopilotoFaqOrientacao.objects.all().delete()
+        faq_service.invalidar_cache_faq()
+        self.addCleanup(faq_service.invalidar_cache_faq)
+
+    def _faq(self, categoria: str, ordem: int, *padroes: str) -> CopilotoFaqOrientacao:
+        faq = CopilotoFaqOrientacao.objects.create(
+            slug=categoria.lower(),
+            categoria_orientacao=categoria,
+            titulo=categoria.title(),
+            mensagem=f"Mensagem {categoria}",
+            orgao_hint=f"Órgão {categoria}",
+            ordem=ordem,
+            ativo=True,
+        )
+        for i, expr in enumerate(padroes):
+            CopilotoFaqPadraoRegex.objects.create(faq=faq, expressao=expr, ordem=i, ativo=True)
+        return faq
+
+    def test_respeita_ordem_do_catalogo(self):
+        self._faq("ENERGIA_CONCESSIONARIA", 20, r"\bluz\b")
+        self._faq("CONTA_CONSUMO", 10, r"\bconta\s+de\s+(?:luz|[aá]gua)\b")
+        faq = faq_service.detectar_faq_por_texto("A conta de luz veio errada")
+        self.assertEqual(faq.categoria_orientacao, "CONTA_CONSUMO")
+        faq = faq_service.detectar_faq_por_texto("Falta luz em casa")
+        self.assertEqual(faq.categoria_orientacao, "ENERGIA_CONCESSIONARIA")
+        self.assertIsNone(faq_service.detectar_faq_por_texto("Buraco na Rua A"))
+
+    def test_fallback_so_depois_do_catalogo_e_com_alias(self):
+        self._faq("MANDATO_DE_PRISAO", 50, r"\bmandado\b")
+        self._faq("JUSTICA_ESTADUAL", 40, r"\bvara\s+criminal\b")
+        faq = faq_service.detectar_faq_por_texto("quero a prisão preventiva dele")
+        self.assertEqual(faq.categoria_orientacao, "MANDATO_DE_PRISAO")
+        faq = faq_service.detectar_faq_por_texto("fui no juiz ontem")
+        self.assertEqual(faq.categoria_orientacao, "JUSTICA_ESTADUAL")
+
+    def test_matcher_reaproveitado_entre_chamadas(self):
+        self._faq("ENERGIA_CONCESSIONARIA", 10, r"\bluz\b")
+        faq_service.detectar_faq_por_texto("luz")
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                faq_service.detectar_faq_por_texto("sem luz na rua")
+
+    def test_nova_versao_no_cache_invalida_outros_workers(self):
+        self._faq("ENERGIA_CONCESSIONARIA", 10, r"\bluz\b")
+        self.assertIsNotNone(faq_service.detectar_faq_por_texto("sem luz"))
+        # Outro worker altera a FAQ (`update` não dispara sinais neste processo); aqui
+        # só chega a nova versão no cache compartilhado.
+        CopilotoFaqPadraoRegex.objects.update(expressao=r"\benergia\b")
+        self.assertIsNotNone(faq_service.detectar_faq_por_texto("sem luz"))
+        cache.set(faq_service.FAQ_VERSAO_KEY, "versao-de-outro-worker", None)
+        self.assertIsNone(faq_service.detectar_faq_por_texto("sem luz"))
+        self.assertIsNotNone(faq_service.detectar_faq_por_texto("sem energia"))
+
+    def test_versao_republicada_apos_despejo_nunca_repete_a_anterior(self):
+        faq_service.detectar_faq_por_texto("sem luz")
+        anterior = cache.get(faq_service.FAQ_VERSAO_KEY)
+        # Chave despejada: tanto a republicação quanto a recriação sob demanda
+        # precisam produzir um valor que nenhum worker tenha como versão local.
+        cache.delete(faq_service.FAQ_VERSAO_KEY)
+        faq_service.invalidar_cache_faq()
+        republicada = cache.get(faq_service.FAQ_VERSAO_KEY)
+        self.assertNotIn(republicada, (None, anterior))
+        cache.delete(faq_service.FAQ_VERSAO_KEY)
+        self.assertNotIn(faq_service._versao_faq(), ("", anterior, republicada))
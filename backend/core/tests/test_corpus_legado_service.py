@@ -2,6 +2,7 @@
 
 import json
 from pathlib import Path
+from unittest.mock import patch
 
 from django.test import SimpleTestCase, override_settings
 
@@ -217,3 +218,85 @@ class CorpusLegadoServiceTests(SimpleTestCase):
                 )
         self.assertGreaterEqual(len(hints), 1)
         self.assertIn("servico_legado", hints[0])
+
+
+def _relatorio_sintetico(checksum: str = "abc") -> dict:
+    return {
+        "checksum_csv": checksum,
+        "top_trends": [
+            {
+                "id": "limpeza",
+                "titulo": "Limpeza Pública (Serviços Urbanos)",
+                "servico_legado": "Limpeza Pública",
+                "atalho_sugerido": "Limpeza e roçada de via",
+                "exemplos_assunto": ["Limpeza da rua no bairro Centro", "Roçagem do bairro"],
+            },
+            {
+                "id": "buraco",
+                "titulo": "Recapeamento/Tapa Buraco (Obras)",
+                "servico_legado": "Recapeamento/Tapa Buraco",
+                "atalho_sugerido": "Tapa buraco na via",
+                "exemplos_assunto": ["Tapa buraco na rua do bairro", "Buraco enorme na avenida"],
+            },
+            {
+                "id": "poda",
+                "titulo": "Poda de Árvore (Meio Ambiente)",
+                "servico_legado": "Poda de Árvore",
+                "atalho_sugerido": "Poda de árvore",
+                "exemplos_assunto": ["Poda de árvore na praça do bairro"],
+            },
+        ],
+    }
+
+
+class CorpusLegadoIndiceTests(SimpleTestCase):
+    def setUp(self):
+        import tempfile
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.json_path = Path(tmp.name) / "corpus.json"
+        self.json_path.write_text(json.dumps(_relatorio_sintetico()), encoding="utf-8")
+        override = override_settings(
+            CORPUS_LEGADO_ENABLED=True, CORPUS_LEGADO_JSON_PATH=str(self.json_path)
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_bm25_ranqueia_por_termos_raros(self):
+        from core.services.corpus_legado_service import CorpusLegadoService, gravar_indice_corpus
+
+        gravar_indice_corpus(_relatorio_sintetico(), self.json_path)
+        hits = CorpusLegadoService().sugerir_por_texto("tapa buraco na rua do bairro")
+        self.assertEqual(hits[0]["servico_legado"], "Recapeamento/Tapa Buraco")
+        self.assertTrue(all(0 < h["score_sugestao"] <= 1 for h in hits))
+        # «bairro» aparece em todas as trends: sozinho com outro token comum não sugere nada.
+        self.assertEqual(CorpusLegadoService().sugerir_por_texto("bairro distante"), [])
+
+    def test_indice_gravado_ao_lado_do_json_e_lido_uma_vez_por_processo(self):
+        from core.services.corpus_legado_service import (
+            CorpusLegadoService,
+            corpus_legado_indice_path,
+            gravar_indice_corpus,
+        )
+
+        gravar_indice_corpus(_relatorio_sintetico(), self.json_path)
+        indice_path = corpus_legado_indice_path(self.json_path)
+        self.assertEqual(indice_path.name, "corpus.indice.json")
+        self.assertEqual(json.loads(indice_path.read_text())["checksum_csv"], "abc")
+
+        CorpusLegadoService().sugerir_por_texto("poda de árvore na praça")
+        with patch.object(Path, "read_text", side_effect=AssertionError("releu do disco")):
+            hits = CorpusLegadoService().sugerir_por_texto("poda de árvore na praça")
+        self.assertEqual(hits[0]["servico_legado"], "Poda de Árvore")
+
+    def test_indice_de_outro_csv_e_reconstruido(self):
+        from core.services.corpus_legado_service import CorpusLegadoService, gravar_indice_corpus
+
+        # Índice gravado para um CSV cujas trends não batem com o relatório atual.
+        antigo = _relatorio_sintetico("outro-checksum")
+        antigo["top_trends"] = list(reversed(antigo["top_trends"]))
+        gravar_indice_corpus(antigo, self.json_path)
+
+        hits = CorpusLegadoService().sugerir_por_texto("tapa buraco na avenida", limite=1)
+        self.assertEqual(hits[0]["servico_legado"], "Recapeamento/Tapa Buraco")
@@ -1,5 +1,9 @@
 """Paginação server-side da listagem de demandas."""
 
+import csv
+import io
+import json
+
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -106,3 +110,100 @@ class DemandaListPaginationTests(SinapseCatalogTestMixin, APITestCase):
         self.assertIn("data_finalizacao", row)
         self.assertIn("tempo_execucao_segundos", row)
         self.assertGreaterEqual(row["tempo_execucao_segundos"], 5 * 86400 - 60)
+
+
+class DemandaListCursorTests(SinapseCatalogTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.protocolo = Usuario.objects.create_user(
+            username="prot_cursor", password="x", perfil="PROTOCOLO"
+        )
+        self.vereador = Usuario.objects.create_user(
+            username="ver_cursor", password="x", perfil="VEREADOR"
+        )
+        self.client.force_authenticate(self.protocolo)
+        base = timezone.now() - timezone.timedelta(days=10)
+        # Empates em data_entrada_etapa e etapas nulas: o pk desempata, NULLs vão ao fim.
+        etapas = [base, base, None, base + timezone.timedelta(hours=1), None, base]
+        for i, etapa in enumerate(etapas):
+            Demanda.objects.create(
+                titulo=f"Cursor {i}",
+                descricao="x",
+                autor=self.vereador,
+                status="AGUARDANDO_PROTOCOLO",
+                sinapse_orgao_id=SINAPSE_ORGAO_A,
+                data_entrada_etapa=etapa,
+                data_criacao=base - timezone.timedelta(minutes=i % 2),
+            )
+
+    def _percorrer(self, params):
+        ids, cursor, paginas = [], "", 0
+        while True:
+            r = self.client.get("/api/demandas/", {**params, "cursor": cursor, "page_size": 2})
+            self.assertEqual(r.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", r.data)
+            ids.extend(row["id"] for row in r.data["results"])
+            paginas += 1
+            if not r.data["cursor"]:
+                return ids, paginas
+            self.assertIn("cursor=", r.data["next"])
+            cursor = r.data["cursor"]
+
+    def test_cursor_percorre_fila_na_ordem_do_painel_sem_repetir(self):
+        ids, paginas = self._percorrer({"fila": "protocolados"})
+        esperado = sorted(
+            Demanda.objects.all(),
+            key=lambda d: (
+                d.data_entrada_etapa is None,
+                d.data_entrada_etapa or timezone.now(),
+                d.data_criacao,
+                d.pk,
+            ),
+        )
+        self.assertEqual(ids, [d.pk for d in esperado])
+        self.assertEqual(paginas, 3)
+
+    def test_cursor_fila_finalizados(self):
+        fim = timezone.now()
+        for i, demanda in enumerate(Demanda.objects.order_by("pk")):
+            demanda.status = "FINALIZADO"
+            demanda.data_finalizacao = None if i == 2 else fim - timezone.timedelta(hours=i % 3)
+            demanda.save(update_fields=["status", "data_finalizacao"])
+        ids, _paginas = self._percorrer({"fila": "finalizados"})
+        esperado = sorted(
+            Demanda.objects.all(),
+            key=lambda d: (
+                d.data_finalizacao is None,
+                -(d.data_finalizacao or fim).timestamp(),
+                -d.data_criacao.timestamp(),
+                -d.pk,
+            ),
+        )
+        self.assertEqual(ids, [d.pk for d in esperado])
+
+    def test_cursor_invalido_ou_de_outra_fila(self):
+        r = self.client.get("/api/demandas/", {"fila": "protocolados", "cursor": "xx", "page_size": 2})
+        self.assertEqual(r.status_code, status.HTTP_404_NOT_FOUND)
+        r = self.client.get("/api/demandas/", {"fila": "protocolados", "cursor": "", "page_size": 2})
+        cursor = r.data["cursor"]
+        r = self.client.get("/api/demandas/", {"fila": "finalizados", "cursor": cursor})
+        self.assertEqual(r.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_exportar_ndjson_e_csv(self):
+        r = self.client.get("/api/demandas/exportar/", {"fila": "protocolados"})
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        self.assertTrue(r.streaming)
+        linhas = b"".join(r.streaming_content).decode().splitlines()
+        itens = [json.loads(linha) for linha in linhas]
+        self.assertEqual(len(itens), 6)
+        self.assertIn("super_os", itens[0])
+
+        r = self.client.get("/api/demandas/exportar/", {"fila": "protocolados", "formato": "csv"})
+        self.assertEqual(r["Content-Type"], "text/csv; charset=utf-8")
+        linhas = list(csv.reader(io.StringIO(b"".join(r.streaming_content).decode())))
+        self.assertEqual(linhas[0][0], "id")
+        self.assertEqual(len(linhas), 7)
+        self.assertEqual(linhas[1][8], "Secretaria A")
+
+        r = self.client.get("/api/demandas/exportar/", {"formato": "xlsx"})
+        self.assertEqual(r.status_code, status.HTTP_400_BAD_REQUEST)
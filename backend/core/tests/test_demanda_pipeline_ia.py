@@ -0,0 +1,107 @@
+"""Pipeline IA pós-save: agendamento via Celery, fallback síncrono e deduplicação."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import Demanda, Usuario
+from core.services import demanda_pipeline_ia_service as pipeline
+from core.tasks import pipeline_ia_demanda_task
+
+
+class DemandaPipelineIATests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.vereador = Usuario.objects.create_user(
+            username="ver_pipeline_ia", password="x", perfil="VEREADOR"
+        )
+        self.demanda = Demanda.objects.create(
+            titulo="Buraco na rua",
+            descricao="Buraco grande na via",
+            autor=self.vereador,
+            status="RASCUNHO",
+        )
+        cache.clear()
+
+    def _patch_ia(self, vetor):
+        vector = patch("core.services.vector_service.VectorService")
+        llm = patch("core.services.llm_service.LLMService")
+        triagem = patch("core.services.triagem_service.TriagemService")
+        mocks = [p.start() for p in (vector, llm, triagem)]
+        for p in (vector, llm, triagem):
+            self.addCleanup(p.stop)
+        mocks[0].return_value.generate_embedding.return_value = vetor
+        mocks[1].return_value.extrair_entidades.return_value = {
+            "categoria_principal": "Zeladoria",
+            "sentimento_municipe": "Neutro",
+        }
+        mocks[2].return_value.buscar_servico_sinapse.return_value = []
+        return mocks
+
+    @override_settings(CELERY_ENABLED=False)
+    def test_sem_celery_roda_sincrono_apos_commit(self):
+        self._patch_ia([0.1] * 1024)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.demanda.titulo = "Buraco na rua principal"
+            self.demanda.save()
+        self.demanda.refresh_from_db()
+        self.assertIsNotNone(self.demanda.embedding)
+        self.assertEqual(self.demanda.ia_categoria, "Zeladoria")
+        self.assertTrue(self.demanda.ia_processado)
+        # Lock liberado ao fim da execução síncrona.
+        self.assertIsNone(cache.get(f"{pipeline.PIPELINE_LOCK_PREFIX}{self.demanda.pk}"))
+
+    @override_settings(CELERY_ENABLED=True)
+    def test_com_celery_enfileira_uma_vez_por_demanda(self):
+        with patch.object(pipeline_ia_demanda_task, "delay") as delay:
+            self.assertTrue(pipeline.agendar_pipeline_ia(self.demanda.pk))
+            self.assertFalse(pipeline.agendar_pipeline_ia(self.demanda.pk))
+        delay.assert_called_once_with(self.demanda.pk)
+
+    @override_settings(CELERY_ENABLED=True)
+    def test_broker_indisponivel_cai_para_sincrono(self):
+        with patch.object(
+            pipeline_ia_demanda_task, "delay", side_effect=ConnectionError("redis down")
+        ), patch.object(pipeline, "executar_pipeline_ia") as executar:
+            self.assertTrue(pipeline.agendar_pipeline_ia(self.demanda.pk))
+        executar.assert_called_once_with(self.demanda.pk)
+        self.assertIsNone(cache.get(f"{pipeline.PIPELINE_LOCK_PREFIX}{self.demanda.pk}"))
+
+    @override_settings(DEMANDA_PIPELINE_IA_MAX_RETRIES=3, DEMANDA_PIPELINE_IA_RETRY_BACKOFF=10)
+    def test_task_reagenda_enquanto_embedding_indisponivel(self):
+        self._patch_ia([])
+        retry = MagicMock(side_effect=RuntimeError("retry"))
+        with patch.object(pipeline_ia_demanda_task, "retry", retry):
+            with self.assertRaises(RuntimeError):
+                pipeline_ia_demanda_task.apply(args=(self.demanda.pk,), throw=True)
+        self.assertEqual(retry.call_args.kwargs["countdown"], 10)
+        self.assertEqual(retry.call_args.kwargs["max_retries"], 3)
+        # Triagem Groq persistida mesmo sem embedding.
+        self.demanda.refresh_from_db()
+        self.assertEqual(self.demanda.ia_categoria, "Zeladoria")
+        self.assertIsNone(self.demanda.embedding)
+
+    @override_settings(
+        CELERY_ENABLED=True,
+        DEMANDA_PIPELINE_IA_LOCK_TTL=60,
+        DEMANDA_PIPELINE_IA_RETRY_BACKOFF=600,
+    )
+    def test_lock_renovado_a_cada_retry_sobrevive_ao_ttl(self):
+        self._patch_ia([])
+        with patch.object(pipeline_ia_demanda_task, "delay"):
+            self.assertTrue(pipeline.agendar_pipeline_ia(self.demanda.pk))
+        retry = MagicMock(side_effect=RuntimeError("retry"))
+        with patch.object(pipeline_ia_demanda_task, "retry", retry):
+            with self.assertRaises(RuntimeError):
+                pipeline_ia_demanda_task.apply(args=(self.demanda.pk,), throw=True)
+
+        # TTL original (60 s) vencido durante a espera do retry (600 s): o lock segue válido.
+        agora = time.time()
+        with patch.object(pipeline_ia_demanda_task, "delay") as delay:
+            with patch("time.time", return_value=agora + 300):
+                self.assertFalse(pipeline.agendar_pipeline_ia(self.demanda.pk))
+            with patch("time.time", return_value=agora + 600 + 60 + 1):
+                self.assertTrue(pipeline.agendar_pipeline_ia(self.demanda.pk))
+        delay.assert_called_once_with(self.demanda.pk)
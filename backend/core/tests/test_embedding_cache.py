@@ -0,0 +1,76 @@
+"""Cache de embeddings: chave por conteúdo, dois níveis e invalidação por modelo."""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+from core.models import EmbeddingCacheEntrada
+from core.services import embedding_cache_service as cache_emb
+from core.services.vector_service import VectorService
+
+
+def _sessao_kernel(vetor):
+    sessao = MagicMock()
+    resp = MagicMock()
+    resp.raise_for_status.return_value = None
+    resp.json.side_effect = lambda: {"embeddings": [list(vetor) for _ in sessao.post.call_args.kwargs["json"]["texts"]]}
+    sessao.post.return_value = resp
+    return sessao
+
+
+@override_settings(AI_KERNEL_EMBEDDING_COALESCE_MS=0, AI_KERNEL_EMBEDDING_MODEL="modelo-a")
+class EmbeddingCacheTests(TestCase):
+    def setUp(self):
+        cache_emb.limpar_memoria()
+        self.addCleanup(cache_emb.limpar_memoria)
+
+    def test_chave_ignora_espacos_e_depende_do_modelo(self):
+        self.assertEqual(
+            cache_emb.chave_embedding("m", "  buraco   na\nrua "),
+            cache_emb.chave_embedding("m", "buraco na rua"),
+        )
+        self.assertNotEqual(
+            cache_emb.chave_embedding("m", "buraco na rua"),
+            cache_emb.chave_embedding("outro", "buraco na rua"),
+        )
+
+    def test_float32_compacto(self):
+        dados = cache_emb.vetor_para_bytes([0.5, -1.25, 3.0])
+        self.assertEqual(len(dados), 12)
+        self.assertEqual(cache_emb.bytes_para_vetor(dados), [0.5, -1.25, 3.0])
+
+    def test_segundo_pedido_nao_vai_ao_kernel(self):
+        sessao = _sessao_kernel([0.25, 0.5])
+        with patch("core.services.vector_service._sessao_kernel", return_value=sessao):
+            primeiro = VectorService().generate_embedding("Buraco na rua")
+            segundo = VectorService().generate_embedding("Buraco  na rua")
+            lote = VectorService().generate_embeddings(["Buraco na rua", "Poste apagado"])
+        self.assertEqual(primeiro, segundo)
+        self.assertEqual(lote, [[0.25, 0.5], [0.25, 0.5]])
+        self.assertEqual(sessao.post.call_count, 2)
+        self.assertEqual(sessao.post.call_args.kwargs["json"]["texts"], ["Poste apagado"])
+        stats = cache_emb.estatisticas()
+        self.assertEqual(stats["hits_memoria"], 2)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(EmbeddingCacheEntrada.objects.count(), 2)
+
+    def test_banco_serve_outro_processo(self):
+        cache_emb.gravar("modelo-a", {"Poste apagado": [1.0, 2.0]})
+        cache_emb.limpar_memoria()  # simula outro worker
+        sessao = _sessao_kernel([9.0, 9.0])
+        with patch("core.services.vector_service._sessao_kernel", return_value=sessao):
+            vetor = VectorService().generate_embedding("Poste apagado")
+        self.assertEqual(vetor, [1.0, 2.0])
+        sessao.post.assert_not_called()
+        self.assertEqual(cache_emb.estatisticas()["hits_banco"], 1)
+
+    def test_troca_de_modelo_invalida_entradas(self):
+        cache_emb.gravar("modelo-antigo", {"Poste apagado": [1.0, 2.0]})
+        cache_emb.limpar_memoria()
+        sessao = _sessao_kernel([3.0, 4.0])
+        with patch("core.services.vector_service._sessao_kernel", return_value=sessao):
+            vetor = VectorService().generate_embedding("Poste apagado")
+        self.assertEqual(vetor, [3.0, 4.0])
+        self.assertEqual(
+            list(EmbeddingCacheEntrada.objects.values_list("modelo", flat=True)), ["modelo-a"]
+        )
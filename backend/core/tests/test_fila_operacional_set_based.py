@@ -0,0 +1,228 @@
+"""Filas operacionais em SQL (EXISTS) — mesmos ids do algoritmo anterior linha a linha."""
+
+import importlib.util
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Demanda, Tramitacao, Usuario
+from core.models_no_operacional import NoOperacional, StatusNoOperacional
+from core.models_perna_operacional import PernaOperacional, StatusPernaOperacional
+from core.models_unidade_administrativa import UnidadeAdministrativa
+from core.services import demanda_visibilidade as vis
+
+_spec = importlib.util.spec_from_file_location("core_tests_legacy", "core/tests.py")
+_legacy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_legacy)
+SINAPSE_ORGAO_A = _legacy.SINAPSE_ORGAO_A
+SINAPSE_ORGAO_B = _legacy.SINAPSE_ORGAO_B
+SinapseCatalogTestMixin = _legacy.SinapseCatalogTestMixin
+
+FILA = ("PROTOCOLADO", "EM_EXECUCAO", "AGUARDANDO_TRANSFERENCIA")
+
+
+# --- Referência: algoritmo anterior (uma query por perna/candidata) -----------------
+
+
+def _ref_scatter_encerrado(did, oid, uas=None):
+    nos = NoOperacional.objects.filter(demanda_id=did, sinapse_orgao_id=oid)
+    if uas:
+        nos = nos.filter(unidade_administrativa_id__in=uas)
+    if not nos.exists():
+        return False
+    return not nos.filter(status=StatusNoOperacional.ABERTO).exists()
+
+
+def _ref_alerta(oid):
+    ids = set()
+    for tram in Tramitacao.objects.filter(tipo__in=("DEVOLUTIVA_PROTOCOLO", "CONCLUSAO_FINAL")):
+        meta = tram.metadata if isinstance(tram.metadata, dict) else {}
+        if any(int(d.get("secretaria_id") or 0) == oid for d in meta.get("alerta_destinos") or []):
+            ids.add(tram.demanda_id)
+    return ids
+
+
+def _ref_fluxo_direto(oid, uas=None):
+    ids = set()
+    qs = Demanda.objects.filter(sinapse_orgao_id=oid, status__in=FILA)
+    if uas:
+        qs = qs.filter(unidade_administrativa_id__in=uas)
+    for d in qs:
+        if d.fluxo_roteamento == "FLUXO_TRANSVERSAL" or d.nos_ativos > 0:
+            continue
+        pernas = PernaOperacional.objects.filter(
+            demanda_id=d.pk, status__in=StatusPernaOperacional.ATIVOS
+        )
+        nos = NoOperacional.objects.filter(demanda_id=d.pk, status=StatusNoOperacional.ABERTO)
+        if uas:
+            pernas = pernas.filter(unidade_administrativa_id__in=uas)
+            nos = nos.filter(unidade_administrativa_id__in=uas)
+            if nos.exists():
+                continue
+        if pernas.exists():
+            continue
+        ids.add(d.pk)
+    return ids
+
+
+def _ref_pendencia(oid, uas=None):
+    pernas = PernaOperacional.objects.filter(
+        sinapse_orgao_id=oid, status__in=StatusPernaOperacional.ATIVOS
+    )
+    nos = NoOperacional.objects.filter(sinapse_orgao_id=oid, status=StatusNoOperacional.ABERTO)
+    if uas:
+        pernas = pernas.filter(unidade_administrativa_id__in=uas)
+        nos = nos.filter(unidade_administrativa_id__in=uas)
+    ids = {p.demanda_id for p in pernas if not _ref_scatter_encerrado(p.demanda_id, oid, uas)}
+    ids |= set(nos.values_list("demanda_id", flat=True))
+    return ids | _ref_fluxo_direto(oid, uas) | _ref_alerta(oid)
+
+
+def _ref_em_operacao(oid, uas):
+    ids = set(
+        NoOperacional.objects.filter(
+            unidade_administrativa_id__in=uas, status=StatusNoOperacional.ABERTO
+        ).values_list("demanda_id", flat=True)
+    )
+    ids |= set(
+        PernaOperacional.objects.filter(
+            unidade_administrativa_id__in=uas, status__in=StatusPernaOperacional.ATIVOS
+        ).values_list("demanda_id", flat=True)
+    )
+    ids = {d for d in ids if not _ref_scatter_encerrado(d, oid, uas)}
+    return ids | _ref_fluxo_direto(oid, uas)
+
+
+def _ref_participacao_encerrada(oid, uas=None):
+    nos = NoOperacional.objects.filter(sinapse_orgao_id=oid, status=StatusNoOperacional.CONCLUIDO)
+    if uas:
+        nos = nos.filter(unidade_administrativa_id__in=uas)
+    return {d for d in nos.values_list("demanda_id", flat=True) if _ref_scatter_encerrado(d, oid, uas)}
+
+
+class FilaOperacionalSetBasedTests(SinapseCatalogTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.vereador = Usuario.objects.create_user(
+            username="ver_fila_sql", password="x", perfil="VEREADOR"
+        )
+        self.sec_a = Usuario.objects.create_user(
+            username="sec_fila_sql",
+            password="x",
+            perfil="SECRETARIA",
+            sinapse_orgao_id=SINAPSE_ORGAO_A,
+        )
+        self.ua1 = UnidadeAdministrativa.objects.create(
+            nome="Setor 1", sigla="S1-SQL", sinapse_orgao_id=SINAPSE_ORGAO_A, ativo=True
+        )
+        self.ua2 = UnidadeAdministrativa.objects.create(
+            nome="Setor 2", sigla="S2-SQL", sinapse_orgao_id=SINAPSE_ORGAO_A, ativo=True
+        )
+        A, B = SINAPSE_ORGAO_A, SINAPSE_ORGAO_B
+        ABERTO, CONCLUIDO = StatusNoOperacional.ABERTO, StatusNoOperacional.CONCLUIDO
+        ATIVA, CONCLUIDA = StatusPernaOperacional.EM_EXECUCAO, StatusPernaOperacional.CONCLUIDA
+
+        # Fluxo direto do órgão A (com e sem setor), transversal e nós_ativos > 0.
+        self._demanda(A, "PROTOCOLADO")
+        self._demanda(A, "EM_EXECUCAO", ua=self.ua1)
+        self._demanda(A, "EM_EXECUCAO", fluxo="FLUXO_TRANSVERSAL")
+        self._demanda(A, "EM_EXECUCAO", ua=self.ua2, nos_ativos=1)
+        self._demanda(A, "FINALIZADO")
+        d = self._demanda(A, "AGUARDANDO_TRANSFERENCIA", ua=self.ua1)
+        self._perna(d, B, ATIVA)
+        d = self._demanda(A, "EM_EXECUCAO", ua=self.ua1)
+        self._perna(d, A, ATIVA, ua=self.ua1)
+        # Transversal de B com perna de A: aberta, encerrada por scatter, concluída.
+        d = self._demanda(B, "EM_EXECUCAO", fluxo="FLUXO_TRANSVERSAL")
+        self._perna(d, A, ATIVA)
+        d = self._demanda(B, "EM_EXECUCAO", fluxo="FLUXO_TRANSVERSAL")
+        self._perna(d, A, ATIVA)
+        self._no(d, A, CONCLUIDO)
+        d = self._demanda(B, "EM_EXECUCAO", fluxo="FLUXO_TRANSVERSAL")
+        self._perna(d, A, CONCLUIDA)
+        # Scatter por setor: ua1 concluído e ua2 aberto; perna de ua1 com nó de ua1 concluído.
+        d = self._demanda(B, "EM_EXECUCAO", fluxo="FLUXO_TRANSVERSAL", nos_ativos=1)
+        self._no(d, A, CONCLUIDO, ua=self.ua1)
+        self._no(d, A, ABERTO, ua=self.ua2)
+        d = self._demanda(B, "EM_EXECUCAO", fluxo="FLUXO_TRANSVERSAL")
+        self._perna(d, A, ATIVA, ua=self.ua1)
+        self._no(d, A, CONCLUIDO, ua=self.ua1)
+        d = self._demanda(B, "EM_EXECUCAO", fluxo="FLUXO_TRANSVERSAL", nos_ativos=1)
+        self._no(d, A, ABERTO, ua=self.ua1)
+        self._no(d, B, ABERTO)
+        # Nó aberto de outro órgão num setor de A.
+        d = self._demanda(B, "EM_EXECUCAO", fluxo="FLUXO_TRANSVERSAL", nos_ativos=1)
+        self._no(d, B, ABERTO, ua=self.ua1)
+        # Alertas de devolutiva (int e str) e um destino de outro órgão.
+        for destino in (A, str(A), B):
+            d = self._demanda(B, "FINALIZADO")
+            Tramitacao.objects.create(
+                demanda=d,
+                tipo="DEVOLUTIVA_PROTOCOLO",
+                descricao="Devolutiva",
+                metadata={"alerta_destinos": [{"secretaria_id": destino}]},
+            )
+
+    def _demanda(self, orgao, status, *, ua=None, fluxo="FLUXO_DIRETO", nos_ativos=0):
+        return Demanda.objects.create(
+            titulo="Fila SQL",
+            descricao="x",
+            autor=self.vereador,
+            status=status,
+            sinapse_orgao_id=orgao,
+            unidade_administrativa=ua,
+            fluxo_roteamento=fluxo,
+            nos_ativos=nos_ativos,
+        )
+
+    def _perna(self, demanda, orgao, status, *, ua=None):
+        return PernaOperacional.objects.create(
+            demanda=demanda, sinapse_orgao_id=orgao, status=status, unidade_administrativa=ua
+        )
+
+    def _no(self, demanda, orgao, status, *, ua=None):
+        return NoOperacional.objects.create(
+            demanda=demanda, sinapse_orgao_id=orgao, status=status, unidade_administrativa=ua
+        )
+
+    def test_pendencia_operacional_igual_a_referencia(self):
+        for oid in (SINAPSE_ORGAO_A, SINAPSE_ORGAO_B):
+            with self.subTest(orgao=oid):
+                esperado = _ref_pendencia(oid)
+                self.assertTrue(esperado)
+                self.assertEqual(set(vis.demanda_ids_pendencia_operacional(oid)), esperado)
+
+    def test_pendencia_e_em_operacao_por_setor_iguais_a_referencia(self):
+        for uas in ([self.ua1.pk], [self.ua2.pk], [self.ua1.pk, self.ua2.pk]):
+            with self.subTest(uas=uas):
+                self.assertEqual(
+                    set(vis._demanda_ids_pendencia_para_orgao_uas(SINAPSE_ORGAO_A, uas)),
+                    _ref_pendencia(SINAPSE_ORGAO_A, uas),
+                )
+                self.assertEqual(
+                    set(vis._demanda_ids_em_operacao_para_orgao_uas(SINAPSE_ORGAO_A, uas)),
+                    _ref_em_operacao(SINAPSE_ORGAO_A, uas),
+                )
+
+    def test_participacao_scatter_encerrada_igual_a_referencia(self):
+        self.assertEqual(
+            set(vis.demanda_ids_participacao_scatter_encerrada(SINAPSE_ORGAO_A)),
+            _ref_participacao_encerrada(SINAPSE_ORGAO_A),
+        )
+        with patch.object(vis, "_ids_unidades_usuario", return_value=[self.ua1.pk]):
+            self.assertEqual(
+                set(vis.demanda_ids_participacao_scatter_encerrada_setor(self.sec_a)),
+                _ref_participacao_encerrada(SINAPSE_ORGAO_A, [self.ua1.pk]),
+            )
+
+    def test_escopo_fila_compoe_como_subquery(self):
+        with patch.object(vis, "_ids_unidades_usuario", return_value=[self.ua1.pk]):
+            with CaptureQueriesContext(connection) as ctx:
+                ids = set(
+                    vis.aplicar_escopo_fila_operacional(Demanda.objects.all(), self.sec_a)
+                    .values_list("pk", flat=True)
+                )
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(ids, _ref_pendencia(SINAPSE_ORGAO_A, [self.ua1.pk]))
@@ -0,0 +1,179 @@
+"""Cache persistente de geocode: mapa só lê a tabela; lote em background resolve pendentes."""
+
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.models import Demanda, GeocodeEnderecoCache, Usuario
+from core.services.endereco_normalizacao import chave_endereco_canonica
+from core.services.geocode_cache_service import geocodificar_pendentes
+from core.services.geocoding_service import GeocodingService
+from core.services.mapa_demanda_service import iter_demandas_geolocalizadas_mapa
+
+
+def _geocoder(resultados: dict[str, dict], *, disponivel=True):
+    geocoder = MagicMock()
+    geocoder.nominatim_disponivel.return_value = disponivel
+    geocoder.resolver_endereco_geocode.side_effect = lambda logr, bai, cep: resultados.get(
+        logr, {"latitude": None, "longitude": None, "fonte": "indisponivel"}
+    )
+    return geocoder
+
+
+class GeocodeCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.autor = Usuario.objects.create_user(
+            username="ver_geocode", password="x", perfil="VEREADOR"
+        )
+
+    def _demanda(self, logradouro: str, bairro: str = "Centro", **kwargs) -> Demanda:
+        return Demanda.objects.create(
+            titulo=f"Indicação {logradouro}",
+            descricao="Relato",
+            autor=self.autor,
+            status="PROTOCOLADO",
+            tipo_legislativo=Demanda.TIPO_LEGISLATIVO_INDICACAO,
+            logradouro=logradouro,
+            bairro=bairro,
+            **kwargs,
+        )
+
+    def _pendente(self, logradouro: str) -> GeocodeEnderecoCache:
+        return GeocodeEnderecoCache.objects.create(
+            chave=chave_endereco_canonica(logradouro, "Centro", None),
+            logradouro=logradouro,
+            bairro="Centro",
+        )
+
+    @override_settings(CELERY_ENABLED=True)
+    def test_mapa_nao_geocodifica_e_agenda_lote_uma_vez(self):
+        for i in range(5):
+            self._demanda(f"Rua Nova {i}")
+        self._demanda("Rua Nova 0")
+        qs = Demanda.objects.order_by("pk")
+        with patch(
+            "core.services.geocoding_service.GeocodingService"
+        ) as geo_cls, patch("core.tasks.geocodificar_enderecos_pendentes_task.delay") as delay:
+            self.assertEqual(list(iter_demandas_geolocalizadas_mapa(qs)), [])
+            self.assertEqual(list(iter_demandas_geolocalizadas_mapa(qs)), [])
+        geo_cls.return_value.resolver_endereco_geocode.assert_not_called()
+        delay.assert_called_once_with()
+        self.assertEqual(
+            GeocodeEnderecoCache.objects.filter(
+                status=GeocodeEnderecoCache.STATUS_PENDENTE
+            ).count(),
+            5,
+        )
+
+    def test_mapa_le_cache_com_consultas_constantes(self):
+        for i in range(3):
+            self._demanda(f"Rua Resolvida {i}")
+            GeocodeEnderecoCache.objects.create(
+                chave=chave_endereco_canonica(f"Rua Resolvida {i}", "Centro", None),
+                status=GeocodeEnderecoCache.STATUS_RESOLVIDO,
+                resultado={"latitude": -23.52 - i / 1000, "longitude": -46.19, "fonte": "logradouro"},
+            )
+        qs = Demanda.objects.order_by("pk")
+        # 1 leitura das demandas + 1 do cache + 1 UPDATE por indicação que recebe coordenadas.
+        with self.assertNumQueries(5):
+            pontos = list(iter_demandas_geolocalizadas_mapa(qs))
+        self.assertEqual([round(lat, 3) for _d, lat, _lng in pontos], [-23.52, -23.521, -23.522])
+        with self.assertNumQueries(1):
+            self.assertEqual(len(list(iter_demandas_geolocalizadas_mapa(qs))), 3)
+
+    def test_lote_resolve_pendentes(self):
+        self._pendente("Rua das Flores")
+        self._pendente("Rua Inexistente")
+        geocoder = _geocoder(
+            {"Rua das Flores": {"latitude": -23.523, "longitude": -46.19, "fonte": "logradouro"}}
+        )
+
+        resumo = geocodificar_pendentes(geocoder=geocoder)
+
+        self.assertEqual(
+            resumo, {"resolvidos": 1, "sem_resultado": 1, "adiados": 0, "interrompido": 0}
+        )
+        resolvido = GeocodeEnderecoCache.objects.get(logradouro="Rua das Flores")
+        self.assertEqual(resolvido.status, GeocodeEnderecoCache.STATUS_RESOLVIDO)
+        self.assertEqual(resolvido.resultado["latitude"], -23.523)
+        sem = GeocodeEnderecoCache.objects.get(logradouro="Rua Inexistente")
+        self.assertEqual(sem.status, GeocodeEnderecoCache.STATUS_SEM_RESULTADO)
+        self.assertEqual(sem.tentativas, 1)
+        self.assertEqual(geocodificar_pendentes(geocoder=geocoder)["resolvidos"], 0)
+
+    def test_lote_para_em_backoff_sem_consumir_tentativas(self):
+        self._pendente("Rua das Flores")
+        geocoder = _geocoder({}, disponivel=False)
+
+        resumo = geocodificar_pendentes(geocoder=geocoder)
+
+        self.assertEqual(resumo["interrompido"], 1)
+        geocoder.resolver_endereco_geocode.assert_not_called()
+        entrada = GeocodeEnderecoCache.objects.get()
+        self.assertEqual(entrada.status, GeocodeEnderecoCache.STATUS_PENDENTE)
+        self.assertEqual(entrada.tentativas, 0)
+
+    def test_falha_de_transporte_mantem_pendente(self):
+        self._pendente("Rua das Flores")
+        geocoder = _geocoder({})
+        geocoder.resolver_endereco_geocode.side_effect = None
+        geocoder.resolver_endereco_geocode.return_value = {
+            "latitude": None,
+            "longitude": None,
+            "fonte": "indisponivel",
+            "consulta_incompleta": True,
+        }
+
+        resumo = geocodificar_pendentes(geocoder=geocoder)
+
+        self.assertEqual(resumo["adiados"], 1)
+        entrada = GeocodeEnderecoCache.objects.get()
+        self.assertEqual(entrada.status, GeocodeEnderecoCache.STATUS_PENDENTE)
+        self.assertEqual(entrada.tentativas, 0)
+
+    @override_settings(GEOCODING_NOMINATIM_MIN_INTERVAL=0)
+    def test_geocoder_distingue_resposta_vazia_de_falha_de_transporte(self):
+        vazio = MagicMock(status_code=200, ok=True)
+        vazio.json.return_value = []
+        erro_500 = MagicMock(status_code=503, ok=False)
+        cenarios = (
+            ("Rua Vazia Um", {"return_value": vazio}, False),
+            ("Rua Timeout Dois", {"side_effect": requests.Timeout("timeout")}, True),
+            ("Rua Erro Tres", {"return_value": erro_500}, True),
+        )
+        for logradouro, comportamento, incompleta in cenarios:
+            with self.subTest(logradouro=logradouro):
+                cliente = MagicMock()
+                cliente.circuito.aberto.return_value = False
+                cliente.get = MagicMock(**comportamento)
+                with patch("core.services.geocoding_service.cliente_http", return_value=cliente):
+                    geo = GeocodingService().resolver_endereco_geocode(logradouro, "Centro", None)
+                self.assertIsNone(geo["latitude"])
+                self.assertEqual(geo["consulta_incompleta"], incompleta)
+
+    def test_lote_respeita_limite(self):
+        for i in range(4):
+            self._pendente(f"Rua {i} de Maio")
+        geocoder = _geocoder({})
+        self.assertEqual(geocodificar_pendentes(2, geocoder=geocoder)["sem_resultado"], 2)
+        self.assertEqual(geocoder.resolver_endereco_geocode.call_count, 2)
+
+    def test_comando_registra_e_geocodifica(self):
+        self._demanda("Rua das Flores")
+        self._demanda("Rua com Coordenada", latitude=-23.5, longitude=-46.2)
+        geocoder = _geocoder(
+            {"Rua das Flores": {"latitude": -23.523, "longitude": -46.19, "fonte": "logradouro"}}
+        )
+        out = StringIO()
+        with patch("core.services.geocoding_service.GeocodingService", return_value=geocoder):
+            call_command("geocodificar_enderecos", "--registrar", stdout=out)
+
+        entrada = GeocodeEnderecoCache.objects.get()
+        self.assertEqual(entrada.status, GeocodeEnderecoCache.STATUS_RESOLVIDO)
+        self.assertIn("Resolvidos: 1", out.getvalue())
@@ -0,0 +1,89 @@
+"""Cliente HTTP de saída: Session por host, circuit breaker e histogramas."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock, patch
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from core.services import http_externo
+from core.services.ai_kernel_client import AIKernelClient, AIKernelClientError
+from core.services.http_externo import CircuitoAbertoError, cliente_http
+
+
+def _resposta(status_code: int = 200) -> Mock:
+    return Mock(status_code=status_code, ok=status_code < 400, text="")
+
+
+@override_settings(
+    HTTP_EXTERNO_CIRCUITO_FALHAS=2,
+    HTTP_EXTERNO_CIRCUITO_ABERTO_SEGUNDOS=30,
+    AI_KERNEL_MAX_RETRIES=3,
+    AI_KERNEL_RETRY_BACKOFF_SECONDS=0,
+)
+class ClienteHttpExternoTests(SimpleTestCase):
+    def setUp(self):
+        http_externo.resetar_clientes_http()
+        self.addCleanup(http_externo.resetar_clientes_http)
+
+    def test_session_reaproveitada_por_host(self):
+        cliente = cliente_http("groq")
+        with patch.object(requests.Session, "request", return_value=_resposta()):
+            cliente.post("https://api.exemplo/v1/a", timeout=1)
+            cliente.post("https://api.exemplo/v1/b", timeout=1)
+            cliente.get("https://outro.exemplo/x", timeout=1)
+        self.assertEqual(
+            sorted(cliente._sessoes), ["https://api.exemplo", "https://outro.exemplo"]
+        )
+        self.assertIs(cliente_http("groq"), cliente)
+
+    def test_circuito_abre_apos_falhas_e_falha_sem_chamar_upstream(self):
+        cliente = cliente_http("nominatim")
+        with patch.object(
+            requests.Session, "request", side_effect=requests.Timeout("lento")
+        ) as req:
+            for _ in range(2):
+                with self.assertRaises(requests.Timeout):
+                    cliente.get("https://geo.exemplo/search", timeout=1)
+            with self.assertRaises(CircuitoAbertoError):
+                cliente.get("https://geo.exemplo/search", timeout=1)
+        self.assertEqual(req.call_count, 2)
+        self.assertTrue(cliente.circuito.aberto())
+        # Quem já trata queda de conexão continua tratando o circuito aberto.
+        self.assertTrue(issubclass(CircuitoAbertoError, requests.ConnectionError))
+
+    def test_meio_aberto_fecha_com_sucesso(self):
+        cliente = cliente_http("viacep")
+        with patch.object(requests.Session, "request", return_value=_resposta(503)):
+            cliente.get("https://cep.exemplo/1", timeout=1)
+            cliente.get("https://cep.exemplo/1", timeout=1)
+        self.assertTrue(cliente.circuito.aberto())
+
+        cliente.circuito._aberto_em -= 31
+        with patch.object(requests.Session, "request", return_value=_resposta(404)):
+            self.assertEqual(cliente.get("https://cep.exemplo/1", timeout=1).status_code, 404)
+        self.assertEqual(cliente.circuito.estado, "FECHADO")
+
+    def test_histograma_por_operacao(self):
+        cliente = cliente_http("groq")
+        with patch.object(requests.Session, "request", return_value=_resposta()):
+            cliente.post("https://api.exemplo/chat", timeout=1, operacao="copiloto")
+            cliente.post("https://api.exemplo/chat", timeout=1, operacao="copiloto")
+            cliente.post("https://api.exemplo/chat", timeout=1)
+        metricas = http_externo.metricas_http_externo()["groq"]
+        self.assertEqual(metricas["circuito"]["estado"], "FECHADO")
+        self.assertEqual(metricas["operacoes"]["copiloto"]["total"], 2)
+        self.assertEqual(metricas["operacoes"]["/chat"]["total"], 1)
+        self.assertEqual(sum(metricas["operacoes"]["copiloto"]["buckets"].values()), 2)
+
+    def test_kernel_client_nao_refaz_com_circuito_aberto(self):
+        with patch.object(
+            requests.Session, "request", side_effect=requests.ConnectionError("offline")
+        ) as req:
+            with self.assertRaises(AIKernelClientError):
+                AIKernelClient().embeddings(["x"])
+            self.assertEqual(req.call_count, 2)
+            with self.assertRaises(AIKernelClientError):
+                AIKernelClient().embeddings(["x"])
+            self.assertEqual(req.call_count, 2)
@@ -0,0 +1,122 @@
+"""Cache de respostas Groq por hash do prompt (LLMService / copiloto)."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from core.services import llm_cache_service
+from core.services.chatbot_service import ChatbotService
+from core.services.http_externo import ClienteHttpExterno
+from core.services.llm_service import LLMService
+
+
+def _resposta_groq(content: str, tokens: int = 120) -> Mock:
+    resposta = Mock(status_code=200, ok=True, text="")
+    resposta.json.return_value = {
+        "choices": [{"message": {"content": content}}],
+        "usage": {"total_tokens": tokens},
+    }
+    return resposta
+
+
+@override_settings(
+    GROQ_API_KEY="test-key",
+    GROQ_TEMPERATURE=0.2,
+    LLM_CACHE_ENABLED=True,
+    LLM_CACHE_TTL=600,
+    LLM_CACHE_MAX_ENTRADAS=8,
+)
+class LLMCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        llm_cache_service.limpar_memoria()
+        self.addCleanup(llm_cache_service.limpar_memoria)
+        self.addCleanup(cache.clear)
+
+    def test_extrair_entidades_repetida_nao_chama_groq(self):
+        content = json.dumps({"categoria_principal": "Zeladoria", "urgencia": 3})
+        with patch.object(
+            ClienteHttpExterno, "post", return_value=_resposta_groq(content, 150)
+        ) as post:
+            primeira = LLMService().extrair_entidades("Buraco", "Rua A, 10")
+            segunda = LLMService().extrair_entidades("Buraco", "Rua A, 10")
+            outra = LLMService().extrair_entidades("Buraco", "Rua B, 20")
+
+        self.assertEqual(primeira, segunda)
+        self.assertEqual(primeira["categoria_principal"], "Zeladoria")
+        self.assertEqual(outra["urgencia"], 3)
+        self.assertEqual(post.call_count, 2)
+        stats = llm_cache_service.estatisticas()
+        self.assertEqual(stats["hits_memoria"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["tokens_economizados"], 150)
+        self.assertAlmostEqual(stats["taxa_acerto"], 1 / 3, places=3)
+
+    def test_completar_texto_so_cacheia_quando_pedido(self):
+        with patch.object(
+            ClienteHttpExterno, "post", return_value=_resposta_groq("texto livre")
+        ) as post:
+            llm = LLMService()
+            llm.completar_texto("sys", "user")
+            llm.completar_texto("sys", "user")
+            self.assertEqual(post.call_count, 2)
+
+            llm.completar_texto("sys", "user", cacheavel=True)
+            self.assertEqual(llm.completar_texto("sys", "user", cacheavel=True), "texto livre")
+            self.assertEqual(post.call_count, 3)
+
+    @override_settings(GROQ_TEMPERATURE=0.0)
+    def test_temperatura_zero_cacheia_sem_opt_in(self):
+        with patch.object(
+            ClienteHttpExterno, "post", return_value=_resposta_groq("ok")
+        ) as post:
+            llm = LLMService()
+            llm.completar_texto("sys", "user")
+            llm.completar_texto("sys", "user")
+        self.assertEqual(post.call_count, 1)
+
+    def test_copiloto_reaproveita_resposta_e_pula_429(self):
+        chatbot = ChatbotService()
+        mensagens = [{"role": "user", "content": "Tem um buraco na minha rua"}]
+
+        with patch.object(
+            ClienteHttpExterno, "post", return_value=_resposta_groq('{"resposta": "ok"}')
+        ):
+            self.assertEqual(chatbot._post_groq(mensagens, cacheavel=True), '{"resposta": "ok"}')
+
+        limite = Mock(status_code=429, ok=False, text="try again in 9s")
+        with patch.object(ClienteHttpExterno, "post", return_value=limite) as post, patch(
+            "core.services.chatbot_service.time.sleep"
+        ) as sleep:
+            self.assertEqual(chatbot._post_groq(mensagens, cacheavel=True), '{"resposta": "ok"}')
+        post.assert_not_called()
+        sleep.assert_not_called()
+
+    def test_falha_nao_entra_no_cache(self):
+        erro = Mock(status_code=500, ok=False, text="erro")
+        with patch.object(ClienteHttpExterno, "post", return_value=erro):
+            self.assertEqual(LLMService().extrair_entidades("Poste", "apagado"), {})
+        self.assertEqual(llm_cache_service.estatisticas()["gravados"], 0)
+
+    def test_entrada_expirada_volta_ao_upstream(self):
+        chave = llm_cache_service.chave_prompt("m", [{"role": "user", "content": "x"}], 0.0)
+        with patch("core.services.llm_cache_service.time.monotonic", return_value=1000.0):
+            llm_cache_service.gravar(chave, "resposta", 10)
+        cache.clear()
+        with patch("core.services.llm_cache_service.time.monotonic", return_value=1601.0):
+            self.assertIsNone(llm_cache_service.buscar(chave))
+
+    def test_hit_no_cache_compartilhado_aquece_memoria(self):
+        chave = llm_cache_service.chave_prompt("m", [{"role": "user", "content": "y"}], 0.0)
+        llm_cache_service.gravar(chave, "resposta", 40)
+        llm_cache_service._lru.clear()
+
+        self.assertEqual(llm_cache_service.buscar(chave), "resposta")
+        self.assertEqual(llm_cache_service.buscar(chave), "resposta")
+        stats = llm_cache_service.estatisticas()
+        self.assertEqual((stats["hits_compartilhado"], stats["hits_memoria"]), (1, 1))
+        self.assertEqual(stats["tokens_economizados"], 80)
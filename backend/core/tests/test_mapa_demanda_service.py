@@ -7,7 +7,8 @@ from django.contrib.auth import get_user_model
 from django.test import RequestFactory, TestCase
 from django.utils import timezone
 
-from core.models import Demanda
+from core.models import Demanda, GeocodeEnderecoCache
+from core.services.endereco_normalizacao import chave_endereco_canonica
 from core.services.mapa_demanda_service import (
     agregar_espacial_sazonal,
     filtrar_demandas_mapa,
@@ -93,13 +94,6 @@ class MapaDemandaServiceTests(TestCase):
             bairro='Centro',
             sinapse_servico_id=20,
         )
-        mock_geo_cls.return_value.resolver_endereco_geocode.return_value = {
-            'latitude': None,
-            'longitude': None,
-            'latitude_bruta': None,
-            'longitude_bruta': None,
-            'fonte': 'indisponivel',
-        }
         qs = filtrar_demandas_mapa(self._request())
         self.assertEqual(qs.count(), 3)
         locs = serializar_locations(qs)
@@ -107,6 +101,11 @@ class MapaDemandaServiceTests(TestCase):
         self.assertEqual(len(locs), 2)
         self.assertEqual(data['total_geolocalizadas'], 2)
         self.assertNotIn('Endereco sem geo', {loc['titulo'] for loc in locs})
+        mock_geo_cls.return_value.resolver_endereco_geocode.assert_not_called()
+        pendente = GeocodeEnderecoCache.objects.get(
+            chave=chave_endereco_canonica('Rua Inexistente', 'Centro', None)
+        )
+        self.assertEqual(pendente.status, GeocodeEnderecoCache.STATUS_PENDENTE)
 
     def test_camara_ve_rascunho_geolocalizado_proprio(self):
         camara = User.objects.create_user(
@@ -156,8 +155,7 @@ class MapaDemandaServiceTests(TestCase):
         self.assertEqual(len(ids), 1)
         self.assertEqual(qs.first().status, 'RASCUNHO')
 
-    @patch('core.services.geocoding_service.GeocodingService')
-    def test_indicacao_geocodifica_automaticamente_com_logradouro_e_bairro(self, mock_geo_cls):
+    def test_indicacao_usa_geocode_em_cache_e_persiste_coords(self):
         camara = User.objects.create_user(
             username='camara_geo',
             password='test',
@@ -172,14 +170,17 @@ class MapaDemandaServiceTests(TestCase):
             bairro='Centro',
             autor=camara,
         )
-        mock_geo_cls.return_value.resolver_endereco_geocode.return_value = {
-            'latitude': -23.523,
-            'longitude': -46.19,
-            'logradouro': 'Rua das Flores',
-            'bairro': 'Centro',
-            'cep': None,
-            'fonte': 'logradouro',
-        }
+        GeocodeEnderecoCache.objects.create(
+            chave=chave_endereco_canonica('Rua das Flores', 'Centro', None),
+            status=GeocodeEnderecoCache.STATUS_RESOLVIDO,
+            resultado={
+                'latitude': -23.523,
+                'longitude': -46.19,
+                'logradouro': 'Rua das Flores',
+                'bairro': 'Centro',
+                'fonte': 'logradouro',
+            },
+        )
 
         req = self.factory.get('/api/demandas/locations/')
         req.user = camara
@@ -191,8 +192,7 @@ class MapaDemandaServiceTests(TestCase):
         self.assertIsNotNone(demanda.latitude)
         self.assertIsNotNone(demanda.longitude)
 
-    @patch('core.services.geocoding_service.GeocodingService')
-    def test_indicacao_sem_geocode_nao_aparece_no_mapa(self, mock_geo_cls):
+    def test_indicacao_sem_geocode_nao_aparece_no_mapa(self):
         camara = User.objects.create_user(
             username='camara_sem_geo',
             password='test',
@@ -207,13 +207,11 @@ class MapaDemandaServiceTests(TestCase):
             bairro='Centro',
             autor=camara,
         )
-        mock_geo_cls.return_value.resolver_endereco_geocode.return_value = {
-            'latitude': None,
-            'longitude': None,
-            'latitude_bruta': None,
-            'longitude_bruta': None,
-            'fonte': 'indisponivel',
-        }
+        GeocodeEnderecoCache.objects.create(
+            chave=chave_endereco_canonica('Rua Inexistente', 'Centro', None),
+            status=GeocodeEnderecoCache.STATUS_SEM_RESULTADO,
+            resultado={'fonte': 'indisponivel'},
+        )
 
         req = self.factory.get('/api/demandas/locations/')
         req.user = camara
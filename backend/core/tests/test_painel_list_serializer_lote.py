@@ -0,0 +1,180 @@
+"""Listagem do painel: campos calculados em lote, mesmo resultado e consultas constantes."""
+
+import importlib.util
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import ClusterExecucao, Demanda, DemandaVereadorVinculo, Tramitacao, Usuario
+from core.models_acompanhamento import DemandaAcompanhamento
+from core.models_assinatura_eletronica import AssinaturaEletronica
+from core.models_fluxo_protocolo import ServicoFluxoProtocolo
+from core.models_no_operacional import NoOperacional
+from core.serializers import DemandaPainelListSerializer
+
+_spec = importlib.util.spec_from_file_location("core_tests_legacy", "core/tests.py")
+_legacy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_legacy)
+SINAPSE_ORGAO_A = _legacy.SINAPSE_ORGAO_A
+SINAPSE_ORGAO_B = _legacy.SINAPSE_ORGAO_B
+SINAPSE_SERVICO_ID = _legacy.SINAPSE_SERVICO_ID
+SinapseCatalogTestMixin = _legacy.SinapseCatalogTestMixin
+
+def _vetor(eixo: int) -> list[float]:
+    vetor = [0.0] * 1024
+    vetor[eixo] = 1.0
+    return vetor
+
+
+CAMPOS_CALCULADOS = (
+    "protocolo_executivo",
+    "prazo_resolvido",
+    "assinaturas_resumo",
+    "acompanhando",
+    "pode_acompanhar",
+    "vereadores_vinculados",
+    "cluster_acao_visivel",
+    "fluxo_automatico",
+)
+
+
+class PainelListSerializerLoteTests(SinapseCatalogTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.vereador = Usuario.objects.create_user(
+            username="ver_painel_lote", password="x", perfil="VEREADOR", first_name="Ana"
+        )
+        self.secretaria = Usuario.objects.create_user(
+            username="sec_painel_lote",
+            password="x",
+            perfil="SECRETARIA",
+            sinapse_orgao_id=SINAPSE_ORGAO_A,
+        )
+        self.request = SimpleNamespace(user=self.secretaria, query_params={})
+        ServicoFluxoProtocolo.objects.create(
+            sinapse_servico_id=SINAPSE_SERVICO_ID,
+            modo=ServicoFluxoProtocolo.MODO_AUTOMATICO,
+            ativo=True,
+        )
+        self.demandas: list[Demanda] = []
+        self.assinaturas = 0
+
+    def _demanda(self, **kwargs) -> Demanda:
+        dados = dict(
+            titulo="Buraco",
+            descricao="Relato",
+            autor=self.vereador,
+            status="EM_EXECUCAO",
+            sinapse_servico_id=SINAPSE_SERVICO_ID,
+            sinapse_orgao_id=SINAPSE_ORGAO_A,
+        )
+        dados.update(kwargs)
+        demanda = Demanda.objects.create(**dados)
+        self.demandas.append(demanda)
+        return demanda
+
+    def _assinar(self, demanda: Demanda, etapa: str, papel: str) -> None:
+        self.assinaturas += 1
+        AssinaturaEletronica.objects.create(
+            demanda=demanda,
+            usuario=self.vereador,
+            etapa=etapa,
+            papel=papel,
+            hash_documento=f"{self.assinaturas:064d}",
+            hash_assinatura=f"h{self.assinaturas:063d}",
+            codigo_validacao=f"c{self.assinaturas:031d}",
+        )
+
+    def _grupo(self, i: int) -> None:
+        """
+        Líder + seguidora integrada, indicação, demanda acompanhada, uma aguardando
+        sem embedding e quatro soltas com embedding (cluster próximo, par, par, nada).
+        """
+        cluster = ClusterExecucao.objects.create(
+            titulo=f"Cluster {i}",
+            status="EM_ANDAMENTO",
+            sinapse_servico_id=SINAPSE_SERVICO_ID,
+            centroide=_vetor(i),
+        )
+        lider = self._demanda(cluster=cluster, protocolo_executivo=f"2026-{i:04d}")
+        seguidora = self._demanda(cluster=cluster, sinapse_orgao_id=SINAPSE_ORGAO_B)
+        Tramitacao.objects.create(
+            demanda=seguidora,
+            responsavel=self.vereador,
+            tipo="COMENTARIO",
+            descricao="Integrada",
+            metadata={"acao": "ADERIR_LIDER", "lider_demanda_id": lider.pk},
+        )
+        for papel in (
+            AssinaturaEletronica.PAPEL_OPERADOR,
+            AssinaturaEletronica.PAPEL_GESTOR_PROTOCOLO,
+        ):
+            self._assinar(lider, AssinaturaEletronica.ETAPA_DESPACHO_INICIAL, papel)
+
+        indicacao = self._demanda(
+            tipo_legislativo=Demanda.TIPO_LEGISLATIVO_INDICACAO, status="PROTOCOLADO"
+        )
+        DemandaVereadorVinculo.objects.create(
+            demanda=indicacao, vereador=self.vereador, papel=DemandaVereadorVinculo.PAPEL_AUTOR
+        )
+
+        acompanhada = self._demanda(sinapse_orgao_id=SINAPSE_ORGAO_B)
+        NoOperacional.objects.create(demanda=acompanhada, sinapse_orgao_id=SINAPSE_ORGAO_A)
+        DemandaAcompanhamento.objects.create(usuario=self.secretaria, demanda=acompanhada)
+
+        self._demanda(status="AGUARDANDO_PROTOCOLO", prazo_efetivo_dias=None)
+
+        for eixo in (i, 500 + i, 500 + i, 900 + i):
+            self._demanda(status="AGUARDANDO_PROTOCOLO", embedding=_vetor(eixo), bairro="Centro")
+
+    def _listar(self) -> tuple[list[dict], int]:
+        qs = Demanda.objects.filter(pk__in=[d.pk for d in self.demandas]).select_related(
+            "autor", "cluster", "unidade_administrativa"
+        ).order_by("pk")
+        with CaptureQueriesContext(connection) as ctx:
+            dados = DemandaPainelListSerializer(
+                qs, many=True, context={"request": self.request}
+            ).data
+        return dados, len(ctx.captured_queries)
+
+    def test_lote_equivale_ao_calculo_por_linha(self):
+        self._grupo(1)
+        dados, _ = self._listar()
+        for item in dados:
+            demanda = Demanda.objects.get(pk=item["id"])
+            individual = DemandaPainelListSerializer(
+                demanda, context={"request": self.request}
+            ).data
+            for campo in CAMPOS_CALCULADOS:
+                self.assertEqual(item[campo], individual[campo], (item["id"], campo))
+
+        (
+            lider, seguidora, indicacao, acompanhada, aguardando,
+            perto_do_cluster, par_a, par_b, isolada,
+        ) = dados
+        self.assertEqual(seguidora["protocolo_executivo"], "2026-0001")
+        self.assertTrue(seguidora["assinaturas_resumo"]["despacho_inicial_assinado"])
+        self.assertEqual([v["nome"] for v in indicacao["vereadores_vinculados"]], ["Ana"])
+        self.assertTrue(acompanhada["acompanhando"])
+        self.assertTrue(acompanhada["pode_acompanhar"])
+        self.assertFalse(lider["acompanhando"])
+        self.assertTrue(aguardando["fluxo_automatico"])
+        self.assertEqual(
+            [
+                d["cluster_acao_visivel"]
+                for d in (aguardando, perto_do_cluster, par_a, par_b, isolada)
+            ],
+            [False, True, True, True, False],
+        )
+
+    def test_consultas_nao_crescem_com_a_listagem(self):
+        self._grupo(1)
+        _, pequena = self._listar()
+        for i in range(2, 6):
+            self._grupo(i)
+        dados, grande = self._listar()
+        self.assertEqual(len(dados), 45)
+        self.assertEqual(grande, pequena)
+        self.assertLessEqual(grande, 24)
@@ -0,0 +1,165 @@
+"""Enriquecimento em lote (órgão/serviço/setor): consultas constantes por timeline, mapa e ofício."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Demanda, Tramitacao, Usuario
+from core.models_unidade_administrativa import UnidadeAdministrativa
+from core.services.mapa_demanda_service import agregar_espacial_sazonal_de_locations
+from core.services.oficio_service import OficioService
+from core.services.operacional_estado_service import OperacionalEstadoService
+from core.services.resolvedor_catalogo import ResolvedorCatalogo
+from integrations import sinapse_catalog
+
+ORGAOS = {
+    7: SimpleNamespace(pk=7, nome="Secretaria de Obras"),
+    8: SimpleNamespace(pk=8, nome="Secretaria de Serviços Urbanos"),
+}
+SERVICOS = {80: SimpleNamespace(pk=80, titulo="Tapa Buraco ")}
+
+
+def _catalogo(fonte):
+    return Mock(side_effect=lambda ids: {i: fonte[i] for i in ids if i in fonte})
+
+
+class ResolvedorCatalogoTestCase(TestCase):
+    def setUp(self):
+        self.get_orgaos = _catalogo(ORGAOS)
+        self.get_servicos = _catalogo(SERVICOS)
+        catalogo = patch.multiple(
+            sinapse_catalog,
+            get_orgaos=self.get_orgaos,
+            get_servicos=self.get_servicos,
+            get_orgao_nome=Mock(side_effect=AssertionError("lookup de órgão por item")),
+            get_servico=Mock(side_effect=AssertionError("lookup de serviço por item")),
+        )
+        catalogo.start()
+        self.addCleanup(catalogo.stop)
+        self.vereador = Usuario.objects.create_user(
+            username="ver_resolvedor", password="x", perfil="VEREADOR"
+        )
+        self.setor_a = UnidadeAdministrativa.objects.create(
+            sinapse_orgao_id=7, nome="Departamento de Vias", sigla="DEVIA"
+        )
+        self.setor_b = UnidadeAdministrativa.objects.create(
+            sinapse_orgao_id=8, nome="Departamento de Limpeza"
+        )
+
+    def _demanda(self, **kwargs):
+        dados = dict(
+            titulo="Buraco",
+            descricao="Relato",
+            autor=self.vereador,
+            status="EM_EXECUCAO",
+            sinapse_orgao_id=7,
+            sinapse_servico_id=80,
+        )
+        dados.update(kwargs)
+        return Demanda.objects.create(**dados)
+
+
+class ResolvedorCatalogoTests(ResolvedorCatalogoTestCase):
+    def test_uma_consulta_por_tipo(self):
+        resolvedor = ResolvedorCatalogo().registrar(
+            orgaos=[7, "8", None, 99],
+            servicos=[80, 80, ""],
+            unidades=[self.setor_a.pk, self.setor_b.pk],
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(resolvedor.nome_setor(self.setor_a.pk), "DEVIA")
+            self.assertEqual(resolvedor.nome_setor(self.setor_b.pk), "Departamento de Limpeza")
+            self.assertEqual(resolvedor.nome_orgao("8"), "Secretaria de Serviços Urbanos")
+            self.assertIsNone(resolvedor.nome_orgao(99))
+            self.assertEqual(resolvedor.titulo_servico(80), "Tapa Buraco ")
+            self.assertIsNone(resolvedor.nome_orgao(None))
+        self.get_orgaos.assert_called_once_with({7, 8, 99})
+        self.get_servicos.assert_called_once_with({80})
+
+    def test_id_nao_registrado_entra_no_proximo_lote(self):
+        resolvedor = ResolvedorCatalogo().registrar(orgaos=[7])
+        self.assertEqual(resolvedor.nome_orgao(7), "Secretaria de Obras")
+        self.assertEqual(resolvedor.nome_orgao(8), "Secretaria de Serviços Urbanos")
+        self.assertEqual(resolvedor.nome_orgao(8), "Secretaria de Serviços Urbanos")
+        self.assertEqual(self.get_orgaos.call_count, 2)
+
+
+class EnriquecimentoEmLoteTests(ResolvedorCatalogoTestCase):
+    def _timeline(self, demanda, total: int):
+        Tramitacao.objects.filter(demanda=demanda).delete()
+        setores = (self.setor_a, self.setor_b)
+        for i in range(total):
+            Tramitacao.objects.create(
+                demanda=demanda,
+                responsavel=self.vereador,
+                tipo="EXECUCAO",
+                descricao=f"Execução {i}",
+                unidade_destino=setores[i % 2],
+                metadata={
+                    "pernas": [
+                        {"secretaria_id": 8, "unidade_administrativa_id": self.setor_b.pk}
+                    ],
+                    "destinos": [{"secretaria_id": 7}],
+                },
+            )
+        svc = OperacionalEstadoService()
+        with CaptureQueriesContext(connection) as ctx:
+            timeline = svc.montar_timeline_operacional(demanda)
+        return timeline, len(ctx.captured_queries)
+
+    def test_timeline_com_consultas_constantes(self):
+        demanda = self._demanda()
+        curta, consultas_curta = self._timeline(demanda, 2)
+        longa, consultas_longa = self._timeline(demanda, 12)
+
+        self.assertEqual(len(longa), 12)
+        self.assertEqual(consultas_longa, consultas_curta)
+        item = longa[1]
+        self.assertEqual(item["orgao_nome"], "Secretaria de Obras")
+        self.assertEqual(item["setor_nome"], "Departamento de Limpeza")
+        self.assertEqual(item["metadata"]["pernas"][0]["orgao_nome"], "Secretaria de Serviços Urbanos")
+        self.assertEqual(item["metadata"]["destinos"][0]["orgao_nome"], "Secretaria de Obras")
+        self.assertEqual(curta[0]["setor_nome"], "DEVIA")
+        self.assertEqual(
+            longa[0]["rotulo_institucional"], "Secretaria de Obras — DEVIA"
+        )
+
+    def test_matriz_do_mapa_resolve_servicos_uma_vez(self):
+        locations = [
+            {
+                "lat": -22.9,
+                "lng": -47.0,
+                "bairro": f"Bairro {i % 5}",
+                "sinapse_servico_id": (80, 81, None)[i % 3],
+                "data_criacao": "2026-03-01T10:00:00",
+            }
+            for i in range(30)
+        ]
+        resultado = agregar_espacial_sazonal_de_locations(locations)
+        self.get_servicos.assert_called_once_with({80, 81})
+        nomes = {h["sinapse_servico_id"]: h["servico_nome"] for h in resultado["hotspots"]}
+        self.assertEqual(nomes, {80: "Tapa Buraco", 81: "Serviço 81", None: "Sem serviço"})
+
+    def test_oficio_em_lote_com_consultas_constantes(self):
+        svc = OficioService()
+
+        def gerar(total: int) -> int:
+            demandas = [self._demanda(sinapse_orgao_id=7 + i % 2) for i in range(total)]
+            with patch("core.services.oficio_service.HTML"), patch(
+                "core.services.oficio_service.render_to_string", return_value=""
+            ) as render, CaptureQueriesContext(connection) as ctx:
+                svc.gerar_pdf_oficio_lote(demandas)
+            self.itens = render.call_args.args[1]["itens"]
+            return len(ctx.captured_queries)
+
+        self.assertEqual(gerar(2), gerar(10))
+        self.assertEqual(
+            {(i["servico_nome"], i["secretaria"]) for i in self.itens},
+            {
+                ("Tapa Buraco ", "Secretaria de Obras"),
+                ("Tapa Buraco ", "Secretaria de Serviços Urbanos"),
+            },
+        )
@@ -0,0 +1,133 @@
+"""Sequência de numeração por (escopo, ano): ofício por autor e indicações da Câmara."""
+
+import os
+import threading
+import unittest
+import uuid
+from unittest.mock import patch
+
+from django.db import connections, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Demanda, SequenciaNumeracao, Usuario
+from core.models_config import NumeracaoIndicacaoCamara
+from core.services.indicacao_numeracao_service import IndicacaoNumeracaoService
+from core.services.protocolo_numeracao_service import proximo_protocolo_legislativo
+from core.services.sequencia_numeracao_service import (
+    ESCOPO_INDICACAO_CAMARA,
+    escopo_oficio_autor,
+)
+
+# Ano fora de uso real: as threads gravam em conexões próprias (fora da transação do teste).
+ANO_CONCORRENCIA = 1901
+
+# `settings_test` reutiliza o banco de homologação: o teste concorrente commita de
+# verdade, então só roda quando pedido explicitamente (banco descartável).
+TESTES_CONCORRENCIA = os.environ.get("SGDL_TESTES_CONCORRENCIA") == "1"
+
+
+def _em_paralelo(funcao, quantidade: int) -> tuple[list, list]:
+    """Executa `funcao` em `quantidade` threads, cada uma em sua transação, largando juntas."""
+    resultados, erros = [], []
+    barreira = threading.Barrier(quantidade)
+
+    def executar():
+        try:
+            barreira.wait()
+            with transaction.atomic():
+                valor = funcao()
+            resultados.append(valor)
+        except Exception as exc:  # noqa: BLE001
+            erros.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=executar) for _ in range(quantidade)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+    return resultados, erros
+
+
+def _apagar_sequencias(escopos: list[str]) -> None:
+    """Remove, fora da transação do teste, as linhas gravadas pelas threads."""
+
+    def apagar():
+        try:
+            SequenciaNumeracao.objects.filter(escopo__in=escopos, ano=ANO_CONCORRENCIA).delete()
+        finally:
+            connections.close_all()
+
+    t = threading.Thread(target=apagar)
+    t.start()
+    t.join(timeout=30)
+
+
+class SequenciaNumeracaoTests(TestCase):
+    def setUp(self):
+        self.vereador = Usuario.objects.create_user(
+            username="ver_sequencia", password="x", perfil="VEREADOR"
+        )
+        self.ano = timezone.now().year
+
+    def test_oficio_semeia_uma_vez_e_depois_so_incrementa(self):
+        Demanda.objects.create(
+            titulo="Legado",
+            descricao="x",
+            autor=self.vereador,
+            protocolo_legislativo=f"OFICIO-{self.ano}-0007",
+            status="PROTOCOLADO",
+        )
+        self.assertEqual(proximo_protocolo_legislativo(self.vereador.id), f"{self.ano}-0008")
+        with self.assertNumQueries(1):
+            self.assertEqual(proximo_protocolo_legislativo(self.vereador.id), f"{self.ano}-0009")
+        seq = SequenciaNumeracao.objects.get(escopo=escopo_oficio_autor(self.vereador.id))
+        self.assertEqual((seq.ano, seq.ultimo_numero), (self.ano, 9))
+
+    def test_numero_volta_para_sequencia_se_transacao_desfeita(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            proximo_protocolo_legislativo(self.vereador.id)
+            raise RuntimeError("envio falhou")
+        self.assertEqual(proximo_protocolo_legislativo(self.vereador.id), f"{self.ano}-0001")
+
+    def test_indicacao_usa_contador_e_respeita_ultimo_informado(self):
+        svc = IndicacaoNumeracaoService()
+        svc.atualizar_ultimo_informado(40)
+        self.assertEqual(svc.reservar_numero()[0], 41)
+        self.assertEqual(svc.reservar_numero(50)[0], 50)
+        self.assertEqual(svc.reservar_numero()[0], 51)
+        self.assertEqual(NumeracaoIndicacaoCamara.carregar().ultimo_numero, 51)
+
+        svc.atualizar_ultimo_informado(10)
+        self.assertEqual(svc.reservar_numero()[0], 11)
+        seq = SequenciaNumeracao.objects.get(escopo=ESCOPO_INDICACAO_CAMARA, ano=self.ano)
+        self.assertEqual(seq.ultimo_numero, 11)
+
+    @unittest.skipUnless(
+        TESTES_CONCORRENCIA,
+        "commita no banco compartilhado; defina SGDL_TESTES_CONCORRENCIA=1 com banco descartável",
+    )
+    def test_envios_concorrentes_recebem_numeros_distintos(self):
+        autor_id = 10**9 + uuid.uuid4().int % 10**6
+        escopos = [escopo_oficio_autor(autor_id), ESCOPO_INDICACAO_CAMARA]
+        self.addCleanup(_apagar_sequencias, escopos)
+        envios = 8
+
+        oficios, erros = _em_paralelo(
+            lambda: proximo_protocolo_legislativo(autor_id, ano=ANO_CONCORRENCIA), envios
+        )
+        self.assertEqual(erros, [])
+        self.assertEqual(
+            sorted(oficios), [f"{ANO_CONCORRENCIA}-{n:04d}" for n in range(1, envios + 1)]
+        )
+
+        cfg = NumeracaoIndicacaoCamara(ano=self.ano, ultimo_numero=0)
+        with patch.object(IndicacaoNumeracaoService, "carregar_config", return_value=cfg):
+            indicacoes, erros = _em_paralelo(
+                lambda: IndicacaoNumeracaoService().reservar_numero(ano=ANO_CONCORRENCIA)[0],
+                envios,
+            )
+        self.assertEqual(erros, [])
+        self.assertEqual(sorted(indicacoes), list(range(1, envios + 1)))
@@ -0,0 +1,65 @@
+"""Kernel NumPy de similaridade — paridade com o cosseno puro Python."""
+
+import random
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from core.services.similaridade_vetorial import (
+    CatalogoMatriz,
+    cosine_similarity_lote,
+    empilhar_normalizado,
+    media_vetores,
+    similaridades,
+    top_k_indices,
+)
+from core.services.triagem_service import cosine_similarity
+
+
+class SimilaridadeVetorialTests(SimpleTestCase):
+    def setUp(self):
+        rnd = random.Random(7)
+        self.consulta = [rnd.uniform(-1, 1) for _ in range(64)]
+        self.candidatos = [[rnd.uniform(-1, 1) for _ in range(64)] for _ in range(40)]
+
+    def test_lote_igual_ao_cosseno_python(self):
+        esperado = [cosine_similarity(self.consulta, v) for v in self.candidatos]
+        obtido = cosine_similarity_lote(self.consulta, self.candidatos)
+        for a, b in zip(esperado, obtido):
+            self.assertAlmostEqual(a, b, places=5)
+
+    def test_vetores_invalidos_pontuam_zero(self):
+        obtido = cosine_similarity_lote(
+            self.consulta, [None, [], [0.0] * 64, [1.0] * 3, "[]", self.candidatos[0]]
+        )
+        self.assertEqual(obtido[:5], [0.0] * 5)
+        self.assertAlmostEqual(
+            obtido[5], cosine_similarity(self.consulta, self.candidatos[0]), places=5
+        )
+
+    def test_top_k_ordenado_como_sort_completo(self):
+        matriz, _ = empilhar_normalizado(self.candidatos)
+        scores = similaridades(self.consulta, matriz)
+        esperado = sorted(range(len(self.candidatos)), key=lambda i: -scores[i])[:5]
+        self.assertEqual(top_k_indices(scores, 5).tolist(), esperado)
+        self.assertEqual(len(top_k_indices(scores, 500)), len(self.candidatos))
+
+    def test_media_igual_ao_calculo_legado(self):
+        vetores = [[1.0, 2.0, 3.0], [3.0, 2.0, 1.0], [9.0]]
+        # Vetor com dimensão divergente é ignorado na soma, mas conta no divisor.
+        np.testing.assert_allclose(media_vetores(vetores), [4 / 3, 4 / 3, 4 / 3], rtol=1e-6)
+        self.assertEqual(media_vetores([]), [])
+
+    def test_catalogo_busca_no_formato_da_triagem(self):
+        matriz, _ = empilhar_normalizado([[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]])
+        catalogo = CatalogoMatriz(
+            matriz=matriz,
+            servico_ids=[10, 20, 30],
+            titulos=["A", "B", "C"],
+            orgaos=["Org", None, "Org"],
+            categorias=[None, "Cat", None],
+        )
+        out = catalogo.buscar([1.0, 0.1], top_k=2)
+        self.assertEqual([r["servico_id"] for r in out], [10, 20])
+        self.assertEqual(set(out[0]), {"servico_id", "titulo", "orgao", "categoria", "score", "distancia"})
+        self.assertAlmostEqual(out[0]["score"] + out[0]["distancia"], 1.0, places=3)
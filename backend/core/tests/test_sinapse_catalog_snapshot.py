@@ -0,0 +1,122 @@
+"""Snapshot do catálogo Sinapse no cache compartilhado: lookups sem banco e versão entre workers."""
+
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from integrations import sinapse_catalog
+from integrations import sinapse_catalog_snapshot as snap
+from integrations.services.sinapse_sync_service import SinapseSyncService
+
+
+# Capturadas na importação do módulo (antes de qualquer teste): mixins de outros módulos
+# substituem estas funções por fakes durante a execução.
+_FUNCOES_REAIS = {
+    nome: getattr(sinapse_catalog, nome)
+    for nome in (
+        "get_servico",
+        "get_orgao",
+        "get_servicos",
+        "get_orgaos",
+        "get_orgao_nome",
+        "get_orgao_id_for_servico",
+        "prazo_dias",
+        "servico_requer_localizacao",
+    )
+}
+
+
+def _snapshot_falso(titulo_80: str = "Tapa Buraco"):
+    def montar(versao):
+        return snap.SnapshotCatalogo(
+            versao=versao,
+            servicos={
+                80: (titulo_80, "10 dias", "tapa-buraco", 1, 7, None, True),
+                90: ("Emissão de certidão", "5 dias", "certidao", 1, 8, None, False),
+            },
+            orgaos={
+                7: ("Secretaria de Obras", "obras", "SECRETARIA", "A"),
+                8: ("Secretaria de Finanças", "financas", "SECRETARIA", "A"),
+            },
+        )
+
+    return montar
+
+
+@override_settings(SINAPSE_CATALOGO_VERSAO_INTERVALO=0, SINAPSE_CATALOGO_SNAPSHOT_TTL=3600)
+class SinapseCatalogSnapshotTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        snap.descartar_snapshot_local()
+        self.addCleanup(snap.descartar_snapshot_local)
+        reais = patch.multiple(sinapse_catalog, **_FUNCOES_REAIS)
+        reais.start()
+        self.addCleanup(reais.stop)
+        conexoes = patch.object(snap, "connections", Mock(databases={"default": {}, "sinapse": {}}))
+        conexoes.start()
+        self.addCleanup(conexoes.stop)
+        self.montar = patch.object(snap, "montar_snapshot", side_effect=_snapshot_falso())
+        self.montar_mock = self.montar.start()
+        self.addCleanup(self.montar.stop)
+
+    def test_lookups_servidos_pelo_snapshot(self):
+        servico = sinapse_catalog.get_servico(80)
+        self.assertEqual(servico.titulo, "Tapa Buraco")
+        self.assertEqual(servico.id_orgao.nome, "Secretaria de Obras")
+        self.assertIs(sinapse_catalog.get_servico(80), servico)
+        self.assertEqual(sinapse_catalog.get_orgao_nome(8), "Secretaria de Finanças")
+        self.assertEqual(sinapse_catalog.prazo_dias(90), 5)
+        self.assertEqual(sinapse_catalog.get_orgao_id_for_servico(90), 8)
+        self.assertIsNone(sinapse_catalog.get_servico(12345))
+        self.assertTrue(sinapse_catalog.servico_requer_localizacao(80))
+        self.assertFalse(sinapse_catalog.servico_requer_localizacao(90))
+        self.assertEqual(set(sinapse_catalog.get_servicos([80, 90, 12345, None])), {80, 90})
+        self.assertEqual(set(sinapse_catalog.get_orgaos([7, 99])), {7})
+        self.assertEqual(self.montar_mock.call_count, 1)
+
+    def test_outro_worker_carrega_do_cache_sem_ir_ao_banco(self):
+        sinapse_catalog.get_servico(80)
+        snap.descartar_snapshot_local()  # simula outro processo
+        self.assertEqual(sinapse_catalog.get_servico(80).titulo, "Tapa Buraco")
+        self.assertEqual(self.montar_mock.call_count, 1)
+
+    def test_sync_publica_versao_e_workers_recarregam(self):
+        self.assertEqual(sinapse_catalog.get_servico(80).titulo, "Tapa Buraco")
+        versao_antes = snap.snapshot_catalogo().versao
+
+        self.montar_mock.side_effect = _snapshot_falso("Tapa Buraco (revisado)")
+        # Outro worker roda o sync: só a versão no cache muda para este processo.
+        with patch.object(snap, "_snapshot", None):
+            nova_versao = snap.atualizar_snapshot_catalogo()
+        self.assertEqual(nova_versao, versao_antes + 1)
+
+        self.assertEqual(sinapse_catalog.get_servico(80).titulo, "Tapa Buraco (revisado)")
+        self.assertEqual(snap.snapshot_catalogo().versao, nova_versao)
+        # Snapshot novo gravado pelo sync: este processo não remontou do banco.
+        self.assertEqual(self.montar_mock.call_count, 2)
+
+    @override_settings(SINAPSE_CATALOGO_VERSAO_INTERVALO=60)
+    def test_versao_conferida_no_maximo_uma_vez_por_intervalo(self):
+        sinapse_catalog.get_servico(80)
+        with patch.object(snap.cache, "get", side_effect=AssertionError("consultou o cache")):
+            for _ in range(5):
+                sinapse_catalog.get_orgao(7)
+
+    def test_sem_banco_sinapse_volta_a_consulta_direta(self):
+        with patch.object(snap, "connections", Mock(databases={"default": {}})):
+            self.assertIsNone(snap.snapshot_catalogo())
+        self.montar_mock.assert_not_called()
+
+
+class SinapseSyncSnapshotTests(TestCase):
+    def test_sync_bem_sucedido_atualiza_snapshot(self):
+        service = SinapseSyncService(table_name="catalog_servico")
+        service.client = Mock(fetch_services=Mock(return_value=[]))
+        with patch(
+            "integrations.services.sinapse_sync_service.atualizar_snapshot_catalogo",
+            return_value=3,
+        ) as atualizar:
+            resumo = service.full_sync()
+        atualizar.assert_called_once_with()
+        self.assertEqual(resumo["catalog_snapshot_version"], 3)
@@ -0,0 +1,80 @@
+"""SinapseSyncService._sync_records em lote: uma consulta IN por página e gravação só do que mudou."""
+
+from unittest.mock import Mock, patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from integrations.models import SinapseServiceSync, SinapseServicoMap
+from integrations.services.sinapse_sync_service import SinapseSyncService
+
+
+def _linhas(qtd, *, sufixo="", versao="2026-04-10T09:00:00-03:00"):
+    return [
+        {
+            "id": i,
+            "titulo": f"Servico {i}{sufixo}",
+            "departamento": "Secretaria",
+            "prazo": "10 dias",
+            "updated_at": versao,
+        }
+        for i in range(1, qtd + 1)
+    ]
+
+
+@patch("integrations.sinapse_catalog.servicos_existentes", side_effect=lambda ids: {i for i in ids if i % 2})
+@patch("integrations.services.sinapse_sync_service.SinapseClient")
+class SinapseSyncLoteTests(TestCase):
+    def _sync(self, mock_client_cls, paginas, **kwargs):
+        mock_client = Mock()
+        mock_client.fetch_services.side_effect = [*paginas, []]
+        mock_client_cls.return_value = mock_client
+        service = SinapseSyncService(table_name="public.catalog_servico")
+        if kwargs.pop("incremental", False):
+            return service.incremental_sync(batch_size=100)
+        return service.full_sync(batch_size=100)
+
+    def test_grava_so_registros_alterados(self, mock_client_cls, _catalogo):
+        primeiro = self._sync(mock_client_cls, [_linhas(4)])
+        self.assertEqual(primeiro["created"], 4)
+        self.assertEqual(primeiro["mapped_local"], 2)
+        self.assertEqual(primeiro["unmapped_local"], 2)
+        self.assertEqual(primeiro["mapping_records_created"], 4)
+
+        linhas = _linhas(4)
+        linhas[2]["titulo"] = "Servico 3 revisado"
+        segundo = self._sync(mock_client_cls, [linhas])
+        self.assertEqual((segundo["created"], segundo["updated"], segundo["unchanged"]), (0, 1, 3))
+        self.assertEqual(segundo["mapping_records_created"], 0)
+        self.assertEqual(
+            SinapseServiceSync.objects.get(sinapse_service_id="3").payload["service_name"],
+            "Servico 3 revisado",
+        )
+        self.assertEqual(
+            dict(SinapseServicoMap.objects.values_list("sinapse_service_id", "match_status")),
+            {"1": "AUTO", "2": "UNMATCHED", "3": "AUTO", "4": "UNMATCHED"},
+        )
+
+    def test_consultas_por_pagina_nao_crescem_com_registros(self, mock_client_cls, _catalogo):
+        def consultas(qtd):
+            SinapseServiceSync.objects.all().delete()
+            SinapseServicoMap.objects.all().delete()
+            with CaptureQueriesContext(connection) as ctx:
+                self._sync(mock_client_cls, [_linhas(qtd)])
+            return len(ctx)
+
+        self.assertEqual(consultas(3), consultas(40))
+
+    def test_incremental_pula_versao_antiga_e_reporta_vazao(self, mock_client_cls, _catalogo):
+        self._sync(mock_client_cls, [_linhas(3, versao="2026-04-10T09:00:00-03:00")])
+        resumo = self._sync(
+            mock_client_cls,
+            [_linhas(3, sufixo=" novo", versao="2026-04-01T09:00:00-03:00")],
+            incremental=True,
+        )
+        self.assertEqual(resumo["skipped_by_updated_at"], 3)
+        self.assertEqual(resumo["updated"], 0)
+        self.assertEqual(resumo["pages"], 1)
+        self.assertIn("records_per_second", resumo)
+        self.assertGreaterEqual(resumo["elapsed_seconds"], 0)
@@ -0,0 +1,165 @@
+"""Info Super OS em lote: mesmo resultado da versão por demanda, consultas fixas."""
+
+import importlib.util
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import ClusterExecucao, Demanda, Tramitacao, Usuario
+from core.serializers import DemandaPainelListSerializer
+from core.services import mapa_demanda_service
+from core.services.cluster_service import ClusterService
+
+_spec = importlib.util.spec_from_file_location("core_tests_legacy", "core/tests.py")
+_legacy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_legacy)
+SINAPSE_ORGAO_A = _legacy.SINAPSE_ORGAO_A
+SINAPSE_ORGAO_B = _legacy.SINAPSE_ORGAO_B
+SINAPSE_SERVICO_ID = _legacy.SINAPSE_SERVICO_ID
+SinapseCatalogTestMixin = _legacy.SinapseCatalogTestMixin
+
+
+class InfoSuperOsEmLoteTests(SinapseCatalogTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.svc = ClusterService()
+        self.vereador = Usuario.objects.create_user(
+            username="ver_super_lote", password="x", perfil="VEREADOR"
+        )
+        self.protocolo = Usuario.objects.create_user(
+            username="prot_super_lote", password="x", perfil="PROTOCOLO"
+        )
+        self.demandas: list[Demanda] = []
+
+    def _demanda(self, cluster=None, **kwargs):
+        dados = dict(
+            titulo="Buraco",
+            descricao="Relato",
+            autor=self.vereador,
+            status="EM_EXECUCAO",
+            sinapse_servico_id=SINAPSE_SERVICO_ID,
+            sinapse_orgao_id=SINAPSE_ORGAO_A,
+            cluster=cluster,
+        )
+        dados.update(kwargs)
+        demanda = Demanda.objects.create(**dados)
+        self.demandas.append(demanda)
+        return demanda
+
+    def _cluster(self, i: int, *, multi: bool = False, individual: bool = False):
+        cluster = ClusterExecucao.objects.create(
+            titulo=f"Cluster {i}",
+            status="EM_ANDAMENTO",
+            sinapse_servico_id=SINAPSE_SERVICO_ID,
+            protocolo_super_os=f"SOS-{i}",
+        )
+        lider = self._demanda(cluster, protocolo_executivo=f"2026-{i:04d}", bairro="Centro")
+        self._demanda(cluster, sinapse_orgao_id=SINAPSE_ORGAO_B if multi else SINAPSE_ORGAO_A)
+        if individual:
+            Tramitacao.objects.create(
+                demanda=lider,
+                responsavel=self.protocolo,
+                tipo="CONCLUSAO_FINAL",
+                descricao="Conclusão",
+                metadata={"modo_conclusao": "individual"},
+            )
+        return cluster
+
+    def _cenario(self, clusters: int):
+        for i in range(clusters):
+            self._cluster(len(self.demandas), multi=i % 3 == 1, individual=i % 3 == 2)
+        self._demanda()
+
+    def test_equivale_as_consultas_por_demanda(self):
+        self._cenario(3)
+        lote = self.svc.info_operacional_super_os_em_lote(self.demandas)
+        self.assertEqual(set(lote), {d.pk for d in self.demandas})
+        for demanda in self.demandas:
+            info = lote[demanda.pk]
+            if not demanda.cluster_id:
+                self.assertFalse(info["ativo"])
+                self.assertEqual(info["lider_id"], demanda.pk)
+                continue
+            lider_pk = self.svc.lider_cluster_pk(demanda.cluster_id)
+            meta = self.svc.metadata_cluster(demanda.cluster)
+            self.assertEqual(info["ativo"], self.svc.grupo_super_os_ativo(demanda))
+            self.assertEqual(info["lider_id"], lider_pk)
+            self.assertEqual(info["eh_lider"], demanda.pk == lider_pk)
+            self.assertEqual(
+                info["conclusao_individual_ativa"],
+                self.svc.conclusao_individual_super_os_ativa(demanda),
+            )
+            self.assertEqual(info["total_vinculados"], 2)
+            self.assertEqual(
+                [v["orgao_nome"] for v in info["demandas_vinculadas"]],
+                [
+                    {SINAPSE_ORGAO_A: "Secretaria A", SINAPSE_ORGAO_B: "Secretaria B"}[
+                        d.sinapse_orgao_id
+                    ]
+                    for d in Demanda.objects.filter(cluster_id=demanda.cluster_id).order_by("pk")
+                ],
+            )
+            for chave in ("tipo", "orgaos_envolvidos", "orgao_competente_nome"):
+                self.assertEqual(info[chave], meta[chave])
+        self.assertTrue(any(i.get("conclusao_individual_ativa") for i in lote.values()))
+        self.assertTrue(any(i["tipo"] == "MULTI_DESTINO" for i in lote.values()))
+
+    def test_numero_de_consultas_independe_do_lote(self):
+        self._cenario(2)
+        with CaptureQueriesContext(connection) as pequeno:
+            self.svc.info_operacional_super_os_em_lote(self.demandas)
+        self._cenario(8)
+        with CaptureQueriesContext(connection) as grande:
+            self.svc.info_operacional_super_os_em_lote(self.demandas)
+        self.assertEqual(len(grande.captured_queries), len(pequeno.captured_queries))
+        self.assertLessEqual(len(grande.captured_queries), 3)
+
+    def test_listagem_do_painel_usa_o_lote(self):
+        self._cenario(3)
+        qs = Demanda.objects.filter(pk__in=[d.pk for d in self.demandas]).order_by("pk")
+        with patch.object(
+            ClusterService,
+            "info_operacional_super_os",
+            side_effect=AssertionError("consulta Super OS por linha"),
+        ):
+            dados = DemandaPainelListSerializer(qs, many=True, context={"request": None}).data
+        lider = dados[0]
+        self.assertTrue(lider["super_os"]["ativo"])
+        self.assertEqual(lider["super_os"]["protocolo_super_os"], "SOS-0")
+        self.assertFalse(dados[-1]["super_os"]["ativo"])
+
+    def test_mapa_consulta_super_os_por_bloco_sem_materializar_o_queryset(self):
+        self._cenario(2)
+        for demanda in self.demandas:
+            demanda.latitude, demanda.longitude = -23.52, -46.19
+            demanda.save(update_fields=["latitude", "longitude"])
+        qs = Demanda.objects.filter(pk__in=[d.pk for d in self.demandas]).order_by("pk")
+
+        lidos = 0
+        original_iter = mapa_demanda_service.iter_demandas_geolocalizadas_mapa
+
+        def iter_contando(queryset, **kwargs):
+            nonlocal lidos
+            for ponto in original_iter(queryset, **kwargs):
+                lidos += 1
+                yield ponto
+
+        chamadas: list[tuple[int, int]] = []
+        original_lote = ClusterService.info_operacional_super_os_em_lote
+
+        def lote_registrando(svc, demandas):
+            demandas = list(demandas)
+            chamadas.append((len(demandas), lidos))
+            return original_lote(svc, demandas)
+
+        with patch.object(mapa_demanda_service, "_LOTE_SUPER_OS_MAPA", 2), patch.object(
+            mapa_demanda_service, "iter_demandas_geolocalizadas_mapa", iter_contando
+        ), patch.object(ClusterService, "info_operacional_super_os_em_lote", lote_registrando):
+            locations = mapa_demanda_service.serializar_locations(qs)
+
+        self.assertEqual(len(locations), 5)
+        # Cada bloco é consultado assim que lido: nunca há mais que um bloco em memória.
+        self.assertEqual(chamadas, [(2, 2), (2, 4), (1, 5)])
+        self.assertTrue(locations[0]["super_os"]["ativo"])
@@ -0,0 +1,158 @@
+"""Triagem Sinapse em lote: todos os itens do rascunho numa passada."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from core.models_carta_otimizada import ServicoOtimizado
+from core.services import catalogo_otimizado_indice as indice_mod
+from core.services import triagem_otimizada_service as triagem_mod
+from core.services.chatbot_service import ChatbotService
+from core.services.similaridade_vetorial import (
+    empilhar_normalizado,
+    similaridades,
+    similaridades_lote,
+)
+from core.services.triagem_otimizada_service import (
+    AdapterTriagemOtimizada,
+    TriagemOtimizadaService,
+)
+
+
+def _vetor(seed: int) -> list[float]:
+    return np.random.default_rng(seed).standard_normal(1024).astype(np.float32).tolist()
+
+
+def _nomes_falsos(ids):
+    return {int(i): (f"Órgão {i}", f"Categoria {i}") for i in ids}
+
+
+class SimilaridadesLoteTests(SimpleTestCase):
+    def test_igual_a_uma_consulta_por_vez(self):
+        matriz, _ = empilhar_normalizado([_vetor(i) for i in range(20)])
+        consultas = [_vetor(100), [], _vetor(101), [0.0] * 1024, [1.0, 2.0]]
+        lote = similaridades_lote(consultas, matriz)
+        self.assertEqual(lote.shape, (5, 20))
+        for linha, consulta in zip(lote, consultas):
+            np.testing.assert_allclose(linha, similaridades(consulta, matriz), atol=1e-5)
+
+
+@patch.object(triagem_mod, "nomes_sinapse", side_effect=_nomes_falsos)
+@patch.object(indice_mod, "nomes_sinapse", side_effect=_nomes_falsos)
+class BuscaEmLoteTests(TestCase):
+    def setUp(self):
+        indice_mod.invalidar_indice_catalogo_otimizado()
+        self.addCleanup(indice_mod.invalidar_indice_catalogo_otimizado)
+        titulos = [
+            "Tapa-buraco em via pública",
+            "Poda de árvore",
+            "Troca de lâmpada da iluminação pública",
+            "Limpeza de boca de lobo",
+            "Recapeamento asfáltico",
+        ]
+        for i, titulo in enumerate(titulos, start=1):
+            ServicoOtimizado.objects.create(
+                sinapse_servico_id=200 + i,
+                titulo_otimizado=titulo,
+                descricao_objetiva=f"Descrição do serviço {titulo.lower()}",
+                texto_rag_otimizado=f"{titulo}. Atendimento da prefeitura.",
+                palavras_chave=[],
+                embedding_otimizado=_vetor(i),
+            )
+        self.consultas = [
+            ((np.array(_vetor(2)) + 0.2 * np.array(_vetor(90))).tolist(), "poda de árvore"),
+            ((np.array(_vetor(4)) + 0.2 * np.array(_vetor(91))).tolist(), "bueiro entupido"),
+            (_vetor(5), None),
+        ]
+
+    def test_pgvector_lateral_igual_a_uma_consulta_por_vez(self, *_):
+        svc = TriagemOtimizadaService()
+        embeddings = [emb for emb, _ in self.consultas]
+        with self.assertNumQueries(1):
+            lote = svc._buscar_pgvector_otimizado_db_lote(embeddings, 3)
+        with patch.object(
+            TriagemOtimizadaService, "_obter_orgao_nome", return_value=None
+        ), patch.object(TriagemOtimizadaService, "_obter_categoria_nome", return_value=None):
+            individuais = [svc._buscar_pgvector_otimizado_db(emb, 3) for emb in embeddings]
+
+        self.assertEqual(
+            [[r["servico_id"] for r in res] for res in lote],
+            [[r["servico_id"] for r in res] for res in individuais],
+        )
+        self.assertEqual(lote[0][0]["servico_id"], 202)
+        self.assertEqual(lote[0][0]["orgao"], "Órgão 202")
+        for a, b in zip(lote[1], individuais[1]):
+            self.assertAlmostEqual(a["score"], b["score"], places=4)
+
+    def test_lote_igual_a_buscar_servico_sinapse(self, *_):
+        svc = TriagemOtimizadaService()
+        with patch.object(
+            triagem_mod.VectorService, "generate_embedding", return_value=[]
+        ), patch.object(
+            triagem_mod.VectorService, "generate_embeddings", side_effect=lambda t: [[] for _ in t]
+        ) as lote_emb:
+            individuais = [
+                svc.buscar_servico_sinapse(emb, 4, texto) for emb, texto in self.consultas
+            ]
+            lote = svc.buscar_servicos_em_lote(self.consultas, top_k=4)
+
+        self.assertEqual(lote, individuais)
+        # Expansões lexicais das consultas re-embedadas num único POST.
+        self.assertLessEqual(lote_emb.call_count, 1)
+
+
+class ChatbotTriagemEmLoteTests(SimpleTestCase):
+    def _itens(self):
+        return [
+            {"titulo": "Buraco na rua", "descricao": "Buraco enorme na Rua A"},
+            {"titulo": "Poste apagado", "descricao": "Lâmpada queimada na Rua B"},
+            {"titulo": "Poda de árvore", "descricao": "Galho caindo na Rua C"},
+        ]
+
+    def test_atualizar_triagem_faz_um_lote_e_devolve_por_item(self):
+        itens = self._itens()
+        chatbot = ChatbotService()
+
+        def buscar(consultas, top_k=3):
+            # Candidato depende da variante: mapeamento de volta por item.
+            return [
+                [
+                    {
+                        "servico_id": 300 + len(texto) % 3,
+                        "titulo": texto[:10],
+                        "score": len(texto) / 1000,
+                    }
+                ]
+                for _, texto in consultas
+            ]
+
+        with patch.object(
+            ChatbotService, "_texto_usuario_da_sessao", return_value=""
+        ), patch(
+            "core.services.chatbot_service.VectorService.generate_embeddings",
+            side_effect=lambda textos: [[0.1] * 1024 for _ in textos],
+        ) as emb, patch.object(
+            AdapterTriagemOtimizada, "buscar_servicos_em_lote", side_effect=buscar
+        ) as busca:
+            chatbot._atualizar_triagem_demandas(None, itens, forcar=True)
+
+        self.assertEqual(emb.call_count, 1)
+        self.assertEqual(busca.call_count, 1)
+        n_variantes = len(emb.call_args.args[0])
+        self.assertEqual(len(busca.call_args.args[0]), n_variantes)
+        for item in itens:
+            self.assertTrue(item["candidatos_sinapse"])
+            self.assertEqual(item["candidatos_revisao"], 1)
+        individuais = []
+        for item in self._itens():
+            with patch(
+                "core.services.chatbot_service.VectorService.generate_embeddings",
+                side_effect=lambda textos: [[0.1] * 1024 for _ in textos],
+            ), patch.object(
+                AdapterTriagemOtimizada, "buscar_servicos_em_lote", side_effect=buscar
+            ):
+                individuais.append(chatbot._triagem_sinapse_consolidada(item))
+        self.assertEqual([item["candidatos_sinapse"] for item in itens], individuais)
@@ -0,0 +1,95 @@
+"""VectorService: embeddings em lote, isolamento de falhas e micro-lotes concorrentes."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from core.services.vector_service import VectorService
+
+
+def _resposta(payload):
+    resp = MagicMock()
+    resp.raise_for_status.return_value = None
+    resp.json.return_value = payload
+    return resp
+
+
+def _kernel_fake(ruim: str = ""):
+    """Simula o Kernel gabinete: 1 vetor por texto; `ruim` derruba o POST com 422."""
+    chamadas: list[list[str]] = []
+
+    def post(url, json=None, timeout=None):
+        textos = json["texts"]
+        chamadas.append(list(textos))
+        if ruim and ruim in textos:
+            resp = MagicMock(status_code=422, text="entrada inválida")
+            resp.raise_for_status.side_effect = requests.HTTPError(response=resp)
+            return resp
+        return _resposta({"embeddings": [[float(len(t)), 1.0] for t in textos]})
+
+    sessao = MagicMock()
+    sessao.post.side_effect = post
+    return sessao, chamadas
+
+
+@override_settings(
+    AI_KERNEL_EMBEDDING_BATCH_SIZE=2,
+    AI_KERNEL_EMBEDDING_COALESCE_MS=0,
+    EMBEDDING_CACHE_ENABLED=False,
+)
+class VectorServiceLoteTests(SimpleTestCase):
+    def test_chunks_ordem_e_textos_repetidos(self):
+        sessao, chamadas = _kernel_fake()
+        with patch("core.services.vector_service._sessao_kernel", return_value=sessao):
+            out = VectorService().generate_embeddings(["a", "bb", "", "a", "ccc", "dddd"])
+        self.assertEqual(chamadas, [["a", "bb"], ["ccc", "dddd"]])
+        self.assertEqual([v[0] if v else None for v in out], [1.0, 2.0, None, 1.0, 3.0, 4.0])
+
+    def test_entrada_ruim_nao_zera_o_lote(self):
+        sessao, chamadas = _kernel_fake(ruim="xx")
+        with patch("core.services.vector_service._sessao_kernel", return_value=sessao):
+            out = VectorService().generate_embeddings(["a", "xx"])
+        self.assertEqual(chamadas, [["a", "xx"], ["a"], ["xx"]])
+        self.assertEqual(out, [[1.0, 1.0], []])
+
+    def test_kernel_fora_nao_refaz_texto_a_texto(self):
+        sessao = MagicMock()
+        sessao.post.side_effect = requests.ConnectionError("recusado")
+        with patch("core.services.vector_service._sessao_kernel", return_value=sessao):
+            out = VectorService().generate_embeddings(["a", "b"])
+        self.assertEqual(out, [[], []])
+        self.assertEqual(sessao.post.call_count, 1)
+
+    @override_settings(AI_KERNEL_EMBEDDING_PAYLOAD="openai")
+    def test_payload_openai_em_lote(self):
+        sessao = MagicMock()
+        sessao.post.return_value = _resposta(
+            {"data": [{"index": 1, "embedding": [2.0]}, {"index": 0, "embedding": [1.0]}]}
+        )
+        with patch("core.services.vector_service._sessao_kernel", return_value=sessao):
+            out = VectorService().generate_embeddings(["a", "b"])
+        self.assertEqual(out, [[1.0], [2.0]])
+        self.assertEqual(sessao.post.call_args.kwargs["json"]["input"], ["a", "b"])
+
+    @override_settings(AI_KERNEL_EMBEDDING_COALESCE_MS=200, AI_KERNEL_EMBEDDING_BATCH_SIZE=32)
+    def test_chamadas_concorrentes_viram_um_post(self):
+        sessao, chamadas = _kernel_fake()
+        resultados: dict[str, list[float]] = {}
+        barreira = threading.Barrier(4)
+
+        def chamar(texto):
+            barreira.wait()
+            resultados[texto] = VectorService().generate_embedding(texto)
+
+        with patch("core.services.vector_service._sessao_kernel", return_value=sessao):
+            threads = [threading.Thread(target=chamar, args=(t,)) for t in ("a", "bb", "ccc", "dddd")]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=5)
+
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(sorted(chamadas[0]), ["a", "bb", "ccc", "dddd"])
+        self.assertEqual({t: v[0] for t, v in resultados.items()}, {"a": 1.0, "bb": 2.0, "ccc": 3.0, "dddd": 4.0})
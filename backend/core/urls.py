@@ -42,6 +42,7 @@ from .views_copiloto_faq import (
     CopilotoFaqPadraoRegexViewSet,
     CopilotoFaqSugestoesLlmAPIView,
 )
+from .views_chat_stream import chat_interagir_stream
 from .views_corpus_legado import (
     CorpusLegadoAtalhoDetalheAPIView,
     CorpusLegadoAtalhosCopilotoAPIView,
@@ -115,6 +116,7 @@ router.register(r'gestao-usuarios-gestor', GestaoUsuarioGestorViewSet, basename=
 
 urlpatterns = [
     path('v1/chat/interagir/', ChatInteragirAPIView.as_view(), name='chat-interagir'),
+    path('v1/chat/interagir/stream/', chat_interagir_stream, name='chat-interagir-stream'),
     path(
         'v1/chat/retriagem-carta/',
         ChatRetriagemCartaAPIView.as_view(),
@@ -398,6 +398,71 @@ class ChatRemoverAnexoSessaoAPIView(APIView):
         return Response(payload, status=status.HTTP_200_OK)
 
 
+def parametros_chat_interagir(data, files) -> tuple[dict | None, dict | None]:
+    """
+    Valida o corpo de `chat/interagir` (JSON ou multipart).
+
+    Retorna `(kwargs de ChatbotService.interagir, None)` ou `(None, erro 400)`;
+    compartilhado com o endpoint em streaming (`views_chat_stream`).
+    """
+    mensagem = (data.get("mensagem") or "").strip()
+    anexos = files.getlist("anexos")
+    if not mensagem and not anexos:
+        return None, {"detail": "Informe uma mensagem e/ou anexos."}
+
+    sid_raw = data.get("session_id")
+    sid = None
+    if sid_raw not in (None, ""):
+        try:
+            sid = str(uuid.UUID(str(sid_raw)))
+        except (ValueError, TypeError):
+            return None, {"session_id": "Identificador de sessão inválido."}
+
+    anexo_indices_raw = data.get("anexo_demanda_indices")
+    anexo_indices: list[int | None] = []
+    if anexo_indices_raw not in (None, ""):
+        for parte in str(anexo_indices_raw).split(","):
+            parte = parte.strip()
+            if parte == "":
+                anexo_indices.append(None)
+            else:
+                try:
+                    anexo_indices.append(int(parte))
+                except ValueError:
+                    anexo_indices.append(None)
+
+    indices_aprovados: list[int] | None = None
+    raw_aprov = data.get("indices_aprovados")
+    if raw_aprov not in (None, ""):
+        indices_aprovados = []
+        for parte in str(raw_aprov).split(","):
+            parte = parte.strip()
+            if parte.isdigit():
+                indices_aprovados.append(int(parte))
+
+    corpus_sid_raw = data.get("corpus_sinapse_servico_id")
+    corpus_sinapse_servico_id = None
+    if corpus_sid_raw not in (None, ""):
+        try:
+            corpus_sinapse_servico_id = int(corpus_sid_raw)
+        except (TypeError, ValueError):
+            return None, {"corpus_sinapse_servico_id": "Identificador de serviço inválido."}
+    corpus_atalho_id = (data.get("corpus_atalho_id") or "").strip() or None
+
+    return (
+        {
+            "session_id": sid,
+            "mensagem": mensagem,
+            "anexos_upload": anexos,
+            "anexo_demanda_indices": anexo_indices or None,
+            "indices_aprovados": indices_aprovados,
+            "corpus_sinapse_servico_id": corpus_sinapse_servico_id,
+            "corpus_atalho_id": corpus_atalho_id,
+        },
+        None,
+    )
+
+
 class ChatInteragirAPIView(APIView):
     """
     POST /api/v1/chat/interagir/
@@ -410,70 +475,12 @@ class ChatInteragirAPIView(APIView):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def post(self, request):
-        mensagem = (request.data.get("mensagem") or "").strip()
-        anexos = request.FILES.getlist("anexos")
-        if not mensagem and not anexos:
-            return Response(
-                {"detail": "Informe uma mensagem e/ou anexos."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        sid_raw = request.data.get("session_id")
-        sid = None
-        if sid_raw not in (None, ""):
-            try:
-                sid = str(uuid.UUID(str(sid_raw)))
-            except (ValueError, TypeError):
-                return Response(
-                    {"session_id": "Identificador de sessão inválido."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-        anexo_indices_raw = request.data.get("anexo_demanda_indices")
-        anexo_indices: list[int | None] = []
-        if anexo_indices_raw not in (None, ""):
-            for parte in str(anexo_indices_raw).split(","):
-                parte = parte.strip()
-                if parte == "":
-                    anexo_indices.append(None)
-                else:
-                    try:
-                        anexo_indices.append(int(parte))
-                    except ValueError:
-                        anexo_indices.append(None)
-
-        indices_aprovados: list[int] | None = None
-        raw_aprov = request.data.get("indices_aprovados")
-        if raw_aprov not in (None, ""):
-            indices_aprovados = []
-            for parte in str(raw_aprov).split(","):
-                parte = parte.strip()
-                if parte.isdigit():
-                    indices_aprovados.append(int(parte))
-
-        corpus_sid_raw = request.data.get("corpus_sinapse_servico_id")
-        corpus_sinapse_servico_id = None
-        if corpus_sid_raw not in (None, ""):
-            try:
-                corpus_sinapse_servico_id = int(corpus_sid_raw)
-            except (TypeError, ValueError):
-                return Response(
-                    {"corpus_sinapse_servico_id": "Identificador de serviço inválido."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        corpus_atalho_id = (request.data.get("corpus_atalho_id") or "").strip() or None
+        parametros, erro = parametros_chat_interagir(request.data, request.FILES)
+        if erro:
+            return Response(erro, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            payload = ChatbotService().interagir(
-                usuario=request.user,
-                session_id=sid,
-                mensagem=mensagem,
-                anexos_upload=anexos,
-                anexo_demanda_indices=anexo_indices or None,
-                indices_aprovados=indices_aprovados,
-                corpus_sinapse_servico_id=corpus_sinapse_servico_id,
-                corpus_atalho_id=corpus_atalho_id,
-            )
+            payload = ChatbotService().interagir(usuario=request.user, **parametros)
         except ValueError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         except PermissionError:
@@ -537,7 +544,7 @@ class DemandaViewSet(viewsets.ModelViewSet):
     _DESC_SIMILARES_MAX = 280
 
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action in ("list", "exportar"):
             return DemandaPainelListSerializer
         return DemandaSerializer
 
@@ -565,13 +572,9 @@ class DemandaViewSet(viewsets.ModelViewSet):
                 return qs.none()
         if fila in ("protocolados", "operacionais", "devolutivas", "finalizados", "stand_by"):
             if fila == "finalizados":
-                qs = qs.prefetch_related("assinaturas_eletronicas").order_by(
-                    "-data_finalizacao", "-data_criacao"
-                )
+                qs = qs.order_by("-data_finalizacao", "-data_criacao")
             else:
-                qs = qs.prefetch_related("assinaturas_eletronicas").order_by(
-                    "data_entrada_etapa", "data_criacao"
-                )
+                qs = qs.order_by("data_entrada_etapa", "data_criacao")
             if fila == "operacionais":
                 from core.services.acompanhamento_demanda_service import (
                     filtrar_demandas_acompanhando,
@@ -633,7 +636,7 @@ class DemandaViewSet(viewsets.ModelViewSet):
                         "True",
                     ):
                         qs = filtrar_demandas_minha_unidade(qs, self.request.user)
-            if self.action == "list":
+            if self.action in ("list", "exportar"):
                 qs = self._aplicar_filtros_cluster_listagem(qs)
             from core.services.demanda_visibilidade import (
                 filtrar_demandas_por_unidades,
@@ -645,7 +648,7 @@ class DemandaViewSet(viewsets.ModelViewSet):
                 qs = filtrar_demandas_por_unidades(qs, parsed_uas)
             return qs
         qs = qs.order_by("-data_criacao")
-        if self.action == "list":
+        if self.action in ("list", "exportar"):
             qs = self._aplicar_filtros_cluster_listagem(qs)
         return qs
 
@@ -674,6 +677,47 @@ class DemandaViewSet(viewsets.ModelViewSet):
                 )
         return response
 
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="exportar",
+        permission_classes=[IsAuthenticated],
+    )
+    def exportar(self, request):
+        """Exporta a listagem (mesmos filtros/filas) em streaming.
+
+        Query params:
+            formato (str): ``ndjson`` (padrão, um objeto por linha) ou ``csv``.
+        """
+        from django.http import StreamingHttpResponse
+
+        from core.services.demanda_exportacao_service import (
+            FORMATOS_EXPORTACAO,
+            iterar_itens_serializados,
+            linhas_exportacao,
+        )
+
+        formato = (request.query_params.get("formato") or "ndjson").strip().lower()
+        if formato not in FORMATOS_EXPORTACAO:
+            return Response(
+                {"detail": f"Formato inválido. Use: {', '.join(FORMATOS_EXPORTACAO)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        itens = iterar_itens_serializados(queryset, self.get_serializer_context())
+        if formato == "csv":
+            response = StreamingHttpResponse(
+                linhas_exportacao(itens, formato), content_type="text/csv; charset=utf-8"
+            )
+            response["Content-Disposition"] = 'attachment; filename="demandas.csv"'
+        else:
+            response = StreamingHttpResponse(
+                linhas_exportacao(itens, formato),
+                content_type="application/x-ndjson; charset=utf-8",
+            )
+            response["Content-Disposition"] = 'attachment; filename="demandas.ndjson"'
+        return response
+
     @action(
         detail=False,
         methods=["get"],
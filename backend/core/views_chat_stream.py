@@ -0,0 +1,127 @@
+"""
+POST /api/v1/chat/interagir/stream/ — turno do copiloto em streaming (ASGI).
+
+Mesmo corpo e mesma autenticação (JWT) de `chat/interagir/`. A resposta é NDJSON,
+um evento por linha:
+
+- `{"tipo": "fragmento", "texto": "..."}` — trecho de `resposta_agente` enquanto a
+  Groq gera;
+- `{"tipo": "final", "status": 200, "dados": {...}}` — payload idêntico ao de
+  `chat/interagir/` (o texto final pode diferir dos fragmentos após as regras do
+  turno; a UI deve trocar pelo `dados.resposta_agente`).
+
+A view é assíncrona: o turno (`ChatbotService.interagir`, síncrono) roda numa
+thread do executor e não prende o event loop; servido por ASGI
+(`config/asgi.py`), um worker atende outros chats enquanto a Groq responde.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Callable
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .services.chatbot_service import ChatbotService
+from .views import parametros_chat_interagir
+
+logger = logging.getLogger(__name__)
+
+
+def _preparar_turno(request) -> tuple[Any, dict | None, int, dict | None]:
+    """Autentica (JWT) e valida o corpo como a view DRF: (usuário, kwargs, status, erro)."""
+    drf_request = Request(
+        request,
+        parsers=[MultiPartParser(), FormParser(), JSONParser()],
+        authenticators=[JWTAuthentication()],
+    )
+    try:
+        usuario = drf_request.user
+        if not getattr(usuario, "is_authenticated", False):
+            return None, None, status.HTTP_401_UNAUTHORIZED, {
+                "detail": "As credenciais de autenticação não foram fornecidas."
+            }
+        parametros, erro = parametros_chat_interagir(drf_request.data, drf_request.FILES)
+    except APIException as exc:
+        return None, None, exc.status_code, {"detail": str(exc.detail)}
+    if erro:
+        return None, None, status.HTTP_400_BAD_REQUEST, erro
+    return usuario, parametros, status.HTTP_200_OK, None
+
+
+def _executar_turno(
+    usuario, parametros: dict, ao_fragmento: Callable[[str], None]
+) -> tuple[int, dict]:
+    """Roda o turno na thread do executor; mesmos status HTTP de `ChatInteragirAPIView`."""
+    close_old_connections()
+    try:
+        payload = ChatbotService(ao_fragmento=ao_fragmento).interagir(
+            usuario=usuario, **parametros
+        )
+    except ValueError as exc:
+        return status.HTTP_400_BAD_REQUEST, {"detail": str(exc)}
+    except PermissionError:
+        return status.HTTP_403_FORBIDDEN, {
+            "detail": "Sessão inexistente ou não pertence ao usuário."
+        }
+    except Exception as exc:
+        logger.exception("Falha no copiloto (chat/interagir/stream): %s", exc)
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {
+            "detail": "Não foi possível processar a mensagem. Tente novamente em instantes."
+        }
+    finally:
+        # Threads do executor são reaproveitadas entre requisições: devolve a conexão.
+        connections.close_all()
+    if payload.get("erro"):
+        return status.HTTP_400_BAD_REQUEST, payload
+    return status.HTTP_200_OK, payload
+
+
+def _linha(evento: dict) -> bytes:
+    return (json.dumps(evento, cls=JSONEncoder, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+async def _eventos_turno(usuario, parametros: dict) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    fila: asyncio.Queue[str | None] = asyncio.Queue()
+
+    def ao_fragmento(texto: str) -> None:
+        loop.call_soon_threadsafe(fila.put_nowait, texto)
+
+    # Se o cliente desconectar, o turno termina mesmo assim e a sessão fica persistida.
+    turno = asyncio.ensure_future(
+        sync_to_async(_executar_turno, thread_sensitive=False)(usuario, parametros, ao_fragmento)
+    )
+    turno.add_done_callback(lambda _t: fila.put_nowait(None))
+
+    while (texto := await fila.get()) is not None:
+        yield _linha({"tipo": "fragmento", "texto": texto})
+    status_http, dados = turno.result()
+    yield _linha({"tipo": "final", "status": status_http, "dados": dados})
+
+
+@csrf_exempt
+@require_POST
+async def chat_interagir_stream(request):
+    usuario, parametros, status_http, erro = await sync_to_async(_preparar_turno)(request)
+    if erro:
+        return JsonResponse(erro, status=status_http, json_dumps_params={"ensure_ascii": False})
+    resposta = StreamingHttpResponse(
+        _eventos_turno(usuario, parametros), content_type="application/x-ndjson"
+    )
+    resposta["Cache-Control"] = "no-cache"
+    # Nginx: não bufferizar, senão os fragmentos chegam todos no fim.
+    resposta["X-Accel-Buffering"] = "no"
+    return resposta
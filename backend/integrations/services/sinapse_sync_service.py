@@ -2,6 +2,7 @@ import logging
 import hashlib
 import json
 import re
+import time
 from datetime import datetime
 from html import unescape
 from typing import Any
@@ -12,6 +13,7 @@ from django.utils import timezone
 
 from integrations import sinapse_catalog
 from integrations.models import SinapseServiceSync, SinapseServicoMap
+from integrations.sinapse_catalog_snapshot import atualizar_snapshot_catalogo
 from integrations.sinapse_client import SinapseClient, SinapseClientError
 
 logger = logging.getLogger(__name__)
@@ -113,46 +115,54 @@ class SinapseSyncService:
         text = re.sub(r"[^a-z0-9\s]", " ", text)
         return re.sub(r"\s+", " ", text).strip()
 
-    def _upsert_service_mapping(
-        self,
-        sinapse_service_id: str,
-        service_name: str,
-    ) -> tuple[bool, bool]:
-        """Retorna (presente_no_catalogo, registro_map_criado_agora)."""
-        try:
-            in_catalog = sinapse_catalog.servico_existe(int(sinapse_service_id))
-        except (TypeError, ValueError):
-            in_catalog = False
-
-        defaults = {
-            "match_status": "AUTO" if in_catalog else "UNMATCHED",
-            "match_rule": "catalog_servico_id" if in_catalog else "none",
-            "confidence": "1.00" if in_catalog else "0.00",
-            "notes": None if in_catalog else "Serviço ausente no catálogo Sinapse.",
-            "last_seen_at": timezone.now(),
-        }
-        obj, created_now = SinapseServicoMap.objects.get_or_create(
-            sinapse_service_id=sinapse_service_id,
-            defaults=defaults,
-        )
+    @staticmethod
+    def _catalog_ids(service_ids: set[str]) -> set[str]:
+        numericos = {sid for sid in service_ids if sid.isdigit()}
+        if not numericos:
+            return set()
+        presentes = sinapse_catalog.servicos_existentes(int(sid) for sid in numericos)
+        return {sid for sid in numericos if int(sid) in presentes}
+
+    def _upsert_service_mappings(self, service_ids: set[str]) -> tuple[set[str], set[str]]:
+        """
+        Atualiza `SinapseServicoMap` de uma página inteira.
 
-        if not created_now:
-            obj.match_status = defaults["match_status"]
-            obj.match_rule = defaults["match_rule"]
-            obj.confidence = defaults["confidence"]
-            obj.notes = defaults["notes"]
-            obj.last_seen_at = defaults["last_seen_at"]
-            obj.save(
-                update_fields=[
-                    "match_status",
-                    "match_rule",
-                    "confidence",
-                    "notes",
-                    "last_seen_at",
-                    "updated_at",
-                ]
+        Retorna (ids presentes no catálogo, ids cujo registro de map foi criado agora).
+        """
+        if not service_ids:
+            return set(), set()
+        in_catalog = self._catalog_ids(service_ids)
+        now = timezone.now()
+        existentes = set(
+            SinapseServicoMap.objects.filter(sinapse_service_id__in=service_ids).values_list(
+                "sinapse_service_id", flat=True
             )
-        return in_catalog, created_now
+        )
+
+        def defaults(found: bool) -> dict[str, Any]:
+            return {
+                "match_status": "AUTO" if found else "UNMATCHED",
+                "match_rule": "catalog_servico_id" if found else "none",
+                "confidence": "1.00" if found else "0.00",
+                "notes": None if found else "Serviço ausente no catálogo Sinapse.",
+                "last_seen_at": now,
+            }
+
+        novos = service_ids - existentes
+        SinapseServicoMap.objects.bulk_create(
+            [
+                SinapseServicoMap(sinapse_service_id=sid, **defaults(sid in in_catalog))
+                for sid in sorted(novos)
+            ],
+            batch_size=500,
+        )
+        for found in (True, False):
+            alvo = {sid for sid in existentes if (sid in in_catalog) is found}
+            if alvo:
+                SinapseServicoMap.objects.filter(sinapse_service_id__in=alvo).update(
+                    updated_at=now, **defaults(found)
+                )
+        return in_catalog, novos
 
     def list_unmatched(
         self,
@@ -442,18 +452,27 @@ class SinapseSyncService:
         incremental: bool = False,
         reconcile: bool = False,
     ) -> dict[str, Any]:
+        """
+        Sincroniza página a página: uma consulta `IN` traz registros e hashes
+        existentes, só os alterados são gravados (`bulk_create`/`bulk_update`) e
+        cada página é confirmada na sua própria transação.
+        """
+        started = time.perf_counter()
         offset = 0
         processed = 0
-        created = 0
-        updated = 0
-        unchanged = 0
-        skipped_missing_id = 0
-        skipped_missing_name = 0
-        skipped_by_updated_at = 0
-        divergentes = 0
-        mapped_local = 0
-        unmapped_local = 0
-        mapping_records_created = 0
+        pages = 0
+        counters = {
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "skipped_by_updated_at": 0,
+            "skipped_missing_id": 0,
+            "skipped_missing_name": 0,
+            "divergentes": 0,
+            "mapped_local": 0,
+            "unmapped_local": 0,
+            "mapping_records_created": 0,
+        }
         seen_ids: set[str] = set()
         while True:
             if max_records is not None and processed >= max_records:
@@ -465,99 +484,16 @@ class SinapseSyncService:
             if not rows:
                 break
 
-            mapped_rows = [self.map_service_record(row) for row in rows]
-
-            for mapped in mapped_rows:
-                mapped = self.sanitize_payload(mapped)
-                service_id = mapped.get("service_id")
-                service_name = mapped.get("service_name")
-                service_id_str = str(service_id) if service_id is not None else ""
-
-                if not service_id:
-                    skipped_missing_id += 1
-                    if reconcile:
-                        divergentes += 1
-                    continue
-
-                seen_ids.add(service_id_str)
-
-                if not service_name:
-                    skipped_missing_name += 1
-                    if reconcile:
-                        self._mark_divergence(service_id_str, "Registro sem service_name.")
-                        divergentes += 1
-                    continue
-
-                payload_hash = self.compute_payload_hash(mapped)
-                source_version = str(mapped.get("updated_at") or "")
-
-                existing = SinapseServiceSync.objects.filter(sinapse_service_id=service_id_str).first()
-                if incremental and existing:
-                    src_dt = self.parse_dt(source_version)
-                    dst_dt = self.parse_dt(existing.version)
-                    if src_dt and dst_dt and src_dt <= dst_dt:
-                        skipped_by_updated_at += 1
-                        continue
-
-                with transaction.atomic():
-                    obj, created_now = SinapseServiceSync.objects.get_or_create(
-                        sinapse_service_id=service_id_str,
-                        defaults={
-                            "source_table": self.table_name,
-                            "version": source_version,
-                            "hash_payload": payload_hash,
-                            "payload": mapped,
-                            "status_sync": "SYNCED",
-                            "divergencia": None,
-                            "last_sync_at": timezone.now(),
-                        },
-                    )
-                    is_mapped, map_created = self._upsert_service_mapping(
-                        sinapse_service_id=service_id_str,
-                        service_name=service_name,
-                    )
-                    if is_mapped:
-                        mapped_local += 1
-                    else:
-                        unmapped_local += 1
-                    if map_created:
-                        mapping_records_created += 1
-
-                if created_now:
-                    created += 1
-                    continue
-
-                if obj.hash_payload == payload_hash:
-                    unchanged += 1
-                    obj.last_sync_at = timezone.now()
-                    obj.source_table = self.table_name
-                    obj.status_sync = "SYNCED"
-                    obj.divergencia = None
-                    obj.version = source_version or obj.version or ""
-                    obj.save(
-                        update_fields=[
-                            "last_sync_at",
-                            "source_table",
-                            "status_sync",
-                            "divergencia",
-                            "version",
-                            "updated_at",
-                        ]
-                    )
-                    continue
-
-                obj.source_table = self.table_name
-                obj.version = source_version
-                obj.hash_payload = payload_hash
-                obj.payload = mapped
-                obj.status_sync = "SYNCED"
-                obj.divergencia = None
-                obj.last_sync_at = timezone.now()
-                obj.save()
-                updated += 1
-
+            self._sync_page(
+                [self.map_service_record(row) for row in rows],
+                counters=counters,
+                seen_ids=seen_ids,
+                incremental=incremental,
+                reconcile=reconcile,
+            )
             processed += len(rows)
             offset += len(rows)
+            pages += 1
 
         if reconcile:
             stale_qs = SinapseServiceSync.objects.filter(source_table=self.table_name).exclude(
@@ -570,35 +506,163 @@ class SinapseSyncService:
                     divergencia="Registro nao encontrado na leitura atual da fonte Sinapse.",
                     last_sync_at=timezone.now(),
                 )
-            divergentes += stale_count
+            counters["divergentes"] += stale_count
 
+        elapsed = time.perf_counter() - started
         summary = {
             "table_name": self.table_name,
             "processed": processed,
-            "created": created,
-            "updated": updated,
-            "unchanged": unchanged,
-            "skipped_by_updated_at": skipped_by_updated_at,
-            "skipped_missing_id": skipped_missing_id,
-            "skipped_missing_name": skipped_missing_name,
-            "divergentes": divergentes,
-            "mapped_local": mapped_local,
-            "unmapped_local": unmapped_local,
-            "mapping_records_created": mapping_records_created,
+            **counters,
             "mapping_total": SinapseServicoMap.objects.count(),
             "total_synced_records": SinapseServiceSync.objects.count(),
+            "pages": pages,
+            "elapsed_seconds": round(elapsed, 3),
+            "records_per_second": round(processed / elapsed, 1) if elapsed > 0 else None,
         }
+        # Catálogo possivelmente alterado: todos os workers passam a ler o snapshot novo.
+        summary["catalog_snapshot_version"] = atualizar_snapshot_catalogo()
         return summary
 
+    def _sync_page(
+        self,
+        mapped_rows: list[dict[str, Any]],
+        *,
+        counters: dict[str, int],
+        seen_ids: set[str],
+        incremental: bool,
+        reconcile: bool,
+    ) -> None:
+        candidates: list[tuple[str, dict[str, Any]]] = []
+        for mapped in mapped_rows:
+            mapped = self.sanitize_payload(mapped)
+            service_id = mapped.get("service_id")
+            service_id_str = str(service_id) if service_id is not None else ""
+
+            if not service_id:
+                counters["skipped_missing_id"] += 1
+                if reconcile:
+                    counters["divergentes"] += 1
+                continue
+
+            seen_ids.add(service_id_str)
+
+            if not mapped.get("service_name"):
+                counters["skipped_missing_name"] += 1
+                if reconcile:
+                    self._mark_divergence(service_id_str, "Registro sem service_name.")
+                    counters["divergentes"] += 1
+                continue
+            candidates.append((service_id_str, mapped))
+
+        if not candidates:
+            return
+
+        existing = {
+            obj.sinapse_service_id: obj
+            for obj in SinapseServiceSync.objects.filter(
+                sinapse_service_id__in={sid for sid, _ in candidates}
+            ).only("id", "sinapse_service_id", "version", "hash_payload")
+        }
+        now = timezone.now()
+        to_create: dict[str, SinapseServiceSync] = {}
+        to_update: dict[str, SinapseServiceSync] = {}
+        unchanged_ids: set[str] = set()
+        mapping_rows: list[str] = []
+
+        for service_id_str, mapped in candidates:
+            payload_hash = self.compute_payload_hash(mapped)
+            source_version = str(mapped.get("updated_at") or "")
+            obj = existing.get(service_id_str)
+
+            if incremental and obj is not None:
+                src_dt = self.parse_dt(source_version)
+                dst_dt = self.parse_dt(obj.version)
+                if src_dt and dst_dt and src_dt <= dst_dt:
+                    counters["skipped_by_updated_at"] += 1
+                    continue
+
+            mapping_rows.append(service_id_str)
+            if obj is None:
+                obj = SinapseServiceSync(
+                    sinapse_service_id=service_id_str,
+                    source_table=self.table_name,
+                    version=source_version,
+                    hash_payload=payload_hash,
+                    payload=mapped,
+                    status_sync="SYNCED",
+                    divergencia=None,
+                    last_sync_at=now,
+                )
+                existing[service_id_str] = obj
+                to_create[service_id_str] = obj
+                counters["created"] += 1
+                continue
+
+            if obj.hash_payload == payload_hash:
+                unchanged_ids.add(service_id_str)
+                counters["unchanged"] += 1
+                continue
+
+            obj.version = source_version
+            obj.hash_payload = payload_hash
+            obj.payload = mapped
+            unchanged_ids.discard(service_id_str)
+            if service_id_str not in to_create:
+                to_update[service_id_str] = obj
+            counters["updated"] += 1
+
+        with transaction.atomic():
+            if to_create:
+                SinapseServiceSync.objects.bulk_create(to_create.values(), batch_size=500)
+            if to_update:
+                for obj in to_update.values():
+                    obj.source_table = self.table_name
+                    obj.status_sync = "SYNCED"
+                    obj.divergencia = None
+                    obj.last_sync_at = now
+                    obj.updated_at = now
+                SinapseServiceSync.objects.bulk_update(
+                    to_update.values(),
+                    [
+                        "source_table",
+                        "version",
+                        "hash_payload",
+                        "payload",
+                        "status_sync",
+                        "divergencia",
+                        "last_sync_at",
+                        "updated_at",
+                    ],
+                    batch_size=500,
+                )
+            if unchanged_ids:
+                # Payload idêntico: não regrava, só confirma a leitura.
+                SinapseServiceSync.objects.filter(sinapse_service_id__in=unchanged_ids).update(
+                    source_table=self.table_name,
+                    status_sync="SYNCED",
+                    divergencia=None,
+                    last_sync_at=now,
+                    updated_at=now,
+                )
+            in_catalog, maps_created = self._upsert_service_mappings(set(mapping_rows))
+
+        for service_id_str in mapping_rows:
+            if service_id_str in in_catalog:
+                counters["mapped_local"] += 1
+            else:
+                counters["unmapped_local"] += 1
+        counters["mapping_records_created"] += len(maps_created)
+
     def full_sync(self, batch_size: int = 500, max_records: int | None = None) -> dict[str, Any]:
         summary = self._sync_records(batch_size=batch_size, max_records=max_records, incremental=False, reconcile=False)
         logger.info(
-            "Sinapse full-sync concluido tabela=%s processed=%s created=%s updated=%s unchanged=%s",
+            "Sinapse full-sync concluido tabela=%s processed=%s created=%s updated=%s unchanged=%s rps=%s",
             self.table_name,
             summary["processed"],
             summary["created"],
             summary["updated"],
             summary["unchanged"],
+            summary["records_per_second"],
         )
         return summary
 
@@ -1,15 +1,20 @@
-"""Leitura do catálogo Sinapse (CatalogServico / CatalogOrgao) para o SGDL."""
+"""Leitura do catálogo Sinapse (CatalogServico / CatalogOrgao) para o SGDL.
+
+Lookups por id (`get_servico`, `get_orgao`, `get_servicos`, ...) leem do snapshot
+compartilhado entre workers (`sinapse_catalog_snapshot`); buscas e listagens
+continuam consultando o banco `sinapse`.
+"""
 
 from __future__ import annotations
 
 import re
-from functools import lru_cache
 from html import unescape
-from typing import Any
+from typing import Any, Iterable
 
 from django.db import connections
 
 from integrations.models_sinapse import CatalogOrgao, CatalogServico, SINAPSE_DB_ALIAS
+from integrations.sinapse_catalog_snapshot import snapshot_catalogo
 
 DEFAULT_TIPO_SERVICO = "SERVIÇO"
 CHOICES_SERVICO_LIMIT = 2000
@@ -69,23 +74,28 @@ _CHAVES_SERVICO_REQUER_LOCAL = (
 )
 
 
-@lru_cache(maxsize=1024)
+def requer_localizacao_por_texto(titulo: str | None, descricao_html: str | None) -> bool:
+    blob = f"{(titulo or '').strip()} {_strip_html(descricao_html)}".lower().strip()
+    if not blob:
+        return True
+    return any(chave in blob for chave in _CHAVES_SERVICO_REQUER_LOCAL)
+
+
 def servico_requer_localizacao(servico_id: int | None) -> bool:
     """Heurística: serviços de local físico exigem proximidade geográfica no cluster."""
     if not servico_id:
         return True
+    snapshot = snapshot_catalogo()
+    if snapshot is not None:
+        requer = snapshot.requer_localizacao(int(servico_id))
+        return True if requer is None else requer
     servico = get_servico(servico_id)
     if not servico:
         return True
-    titulo = (getattr(servico, "titulo", None) or "").strip()
-    descricao = _strip_html(
-        getattr(servico, "descricao_html", None)
-        or getattr(servico, "descricao", None)
+    return requer_localizacao_por_texto(
+        getattr(servico, "titulo", None),
+        getattr(servico, "descricao_html", None) or getattr(servico, "descricao", None),
     )
-    blob = f"{titulo} {descricao}".lower().strip()
-    if not blob:
-        return True
-    return any(chave in blob for chave in _CHAVES_SERVICO_REQUER_LOCAL)
 
 
 def parse_prazo_dias(value: Any) -> int | None:
@@ -101,10 +111,12 @@ def parse_prazo_dias(value: Any) -> int | None:
     return number
 
 
-@lru_cache(maxsize=512)
 def get_orgao(orgao_id: int | None) -> CatalogOrgao | None:
     if not orgao_id:
         return None
+    snapshot = snapshot_catalogo()
+    if snapshot is not None:
+        return snapshot.orgao(int(orgao_id))
     return (
         CatalogOrgao.objects.using(SINAPSE_DB_ALIAS)
         .filter(pk=orgao_id)
@@ -112,10 +124,12 @@ def get_orgao(orgao_id: int | None) -> CatalogOrgao | None:
     )
 
 
-@lru_cache(maxsize=2048)
 def get_servico(servico_id: int | None) -> CatalogServico | None:
     if not servico_id:
         return None
+    snapshot = snapshot_catalogo()
+    if snapshot is not None:
+        return snapshot.servico(int(servico_id))
     return (
         CatalogServico.objects.using(SINAPSE_DB_ALIAS)
         .select_related("id_orgao")
@@ -124,6 +138,36 @@ def get_servico(servico_id: int | None) -> CatalogServico | None:
     )
 
 
+def get_orgaos(orgao_ids: Iterable[int | None]) -> dict[int, CatalogOrgao]:
+    """Órgãos presentes no catálogo por id — sem consulta com snapshot, senão um `IN`."""
+    ids = {int(oid) for oid in orgao_ids if oid}
+    if not ids:
+        return {}
+    snapshot = snapshot_catalogo()
+    if snapshot is not None:
+        return {oid: orgao for oid in ids if (orgao := snapshot.orgao(oid)) is not None}
+    return {
+        int(orgao.pk): orgao
+        for orgao in CatalogOrgao.objects.using(SINAPSE_DB_ALIAS).filter(pk__in=ids)
+    }
+
+
+def get_servicos(servico_ids: Iterable[int | None]) -> dict[int, CatalogServico]:
+    """Serviços presentes no catálogo por id (para listagens) — mesmo contrato de `get_orgaos`."""
+    ids = {int(sid) for sid in servico_ids if sid}
+    if not ids:
+        return {}
+    snapshot = snapshot_catalogo()
+    if snapshot is not None:
+        return {sid: servico for sid in ids if (servico := snapshot.servico(sid)) is not None}
+    return {
+        int(servico.pk): servico
+        for servico in CatalogServico.objects.using(SINAPSE_DB_ALIAS)
+        .select_related("id_orgao")
+        .filter(pk__in=ids)
+    }
+
+
 def orgao_to_dict(orgao: CatalogOrgao | None) -> dict[str, Any] | None:
     if not orgao:
         return None
@@ -170,6 +214,18 @@ def servico_existe(servico_id: int) -> bool:
     )
 
 
+def servicos_existentes(servico_ids: Iterable[int]) -> set[int]:
+    """Subconjunto de `servico_ids` presente no catálogo — uma consulta `IN` por chamada."""
+    ids = {int(sid) for sid in servico_ids}
+    if not ids:
+        return set()
+    return set(
+        CatalogServico.objects.using(SINAPSE_DB_ALIAS)
+        .filter(pk__in=ids)
+        .values_list("pk", flat=True)
+    )
+
+
 def orgao_existe(orgao_id: int) -> bool:
     return (
         CatalogOrgao.objects.using(SINAPSE_DB_ALIAS)
@@ -273,7 +329,13 @@ def list_servicos_api(*, limit: int = 2000, orgao_id: int | None = None) -> list
 
 def servico_detalhe_dict(servico_id: int) -> dict[str, Any] | None:
     """Ficha completa do serviço para o Explorer da Carta."""
-    servico = get_servico(servico_id)
+    # Direto do banco: a ficha usa os campos longos que o snapshot não guarda.
+    servico = (
+        CatalogServico.objects.using(SINAPSE_DB_ALIAS)
+        .select_related("id_orgao", "id_categoria")
+        .filter(pk=servico_id)
+        .first()
+    )
     if not servico:
         return None
     categoria = servico.id_categoria
@@ -320,14 +382,36 @@ def buscar_servicos_catalogo(
     if orgao_id:
         qs = qs.filter(id_orgao_id=int(orgao_id))
     termo = (q or "").strip()
+    rows = None
     if termo:
-        qs = qs.filter(
-            Q(titulo__icontains=termo)
-            | Q(texto_limpo_rag__icontains=termo)
-            | Q(documentos_necessarios__icontains=termo)
+        from core.models_busca_lexical import CatalogoBuscaLexical
+        from core.services.busca_lexical_catalogo import (
+            buscar_catalogo_lexical,
+            indice_lexical_disponivel,
         )
-    total = qs.count()
-    rows = list(qs.order_by("titulo")[offset : offset + limit])
+
+        if indice_lexical_disponivel(CatalogoBuscaLexical.FONTE_SINAPSE):
+            # Ranking full-text (ts_rank_cd) no índice local; ficha completa em uma consulta.
+            busca = buscar_catalogo_lexical(
+                termo,
+                fonte=CatalogoBuscaLexical.FONTE_SINAPSE,
+                limit=limit,
+                offset=offset,
+                orgao_id=orgao_id,
+                contar=True,
+            )
+            total = busca.total or 0
+            por_id = qs.in_bulk(busca.ids)
+            rows = [por_id[sid] for sid in busca.ids if sid in por_id]
+        else:
+            qs = qs.filter(
+                Q(titulo__icontains=termo)
+                | Q(texto_limpo_rag__icontains=termo)
+                | Q(documentos_necessarios__icontains=termo)
+            )
+    if rows is None:
+        total = qs.count()
+        rows = list(qs.order_by("titulo")[offset : offset + limit])
     results: list[dict[str, Any]] = []
     for servico in rows:
         base = servico_to_dict(servico)
@@ -0,0 +1,240 @@
+"""Snapshot compartilhado do catálogo Sinapse (serviços + órgãos) entre workers.
+
+Todo lookup pontual (`get_servico`, `get_orgao`, `servico_requer_localizacao`) lê
+deste snapshot em memória; nenhum vai ao banco remoto `sinapse`. O snapshot é
+uma estrutura compacta (tuplas, sem HTML nem embedding) guardada no cache
+Django sob `SNAPSHOT_KEY_PREFIXO + versão`:
+
+- o primeiro worker que não o encontra lê o catálogo (duas consultas) e grava;
+  os demais só desserializam — cada processo carrega uma vez por versão;
+- a versão vigente fica em `VERSAO_KEY`; cada processo a consulta no máximo a
+  cada `SINAPSE_CATALOGO_VERSAO_INTERVALO` segundos;
+- `atualizar_snapshot_catalogo()` (chamado ao fim de cada `SinapseSyncService`
+  bem-sucedido) publica nova versão e já grava o snapshot novo;
+- `SINAPSE_CATALOGO_SNAPSHOT_TTL` limita a idade do snapshot mesmo sem sync.
+
+Sem o banco `sinapse` configurado ou com falha ao montar, `snapshot_catalogo()`
+devolve None e `sinapse_catalog` volta às consultas diretas.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from integrations.models_sinapse import CatalogOrgao, CatalogServico, SINAPSE_DB_ALIAS
+
+logger = logging.getLogger(__name__)
+
+VERSAO_KEY = "sgdl:sinapse_catalog:versao"
+SNAPSHOT_KEY_PREFIXO = "sgdl:sinapse_catalog:snapshot:"
+FORMATO = 1
+
+# Após falha ao montar o snapshot, não tenta de novo antes disso (segundos).
+_ESPERA_APOS_FALHA = 30.0
+
+# Ordem das tuplas serializadas.
+_CAMPOS_SERVICO = ("titulo", "prazo", "slug", "status", "id_orgao_id", "id_categoria_id")
+_CAMPOS_ORGAO = ("nome", "slug", "tipo_orgao", "grupo")
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "SINAPSE_CATALOGO_SNAPSHOT_TTL", 3600))
+
+
+def _intervalo_versao() -> float:
+    return float(getattr(settings, "SINAPSE_CATALOGO_VERSAO_INTERVALO", 5))
+
+
+def _instanciar(modelo, valores: dict[str, Any]):
+    """Instância "vinda do banco": campos fora do snapshot ficam adiados (lazy)."""
+    nomes = [f.attname for f in modelo._meta.concrete_fields if f.attname in valores]
+    return modelo.from_db(SINAPSE_DB_ALIAS, nomes, [valores[n] for n in nomes])
+
+
+@dataclass
+class SnapshotCatalogo:
+    versao: int
+    # id → tupla em `_CAMPOS_SERVICO` + (requer_localizacao,)
+    servicos: dict[int, tuple]
+    orgaos: dict[int, tuple]
+    carregado_em: float = field(default_factory=time.monotonic)
+    _orgaos_obj: dict[int, CatalogOrgao] = field(default_factory=dict, repr=False)
+    _servicos_obj: dict[int, CatalogServico] = field(default_factory=dict, repr=False)
+
+    def orgao(self, orgao_id: int) -> CatalogOrgao | None:
+        obj = self._orgaos_obj.get(orgao_id)
+        if obj is None:
+            row = self.orgaos.get(orgao_id)
+            if row is None:
+                return None
+            obj = _instanciar(CatalogOrgao, {"id": orgao_id, **dict(zip(_CAMPOS_ORGAO, row))})
+            self._orgaos_obj[orgao_id] = obj
+        return obj
+
+    def servico(self, servico_id: int) -> CatalogServico | None:
+        obj = self._servicos_obj.get(servico_id)
+        if obj is None:
+            row = self.servicos.get(servico_id)
+            if row is None:
+                return None
+            obj = _instanciar(
+                CatalogServico, {"id": servico_id, **dict(zip(_CAMPOS_SERVICO, row))}
+            )
+            orgao = self.orgao(obj.id_orgao_id) if obj.id_orgao_id else None
+            if orgao is not None:
+                CatalogServico.id_orgao.field.set_cached_value(obj, orgao)
+            self._servicos_obj[servico_id] = obj
+        return obj
+
+    def requer_localizacao(self, servico_id: int) -> bool | None:
+        row = self.servicos.get(servico_id)
+        return None if row is None else bool(row[-1])
+
+    def serializar(self) -> dict[str, Any]:
+        return {
+            "formato": FORMATO,
+            "versao": self.versao,
+            "servicos": self.servicos,
+            "orgaos": self.orgaos,
+        }
+
+    @classmethod
+    def de_serializado(cls, dados: Any, versao: int) -> "SnapshotCatalogo | None":
+        if not isinstance(dados, dict) or dados.get("formato") != FORMATO:
+            return None
+        return cls(versao=versao, servicos=dados["servicos"], orgaos=dados["orgaos"])
+
+
+def montar_snapshot(versao: int) -> SnapshotCatalogo:
+    """Lê serviços e órgãos do banco `sinapse` (duas consultas)."""
+    from integrations.sinapse_catalog import requer_localizacao_por_texto
+
+    orgaos = {
+        int(row[0]): tuple(row[1:])
+        for row in CatalogOrgao.objects.using(SINAPSE_DB_ALIAS).values_list("id", *_CAMPOS_ORGAO)
+    }
+    servicos: dict[int, tuple] = {}
+    linhas = CatalogServico.objects.using(SINAPSE_DB_ALIAS).values_list(
+        "id", *_CAMPOS_SERVICO, "descricao_html"
+    )
+    for row in linhas:
+        *campos, descricao_html = row[1:]
+        servicos[int(row[0])] = (*campos, requer_localizacao_por_texto(campos[0], descricao_html))
+    return SnapshotCatalogo(versao=versao, servicos=servicos, orgaos=orgaos)
+
+
+_lock = threading.Lock()
+_snapshot: SnapshotCatalogo | None = None
+_versao_verificada_em = 0.0
+_falhou_em: float | None = None
+
+
+def _versao_publicada() -> int:
+    try:
+        versao = cache.get(VERSAO_KEY)
+        if versao is None:
+            cache.add(VERSAO_KEY, 1, None)
+            versao = cache.get(VERSAO_KEY) or 1
+        return int(versao)
+    except Exception:  # noqa: BLE001 - cache fora: vale só o TTL local
+        return 0
+
+
+def _carregar(versao: int) -> SnapshotCatalogo:
+    chave = f"{SNAPSHOT_KEY_PREFIXO}{versao}"
+    try:
+        snapshot = SnapshotCatalogo.de_serializado(cache.get(chave), versao)
+    except Exception:  # noqa: BLE001
+        snapshot = None
+    if snapshot is not None:
+        return snapshot
+    inicio = time.perf_counter()
+    snapshot = montar_snapshot(versao)
+    try:
+        cache.set(chave, snapshot.serializar(), _ttl())
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Snapshot do catálogo Sinapse não gravado no cache: %s", exc)
+    logger.info(
+        "Snapshot do catálogo Sinapse v%s montado: %s serviços, %s órgãos em %.0f ms.",
+        versao,
+        len(snapshot.servicos),
+        len(snapshot.orgaos),
+        (time.perf_counter() - inicio) * 1000,
+    )
+    return snapshot
+
+
+def snapshot_catalogo() -> SnapshotCatalogo | None:
+    """Snapshot vigente deste processo (ou None: catálogo indisponível)."""
+    global _snapshot, _versao_verificada_em, _falhou_em
+    if SINAPSE_DB_ALIAS not in connections.databases:
+        return None
+    agora = time.monotonic()
+    snapshot = _snapshot
+    if (
+        snapshot is not None
+        and agora - _versao_verificada_em < _intervalo_versao()
+        and agora - snapshot.carregado_em < _ttl()
+    ):
+        return snapshot
+    if _falhou_em is not None and agora - _falhou_em < _ESPERA_APOS_FALHA:
+        return None
+    with _lock:
+        versao = _versao_publicada()
+        _versao_verificada_em = time.monotonic()
+        snapshot = _snapshot
+        if (
+            snapshot is not None
+            and snapshot.versao == versao
+            and time.monotonic() - snapshot.carregado_em < _ttl()
+        ):
+            return snapshot
+        try:
+            snapshot = _carregar(versao)
+        except Exception:  # noqa: BLE001 - banco sinapse fora: consultas diretas
+            logger.exception("Falha ao montar snapshot do catálogo Sinapse.")
+            _falhou_em = time.monotonic()
+            return None
+        _falhou_em = None
+        _snapshot = snapshot
+        return snapshot
+
+
+def descartar_snapshot_local() -> None:
+    global _snapshot, _falhou_em
+    with _lock:
+        _snapshot = None
+        _falhou_em = None
+
+
+def atualizar_snapshot_catalogo() -> int | None:
+    """Publica nova versão (os outros workers recarregam) e já grava o snapshot novo."""
+    global _snapshot, _versao_verificada_em
+    descartar_snapshot_local()
+    try:
+        versao = int(cache.incr(VERSAO_KEY))
+    except ValueError:
+        versao = 1
+        cache.set(VERSAO_KEY, versao, None)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Não foi possível publicar nova versão do catálogo Sinapse: %s", exc)
+        return None
+    if SINAPSE_DB_ALIAS not in connections.databases:
+        return versao
+    try:
+        snapshot = _carregar(versao)
+    except Exception:  # noqa: BLE001 - próximo acesso tenta de novo
+        logger.exception("Falha ao montar snapshot do catálogo Sinapse após sync.")
+        return versao
+    with _lock:
+        _snapshot = snapshot
+        _versao_verificada_em = time.monotonic()
+    return versao
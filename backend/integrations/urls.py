@@ -1,6 +1,7 @@
 from django.urls import path
 
 from integrations.views import (
+    HttpExternoMetricasAPIView,
     SinapseBulkManualBindAPIView,
     SinapseManualBindAPIView,
     SinapseSyncHealthAPIView,
@@ -14,6 +15,7 @@ from integrations.views_carta_explorer import (
 
 
 urlpatterns = [
+    path("http-externo/metricas/", HttpExternoMetricasAPIView.as_view(), name="http-externo-metricas"),
     path("sinapse/sync-health/", SinapseSyncHealthAPIView.as_view(), name="sinapse-sync-health"),
     path("sinapse/unmatched/", SinapseUnmatchedListAPIView.as_view(), name="sinapse-unmatched-list"),
     path("sinapse/bind-manual/", SinapseManualBindAPIView.as_view(), name="sinapse-bind-manual"),
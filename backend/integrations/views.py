@@ -5,7 +5,9 @@ from rest_framework.views import APIView
 
 from integrations.services.sinapse_sync_service import SinapseSyncService
 from integrations.sinapse_client import SinapseClientError
+from core.services import llm_cache_service
 from core.services.gestor_escopo import gestor_pode_crud_admin
+from core.services.http_externo import metricas_http_externo
 
 
 def _can_manage_reconciliation(user) -> bool:
@@ -83,6 +85,19 @@ class SinapseSyncHealthAPIView(APIView):
         return Response(service.sync_health_report(), status=status.HTTP_200_OK)
 
 
+class HttpExternoMetricasAPIView(APIView):
+    """Circuitos e histogramas das chamadas externas + cache de LLM (deste worker)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not _can_manage_reconciliation(request.user):
+            return Response({"detail": "Sem permissao."}, status=status.HTTP_403_FORBIDDEN)
+        dados = metricas_http_externo()
+        dados["llm_cache"] = llm_cache_service.estatisticas()
+        return Response(dados, status=status.HTTP_200_OK)
+
+
 class SinapseBulkManualBindAPIView(APIView):
     permission_classes = [IsAuthenticated]
 